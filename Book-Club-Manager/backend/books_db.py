@@ -0,0 +1,321 @@
+"""Shared read-only access to the local books.db SQLite catalog.
+
+books.db is written once by the data pipeline and only read by the app, so every
+lookup used to pay for a fresh `sqlite3.connect` (file open, schema parse, cold
+page cache) and, for batches, a one-off `IN (?,?,...)` statement that SQLite had
+to compile each time because its text changed with the list length.
+
+This module keeps one connection per (thread, database file), opened with
+`mode=ro&immutable=1` so SQLite skips locking and change detection, and tuned
+with a larger `mmap_size` / `cache_size`. Statement text is fixed per column
+set, so SQLite's per-connection statement cache reuses the compiled plans.
+Batches are a single `json_each` join on one JSON-array parameter. A thread's
+connections are closed when the thread exits, so short-lived worker threads do
+not leak file descriptors.
+
+Each thread re-stats the file at most once per BOOKS_DB_STAT_INTERVAL_S; if it
+was replaced (different mtime, size or inode) that thread opens a fresh
+connection. `immutable=1` is only safe because of that check.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from backend import config
+from backend.instrumentation import enabled as _instrumentation_enabled
+from backend.instrumentation import get_registry
+
+PathLike = Union[str, Path]
+
+# Columns callers may request; anything else is rejected before it reaches SQL text.
+BOOK_COLUMNS: Tuple[str, ...] = (
+    "parent_asin",
+    "title",
+    "author_name",
+    "average_rating",
+    "rating_number",
+    "description",
+    "images",
+    "categories",
+    "title_author_key",
+)
+METADATA_COLUMNS: Tuple[str, ...] = (
+    "parent_asin",
+    "title",
+    "author_name",
+    "average_rating",
+    "rating_number",
+    "images",
+    "categories",
+)
+# Fallback batch size when the SQLite build lacks json_each (stays under the
+# default SQLITE_MAX_VARIABLE_NUMBER of older builds).
+_IN_CHUNK = 500
+
+# Pool entry: (file signature, connection, time.monotonic() of the last stat).
+_PoolEntry = Tuple[Tuple[int, int, int], sqlite3.Connection, float]
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_pools_lock = threading.Lock()
+
+
+class _ThreadPool:  # pylint: disable=too-few-public-methods
+    """One thread's connections by database path; closed when the thread exits."""
+
+    __slots__ = ("entries", "__weakref__")
+
+    def __init__(self) -> None:
+        """Start empty; connection() fills it."""
+        self.entries: Dict[str, _PoolEntry] = {}
+
+
+# Weak, so the pools of finished threads are collected (and their connections closed).
+_pools: "weakref.WeakSet[_ThreadPool]" = weakref.WeakSet()
+
+
+def _empty_stats() -> Dict[str, float]:
+    """Return zeroed query counters."""
+    return {
+        "queries": 0,
+        "batch_queries": 0,
+        "rows": 0,
+        "total_ms": 0.0,
+        "max_ms": 0.0,
+        "connections_opened": 0,
+        "connections_closed": 0,
+    }
+
+
+_stats: Dict[str, float] = _empty_stats()
+
+
+def _record(batch: bool, rows: int, elapsed_s: float) -> None:
+    """Add one query to the timing counters."""
+    ms = elapsed_s * 1000.0
+    if _instrumentation_enabled():
+        get_registry().record("sqlite.fetch_many" if batch else "sqlite.fetch_one", elapsed_s)
+    with _stats_lock:
+        _stats["queries"] += 1
+        if batch:
+            _stats["batch_queries"] += 1
+        _stats["rows"] += rows
+        _stats["total_ms"] += ms
+        _stats["max_ms"] = max(_stats["max_ms"], ms)
+
+
+def query_stats() -> Dict[str, float]:
+    """Return a snapshot of query counters (counts, rows, total/max/mean milliseconds)."""
+    with _stats_lock:
+        out = dict(_stats)
+    out["mean_ms"] = out["total_ms"] / out["queries"] if out["queries"] else 0.0
+    return out
+
+
+def reset_query_stats() -> None:
+    """Zero the query counters."""
+    with _stats_lock:
+        _stats.clear()
+        _stats.update(_empty_stats())
+
+
+def _file_signature(path: Path) -> Tuple[int, int, int]:
+    """Return (mtime_ns, size, inode) so a rebuilt books.db gets new connections."""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _open(path: Path) -> sqlite3.Connection:
+    """Open a tuned read-only connection to path.
+
+    check_same_thread is off so close_all() and thread-exit finalizers may
+    close it; only the owning thread ever runs statements on it.
+    """
+    uri = f"{path.resolve().as_uri()}?mode=ro&immutable=1"
+    conn = sqlite3.connect(
+        uri,
+        uri=True,
+        check_same_thread=False,
+        cached_statements=config.BOOKS_DB_CACHED_STATEMENTS,
+    )
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute(f"PRAGMA mmap_size = {int(config.BOOKS_DB_MMAP_BYTES)}")
+        # Negative cache_size is in KiB rather than pages.
+        conn.execute(f"PRAGMA cache_size = -{int(config.BOOKS_DB_CACHE_KIB)}")
+        conn.execute("PRAGMA query_only = 1")
+    except sqlite3.Error:
+        conn.close()
+        raise
+    with _stats_lock:
+        _stats["connections_opened"] += 1
+    return conn
+
+
+def _close(conn: sqlite3.Connection) -> None:
+    """Close a pooled connection, counting it."""
+    try:
+        conn.close()
+    except sqlite3.Error:
+        return
+    with _stats_lock:
+        _stats["connections_closed"] += 1
+
+
+def _close_entries(entries: Dict[str, _PoolEntry]) -> None:
+    """Close and forget every connection in one thread's pool."""
+    for _, conn, _ in list(entries.values()):
+        _close(conn)
+    entries.clear()
+
+
+def _thread_pool() -> _ThreadPool:
+    """Return this thread's pool, registering its close-on-exit finalizer on first use."""
+    pool: Optional[_ThreadPool] = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _ThreadPool()
+        _local.pool = pool
+        # The finalizer holds the entries dict, never the pool itself.
+        weakref.finalize(pool, _close_entries, pool.entries)
+        with _pools_lock:
+            _pools.add(pool)
+    return pool
+
+
+def connection(db_path: PathLike) -> sqlite3.Connection:
+    """Return this thread's pooled read-only connection for db_path.
+
+    Args:
+        db_path: Path to a books.db file.
+
+    Returns:
+        A connection with sqlite3.Row rows; do not close it.
+
+    Exceptions:
+        OSError: If the file does not exist.
+        sqlite3.Error: If SQLite cannot open it.
+    """
+    path = Path(db_path)
+    key = str(path)
+    entries = _thread_pool().entries
+    cached = entries.get(key)
+    now = time.monotonic()
+    if cached is not None and now - cached[2] < config.BOOKS_DB_STAT_INTERVAL_S:
+        return cached[1]
+    signature = _file_signature(path)
+    if cached is not None and cached[0] == signature:
+        entries[key] = (signature, cached[1], now)
+        return cached[1]
+    if cached is not None:
+        del entries[key]
+        _close(cached[1])
+    conn = _open(path)
+    entries[key] = (signature, conn, now)
+    return conn
+
+
+def close_all() -> None:
+    """Close every pooled connection (all threads). Used by tests and shutdown hooks."""
+    with _pools_lock:
+        pools = list(_pools)
+    for pool in pools:
+        _close_entries(pool.entries)
+
+
+def _columns_sql(columns: Sequence[str]) -> str:
+    """Validate requested columns and return them as a SELECT list."""
+    bad = [c for c in columns if c not in BOOK_COLUMNS]
+    if bad or not columns:
+        raise ValueError(f"unknown books.db columns: {bad or 'none requested'}")
+    return ", ".join(columns)
+
+
+@lru_cache(maxsize=32)
+def _one_sql(columns: Tuple[str, ...]) -> str:
+    """Single-row lookup statement for a column set."""
+    return f"SELECT {_columns_sql(columns)} FROM books WHERE parent_asin = ? LIMIT 1"
+
+
+@lru_cache(maxsize=32)
+def _many_sql(columns: Tuple[str, ...]) -> str:
+    """Batch lookup statement for a column set: one JSON-array parameter, input order kept."""
+    _columns_sql(columns)
+    cols = ", ".join(f"b.{c}" for c in columns)
+    return (
+        f"SELECT {cols} FROM json_each(?) AS j "
+        "JOIN books AS b ON b.parent_asin = j.value ORDER BY j.key"
+    )
+
+
+def _query(db_path: PathLike, sql: str, params: Tuple[Any, ...]) -> List[sqlite3.Row]:
+    """Run a statement on the pooled connection, reopening once if close_all() closed it."""
+    try:
+        return connection(db_path).execute(sql, params).fetchall()
+    except sqlite3.ProgrammingError:
+        _thread_pool().entries.clear()
+        return connection(db_path).execute(sql, params).fetchall()
+
+
+def fetch_one(
+    db_path: PathLike, parent_asin: str, columns: Sequence[str] = BOOK_COLUMNS
+) -> Optional[sqlite3.Row]:
+    """Return the books row for parent_asin, or None when absent.
+
+    Exceptions:
+        OSError, sqlite3.Error: If the database cannot be opened or queried.
+        ValueError: If columns contains a name outside BOOK_COLUMNS.
+    """
+    sql = _one_sql(tuple(columns))
+    start = time.perf_counter()
+    rows = _query(db_path, sql, (str(parent_asin),))
+    _record(False, len(rows), time.perf_counter() - start)
+    return rows[0] if rows else None
+
+
+def fetch_many(
+    db_path: PathLike, parent_asins: Iterable[Any], columns: Sequence[str] = METADATA_COLUMNS
+) -> List[sqlite3.Row]:
+    """Return books rows for parent_asins in input order (duplicates and misses dropped).
+
+    Exceptions:
+        OSError, sqlite3.Error: If the database cannot be opened or queried.
+        ValueError: If columns contains a name outside BOOK_COLUMNS.
+    """
+    asins = list(dict.fromkeys(str(a) for a in parent_asins if a is not None))
+    if not asins:
+        return []
+    cols = tuple(columns)
+    if "parent_asin" not in cols:
+        raise ValueError("fetch_many needs parent_asin among the columns")
+    start = time.perf_counter()
+    try:
+        rows = _query(db_path, _many_sql(cols), (json.dumps(asins),))
+    except sqlite3.OperationalError as exc:
+        if "json_each" not in str(exc):
+            raise
+        rows = _fetch_many_in_chunks(connection(db_path), asins, cols)
+    _record(True, len(rows), time.perf_counter() - start)
+    return rows
+
+
+def _fetch_many_in_chunks(
+    conn: sqlite3.Connection, asins: List[str], columns: Tuple[str, ...]
+) -> List[sqlite3.Row]:
+    """IN (...) fallback for SQLite builds without JSON1; chunks share one statement shape."""
+    by_asin: Dict[str, sqlite3.Row] = {}
+    select = _columns_sql(columns)
+    for i in range(0, len(asins), _IN_CHUNK):
+        chunk = asins[i:i + _IN_CHUNK]
+        sql = f"SELECT {select} FROM books WHERE parent_asin IN ({','.join('?' * len(chunk))})"
+        for row in conn.execute(sql, chunk).fetchall():
+            by_asin[str(row["parent_asin"])] = row
+    return [by_asin[a] for a in asins if a in by_asin]
@@ -0,0 +1,118 @@
+"""Process-wide cache of the frontend bootstrap, one entry per section.
+
+frontend/main.py used to rebuild its bootstrap (trending books, explore events,
+forum) on every Streamlit rerun in local mode, and behind a blind 300s
+st.cache_data TTL in AWS mode. BootstrapCache keeps each section ("books",
+"events", "forum") together with the key it was built for: the (mtime, size)
+of the section's local data files (storage.bootstrap_sources()) plus this
+process's storage write generation for the section. A rerun with unchanged
+data costs a few os.stat calls and a dict lookup; a section is rebuilt when its
+key changes, after invalidate(), or once older than
+config.BOOTSTRAP_MAX_AGE_SECONDS (writes this process cannot see).
+
+Sections are built on first use, so a page that never needs the forum or the
+events does not load them.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from backend import config
+from backend.storage import file_stamp, write_generation
+
+
+def section_key(storage: Any, section: str) -> Tuple[Any, ...]:
+    """Return the cache key of a bootstrap section for this storage backend.
+
+    Args:
+        storage: LocalStorage/CloudStorage (anything without bootstrap_sources
+            is treated as having no local files).
+        section: "books", "events" or "forum".
+
+    Returns:
+        tuple: File stamps of the section's sources and its write generation.
+    """
+    sources_fn = getattr(storage, "bootstrap_sources", None)
+    paths = (sources_fn() if callable(sources_fn) else {}).get(section) or ()
+    return (tuple((str(p), file_stamp(p)) for p in paths), write_generation(section))
+
+
+class BootstrapCache:
+    """Per-section values with the key they were built for and their build time."""
+
+    def __init__(
+        self, max_age_seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Create an empty cache; entries older than max_age_seconds are rebuilt."""
+        self.max_age_seconds = float(max_age_seconds)
+        self._clock = clock
+        self._entries: Dict[str, Tuple[Hashable, float, Any, int]] = {}
+        self._builds = 0
+        self._lock = threading.Lock()
+
+    def get(self, section: str, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the cached value of section if it was built for key, else build it.
+
+        Args:
+            section: Section name.
+            key: Current key of the section (see section_key).
+            build: Zero-argument function producing the section value.
+
+        Returns:
+            The cached or newly built value. Exceptions from build propagate and
+            nothing is cached.
+        """
+        return self.get_stamped(section, key, build)[0]
+
+    def get_stamped(
+        self, section: str, key: Hashable, build: Callable[[], Any]
+    ) -> Tuple[Any, Tuple[Hashable, int]]:
+        """Like get, but also return a stamp identifying this build of the section.
+
+        The stamp is (key, build number) and changes whenever the section is
+        rebuilt, including max-age rebuilds and rebuilds after invalidate(), so
+        dependent sections can use it in their own key.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(section)
+        if entry is not None and entry[0] == key and now - entry[1] < self.max_age_seconds:
+            return entry[2], (key, entry[3])
+        value = build()
+        with self._lock:
+            self._builds += 1
+            build_number = self._builds
+            self._entries[section] = (key, now, value, build_number)
+        return value, (key, build_number)
+
+    def invalidate(self, section: Optional[str] = None) -> None:
+        """Drop one section (or all of them) so the next get rebuilds it."""
+        with self._lock:
+            if section is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(section, None)
+
+
+_BOOTSTRAP_CACHE: Optional[BootstrapCache] = None
+_BOOTSTRAP_CACHE_LOCK = threading.Lock()
+
+
+def get_bootstrap_cache() -> BootstrapCache:
+    """Return the process-wide bootstrap cache, creating it on first use."""
+    global _BOOTSTRAP_CACHE  # pylint: disable=global-statement
+    if _BOOTSTRAP_CACHE is None:
+        with _BOOTSTRAP_CACHE_LOCK:
+            if _BOOTSTRAP_CACHE is None:
+                _BOOTSTRAP_CACHE = BootstrapCache(config.BOOTSTRAP_MAX_AGE_SECONDS)
+    return _BOOTSTRAP_CACHE
+
+
+def reset_bootstrap_cache() -> None:
+    """Discard the process-wide bootstrap cache (tests, or after a data import)."""
+    global _BOOTSTRAP_CACHE  # pylint: disable=global-statement
+    with _BOOTSTRAP_CACHE_LOCK:
+        _BOOTSTRAP_CACHE = None
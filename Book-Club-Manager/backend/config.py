@@ -75,6 +75,10 @@ USER_RECOMMENDATIONS_TABLE = os.getenv("USER_RECOMMENDATIONS_TABLE", "user_recom
 # GSI on forum_posts for querying thread by parent_asin (partition key = parent_asin, sort key = sk).
 # Set to GSI name (e.g. "parent_asin-index") or leave empty to use full load + filter.
 FORUM_POSTS_GSI = os.getenv("FORUM_POSTS_GSI", "parent_asin-index").strip() or None
+# GSI on forum_posts for threads by normalized book title (partition key book_title_key,
+# sort key = sk), so posts without a parent_asin are found. Items written before this
+# attribute existed need data/scripts/loaders/backfill_forum_title_keys.py once.
+FORUM_POSTS_TITLE_GSI = os.getenv("FORUM_POSTS_TITLE_GSI", "book_title_key-index").strip() or None
 # Optional GSI on forum_posts for \"all posts by created_at\": partition key pk, sort key created_at.
 FORUM_POSTS_CREATED_AT_GSI = os.getenv("FORUM_POSTS_CREATED_AT_GSI", "created_at-index").strip() or None
 BOOKS_TABLE = os.getenv("BOOKS_TABLE", "books")
@@ -86,6 +90,9 @@ EVENTS_GSI = os.getenv("EVENTS_GSI", "ttl-index").strip() or None
 EVENTS_CITY_STATE_GSI = os.getenv("EVENTS_CITY_STATE_GSI", "city_state_ttl-index").strip() or None
 # GSI on events for "events related to a book": partition key parent_asin, sort key ttl.
 EVENTS_PARENT_ASIN_GSI = os.getenv("EVENTS_PARENT_ASIN_GSI", "parent_asin_ttl-index").strip() or None
+# GSI on events by start day: partition key day_bucket ("day#YYYYMMDD", written by
+# load_events_to_dynamodb), sort key ttl. Used for soonest events when EVENTS_GSI fails.
+EVENTS_DAY_BUCKET_GSI = os.getenv("EVENTS_DAY_BUCKET_GSI", "day_bucket-ttl-index").strip() or None
 
 # S3 bucket for book data and images.
 DATA_BUCKET = os.getenv("DATA_BUCKET", "bookish-data-elsie")
@@ -105,6 +112,10 @@ RECOMMENDED_BOOKS_SIZE = 50
 RECOMMENDED_EVENTS_SIZE = 10
 # Run book recommender after this many adds-to-shelf since last run.
 ADDS_BEFORE_BOOK_RERUN = 3
+# Run that book recommender refresh on a background pool (backend/refresh_executor.py)
+# instead of inside the add-to-shelf click; readers keep the previous list meanwhile.
+RECS_REFRESH_ASYNC = os.getenv("RECS_REFRESH_ASYNC", "1").strip().lower() in ("1", "true", "yes")
+RECS_REFRESH_WORKERS = int(os.getenv("RECS_REFRESH_WORKERS", "2").strip() or "2")
 # Max number of upcoming events to score for personalized event recommendations (~90–100 typical; 200 covers full pool).
 EVENT_RECOMMENDATION_POOL_SIZE = 200
 
@@ -156,8 +167,123 @@ BOOK_RATING_NORMS_S3_KEY = os.getenv(
     "BOOK_RATING_NORMS_S3_KEY",
     f"{BOOK_RECOMMENDER_ARTIFACTS_S3_PREFIX}/book_rating_norms.npz",
 )
+# Optional top-K table for genre-only / cold-start users (built alongside the artifacts above).
+BOOK_GENRE_BUCKETS_S3_KEY = os.getenv(
+    "BOOK_GENRE_BUCKETS_S3_KEY",
+    f"{BOOK_RECOMMENDER_ARTIFACTS_S3_PREFIX}/book_genre_buckets.npz",
+)
 
 ML_ARTIFACTS_LOCAL_CACHE_DIR = os.getenv("ML_ARTIFACTS_LOCAL_CACHE_DIR", "/tmp/bookish-ml")
+# Artifact cache (backend/recommender/artifact_cache.py): S3 artifacts are downloaded with
+# parallel ranged GETs of ML_ARTIFACTS_PART_SIZE_MB, verified (manifest sha256, else the
+# ETag MD5) and kept per ETag under ML_ARTIFACTS_LOCAL_CACHE_DIR, so restarts and other
+# workers on the host load them from disk. ML_ARTIFACTS_KEEP_VERSIONS versions per key are kept.
+ML_ARTIFACTS_PART_SIZE_MB = max(1, int(os.getenv("ML_ARTIFACTS_PART_SIZE_MB", "8")))
+ML_ARTIFACTS_DOWNLOAD_WORKERS = max(1, int(os.getenv("ML_ARTIFACTS_DOWNLOAD_WORKERS", "8")))
+ML_ARTIFACTS_KEEP_VERSIONS = max(1, int(os.getenv("ML_ARTIFACTS_KEEP_VERSIONS", "2")))
+# {artifact file name: {"sha256", "size"}} written by build_recommender_artifacts.py.
+BOOK_RECOMMENDER_MANIFEST_S3_KEY = os.getenv(
+    "BOOK_RECOMMENDER_MANIFEST_S3_KEY",
+    f"{BOOK_RECOMMENDER_ARTIFACTS_S3_PREFIX}/manifest.json",
+)
+
+# Content-based recommender candidate generation. Catalogs with at least
+# BOOK_CANDIDATE_INDEX_MIN_BOOKS rows are scored through the genre candidate
+# index, which prunes books that cannot reach the top-k (results match
+# exhaustive scoring); BOOK_CANDIDATE_POOL_SIZE books are scored up front to
+# bound the k-th score. Smaller catalogs are scored exhaustively.
+BOOK_CANDIDATE_INDEX_MIN_BOOKS = int(os.getenv("BOOK_CANDIDATE_INDEX_MIN_BOOKS", "50000").strip() or "50000")
+BOOK_CANDIDATE_POOL_SIZE = int(os.getenv("BOOK_CANDIDATE_POOL_SIZE", "4000").strip() or "4000")
+# Compact numeric mode for the precomputed (full-catalog) recommender: float32
+# artifacts and scores, int32 indices, per-thread reusable score buffers.
+BOOK_RECOMMENDER_COMPACT = os.getenv("BOOK_RECOMMENDER_COMPACT", "0").strip().lower() in ("1", "true", "yes")
+# Users whose content-based profile (genre prefs + library TF-IDF sum) is kept in
+# memory; adding a book to a cached user's library updates the sum incrementally.
+BOOK_PROFILE_CACHE_SIZE = int(os.getenv("BOOK_PROFILE_CACHE_SIZE", "10000").strip() or "10000")
+
+# Local books.db read pool (backend/books_db.py): per-thread read-only connections
+# with a larger memory map and page cache than SQLite's defaults.
+BOOKS_DB_MMAP_BYTES = int(os.getenv("BOOKS_DB_MMAP_BYTES", str(256 * 1024 * 1024)).strip() or str(256 * 1024 * 1024))
+BOOKS_DB_CACHE_KIB = int(os.getenv("BOOKS_DB_CACHE_KIB", "16384").strip() or "16384")
+BOOKS_DB_CACHED_STATEMENTS = int(os.getenv("BOOKS_DB_CACHED_STATEMENTS", "64").strip() or "64")
+# Seconds between os.stat checks for a rebuilt books.db (per thread; 0 = every lookup).
+BOOKS_DB_STAT_INTERVAL_S = float(os.getenv("BOOKS_DB_STAT_INTERVAL_S", "1.0").strip() or "1.0")
+
+# Process-wide book metadata cache (backend/metadata_cache.py). Not-found ASINs
+# are remembered for the shorter negative TTL. Warm-up preloads the top-N
+# popular ASINs (reviews top-50 + SPL trending) at app start; 0 disables it.
+BOOK_METADATA_CACHE_SIZE = int(os.getenv("BOOK_METADATA_CACHE_SIZE", "20000").strip() or "20000")
+BOOK_METADATA_CACHE_TTL_SECONDS = float(os.getenv("BOOK_METADATA_CACHE_TTL_SECONDS", "3600").strip() or "3600")
+BOOK_METADATA_NEGATIVE_TTL_SECONDS = float(os.getenv("BOOK_METADATA_NEGATIVE_TTL_SECONDS", "300").strip() or "300")
+BOOK_METADATA_WARMUP_TOP_N = int(os.getenv("BOOK_METADATA_WARMUP_TOP_N", "100").strip() or "100")
+
+# CloudStorage.get_books_metadata_batch: 100-key BatchGetItem chunks are sent on
+# a bounded pool; UnprocessedKeys are retried with capped exponential backoff.
+# Only the projected attributes are read (empty BOOK_METADATA_PROJECTION = all).
+DYNAMO_BATCH_MAX_WORKERS = int(os.getenv("DYNAMO_BATCH_MAX_WORKERS", "4").strip() or "4")
+DYNAMO_BATCH_MAX_ATTEMPTS = int(os.getenv("DYNAMO_BATCH_MAX_ATTEMPTS", "6").strip() or "6")
+DYNAMO_BATCH_BACKOFF_BASE_SECONDS = float(os.getenv("DYNAMO_BATCH_BACKOFF_BASE_SECONDS", "0.05").strip() or "0.05")
+DYNAMO_BATCH_BACKOFF_MAX_SECONDS = float(os.getenv("DYNAMO_BATCH_BACKOFF_MAX_SECONDS", "1.0").strip() or "1.0")
+BOOK_METADATA_PROJECTION = [
+    a.strip()
+    for a in os.getenv(
+        "BOOK_METADATA_PROJECTION",
+        "parent_asin,title,author_name,author,average_rating,rating_number,rating_count,"
+        "images,image_url,categories,categories_list,genres,title_author_key",
+    ).split(",")
+    if a.strip()
+]
+
+# Process-wide upcoming-events snapshot (backend/events_pool.py) behind
+# get_soonest_events / get_events_by_city / get_events_for_book. It is reloaded
+# in the background once older than the TTL; at most EVENTS_POOL_MAX_EVENTS
+# events are loaded (soonest first).
+EVENTS_POOL_TTL_SECONDS = float(os.getenv("EVENTS_POOL_TTL_SECONDS", "300").strip() or "300")
+EVENTS_POOL_MAX_EVENTS = int(os.getenv("EVENTS_POOL_MAX_EVENTS", "2000").strip() or "2000")
+# Day buckets (from today) read by the EVENTS_DAY_BUCKET_GSI fallback, a few in parallel.
+EVENTS_DAY_BUCKET_DAYS = int(os.getenv("EVENTS_DAY_BUCKET_DAYS", "120").strip() or "120")
+# Last-resort scan when neither events GSI works: stop after EVENTS_SCAN_FACTOR x
+# EVENTS_POOL_MAX_EVENTS upcoming events or EVENTS_SCAN_MAX_PAGES pages.
+EVENTS_SCAN_FACTOR = int(os.getenv("EVENTS_SCAN_FACTOR", "3").strip() or "3")
+EVENTS_SCAN_MAX_PAGES = int(os.getenv("EVENTS_SCAN_MAX_PAGES", "10").strip() or "10")
+
+# Paged event reads (iter_event_pages): GSI queries use `ttl > now` in the key
+# condition and read only the list-view attributes (empty EVENT_LIST_PROJECTION = all).
+EVENTS_PAGE_SIZE = int(os.getenv("EVENTS_PAGE_SIZE", "50").strip() or "50")
+EVENT_LIST_PROJECTION = [
+    a.strip()
+    for a in os.getenv(
+        "EVENT_LIST_PROJECTION",
+        "event_id,title,description,book_title,book_author,parent_asin,tags,"
+        "day_of_week_start,start_time,start_iso,ttl,city_state,venue,link,thumbnail",
+    ).split(",")
+    if a.strip()
+]
+
+# Frontend bootstrap cache (backend/bootstrap_cache.py). Sections are rebuilt when
+# their local data files change or this process writes to them; the max age only
+# bounds staleness from writes it cannot see (other processes, AWS tables).
+BOOTSTRAP_MAX_AGE_SECONDS = float(os.getenv("BOOTSTRAP_MAX_AGE_SECONDS", "300").strip() or "300")
+
+# Write-behind for per-user activity writes in AWS mode (backend/write_behind.py).
+# When enabled, user_books/user_events/user_forums/user_recommendations puts are
+# coalesced per record for WRITE_BEHIND_WINDOW_SECONDS and flushed with
+# BatchWriteItem from a background thread; reads see queued writes immediately.
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+WRITE_BEHIND_WINDOW_SECONDS = float(os.getenv("WRITE_BEHIND_WINDOW_SECONDS", "0.5").strip() or "0.5")
+# Flushed items stay readable from the overlay this long (covers eventually consistent reads).
+WRITE_BEHIND_SETTLE_SECONDS = float(os.getenv("WRITE_BEHIND_SETTLE_SECONDS", "2").strip() or "2")
+
+# Per-operation timing of storage/service/recommender calls (backend/instrumentation.py).
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+# Latencies kept per operation for p50/p95/p99.
+INSTRUMENTATION_SAMPLE_SIZE = int(os.getenv("INSTRUMENTATION_SAMPLE_SIZE", "512").strip() or "512")
+# Show the timing/trace debug panel in the sidebar (also shown with ?debug=1).
+INSTRUMENTATION_DEBUG_PANEL = os.getenv("INSTRUMENTATION_DEBUG_PANEL", "0").strip().lower() in ("1", "true", "yes")
+
+# Log per-page storage reads (calls vs. round trips after the request-scoped
+# cache in backend/request_cache.py) at the end of every rerun.
+STORAGE_READ_REPORT = os.getenv("STORAGE_READ_REPORT", "0").strip().lower() in ("1", "true", "yes")
 
 # Max characters to show for forum post preview in list views (full text shown when "Open discussion").
 FORUM_PREVIEW_MAX_CHARS = int(os.getenv("FORUM_PREVIEW_MAX_CHARS", "280").strip() or "280")
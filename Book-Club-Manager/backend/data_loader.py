@@ -190,18 +190,23 @@ def _parse_tags(text: str) -> list[str]:
     return []
 
 
-def build_ui_bootstrap(
-    raw_books: list[dict],
-    events: list[dict],
-    forum_posts: list[dict],
-) -> dict:
-    """Build the UI bootstrap dict from service-shaped data (books, events, forum posts).
+def build_books_bootstrap(raw_books: list[dict]) -> dict:
+    """Build the books part of the UI bootstrap (books, lookups by id/source_id, genres)."""
+    books = _books_from_services_to_ui_shape(raw_books, 50)
+    return {
+        "books": books,
+        "books_by_id": {b["id"]: b for b in books},
+        "books_by_source_id": {str(b["source_id"]): b for b in books},
+        "genres": sorted({g for b in books for g in b["genres"]}),
+    }
 
-    Use this when data comes from books_service, events_service, and storage so the
-    frontend gets one consistent dict. Handles empty data with fallbacks.
+
+def build_clubs_bootstrap(events: list[dict], books: list[dict]) -> dict:
+    """Build the events part of the UI bootstrap (clubs, neighborhoods, user_club_ids).
+
+    `books` is the UI-shaped list from build_books_bootstrap; it links events to
+    their current book and seeds the fallback club when there are no events.
     """
-    books = _books_from_services_to_ui_shape(raw_books, 50)
-    books_by_id = {b["id"]: b for b in books}
     books_by_source_id = {str(b["source_id"]): b for b in books}
     clubs = _events_to_clubs_ui_shape(events, books_by_source_id)
     if not clubs:
@@ -225,7 +230,30 @@ def build_ui_bootstrap(
                 "external_link": "",
             }
         ]
-    user_club_ids = [c["id"] for c in clubs[: min(4, len(clubs))]]
+    neighborhoods = sorted(
+        {(c["location"].split(",", maxsplit=1)[0]).strip() for c in clubs}
+    )
+    return {
+        "clubs": clubs,
+        "neighborhoods": neighborhoods,
+        "user_club_ids": [c["id"] for c in clubs[: min(4, len(clubs))]],
+    }
+
+
+def build_ui_bootstrap(
+    raw_books: list[dict],
+    events: list[dict],
+    forum_posts: list[dict],
+) -> dict:
+    """Build the UI bootstrap dict from service-shaped data (books, events, forum posts).
+
+    Use this when data comes from books_service, events_service, and storage so the
+    frontend gets one consistent dict. Handles empty data with fallbacks.
+    """
+    book_part = build_books_bootstrap(raw_books)
+    books = book_part["books"]
+    club_part = build_clubs_bootstrap(events, books)
+    clubs = club_part["clubs"]
     library = {
         "in_progress": [b["id"] for b in books[0:4]],
         "saved": [b["id"] for b in books[4:8]],
@@ -267,20 +295,11 @@ def build_ui_bootstrap(
                 ),
             },
         ]
-    genres = sorted({g for b in books for g in b["genres"]})
-    neighborhoods = sorted(
-        {(c["location"].split(",", maxsplit=1)[0]).strip() for c in clubs}
-    )
     return {
-        "books": books,
-        "books_by_id": books_by_id,
-        "books_by_source_id": books_by_source_id,
-        "clubs": clubs,
+        **book_part,
+        **club_part,
         "forum_posts": forum_posts_ui,
-        "genres": genres,
         "library": library,
-        "neighborhoods": neighborhoods,
-        "user_club_ids": user_club_ids,
     }
 
 def load_data() -> dict:
@@ -0,0 +1,265 @@
+"""Concurrent, retrying DynamoDB BatchGetItem/BatchWriteItem for the storage layer.
+
+BatchGetItem accepts at most 100 keys per request and may return part of a
+request under `UnprocessedKeys` when the table is throttled. `batch_get_items`
+splits the keys into 100-key chunks, sends them on a small shared thread pool,
+re-sends unprocessed keys with capped exponential backoff (with jitter), and
+reports keys that could not be read instead of silently dropping them.
+
+`decode_item` converts wire-format attribute values ({"S": ...}, {"N": ...})
+straight to plain Python values (numbers as int/float, like `_from_dynamo`)
+without a TypeDeserializer round trip through Decimal.
+
+`batch_write_items` is the write-side counterpart (25 puts per request,
+`UnprocessedItems` re-sent with the same backoff) used by the write-behind
+queue; `encode_item` produces the wire format it sends.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend import config
+
+MAX_KEYS_PER_REQUEST = 100
+MAX_ITEMS_PER_WRITE = 25
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+@dataclass
+class BatchGetResult:
+    """Decoded items read, plus wire-format keys still unprocessed after all retries."""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    unprocessed: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _number(raw: str) -> Any:
+    """Decode a DynamoDB N value to int when integral, else float."""
+    try:
+        return int(raw)
+    except ValueError:
+        value = float(raw)
+        return int(value) if value.is_integer() else value
+
+
+def decode_value(value: Any) -> Any:
+    """Decode one wire-format attribute value; values already plain are returned as-is."""
+    if not isinstance(value, dict) or len(value) != 1:
+        return value
+    (tag, raw), = value.items()
+    decoder = _DECODERS.get(tag)
+    # B / BS (unused by the books table), malformed containers and unknown tags pass through.
+    if decoder is None or (decoder[0] is not None and not isinstance(raw, decoder[0])):
+        return value
+    return decoder[1](raw)
+
+
+# Wire tag -> (required container type or None, decoder of the raw value).
+_DECODERS: Dict[str, Tuple[Optional[type], Callable[[Any], Any]]] = {
+    "S": (None, lambda raw: raw),
+    "N": (None, lambda raw: _number(str(raw))),
+    "BOOL": (None, bool),
+    "NULL": (None, lambda raw: None),
+    "M": (dict, lambda raw: {k: decode_value(v) for k, v in raw.items()}),
+    "L": (list, lambda raw: [decode_value(v) for v in raw]),
+    "SS": (list, list),
+    "NS": (list, lambda raw: [_number(str(v)) for v in raw]),
+}
+
+
+def decode_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode a wire-format item to a plain dict."""
+    return {k: decode_value(v) for k, v in item.items()}
+
+
+def encode_value(value: Any) -> Dict[str, Any]:
+    """Encode one plain value (str/number/bool/None/dict/list) as a wire-format attribute."""
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, dict):
+        return {"M": {str(k): encode_value(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [encode_value(v) for v in value]}
+    return {"S": str(value)}
+
+
+def encode_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode a plain dict as a wire-format item."""
+    return {k: encode_value(v) for k, v in item.items()}
+
+
+def _executor() -> ThreadPoolExecutor:
+    """Return the shared bounded pool for chunk requests."""
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=max(1, config.DYNAMO_BATCH_MAX_WORKERS),
+                    thread_name_prefix="dynamo-batch",
+                )
+    return _EXECUTOR
+
+
+def map_concurrently(fn: Callable[[Any], Any], args: Sequence[Any]) -> List[Any]:
+    """Apply fn to each argument on the shared pool; results keep argument order.
+
+    A single argument runs inline (no thread hop).
+    """
+    if len(args) <= 1:
+        return [fn(a) for a in args]
+    futures = [_executor().submit(fn, a) for a in args]
+    return [f.result() for f in futures]
+
+
+def projection(attributes: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Return ProjectionExpression / ExpressionAttributeNames for attributes (empty = all)."""
+    if not attributes:
+        return {}
+    names = {f"#a{i}": name for i, name in enumerate(attributes)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Capped exponential backoff with jitter for retry number attempt (0-based)."""
+    ceiling = min(
+        config.DYNAMO_BATCH_BACKOFF_MAX_SECONDS,
+        config.DYNAMO_BATCH_BACKOFF_BASE_SECONDS * (2 ** attempt),
+    )
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def _get_chunk(
+    client: Any,
+    table_name: str,
+    request: Dict[str, Any],
+    max_attempts: int,
+    sleep: Callable[[float], None],
+) -> BatchGetResult:
+    """Read one chunk, re-sending UnprocessedKeys until done or attempts run out."""
+    result = BatchGetResult()
+    pending: Optional[Dict[str, Any]] = request
+    for attempt in range(max_attempts):
+        if attempt:
+            sleep(_backoff_seconds(attempt - 1))
+        try:
+            resp = client.batch_get_item(RequestItems={table_name: pending})
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning("batch_get_item attempt %d failed: %s", attempt + 1, e)
+            continue
+        for item in (resp.get("Responses") or {}).get(table_name) or []:
+            result.items.append(decode_item(item) if isinstance(item, dict) else item)
+        pending = ((resp.get("UnprocessedKeys") or {}).get(table_name)) or None
+        if not pending or not pending.get("Keys"):
+            return result
+    result.unprocessed.extend((pending or {}).get("Keys") or [])
+    return result
+
+
+def batch_get_items(
+    client: Any,
+    table_name: str,
+    keys: Sequence[Dict[str, Any]],
+    attributes: Optional[Sequence[str]] = None,
+    max_attempts: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> BatchGetResult:
+    """Fetch items by wire-format key, 100 keys per request, chunks in parallel.
+
+    Args:
+        client: Low-level DynamoDB client (thread-safe).
+        table_name: Table to read.
+        keys: Wire-format primary keys, e.g. {"parent_asin": {"S": "B01"}}.
+        attributes: Attribute names to project; None/empty reads whole items.
+        max_attempts: Requests per chunk including retries (default from config).
+        sleep: Backoff sleep function (tests pass a no-op).
+
+    Returns:
+        BatchGetResult with decoded items and any keys left unprocessed.
+    """
+    attempts = max(1, max_attempts or config.DYNAMO_BATCH_MAX_ATTEMPTS)
+    extra = projection(attributes)
+    requests = [
+        {"Keys": list(keys[i:i + MAX_KEYS_PER_REQUEST]), **extra}
+        for i in range(0, len(keys), MAX_KEYS_PER_REQUEST)
+    ]
+    if not requests:
+        return BatchGetResult()
+    parts = map_concurrently(
+        lambda req: _get_chunk(client, table_name, req, attempts, sleep), requests
+    )
+    out = BatchGetResult()
+    for part in parts:
+        out.items.extend(part.items)
+        out.unprocessed.extend(part.unprocessed)
+    return out
+
+
+def _write_chunk(
+    client: Any,
+    table_name: str,
+    requests: List[Dict[str, Any]],
+    max_attempts: int,
+    sleep: Callable[[float], None],
+) -> List[Dict[str, Any]]:
+    """Write one chunk, re-sending UnprocessedItems; return requests never written."""
+    pending = requests
+    for attempt in range(max_attempts):
+        if attempt:
+            sleep(_backoff_seconds(attempt - 1))
+        try:
+            resp = client.batch_write_item(RequestItems={table_name: pending})
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning("batch_write_item attempt %d failed: %s", attempt + 1, e)
+            continue
+        pending = ((resp.get("UnprocessedItems") or {}).get(table_name)) or []
+        if not pending:
+            return []
+    return list(pending)
+
+
+def batch_write_items(
+    client: Any,
+    table_name: str,
+    items: Sequence[Dict[str, Any]],
+    max_attempts: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> List[Dict[str, Any]]:
+    """Put wire-format items, 25 per request, chunks in parallel.
+
+    Args:
+        client: Low-level DynamoDB client (thread-safe).
+        table_name: Table to write.
+        items: Wire-format items (see encode_item); one per primary key.
+        max_attempts: Requests per chunk including retries (default from config).
+        sleep: Backoff sleep function (tests pass a no-op).
+
+    Returns:
+        list: Wire-format items still unwritten after all retries (empty on success).
+    """
+    attempts = max(1, max_attempts or config.DYNAMO_BATCH_MAX_ATTEMPTS)
+    chunks = [
+        [{"PutRequest": {"Item": item}} for item in items[i:i + MAX_ITEMS_PER_WRITE]]
+        for i in range(0, len(items), MAX_ITEMS_PER_WRITE)
+    ]
+    parts = map_concurrently(
+        lambda chunk: _write_chunk(client, table_name, chunk, attempts, sleep), chunks
+    )
+    return [req["PutRequest"]["Item"] for part in parts for req in part]
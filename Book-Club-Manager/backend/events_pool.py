@@ -0,0 +1,289 @@
+"""Process-wide snapshot of upcoming events shared by every events read.
+
+The feed, Explore page, event recommendations, book detail pages and cold-start
+seeding all asked storage for "the soonest events" separately; in AWS mode each
+call was a GSI query (or a scan fallback) and in local mode each call re-sorted
+the whole JSON list. EventsPool loads the events once, keeps them as an
+EventsSnapshot (sorted by ttl, indexed by event_id, parent_asin and
+city_state), and reloads them on a background thread once the snapshot is
+older than the TTL; readers keep using the previous snapshot meanwhile. The
+event recommender's EventIndex over the soonest events is built lazily once
+per snapshot (see EventsSnapshot.event_index).
+
+Listings skip events whose ttl has passed at read time, so an event drops out
+as soon as it expires rather than at the next reload. Lookups by event_id still
+find expired events (saved events keep their details).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from backend import config
+from backend.recommender.event_index import EventIndex
+
+
+DAY_BUCKET_PREFIX = "day#"
+
+
+def day_bucket(ts: float) -> str:
+    """Return the "day#YYYYMMDD" (UTC) partition key of the events day-bucket GSI.
+
+    Must match data/scripts/loaders/load_events_to_dynamodb.day_bucket_from_ttl.
+    """
+    day = datetime.fromtimestamp(int(ts), tz=timezone.utc).strftime("%Y%m%d")
+    return f"{DAY_BUCKET_PREFIX}{day}"
+
+
+def event_expiry(event: Dict[str, Any]) -> int:
+    """Return the event's ttl/expiry as epoch seconds (0 when missing or invalid)."""
+    try:
+        return int(event.get("ttl") or event.get("expiry") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+# EventIndex windows kept per snapshot (distinct pool sizes / expiry positions).
+_MAX_EVENT_INDEXES = 4
+
+
+class EventsSnapshot:  # pylint: disable=too-many-instance-attributes
+    """Immutable, ttl-sorted event list with id / parent_asin / city_state indexes."""
+
+    def __init__(self, events: List[Any], loaded_at: float = 0.0) -> None:
+        """Sort the event dicts by expiry (stable) and build the indexes."""
+        self.events: List[Dict[str, Any]] = sorted(
+            (e for e in events if isinstance(e, dict)), key=event_expiry
+        )
+        self.loaded_at = loaded_at
+        self._expiries = [event_expiry(e) for e in self.events]
+        # Events without an expiry sort first and never expire.
+        self._undated = bisect_right(self._expiries, 0)
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_parent_asin: Dict[str, List[int]] = {}
+        self._by_city_state: Dict[str, List[int]] = {}
+        for row, ev in enumerate(self.events):
+            eid = str(ev.get("event_id") or "").strip()
+            if eid:
+                self._by_id.setdefault(eid, ev)
+            pid = str(ev.get("parent_asin") or "").strip()
+            if pid:
+                self._by_parent_asin.setdefault(pid, []).append(row)
+            city = str(ev.get("city_state") or "").strip()
+            if city:
+                self._by_city_state.setdefault(city, []).append(row)
+        # (limit, first unexpired row) -> EventIndex, filled by event_index().
+        self._event_indexes: Dict[tuple, EventIndex] = {}
+        self._event_indexes_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of events in the snapshot (expired ones included)."""
+        return len(self.events)
+
+    @staticmethod
+    def _cutoff(now: Optional[float]) -> int:
+        """Return the expiry below which an event is over."""
+        return int(time.time() if now is None else now)
+
+    def _soonest_rows(self, n: int, start: int) -> List[Dict[str, Any]]:
+        """Return the first n events that are undated or at/after row start (not copied)."""
+        rows = self.events[: min(n, self._undated)]
+        rows += self.events[start: start + n - len(rows)]
+        return rows
+
+    def soonest(self, limit: int, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return copies of the first `limit` unexpired events, soonest first."""
+        n = max(0, int(limit))
+        start = bisect_left(self._expiries, self._cutoff(now), lo=self._undated)
+        return [dict(e) for e in self._soonest_rows(n, start)]
+
+    def event_index(self, limit: int, now: Optional[float] = None) -> EventIndex:
+        """Return an EventIndex over soonest(limit), built once per snapshot.
+
+        The index is reused until the snapshot is replaced or an event in the
+        window expires (which shifts the window); it shares the snapshot's
+        event dicts, so callers must not mutate index.events.
+        """
+        n = max(0, int(limit))
+        start = bisect_left(self._expiries, self._cutoff(now), lo=self._undated)
+        key = (n, start)
+        with self._event_indexes_lock:
+            index = self._event_indexes.get(key)
+            if index is None:
+                index = EventIndex(self._soonest_rows(n, start))
+                while len(self._event_indexes) >= _MAX_EVENT_INDEXES:
+                    self._event_indexes.pop(next(iter(self._event_indexes)))
+                self._event_indexes[key] = index
+        return index
+
+    def get(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the event with this event_id, expired or not."""
+        ev = self._by_id.get(str(event_id or "").strip())
+        return dict(ev) if ev is not None else None
+
+    def get_many(self, event_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return {event_id: copy} for the ids present in the snapshot."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for eid in event_ids:
+            ev = self._by_id.get(str(eid or "").strip())
+            if ev is not None:
+                out[str(eid).strip()] = dict(ev)
+        return out
+
+    def _select(
+        self, rows: List[int], limit: Optional[int], now: Optional[float]
+    ) -> List[Dict[str, Any]]:
+        """Return copies of the unexpired events at rows (already soonest first)."""
+        cutoff = self._cutoff(now)
+        out: List[Dict[str, Any]] = []
+        cap = None if limit is None else max(0, int(limit))
+        for row in rows:
+            if cap is not None and len(out) >= cap:
+                break
+            expiry = self._expiries[row]
+            if expiry <= 0 or expiry >= cutoff:
+                out.append(dict(self.events[row]))
+        return out
+
+    def for_book(
+        self, parent_asin: str, limit: Optional[int] = None, now: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Return unexpired events for a parent_asin, soonest first."""
+        rows = self._by_parent_asin.get(str(parent_asin or "").strip(), [])
+        return self._select(rows, limit, now)
+
+    def for_city(
+        self, city_state: str, limit: Optional[int] = None, now: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Return unexpired events in a city_state (exact match), soonest first."""
+        rows = self._by_city_state.get(str(city_state or "").strip(), [])
+        return self._select(rows, limit, now)
+
+    def pages(
+        self,
+        page_size: int,
+        city_state: Optional[str] = None,
+        parent_asin: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield unexpired events page by page, soonest first, optionally filtered.
+
+        Mirrors CloudStorage's paged GSI reads for the in-memory snapshot.
+        """
+        if city_state is not None:
+            events = self.for_city(city_state, now=now)
+        elif parent_asin is not None:
+            events = self.for_book(parent_asin, now=now)
+        else:
+            events = self.soonest(len(self.events), now=now)
+        size = max(1, int(page_size))
+        for start in range(0, len(events), size):
+            yield events[start: start + size]
+
+
+class EventsPool:
+    """Holds the current EventsSnapshot for one event source and refreshes it on a TTL."""
+
+    def __init__(
+        self,
+        loader: Callable[[], List[Dict[str, Any]]],
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty pool; the first snapshot() call loads synchronously."""
+        self._loader = loader
+        self.ttl_seconds = float(ttl_seconds)
+        self._clock = clock
+        self._snapshot: Optional[EventsSnapshot] = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def snapshot(self) -> EventsSnapshot:
+        """Return the current snapshot, loading it on first use.
+
+        A snapshot older than the TTL is still returned; a background reload
+        is started (at most one at a time) to replace it.
+        """
+        snap = self._snapshot
+        if snap is None:
+            with self._load_lock:
+                snap = self._snapshot
+                if snap is None:
+                    return self._load()
+        if self._clock() - snap.loaded_at >= self.ttl_seconds:
+            self.refresh_in_background()
+        return snap
+
+    def _load(self) -> EventsSnapshot:
+        """Run the loader and install its result. Caller holds the load lock.
+
+        When the loader fails the previous snapshot is kept (an empty one is
+        returned, but not stored, if there is none yet).
+        """
+        try:
+            events = self._loader() or []
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning("events pool reload failed: %s", e)
+            return self._snapshot if self._snapshot is not None else EventsSnapshot([])
+        snap = EventsSnapshot(list(events), loaded_at=self._clock())
+        self._snapshot = snap
+        return snap
+
+    def refresh(self) -> EventsSnapshot:
+        """Reload the snapshot now and return it."""
+        with self._load_lock:
+            return self._load()
+
+    def refresh_in_background(self) -> Optional[threading.Thread]:
+        """Start a daemon thread that reloads the snapshot, unless one is running."""
+        with self._lock:
+            thread = self._refresh_thread
+            if thread is not None and thread.is_alive():
+                return None
+            thread = threading.Thread(
+                target=self.refresh, name="events-pool-refresh", daemon=True
+            )
+            self._refresh_thread = thread
+        thread.start()
+        return thread
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next read reloads synchronously (e.g. after an import)."""
+        with self._load_lock:
+            self._snapshot = None
+
+
+_POOLS: Dict[str, EventsPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_events_pool(source: str, loader: Callable[[], List[Dict[str, Any]]]) -> EventsPool:
+    """Return the process-wide pool for an event source, creating it with loader on first use.
+
+    Args:
+        source: Key naming the backing data (e.g. the events table or JSON path).
+        loader: Returns every upcoming event for that source; used for all reloads.
+
+    Returns:
+        The shared EventsPool for source.
+    """
+    pool = _POOLS.get(source)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(source)
+            if pool is None:
+                pool = EventsPool(loader, config.EVENTS_POOL_TTL_SECONDS)
+                _POOLS[source] = pool
+    return pool
+
+
+def reset_events_pools() -> None:
+    """Discard every process-wide pool (next read reloads from storage)."""
+    with _POOLS_LOCK:
+        _POOLS.clear()
@@ -57,3 +57,110 @@ def save_forum_store(store: dict) -> None:
     """Persist forum posts/comments store to disk."""
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
     FORUM_DB_PATH.write_text(json.dumps(store, indent=2), encoding="utf-8")
+
+
+def book_title_key(title: object) -> str:
+    """Normalize a book title for thread lookups (case-insensitive, collapsed spaces)."""
+    return " ".join(str(title or "").split()).casefold()
+
+
+def _book_id_key(book_id: object) -> str:
+    """Return a bootstrap book id as an index key ("" when missing or not an int)."""
+    if book_id is None or isinstance(book_id, bool):
+        return ""
+    try:
+        return str(int(book_id))
+    except (TypeError, ValueError):
+        return ""
+
+
+def post_book_keys(post: dict) -> set[tuple[str, str]]:
+    """Return the book index keys of a post.
+
+    A post belongs to a book by parent_asin, or (for posts written before
+    parent_asin was stored) by its bootstrap book_id, book_title or a tag
+    equal to the book title.
+    """
+    keys: set[tuple[str, str]] = set()
+    parent_asin = str(post.get("parent_asin") or "").strip()
+    if parent_asin:
+        keys.add(("asin", parent_asin))
+    book_id = _book_id_key(post.get("book_id"))
+    if book_id:
+        keys.add(("book_id", book_id))
+    for title in [post.get("book_title"), *(post.get("tags") or [])]:
+        norm = book_title_key(title)
+        if norm:
+            keys.add(("title", norm))
+    return keys
+
+
+class ForumBookIndex:
+    """parent_asin / book_id / normalized title -> post ids, over posts kept newest first."""
+
+    def __init__(self, posts: list[dict]) -> None:
+        """Index posts given in store order (newest first)."""
+        self._posts: dict[int, dict] = {}
+        # Higher rank = newer; lets a lookup by asin and title merge two id lists.
+        self._rank: dict[int, int] = {}
+        self._by_key: dict[tuple[str, str], list[int]] = {}
+        self._newest = 0
+        for idx, post in enumerate(posts):
+            self._index(post, rank=-idx)
+
+    def _index(self, post: dict, *, rank: int) -> None:
+        """Add one post under each of its book keys."""
+        try:
+            post_id = int(post.get("id"))
+        except (TypeError, ValueError):
+            return
+        self._posts[post_id] = post
+        self._rank[post_id] = rank
+        for key in post_book_keys(post):
+            self._by_key.setdefault(key, []).append(post_id)
+
+    def add(self, post: dict) -> None:
+        """Index a newly created post (it becomes the newest of its threads)."""
+        self._newest += 1
+        self._index(post, rank=self._newest)
+
+    def get(self, post_id: object) -> dict | None:
+        """Return the indexed post with this id, or None."""
+        try:
+            return self._posts.get(int(post_id))
+        except (TypeError, ValueError):
+            return None
+
+    def replace(self, post: dict) -> None:
+        """Swap in an edited post, keeping its place and re-keying it if its book changed."""
+        post_id = int(post["id"])
+        old = self._posts.get(post_id)
+        if old is None:
+            self.add(post)
+            return
+        old_keys, new_keys = post_book_keys(old), post_book_keys(post)
+        for key in old_keys - new_keys:
+            self._by_key[key].remove(post_id)
+        for key in new_keys - old_keys:
+            self._by_key.setdefault(key, []).append(post_id)
+        self._posts[post_id] = post
+
+    def thread(
+        self,
+        parent_asin: str | None = None,
+        book_title: str | None = None,
+        book_id: object = None,
+    ) -> list[dict]:
+        """Return the posts for a book by parent_asin, book_id and/or title, newest first, without duplicates."""
+        keys = []
+        if str(parent_asin or "").strip():
+            keys.append(("asin", str(parent_asin).strip()))
+        if _book_id_key(book_id):
+            keys.append(("book_id", _book_id_key(book_id)))
+        if book_title_key(book_title):
+            keys.append(("title", book_title_key(book_title)))
+        ids: set[int] = set()
+        for key in keys:
+            ids.update(self._by_key.get(key, ()))
+        ordered = sorted(ids, key=self._rank.__getitem__, reverse=True)
+        return [self._posts[pid] for pid in ordered]
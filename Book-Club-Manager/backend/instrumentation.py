@@ -0,0 +1,318 @@
+"""Per-operation timing for storage, services and recommenders.
+
+Nothing recorded how long S3, DynamoDB, SQLite or recommender calls took, and
+CloudStorage turns most failures into a logged warning plus an empty result,
+so a slow or failing leg of a page render was invisible. This module keeps,
+per operation name:
+
+- count and error count. Errors are exceptions that escape the operation, plus
+  WARNING-or-worse log records emitted while it runs, which is how the storage
+  layer reports the exceptions it swallows.
+- total time and a window of the most recent latencies (config
+  INSTRUMENTATION_SAMPLE_SIZE) from which p50/p95/p99 are computed.
+
+Operations are recorded by the `timed(op)` context manager or the
+`instrumented(op)` decorator; `instrument_class` / `instrument_module` wrap
+every method of a storage backend or every function of a service module.
+`trace(name)` collects an ordered per-rerun trace (operation, start offset,
+duration, nesting depth, error) of everything timed inside it.
+
+Export: `snapshot()` (dict), `to_json()`, `to_prometheus()` (text exposition
+format, summaries in seconds). frontend/main.py renders a hidden debug panel
+with both when INSTRUMENTATION_DEBUG_PANEL is set or the URL has ?debug=1.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import math
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from backend import config
+
+_QUANTILES = (0.5, 0.95, 0.99)
+
+# Name of the innermost operation running in this context (for log-record errors).
+_CURRENT_OP: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "instrumentation_op", default=None
+)
+_CURRENT_TRACE: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar(
+    "instrumentation_trace", default=None
+)
+
+
+def _percentile(sorted_samples: List[float], q: float) -> float:
+    """Return the q-quantile (nearest rank) of an ascending list; 0.0 when empty."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, math.ceil(q * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+class OperationStats:  # pylint: disable=too-few-public-methods
+    """Counters and a bounded latency window for one operation."""
+
+    def __init__(self, sample_size: int) -> None:
+        """Create zeroed stats keeping the last sample_size latencies."""
+        self.count = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.samples: Deque[float] = deque(maxlen=max(1, sample_size))
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, errors and latency figures in milliseconds."""
+        ordered = sorted(self.samples)
+        out: Dict[str, Any] = {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_s * 1000.0, 3),
+            "mean_ms": round(self.total_s * 1000.0 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_s * 1000.0, 3),
+        }
+        for q in _QUANTILES:
+            out[f"p{int(q * 100)}_ms"] = round(_percentile(ordered, q) * 1000.0, 3)
+        return out
+
+
+class Registry:
+    """Thread-safe map of operation name -> OperationStats."""
+
+    def __init__(self, sample_size: int = 512) -> None:
+        """Create an empty registry."""
+        self.sample_size = sample_size
+        self._ops: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, op: str) -> OperationStats:
+        """Return the stats of op, creating them (caller holds the lock)."""
+        stats = self._ops.get(op)
+        if stats is None:
+            stats = self._ops[op] = OperationStats(self.sample_size)
+        return stats
+
+    def record(self, op: str, seconds: float, error: bool = False) -> None:
+        """Add one completed call of op."""
+        with self._lock:
+            stats = self._stats(op)
+            stats.count += 1
+            stats.total_s += seconds
+            stats.max_s = max(stats.max_s, seconds)
+            stats.samples.append(seconds)
+            if error:
+                stats.errors += 1
+
+    def record_error(self, op: str) -> None:
+        """Count an error of op without a latency sample (e.g. a logged, swallowed exception)."""
+        with self._lock:
+            self._stats(op).errors += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return {op: summary} sorted by operation name."""
+        with self._lock:
+            return {op: self._ops[op].summary() for op in sorted(self._ops)}
+
+    def to_json(self) -> str:
+        """Return snapshot() as indented JSON."""
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """Return the stats in Prometheus text exposition format."""
+        lines = [
+            "# HELP bookish_operation_seconds Latency of storage/service/recommender operations.",
+            "# TYPE bookish_operation_seconds summary",
+        ]
+        errors = [
+            "# HELP bookish_operation_errors_total Failed or error-logging operations.",
+            "# TYPE bookish_operation_errors_total counter",
+        ]
+        with self._lock:
+            items = [(op, self._ops[op]) for op in sorted(self._ops)]
+            for op, stats in items:
+                label = op.replace("\\", "\\\\").replace('"', '\\"')
+                ordered = sorted(stats.samples)
+                for q in _QUANTILES:
+                    lines.append(
+                        f'bookish_operation_seconds{{op="{label}",quantile="{q}"}} '
+                        f"{_percentile(ordered, q):.6f}"
+                    )
+                lines.append(f'bookish_operation_seconds_sum{{op="{label}"}} {stats.total_s:.6f}')
+                lines.append(f'bookish_operation_seconds_count{{op="{label}"}} {stats.count}')
+                errors.append(f'bookish_operation_errors_total{{op="{label}"}} {stats.errors}')
+        return "\n".join(lines + errors) + "\n"
+
+    def reset(self) -> None:
+        """Drop all recorded operations."""
+        with self._lock:
+            self._ops.clear()
+
+
+class Trace:
+    """Ordered record of the operations timed inside one trace() block."""
+
+    def __init__(self, name: str) -> None:
+        """Start an empty trace now."""
+        self.name = name
+        self.started = time.perf_counter()
+        self.depth = 0
+        self.spans: List[Dict[str, Any]] = []
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Return spans (op, start_ms, duration_ms, depth, error) in start order."""
+        return sorted(self.spans, key=lambda s: s["start_ms"])
+
+    def slowest(self, n: int = 10) -> List[Dict[str, Any]]:
+        """Return the n longest spans."""
+        return sorted(self.spans, key=lambda s: s["duration_ms"], reverse=True)[:n]
+
+
+class _ErrorLogFilter(logging.Filter):  # pylint: disable=too-few-public-methods
+    """Counts WARNING+ records logged while an operation runs as errors of that operation.
+
+    Installed as a filter (not a handler) on the root logger, which is what the
+    backend logs through, so logging's default output setup is unaffected.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Attribute the record to the innermost running operation; never drop it."""
+        op = _CURRENT_OP.get()
+        if op is not None and record.levelno >= logging.WARNING:
+            get_registry().record_error(op)
+        return True
+
+
+_REGISTRY: Optional[Registry] = None
+_REGISTRY_LOCK = threading.Lock()
+_ERROR_FILTER = _ErrorLogFilter()
+
+
+def get_registry() -> Registry:
+    """Return the process-wide registry, creating it on first use."""
+    global _REGISTRY  # pylint: disable=global-statement
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = Registry(config.INSTRUMENTATION_SAMPLE_SIZE)
+                root = logging.getLogger()
+                if _ERROR_FILTER not in root.filters:
+                    root.addFilter(_ERROR_FILTER)
+    return _REGISTRY
+
+
+def reset_registry() -> None:
+    """Discard the process-wide registry (tests)."""
+    global _REGISTRY  # pylint: disable=global-statement
+    with _REGISTRY_LOCK:
+        _REGISTRY = None
+
+
+def enabled() -> bool:
+    """Return True if operations should be recorded."""
+    return bool(getattr(config, "INSTRUMENTATION_ENABLED", True))
+
+
+@contextlib.contextmanager
+def timed(op: str) -> Iterator[None]:
+    """Record the duration of the enclosed block as one call of op.
+
+    An exception escaping the block is counted as an error and re-raised.
+    """
+    if not enabled():
+        yield
+        return
+    registry = get_registry()
+    current_trace = _CURRENT_TRACE.get()
+    token = _CURRENT_OP.set(op)
+    if current_trace is not None:
+        current_trace.depth += 1
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _CURRENT_OP.reset(token)
+        registry.record(op, elapsed, error)
+        if current_trace is not None:
+            current_trace.depth -= 1
+            current_trace.spans.append(
+                {
+                    "op": op,
+                    "start_ms": round((start - current_trace.started) * 1000.0, 3),
+                    "duration_ms": round(elapsed * 1000.0, 3),
+                    "depth": current_trace.depth,
+                    "error": error,
+                }
+            )
+
+
+@contextlib.contextmanager
+def trace(name: str = "rerun") -> Iterator[Trace]:
+    """Collect a Trace of every timed operation in the block (nested blocks reuse the outer one)."""
+    outer = _CURRENT_TRACE.get()
+    if outer is not None:
+        yield outer
+        return
+    current = Trace(name)
+    token = _CURRENT_TRACE.set(current)
+    try:
+        yield current
+    finally:
+        _CURRENT_TRACE.reset(token)
+
+
+def instrumented(op: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a function so every call is recorded under op (default module.qualname).
+
+    Generator functions are returned unchanged: a call only creates the generator.
+    """
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        "Wrap fn with timed()."
+        if getattr(fn, "__instrumented__", False) or inspect.isgeneratorfunction(fn):
+            return fn
+        name = op or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            "Time one call."
+            with timed(name):
+                return fn(*args, **kwargs)
+
+        wrapper.__instrumented__ = True  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def instrument_class(cls: type, prefix: str) -> type:
+    """Wrap every method defined on cls (dunder methods excepted) as prefix.<name>."""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("__") or not inspect.isfunction(attr):
+            continue
+        setattr(cls, name, instrumented(f"{prefix}.{name}")(attr))
+    return cls
+
+
+def instrument_module(module_name: str, prefix: str) -> None:
+    """Wrap every function defined in module_name (not imported ones) as prefix.<name>.
+
+    Call at the bottom of the module; intra-module calls and later
+    `from module import fn` imports both get the wrapped function.
+    """
+    module = sys.modules[module_name]
+    for name, attr in list(vars(module).items()):
+        if inspect.isfunction(attr) and attr.__module__ == module_name and not name.startswith("__"):
+            setattr(module, name, instrumented(f"{prefix}.{name}")(attr))
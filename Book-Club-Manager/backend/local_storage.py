@@ -17,13 +17,18 @@ All other methods delegate to the base LocalStorage from backend.storage.
 from __future__ import annotations
 
 import json
+import logging
 import sqlite3
 from pathlib import Path
 from typing import Any, Optional
 
-from backend import config
+from backend import books_db, config
+from backend.metadata_cache import IncompleteFetch, get_metadata_cache
 from backend.storage import LocalStorage as _BaseLocalStorage
 
+# Metadata lookups skip the (large) description column.
+_METADATA_ROW_COLUMNS = tuple(c for c in books_db.BOOK_COLUMNS if c != "description")
+
 
 class LocalStorage(_BaseLocalStorage):
     """Local storage with SQLite-backed books table for metadata/details."""
@@ -35,29 +40,22 @@ class LocalStorage(_BaseLocalStorage):
             return Path(processed_dir) / "books.db"
         return Path("data") / "processed" / "books.db"
 
-    def _fetch_book_row(self, parent_asin: str) -> Optional[sqlite3.Row]:
-        """Fetch a single row from books.db for the given parent_asin."""
+    def _read_book_row(self, parent_asin: str) -> Optional[sqlite3.Row]:
+        """Read a single row from books.db; None only when the file or row is missing.
+
+        Exceptions:
+            sqlite3.Error, OSError: If books.db cannot be opened or queried.
+        """
         db_path = self._books_db_path()
         if not db_path.exists():
             return None
+        return books_db.fetch_one(db_path, parent_asin, books_db.BOOK_COLUMNS)
+
+    def _fetch_book_row(self, parent_asin: str) -> Optional[sqlite3.Row]:
+        """Fetch a single row from books.db for the given parent_asin (None on errors)."""
         try:
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT parent_asin, title, author_name, average_rating, rating_number,
-                       description, images, categories, title_author_key
-                FROM books
-                WHERE parent_asin = ?
-                LIMIT 1
-                """,
-                (str(parent_asin),),
-            )
-            row = cur.fetchone()
-            conn.close()
-            return row
-        except sqlite3.Error:
+            return self._read_book_row(parent_asin)
+        except (sqlite3.Error, OSError):
             return None
 
     def _row_to_book_dict(self, row: sqlite3.Row) -> dict[str, Any]:
@@ -100,16 +98,63 @@ class LocalStorage(_BaseLocalStorage):
             "categories": _loads_or_empty(row["categories"]),
             "title_author_key": str(row["title_author_key"] or ""),
         }
-        # description is only used in "details" view
-        out["description"] = _loads_or_empty(row["description"])
+        # description is only used in "details" view (batch metadata rows omit it)
+        try:
+            out["description"] = _loads_or_empty(row["description"])
+        except (IndexError, KeyError):
+            pass
         return out
 
     def get_book_metadata(self, parent_asin: str) -> Optional[dict[str, Any]]:
-        """Return lightweight book metadata from local books.db when available."""
+        """Return lightweight book metadata from local books.db when available (cached)."""
         parent_asin = str(parent_asin or "").strip()
         if not parent_asin:
             return None
-        row = self._fetch_book_row(parent_asin)
+        try:
+            return get_metadata_cache().get_one(parent_asin, self._load_book_metadata)
+        except (sqlite3.Error, OSError) as e:
+            # Not cached: the next call retries books.db.
+            logging.warning("books.db lookup for %s failed: %s", parent_asin, e)
+            return super().get_book_metadata(parent_asin)
+
+    def get_books_metadata_batch(self, parent_asins: list[str]) -> dict[str, dict]:
+        """Return {parent_asin: metadata} from books.db, fetching only cache misses."""
+        ids = list(dict.fromkeys(str(x).strip() for x in (parent_asins or []) if str(x).strip()))
+        if not ids:
+            return {}
+        return get_metadata_cache().get_many(ids, self._load_books_metadata_batch)
+
+    def _load_books_metadata_batch(self, parent_asins: list[str]) -> dict[str, dict]:
+        """Uncached batch lookup: one books.db query, base implementation for the rest.
+
+        Exceptions:
+            IncompleteFetch: If books.db failed; ASINs the base lookup did not
+                find are left uncached instead of cached as missing.
+        """
+        out: dict[str, dict] = {}
+        db_path = self._books_db_path()
+        if db_path.exists():
+            try:
+                rows = books_db.fetch_many(db_path, parent_asins, _METADATA_ROW_COLUMNS)
+            except (sqlite3.Error, OSError) as e:
+                logging.warning("books.db batch lookup failed: %s", e)
+                out = super().get_books_metadata_batch(parent_asins)
+                raise IncompleteFetch(out, [pid for pid in parent_asins if pid not in out]) from e
+            for row in rows:
+                book = self._row_to_book_dict(row)
+                out[book["parent_asin"]] = book
+        rest = [pid for pid in parent_asins if pid not in out]
+        if rest:
+            out.update(super().get_books_metadata_batch(rest))
+        return out
+
+    def _load_book_metadata(self, parent_asin: str) -> Optional[dict[str, Any]]:
+        """Uncached single lookup behind get_book_metadata.
+
+        books.db errors propagate so the metadata cache does not store them
+        as a missing book.
+        """
+        row = self._read_book_row(parent_asin)
         if row is not None:
             book = self._row_to_book_dict(row)
             # Strip heavy description for metadata call
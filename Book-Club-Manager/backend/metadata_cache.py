@@ -0,0 +1,259 @@
+"""Process-wide cache of book metadata (no description) keyed by parent_asin.
+
+Book metadata only changes when the catalog is reloaded, yet feeds, library
+updates, forum post creation and genre merges each fetched it again from
+DynamoDB or books.db. MetadataCache is a bounded LRU with a TTL per entry and a
+shorter TTL for negative entries (ASINs the backend did not return), so a
+missing book is not re-queried on every render either.
+
+Storage adapters route `get_book_metadata` / `get_books_metadata_batch`
+through the shared instance from `get_metadata_cache()`; batch calls only
+send the misses to the backend. `warm_up()` preloads the popular ASINs
+(reviews top-50 and the SPL trending list) at startup.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend import config
+
+_ABSENT = object()
+
+
+class IncompleteFetch(Exception):
+    """Raised by a batch fetch that read some items but could not resolve others.
+
+    The cache stores `found` and negative entries for the other misses, but
+    nothing for `unresolved` (they were never answered, e.g. throttled).
+    """
+
+    def __init__(self, found: Dict[str, Dict[str, Any]], unresolved: Iterable[str]) -> None:
+        """Keep the partial result and the keys that are still unknown."""
+        self.found = found
+        self.unresolved = set(unresolved)
+        super().__init__(f"{len(self.unresolved)} keys unresolved")
+
+
+class MetadataCache:
+    """Thread-safe LRU of parent_asin -> metadata dict with positive and negative TTLs."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty cache (max_entries 0 disables caching)."""
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self.negative_ttl_seconds = float(negative_ttl_seconds)
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "fetched": 0,
+        }
+
+    def _lookup(self, key: str, now: float) -> Any:
+        """Return the cached value, None for a negative entry, or _ABSENT. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return _ABSENT
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._entries[key]
+            self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return _ABSENT
+        self._entries.move_to_end(key)
+        if value is None:
+            self._stats["negative_hits"] += 1
+        else:
+            self._stats["hits"] += 1
+        return value
+
+    def _store(self, key: str, value: Optional[Dict[str, Any]], now: float) -> None:
+        """Insert one entry and evict least recently used ones. Caller holds the lock."""
+        ttl = self.ttl_seconds if value is not None else self.negative_ttl_seconds
+        if ttl <= 0:
+            return
+        self._entries[key] = (now + ttl, dict(value) if value is not None else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put_many(self, found: Dict[str, Dict[str, Any]], missing: Iterable[str] = ()) -> None:
+        """Store fetched metadata and negative entries for ASINs the backend did not return."""
+        if self.max_entries == 0:
+            return
+        now = self._clock()
+        with self._lock:
+            for key, value in found.items():
+                self._store(str(key), value, now)
+            for key in missing:
+                if key not in found:
+                    self._store(str(key), None, now)
+
+    def get_one(
+        self, parent_asin: str, fetch: Callable[[str], Optional[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Return metadata for one ASIN, calling fetch(parent_asin) on a miss.
+
+        A None from fetch is cached as a negative entry; exceptions propagate and
+        cache nothing.
+        """
+        key = str(parent_asin)
+        if self.max_entries:
+            with self._lock:
+                cached = self._lookup(key, self._clock())
+            if cached is not _ABSENT:
+                return dict(cached) if cached is not None else None
+        value = fetch(key)
+        with self._lock:
+            self._stats["fetched"] += 1
+        if value is None:
+            self.put_many({}, [key])
+            return None
+        self.put_many({key: value})
+        return dict(value)
+
+    def get_many(
+        self,
+        parent_asins: List[str],
+        fetch_many: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return {asin: metadata} for the ASINs, sending only cache misses to fetch_many.
+
+        ASINs fetch_many does not return are cached as negative entries. If
+        fetch_many raises IncompleteFetch, its partial result is used; any other
+        exception returns the cached hits and stores nothing.
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        misses: List[str] = []
+        if self.max_entries:
+            now = self._clock()
+            with self._lock:
+                for key in parent_asins:
+                    cached = self._lookup(key, now)
+                    if cached is _ABSENT:
+                        misses.append(key)
+                    elif cached is not None:
+                        out[key] = dict(cached)
+        else:
+            misses = list(parent_asins)
+        if not misses:
+            return out
+        unresolved: set = set()
+        try:
+            fetched = fetch_many(misses) or {}
+        except IncompleteFetch as e:
+            logging.warning("metadata batch fetch incomplete: %s", e)
+            fetched, unresolved = e.found, e.unresolved
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning("metadata batch fetch failed: %s", e)
+            return out
+        with self._lock:
+            self._stats["fetched"] += len(misses)
+        self.put_many(fetched, [key for key in misses if key not in unresolved])
+        for key in misses:
+            value = fetched.get(key)
+            if value is not None:
+                out[key] = dict(value)
+        return out
+
+    def invalidate(self, parent_asin: Optional[str] = None) -> None:
+        """Drop one ASIN, or everything when parent_asin is None (catalog reload)."""
+        with self._lock:
+            if parent_asin is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(parent_asin), None)
+
+    def __len__(self) -> int:
+        """Return the number of cached entries (including negative ones)."""
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and current size."""
+        with self._lock:
+            out: Dict[str, Any] = {**self._stats, "size": len(self._entries)}
+        lookups = out["hits"] + out["negative_hits"] + out["misses"]
+        out["hit_rate"] = (out["hits"] + out["negative_hits"]) / lookups if lookups else 0.0
+        return out
+
+
+_CACHE: Optional[MetadataCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Return the process-wide metadata cache, creating it from config on first use."""
+    global _CACHE  # pylint: disable=global-statement
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = MetadataCache(
+                    config.BOOK_METADATA_CACHE_SIZE,
+                    config.BOOK_METADATA_CACHE_TTL_SECONDS,
+                    config.BOOK_METADATA_NEGATIVE_TTL_SECONDS,
+                )
+    return _CACHE
+
+
+def reset_metadata_cache() -> None:
+    """Discard the process-wide cache (next use rebuilds it from config)."""
+    global _CACHE  # pylint: disable=global-statement
+    with _CACHE_LOCK:
+        _CACHE = None
+
+
+def popular_asins(store: Any, top_n: int) -> List[str]:
+    """Return up to top_n ASINs from the store's reviews top-50 list then its SPL trending list."""
+    out: Dict[str, None] = {}
+    for getter in ("get_top50_review_books", "get_spl_top50_checkout_books"):
+        fn = getattr(store, getter, None)
+        if fn is None:
+            continue
+        try:
+            books = fn() or []
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning("metadata warm-up could not read %s: %s", getter, e)
+            continue
+        for b in books:
+            if not isinstance(b, dict):
+                continue
+            pid = str(b.get("parent_asin") or b.get("source_id") or "").strip()
+            if pid:
+                out.setdefault(pid, None)
+    return list(out)[: max(0, int(top_n))]
+
+
+def warm_up(store: Any, top_n: Optional[int] = None) -> int:
+    """Preload metadata for the store's popular ASINs through its batch method.
+
+    Args:
+        store: Storage adapter with get_books_metadata_batch (LocalStorage / CloudStorage).
+        top_n: ASINs to preload; defaults to config.BOOK_METADATA_WARMUP_TOP_N (0 skips).
+
+    Returns:
+        Number of ASINs requested.
+    """
+    n = config.BOOK_METADATA_WARMUP_TOP_N if top_n is None else top_n
+    if n <= 0 or not hasattr(store, "get_books_metadata_batch"):
+        return 0
+    asins = popular_asins(store, n)
+    if asins:
+        store.get_books_metadata_batch(asins)
+    return len(asins)
@@ -0,0 +1,406 @@
+"""Local disk cache for the recommender artifacts hosted on S3 (the BOOK_*_S3_KEY objects).
+
+Without it every worker pulled book_tfidf.npz, the ASIN map and the rating
+norms from S3 into memory on each fit(), and the logistic backend could only
+read local paths. ArtifactCache keeps one verified copy per S3 object version
+on local disk:
+
+- Layout: <ML_ARTIFACTS_LOCAL_CACHE_DIR>/<bucket>/<key>/<etag>/<file name>,
+  plus meta.json. A new upload (new ETag) gets a new directory, and the
+  newest ML_ARTIFACTS_KEEP_VERSIONS directories per key are kept.
+- Download: objects larger than one part are fetched with parallel ranged
+  GETs (IfMatch=ETag, so every part comes from the same version) into a
+  temporary file that is renamed into place only after verification.
+- Verification: the sha256 and size from the artifact manifest
+  (BOOK_RECOMMENDER_MANIFEST_S3_KEY, written by build_recommender_artifacts.py)
+  when it lists the file; otherwise the ETag when it is an MD5 (single-part
+  upload) or a multipart MD5 with a recognisable part size. Buckets with
+  SSE-KMS (ETag is not an MD5) need the manifest.
+- Reuse: one HEAD request per object; a verified copy for that ETag is used
+  as-is. Workers on the same host share the directory and a file lock, so
+  one process downloads and the others wait and reuse. When S3 cannot be
+  reached, the newest verified copy is used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from backend import config
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock; atomic renames keep copies consistent.
+    fcntl = None  # type: ignore[assignment]
+
+_MIB = 1024 * 1024
+_HASH_CHUNK = 4 * _MIB
+_NOT_FOUND_CODES = ("404", "NoSuchKey", "NotFound")
+
+
+class ArtifactCacheError(RuntimeError):
+    """Download or verification of an artifact failed and no verified copy exists."""
+
+
+class ArtifactNotFoundError(ArtifactCacheError):
+    """The artifact does not exist in S3."""
+
+
+def _error_code(exc: BaseException) -> str:
+    """Return the botocore error code of exc ("" for other exceptions)."""
+    response = getattr(exc, "response", None) or {}
+    return str((response.get("Error") or {}).get("Code") or "")
+
+
+def file_digests(path: Union[str, Path]) -> Dict[str, Any]:
+    """Return {"size", "md5", "sha256"} of a file (hex digests), reading it once."""
+    md5 = hashlib.md5(usedforsecurity=False)
+    sha256 = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            md5.update(chunk)
+            sha256.update(chunk)
+            size += len(chunk)
+    return {"size": size, "md5": md5.hexdigest(), "sha256": sha256.hexdigest()}
+
+
+def multipart_etag(path: Union[str, Path], part_size: int) -> str:
+    """Return the S3 ETag of a multipart upload of path with part_size parts ("<md5>-<n>")."""
+    digests = []
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(part_size), b""):
+            digests.append(hashlib.md5(chunk, usedforsecurity=False).digest())
+    return f"{hashlib.md5(b''.join(digests), usedforsecurity=False).hexdigest()}-{len(digests)}"
+
+
+def write_manifest(paths: Iterable[Union[str, Path]], out_path: Union[str, Path]) -> Dict[str, Any]:
+    """Write {file name: {"sha256", "size"}} for paths to out_path and return it."""
+    manifest = {}
+    for path in paths:
+        digests = file_digests(path)
+        manifest[Path(path).name] = {"sha256": digests["sha256"], "size": digests["size"]}
+    Path(out_path).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+class ArtifactCache:
+    """Download-once, verify, reuse: S3 artifacts as local files shared by all workers."""
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        part_size: int = 8 * _MIB,
+        max_workers: int = 8,
+        keep_versions: int = 2,
+        manifest_key: Optional[str] = None,
+        s3: Any = None,
+    ) -> None:
+        """Create a cache rooted at cache_dir (created on first download).
+
+        s3 is the S3 client to use; by default one is created on first use.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.part_size = max(1, int(part_size))
+        self.max_workers = max(1, int(max_workers))
+        self.keep_versions = max(1, int(keep_versions))
+        self.manifest_key = manifest_key
+        self._s3 = s3
+        self._s3_lock = threading.Lock()
+
+    def _client(self) -> Any:
+        """Return the S3 client (boto3 imported on first use)."""
+        if self._s3 is None:
+            with self._s3_lock:
+                if self._s3 is None:
+                    boto3 = importlib.import_module("boto3")
+                    self._s3 = boto3.client("s3", region_name=config.AWS_REGION)
+        return self._s3
+
+    def _key_dir(self, bucket: str, key: str) -> Path:
+        """Return the directory holding the cached versions of one object."""
+        return self.cache_dir / bucket / key.strip("/")
+
+    def ensure_many(
+        self, bucket: str, keys: Sequence[str], optional: Sequence[str] = ()
+    ) -> Dict[str, Optional[Path]]:
+        """Return {key: local path} for keys and optional keys, downloading in parallel.
+
+        Optional keys missing from S3 map to None; a missing required key raises
+        ArtifactNotFoundError.
+        """
+        if not bucket:
+            raise ArtifactCacheError("No S3 bucket configured for ML artifacts")
+        wanted = list(dict.fromkeys([*keys, *optional]))
+        manifest = self._manifest(bucket)
+        with ThreadPoolExecutor(max_workers=min(len(wanted), 8) or 1) as pool:
+            futures = {k: pool.submit(self._ensure, bucket, k, manifest) for k in wanted}
+        out: Dict[str, Optional[Path]] = {}
+        for key, future in futures.items():
+            try:
+                out[key] = future.result()
+            except ArtifactNotFoundError:
+                if key not in optional or key in keys:
+                    raise
+                out[key] = None
+        return out
+
+    def ensure(self, bucket: str, key: str) -> Path:
+        """Return the local path of one verified artifact, downloading it when needed."""
+        return self.ensure_many(bucket, [key])[key]  # type: ignore[return-value]
+
+    def _manifest(self, bucket: str) -> Dict[str, Any]:
+        """Fetch the artifact manifest ({} when not configured, missing or unreadable)."""
+        if not self.manifest_key:
+            return {}
+        try:
+            resp = self._client().get_object(Bucket=bucket, Key=self.manifest_key)
+            data = json.loads(resp["Body"].read().decode("utf-8"))
+            return data if isinstance(data, dict) else {}
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            if _error_code(e) not in _NOT_FOUND_CODES:
+                logging.warning("Ignoring artifact manifest s3://%s/%s: %s", bucket, self.manifest_key, e)
+            return {}
+
+    def _ensure(self, bucket: str, key: str, manifest: Dict[str, Any]) -> Path:
+        """HEAD the object, then reuse its cached version or download and verify it."""
+        try:
+            head = self._client().head_object(Bucket=bucket, Key=key)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            if _error_code(e) in _NOT_FOUND_CODES:
+                raise ArtifactNotFoundError(f"s3://{bucket}/{key} not found") from e
+            cached = self._newest_cached(bucket, key)
+            if cached is None:
+                raise ArtifactCacheError(f"Cannot reach s3://{bucket}/{key}: {e}") from e
+            logging.warning("S3 unavailable for %s (%s); using cached %s", key, e, cached)
+            return cached
+        etag = str(head.get("ETag") or "").strip('"')
+        size = int(head.get("ContentLength") or 0)
+        if not etag:
+            raise ArtifactCacheError(f"s3://{bucket}/{key} has no ETag")
+        version_dir = self._key_dir(bucket, key) / etag
+        target = version_dir / Path(key).name
+        if self._is_verified(version_dir, target, size):
+            return target
+        version_dir.mkdir(parents=True, exist_ok=True)
+        with self._locked(self._key_dir(bucket, key) / ".lock"):
+            if self._is_verified(version_dir, target, size):
+                return target  # Another process finished the download while we waited.
+            tmp = version_dir / f".{target.name}.{os.getpid()}.{threading.get_ident()}.part"
+            try:
+                started = time.perf_counter()
+                self._download(bucket, key, etag, size, tmp)
+                verified_by, digests = self._verify(tmp, key, etag, size, manifest)
+                os.replace(tmp, target)
+            finally:
+                if tmp.exists():
+                    tmp.unlink()
+            meta = {"bucket": bucket, "key": key, "etag": etag, "verified_by": verified_by, **digests}
+            (version_dir / "meta.json").write_text(json.dumps(meta, sort_keys=True), encoding="utf-8")
+            logging.info(
+                "Cached s3://%s/%s (%d bytes, %.1fs, verified by %s)",
+                bucket, key, size, time.perf_counter() - started, verified_by,
+            )
+            self._prune(bucket, key, keep=version_dir)
+        return target
+
+    @staticmethod
+    def _is_verified(version_dir: Path, target: Path, size: int) -> bool:
+        """Return True when target was downloaded and verified (meta.json) and has the size."""
+        meta_path = version_dir / "meta.json"
+        if not target.exists() or not meta_path.exists():
+            return False
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        return int(meta.get("size", -1)) == size == target.stat().st_size
+
+    def _newest_cached(self, bucket: str, key: str) -> Optional[Path]:
+        """Return the most recently verified cached copy of key, or None."""
+        key_dir = self._key_dir(bucket, key)
+        if not key_dir.is_dir():
+            return None
+        versions = sorted(
+            (d for d in key_dir.iterdir() if (d / "meta.json").exists() and (d / Path(key).name).exists()),
+            key=lambda d: (d / "meta.json").stat().st_mtime,
+            reverse=True,
+        )
+        return versions[0] / Path(key).name if versions else None
+
+    @contextmanager
+    def _locked(self, lock_path: Path) -> Iterator[None]:
+        """Hold an exclusive cross-process lock on lock_path (no-op without fcntl)."""
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _download(self, bucket: str, key: str, etag: str, size: int, dest: Path) -> None:
+        """Fetch the object into dest with parallel ranged GETs of part_size bytes."""
+        s3 = self._client()
+        if size <= self.part_size:
+            try:
+                body = s3.get_object(Bucket=bucket, Key=key, IfMatch=f'"{etag}"')["Body"].read()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                raise ArtifactCacheError(f"Download of s3://{bucket}/{key} failed: {e}") from e
+            dest.write_bytes(body)
+            return
+        with open(dest, "wb") as f:
+            f.truncate(size)
+
+        def fetch(start: int) -> None:
+            """Fetch bytes [start, start + part_size) and write them in place."""
+            end = min(start + self.part_size, size) - 1
+            resp = s3.get_object(
+                Bucket=bucket, Key=key, Range=f"bytes={start}-{end}", IfMatch=f'"{etag}"'
+            )
+            data = resp["Body"].read()
+            if len(data) != end - start + 1:
+                raise ArtifactCacheError(f"Short read for bytes {start}-{end} of {key}")
+            with open(dest, "r+b") as part_file:
+                part_file.seek(start)
+                part_file.write(data)
+
+        starts = range(0, size, self.part_size)
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(starts))) as pool:
+                list(pool.map(fetch, starts))
+        except ArtifactCacheError:
+            raise
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            raise ArtifactCacheError(f"Download of s3://{bucket}/{key} failed: {e}") from e
+
+    def _verify(
+        self, path: Path, key: str, etag: str, size: int, manifest: Dict[str, Any]
+    ) -> tuple[str, Dict[str, Any]]:
+        """Check the download against the manifest or the ETag; return (method, digests)."""
+        digests = file_digests(path)
+        if digests["size"] != size:
+            raise ArtifactCacheError(f"{key}: got {digests['size']} bytes, expected {size}")
+        entry = manifest.get(Path(key).name)
+        if isinstance(entry, dict) and entry.get("sha256"):
+            if digests["sha256"] != entry["sha256"] or int(entry.get("size", size)) != size:
+                raise ArtifactCacheError(f"{key}: sha256 does not match the artifact manifest")
+            return "manifest", digests
+        if "-" not in etag:
+            if digests["md5"] != etag:
+                raise ArtifactCacheError(f"{key}: MD5 does not match ETag {etag}")
+            return "etag", digests
+        n_parts = int(etag.rsplit("-", 1)[1])
+        candidates = {self.part_size, 8 * _MIB, 16 * _MIB, 5 * _MIB}
+        candidates.add(-(-size // max(1, n_parts) // _MIB) * _MIB)  # ceil(size / n) in whole MiB
+        for part_size in sorted(c for c in candidates if c > 0):
+            if -(-size // part_size) == n_parts and multipart_etag(path, part_size) == etag:
+                return "etag", digests
+        logging.warning("%s: multipart ETag %s not reproducible; size checked only", key, etag)
+        return "size", digests
+
+    def _prune(self, bucket: str, key: str, keep: Path) -> None:
+        """Delete all but the newest keep_versions version directories of key."""
+        key_dir = self._key_dir(bucket, key)
+        versions = sorted(
+            (d for d in key_dir.iterdir() if d.is_dir()),
+            key=lambda d: d.stat().st_mtime,
+            reverse=True,
+        )
+        older = [d for d in versions if d != keep]
+        for version in older[self.keep_versions - 1 :]:
+            shutil.rmtree(version, ignore_errors=True)
+
+
+def artifacts_bucket() -> Optional[str]:
+    """Return the S3 bucket holding the recommender artifacts.
+
+    ML_ARTIFACTS_BUCKET wins; DATA_BUCKET is the fallback when it is unset.
+    """
+    return config.ML_ARTIFACTS_BUCKET or config.DATA_BUCKET or None
+
+
+def local_or_cached(
+    paths_to_keys: Dict[Union[str, Path], str], bucket: Optional[str] = None
+) -> Dict[Union[str, Path], Path]:
+    """Map each local artifact path to itself if it exists, else to the cached copy of its S3 key.
+
+    Missing files are fetched together (in parallel) and only in AWS mode with a
+    bucket configured; otherwise the local path is returned as-is, so callers
+    fail the way they did before (file not found).
+    """
+    out = {local: Path(local) for local in paths_to_keys}
+    missing = {local: key for local, key in paths_to_keys.items() if not Path(local).exists()}
+    bucket = bucket or artifacts_bucket()
+    if missing and config.IS_AWS and bucket:
+        fetched = get_artifact_cache().ensure_many(bucket, list(missing.values()))
+        for local, key in missing.items():
+            out[local] = fetched[key]  # type: ignore[assignment]
+    return out
+
+
+_ARTIFACT_CACHE: Optional[ArtifactCache] = None
+_ARTIFACT_CACHE_LOCK = threading.Lock()
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """Return the process-wide artifact cache configured from backend.config."""
+    global _ARTIFACT_CACHE  # pylint: disable=global-statement
+    if _ARTIFACT_CACHE is None:
+        with _ARTIFACT_CACHE_LOCK:
+            if _ARTIFACT_CACHE is None:
+                _ARTIFACT_CACHE = ArtifactCache(
+                    config.ML_ARTIFACTS_LOCAL_CACHE_DIR,
+                    part_size=config.ML_ARTIFACTS_PART_SIZE_MB * _MIB,
+                    max_workers=config.ML_ARTIFACTS_DOWNLOAD_WORKERS,
+                    keep_versions=config.ML_ARTIFACTS_KEEP_VERSIONS,
+                    manifest_key=config.BOOK_RECOMMENDER_MANIFEST_S3_KEY,
+                )
+    return _ARTIFACT_CACHE
+
+
+def reset_artifact_cache() -> None:
+    """Discard the process-wide artifact cache (tests)."""
+    global _ARTIFACT_CACHE  # pylint: disable=global-statement
+    with _ARTIFACT_CACHE_LOCK:
+        _ARTIFACT_CACHE = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Prefetch every configured BOOK_*_S3_KEY artifact (e.g. at instance start)."""
+    parser = argparse.ArgumentParser(description="Prefetch recommender artifacts from S3")
+    parser.add_argument("--bucket", default=artifacts_bucket())
+    args = parser.parse_args(argv)
+    keys = [
+        config.BOOK_TFIDF_S3_KEY,
+        config.BOOK_ID_TO_IDX_ARTIFACT_S3_KEY,
+        config.BOOK_RATING_NORMS_S3_KEY,
+        config.BOOK_GENRE_BUCKETS_S3_KEY,
+        config.BOOK_RECOMMENDER_MODEL_S3_KEY,
+        config.BOOK_RECOMMENDER_SCALER_S3_KEY,
+        config.BOOK_SIMILARITY_S3_KEY,
+        config.BOOK_RATINGS_S3_KEY,
+        config.BOOK_ID_TO_IDX_S3_KEY,
+    ]
+    paths = get_artifact_cache().ensure_many(args.bucket, [], optional=keys)
+    for key, path in paths.items():
+        print(f"{key}: {path or 'not in S3'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+"""Book metadata lookups for recommendation payloads.
+
+The precomputed recommender keeps no DataFrame, so the top-k books are
+described from books.db when it exists locally, and otherwise from the storage
+backend (DynamoDB or S3 on AWS). genre_text maps raw categories onto
+GENRE_VOCAB for the in-memory fit.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+from backend import books_db
+import backend.storage as backend_storage
+from backend.recommender.user_signals import GENRE_KEYWORDS, GENRE_VOCAB
+
+
+def safe_json_loads(value: Any) -> Any:
+    """Best-effort JSON parse that preserves original values on failure."""
+    parsed_input = value
+    if value is None:
+        return parsed_input
+    if isinstance(value, (list, dict, str)):
+        parsed_input = value
+    elif isinstance(value, (bytes, bytearray)):
+        try:
+            parsed_input = value.decode("utf-8", errors="ignore")
+        except (ValueError, TypeError, AttributeError):
+            return value
+    s = parsed_input.strip() if isinstance(parsed_input, str) else ""
+    if s:
+        parsed_input = s
+        try:
+            return json.loads(s)
+        except (ValueError, TypeError):
+            pass
+    return parsed_input
+
+
+def genre_text(raw: Any) -> str:
+    """Map raw categories text/list to a pipe-delimited controlled genre set."""
+    parsed = safe_json_loads(raw)
+    values: List[str] = []
+    if isinstance(parsed, list):
+        values = [str(x) for x in parsed if x is not None]
+    elif isinstance(parsed, str):
+        values = [parsed]
+    else:
+        values = []
+
+    text = " ".join(" ".join(values).split()).lower()
+    if not text:
+        return ""
+
+    matched: List[str] = []
+    for genre in GENRE_VOCAB:
+        keywords = GENRE_KEYWORDS.get(genre, [])
+        for keyword in keywords:
+            if keyword in text:
+                matched.append(genre)
+                break
+
+    seen: Set[str] = set()
+    ordered_unique = [g for g in matched if not (g in seen or seen.add(g))]
+    return "|".join(ordered_unique)
+
+
+def fetch_book_metadata(db_path: Path, asin_list: List[str]) -> List[Dict[str, Any]]:
+    """Fetch metadata for parent_asins from books.db (local) or storage (AWS). Returns list of dicts."""
+    if not asin_list:
+        return []
+    # AWS / no local DB: use storage.get_books_metadata_batch (DynamoDB or S3).
+    if not db_path.exists():
+        return fetch_storage_metadata(asin_list)
+
+    try:
+        rows = books_db.fetch_many(db_path, asin_list, books_db.METADATA_COLUMNS)
+    except (sqlite3.Error, OSError):
+        return []
+    out = []
+    for r in rows:
+        d = dict(r)
+        cats = d.get("categories")
+        if isinstance(cats, str):
+            try:
+                parsed = safe_json_loads(cats)
+                d["categories_list"] = (
+                    [str(x) for x in parsed] if isinstance(parsed, list) else []
+                )
+            except (ValueError, TypeError):
+                d["categories_list"] = []
+        else:
+            d["categories_list"] = d.get("categories_list") or []
+        out.append(d)
+    return out
+
+
+def fetch_storage_metadata(asin_list: List[str]) -> List[Dict[str, Any]]:
+    """Fetch metadata via storage backend when local sqlite is unavailable."""
+    try:
+        store = backend_storage.get_storage()
+        if not hasattr(store, "get_books_metadata_batch"):
+            return []
+        batch = store.get_books_metadata_batch(asin_list) or {}
+    except (RuntimeError, ValueError, TypeError, KeyError):
+        return []
+    out: list[dict[str, Any]] = []
+    for asin in asin_list:
+        metadata = batch.get(str(asin))
+        if not metadata:
+            continue
+        categories = metadata.get("categories") or metadata.get("categories_list") or []
+        if isinstance(categories, str):
+            parsed_categories = safe_json_loads(categories) or []
+            categories = parsed_categories if isinstance(parsed_categories, list) else []
+        if not isinstance(categories, list):
+            categories = []
+        out.append(
+            {
+                "parent_asin": str(asin),
+                "title": metadata.get("title") or "",
+                "author_name": metadata.get("author_name") or metadata.get("author"),
+                "average_rating": float(metadata.get("average_rating") or 0),
+                "rating_number": int(
+                    metadata.get("rating_number")
+                    or metadata.get("rating_count")
+                    or 0
+                ),
+                "images": metadata.get("images"),
+                "categories": metadata.get("categories"),
+                "categories_list": [str(x) for x in categories],
+            }
+        )
+    return out
@@ -14,88 +14,43 @@ from __future__ import annotations
 
 import json
 import logging
-import sqlite3
 from io import BytesIO
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set
 import importlib
 
 import numpy as np
-import pandas as pd
 from scipy import sparse
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import MinMaxScaler
 
 from backend.config import (
     AWS_REGION,
+    BOOK_CANDIDATE_INDEX_MIN_BOOKS,
+    BOOK_CANDIDATE_POOL_SIZE,
+    BOOK_GENRE_BUCKETS_S3_KEY,
+    BOOK_RECOMMENDER_COMPACT,
+    BOOK_PROFILE_CACHE_SIZE,
     BOOK_TFIDF_S3_KEY,
     BOOK_ID_TO_IDX_ARTIFACT_S3_KEY,
     BOOK_RATING_NORMS_S3_KEY,
-    DATA_BUCKET,
     IS_AWS,
-    ML_ARTIFACTS_BUCKET,
     PROCESSED_DIR,
 )
+from backend.instrumentation import instrumented
 import backend.storage as backend_storage
+from backend.recommender.artifact_cache import artifacts_bucket, get_artifact_cache
+from backend.recommender.book_metadata import fetch_book_metadata, genre_text, safe_json_loads
+from backend.recommender.candidate_index import GenreCandidateIndex
+from backend.recommender.compact import SCORE_DTYPE, CompactState, as_compact_csr
+from backend.recommender.genre_buckets import GenreBuckets
+from backend.recommender.profile_cache import ProfileEntry, UserProfileCache, blend_profile, genre_key
+from backend.recommender.user_signals import GENRE_VOCAB, UserSignals, genres_vector
 
-GENRE_VOCAB: List[str] = [
-    "Literature & Fiction",
-    "Children's Books",
-    "Mystery, Thriller & Suspense",
-    "Arts & Photography",
-    "History",
-    "Biographies & Memoirs",
-    "Crafts, Hobbies & Home",
-    "Business & Money",
-    "Politics & Social Sciences",
-    "Growing Up & Facts of Life",
-    "Romance",
-    "Science & Math",
-    "Teen & Young Adult",
-    "Cookbooks, Food & Wine",
-    "Religion & Spirituality",
-    "Poetry",
-    "Comics & Graphic Novels",
-    "Travel",
-    "Fantasy",
-    "Action & Adventure",
-    "Self-Help",
-    "Science Fiction",
-    "Sports & Outdoors",
-    "Classics",
-    "LGBTQ+",
-]
-
-
-GENRE_KEYWORDS: Dict[str, List[str]] = {
-    "Literature & Fiction": ["literature", "fiction"],
-    "Children's Books": ["children", "kids"],
-    "Mystery, Thriller & Suspense": ["mystery", "thriller", "suspense"],
-    "Arts & Photography": ["art", "arts", "photography"],
-    "History": ["history"],
-    "Biographies & Memoirs": ["biography", "memoir"],
-    "Crafts, Hobbies & Home": ["craft", "hobbies", "home"],
-    "Business & Money": ["business", "finance", "money"],
-    "Politics & Social Sciences": ["politics", "social science"],
-    "Growing Up & Facts of Life": ["growing up", "coming of age"],
-    "Romance": ["romance"],
-    "Science & Math": ["science", "math"],
-    "Teen & Young Adult": ["young adult", "teen"],
-    "Cookbooks, Food & Wine": ["cookbook", "food", "wine", "cooking"],
-    "Religion & Spirituality": ["religion", "spirituality"],
-    "Poetry": ["poetry"],
-    "Comics & Graphic Novels": ["comics", "graphic novel"],
-    "Travel": ["travel"],
-    "Fantasy": ["fantasy"],
-    "Action & Adventure": ["adventure", "action"],
-    "Self-Help": ["self help", "self-help"],
-    "Science Fiction": ["science fiction", "sci fi", "sci-fi"],
-    "Sports & Outdoors": ["sports", "outdoor"],
-    "Classics": ["classic"],
-    "LGBTQ+": ["lgbt", "lgbtq"],
-}
+if TYPE_CHECKING:
+    # pandas and sklearn are only needed by the JSON fit path (_fit_from_json);
+    # the precomputed online path never imports them (see benchmarks/import_time.py).
+    import pandas as pd
+    from sklearn.feature_extraction.text import TfidfVectorizer
 
 
 @dataclass(frozen=True)
@@ -107,69 +62,83 @@ class RecommenderWeights:
     rating_number_popularity: float = 0.2
 
 
-def _safe_json_loads(value: Any) -> Any:
-    """Best-effort JSON parse that preserves original values on failure."""
-    parsed_input = value
-    if value is None:
-        return parsed_input
-    if isinstance(value, (list, dict, str)):
-        parsed_input = value
-    elif isinstance(value, (bytes, bytearray)):
-        try:
-            parsed_input = value.decode("utf-8", errors="ignore")
-        except (ValueError, TypeError, AttributeError):
-            return value
-    s = parsed_input.strip() if isinstance(parsed_input, str) else ""
-    if s:
-        parsed_input = s
-        try:
-            return json.loads(s)
-        except (ValueError, TypeError):
-            pass
-    return parsed_input
+@dataclass
+class _DerivedState:
+    """Structures derived from the loaded artifacts, each with the key it was built from.
 
+    Keys come from ContentBasedBookRecommender._artifacts_key (idx_to_asin is
+    keyed on the id mapping instead).
+    """
 
-def _normalize_whitespace(s: str) -> str:
-    """Collapse internal whitespace and trim edges."""
-    return " ".join(s.split())
+    candidate_index: Optional[GenreCandidateIndex] = None
+    compact_state: Optional[CompactState] = None
+    profile_cache: Optional[UserProfileCache] = None
+    idx_to_asin: Optional[List[Optional[str]]] = None
+    keys: Dict[str, tuple] = field(default_factory=dict)
 
 
-def _infer_column(df: pd.DataFrame, candidates: Sequence[str]) -> Optional[str]:
-    """Return the first matching dataframe column from candidate names."""
-    lower_to_actual = {c.lower(): c for c in df.columns}
-    for cand in candidates:
-        if cand.lower() in lower_to_actual:
-            return lower_to_actual[cand.lower()]
-    return None
+def _cosine_similarity_to_rows(vec: np.ndarray, matrix: Any) -> np.ndarray:
+    """Cosine similarity of one dense vector to every row of a sparse or dense matrix.
 
+    Matches sklearn's cosine_similarity(vec.reshape(1, -1), matrix).reshape(-1)
+    (zero rows score 0) without importing sklearn on the online path.
+    """
+    vec = np.asarray(vec, dtype=float).reshape(-1)
+    if sparse.issparse(matrix):
+        dots = np.asarray(matrix @ vec, dtype=float).reshape(-1)
+        row_norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1), dtype=float).reshape(-1))
+    else:
+        dense = np.asarray(matrix, dtype=float)
+        dots = dense @ vec
+        row_norms = np.linalg.norm(dense, axis=1)
+    denom = row_norms * float(np.linalg.norm(vec))
+    return np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
 
-def _map_genre_name(raw_genre: str) -> str:
-    """Map free-form genre labels to the canonical recommender vocabulary."""
-    if raw_genre in GENRE_VOCAB:
-        return raw_genre
-    genre_lower = raw_genre.lower()
-    for official, keywords in GENRE_KEYWORDS.items():
-        if official in GENRE_VOCAB and any(keyword in genre_lower for keyword in keywords):
-            return official
-    return ""
 
-
-class ContentBasedBookRecommender:
+class ContentBasedBookRecommender:  # pylint: disable=too-many-instance-attributes
     """Content-based recommender operating on processed book metadata."""
 
     def __init__(
         self,
         data_dir: Optional[Path] = None,
         weights: Optional[RecommenderWeights] = None,
+        candidate_index_min_books: Optional[int] = None,
+        candidate_pool_size: Optional[int] = None,
+        compact: Optional[bool] = None,
+        profile_cache_size: Optional[int] = None,
+        metadata_fetcher: Optional[Callable[[List[str]], List[Dict[str, Any]]]] = None,
     ) -> None:
-        """Initialize recommender paths, weights, and in-memory artifact holders."""
+        """Initialize recommender paths, weights, and in-memory artifact holders.
+
+        metadata_fetcher replaces the books.db / storage lookup of top-k metadata
+        in precomputed mode (benchmarks and tests pass a stub).
+        """
         self.data_dir = Path(data_dir) if data_dir is not None else PROCESSED_DIR
         self.weights = weights or RecommenderWeights()
+        self.candidate_index_min_books = (
+            BOOK_CANDIDATE_INDEX_MIN_BOOKS
+            if candidate_index_min_books is None
+            else int(candidate_index_min_books)
+        )
+        self.candidate_pool_size = (
+            BOOK_CANDIDATE_POOL_SIZE if candidate_pool_size is None else int(candidate_pool_size)
+        )
+        # Compact mode: float32 artifacts and scoring into per-thread buffers
+        # (precomputed catalogs only; the small in-memory catalog keeps float64).
+        self.compact = BOOK_RECOMMENDER_COMPACT if compact is None else bool(compact)
+        self.profile_cache_size = (
+            BOOK_PROFILE_CACHE_SIZE if profile_cache_size is None else int(profile_cache_size)
+        )
+        self.metadata_fetcher = metadata_fetcher
+        # Derived structures, rebuilt lazily when the artifacts they came from change.
+        self._derived = _DerivedState()
 
         self.books_df: Optional[pd.DataFrame] = None
         self.book_id_to_idx: Optional[Dict[str, int]] = None
         self.tfidf_vectorizer: Optional[TfidfVectorizer] = None
         self.book_tfidf: Optional[sparse.csr_matrix] = None
+        # Optional top-K table for genre-only / cold-start users (book_genre_buckets.npz).
+        self.genre_buckets: Optional[GenreBuckets] = None
         # Precomputed path (full catalog): no DataFrame, query books.db for metadata.
         self._rating_norms: Dict[str, Optional[np.ndarray]] = {
             "average_rating": None,
@@ -204,10 +173,15 @@ class ContentBasedBookRecommender:
         if tfidf_path.exists() and idx_path.exists() and norms_path.exists():
             self._load_precomputed(tfidf_path, idx_path, norms_path)
             return
-        # AWS: try loading content-based artifacts from S3 (e.g. s3://bucket/books/book_recommender/).
+        # AWS: load content-based artifacts from S3 (e.g. s3://bucket/books/book_recommender/)
+        # through the local disk cache, so restarts and other workers read them from disk.
         try:
             if IS_AWS:
-                self._load_precomputed_from_s3()
+                try:
+                    self._load_precomputed_from_cache()
+                except OSError as e:
+                    logging.warning("Artifact cache unusable (%s); loading artifacts from S3 into memory", e)
+                    self._load_precomputed_from_s3()
                 return
         except (RuntimeError, ValueError, TypeError, OSError):
             pass
@@ -218,113 +192,98 @@ class ContentBasedBookRecommender:
         tfidf_path: Path,
         idx_path: Path,
         norms_path: Path,
+        buckets_path: Optional[Path] = None,
     ) -> None:
-        """Load artifacts built by data/scripts/build_recommender_artifacts.py."""
-        self.book_tfidf = sparse.load_npz(str(tfidf_path))
+        """Load artifacts built by data/scripts/build_recommender_artifacts.py.
+
+        buckets_path defaults to book_genre_buckets.npz in data_dir (optional file).
+        """
         with idx_path.open("r", encoding="utf-8") as f:
-            self.book_id_to_idx = json.load(f)
+            book_id_to_idx = json.load(f)
         data = np.load(norms_path)
-        self._rating_norms["average_rating"] = data["average_rating_norm"]
-        self._rating_norms["rating_number"] = data["rating_number_norm"]
-        self.books_df = None
-        self.tfidf_vectorizer = None
+        self.load_arrays(
+            sparse.load_npz(str(tfidf_path)),
+            book_id_to_idx,
+            data["average_rating_norm"],
+            data["rating_number_norm"],
+        )
+        if buckets_path is None:
+            buckets_path = self.data_dir / "book_genre_buckets.npz"
+        self.genre_buckets = None
+        if buckets_path.exists():
+            try:
+                self.genre_buckets = GenreBuckets.load(buckets_path)
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning("Ignoring unreadable %s: %s", buckets_path, e)
+
+    def _load_precomputed_from_cache(self) -> None:
+        """Load precomputed artifacts from S3 via the local artifact cache (artifact_cache.py)."""
+        paths = get_artifact_cache().ensure_many(
+            artifacts_bucket(),
+            [BOOK_TFIDF_S3_KEY, BOOK_ID_TO_IDX_ARTIFACT_S3_KEY, BOOK_RATING_NORMS_S3_KEY],
+            optional=[BOOK_GENRE_BUCKETS_S3_KEY],
+        )
+        self._load_precomputed(
+            paths[BOOK_TFIDF_S3_KEY],  # type: ignore[arg-type]
+            paths[BOOK_ID_TO_IDX_ARTIFACT_S3_KEY],  # type: ignore[arg-type]
+            paths[BOOK_RATING_NORMS_S3_KEY],  # type: ignore[arg-type]
+            buckets_path=paths[BOOK_GENRE_BUCKETS_S3_KEY],
+        )
 
     def _load_precomputed_from_s3(self) -> None:
         """Load precomputed artifacts from S3 (e.g. s3://bucket/books/book_recommender/)."""
-        bucket = DATA_BUCKET or ML_ARTIFACTS_BUCKET
+        bucket = artifacts_bucket()
         region = AWS_REGION
         if not bucket:
-            raise RuntimeError("DATA_BUCKET / ML_ARTIFACTS_BUCKET not set for S3 artifact load")
+            raise RuntimeError("ML_ARTIFACTS_BUCKET / DATA_BUCKET not set for S3 artifact load")
         boto3 = importlib.import_module("boto3")
         s3 = boto3.client("s3", region_name=region)
         tfidf_resp = s3.get_object(Bucket=bucket, Key=BOOK_TFIDF_S3_KEY)
-        self.book_tfidf = sparse.load_npz(BytesIO(tfidf_resp["Body"].read()))
         idx_resp = s3.get_object(Bucket=bucket, Key=BOOK_ID_TO_IDX_ARTIFACT_S3_KEY)
-        self.book_id_to_idx = json.loads(idx_resp["Body"].read().decode("utf-8"))
         norms_resp = s3.get_object(Bucket=bucket, Key=BOOK_RATING_NORMS_S3_KEY)
         data = np.load(BytesIO(norms_resp["Body"].read()))
-        self._rating_norms["average_rating"] = data["average_rating_norm"]
-        self._rating_norms["rating_number"] = data["rating_number_norm"]
+        self.load_arrays(
+            sparse.load_npz(BytesIO(tfidf_resp["Body"].read())),
+            json.loads(idx_resp["Body"].read().decode("utf-8")),
+            data["average_rating_norm"],
+            data["rating_number_norm"],
+        )
+        # Genre buckets are optional: older artifact sets do not include them.
+        self.genre_buckets = None
+        try:
+            buckets_resp = s3.get_object(Bucket=bucket, Key=BOOK_GENRE_BUCKETS_S3_KEY)
+            self.genre_buckets = GenreBuckets.load(BytesIO(buckets_resp["Body"].read()))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.info("No genre buckets at s3://%s/%s: %s", bucket, BOOK_GENRE_BUCKETS_S3_KEY, e)
+
+    def load_arrays(
+        self,
+        book_tfidf: sparse.spmatrix,
+        book_id_to_idx: Dict[str, int],
+        average_rating_norm: np.ndarray,
+        rating_number_norm: np.ndarray,
+    ) -> None:
+        """Use in-memory precomputed artifacts (the arrays fit() loads from disk or S3).
+
+        In compact mode they are stored as float32 / int32. Genre buckets are
+        left as they are.
+        """
+        self.book_tfidf = book_tfidf
+        self.book_id_to_idx = book_id_to_idx
+        self._rating_norms["average_rating"] = average_rating_norm
+        self._rating_norms["rating_number"] = rating_number_norm
         self.books_df = None
         self.tfidf_vectorizer = None
+        if self.compact:
+            self.book_tfidf = as_compact_csr(self.book_tfidf)
+            for name, values in self._rating_norms.items():
+                self._rating_norms[name] = np.asarray(values, dtype=SCORE_DTYPE)
 
     def _fetch_metadata_for_asins(self, asin_list: List[str]) -> List[Dict[str, Any]]:
         """Fetch metadata for parent_asins from books.db (local) or storage (AWS). Returns list of dicts."""
-        if not asin_list:
-            return []
-        # AWS / no local DB: use storage.get_books_metadata_batch (DynamoDB or S3).
-        db_path = self.data_dir / "books.db"
-        if not db_path.exists():
-            return self._fetch_metadata_from_storage(asin_list)
-
-        placeholders = ",".join(["?"] * len(asin_list))
-        query = f"""
-        SELECT parent_asin, title, author_name, average_rating, rating_number, images, categories
-        FROM books WHERE parent_asin IN ({placeholders})
-        """
-        try:
-            with sqlite3.connect(str(db_path)) as conn:
-                rows = conn.execute(query, asin_list).fetchall()
-        except sqlite3.Error:
-            return []
-        columns = [
-            "parent_asin", "title", "author_name",
-            "average_rating", "rating_number", "images", "categories",
-        ]
-        out = []
-        for r in rows:
-            d = dict(zip(columns, r))
-            cats = d.get("categories")
-            if isinstance(cats, str):
-                try:
-                    parsed = _safe_json_loads(cats)
-                    d["categories_list"] = (
-                        [str(x) for x in parsed] if isinstance(parsed, list) else []
-                    )
-                except (ValueError, TypeError):
-                    d["categories_list"] = []
-            else:
-                d["categories_list"] = d.get("categories_list") or []
-            out.append(d)
-        return out
-
-    def _fetch_metadata_from_storage(self, asin_list: List[str]) -> List[Dict[str, Any]]:
-        """Fetch metadata via storage backend when local sqlite is unavailable."""
-        try:
-            store = backend_storage.get_storage()
-            if not hasattr(store, "get_books_metadata_batch"):
-                return []
-            batch = store.get_books_metadata_batch(asin_list) or {}
-        except (RuntimeError, ValueError, TypeError, KeyError):
-            return []
-        out: list[dict[str, Any]] = []
-        for asin in asin_list:
-            metadata = batch.get(str(asin))
-            if not metadata:
-                continue
-            categories = metadata.get("categories") or metadata.get("categories_list") or []
-            if isinstance(categories, str):
-                parsed_categories = _safe_json_loads(categories) or []
-                categories = parsed_categories if isinstance(parsed_categories, list) else []
-            if not isinstance(categories, list):
-                categories = []
-            out.append(
-                {
-                    "parent_asin": str(asin),
-                    "title": metadata.get("title") or "",
-                    "author_name": metadata.get("author_name") or metadata.get("author"),
-                    "average_rating": float(metadata.get("average_rating") or 0),
-                    "rating_number": int(
-                        metadata.get("rating_number")
-                        or metadata.get("rating_count")
-                        or 0
-                    ),
-                    "images": metadata.get("images"),
-                    "categories": metadata.get("categories"),
-                    "categories_list": [str(x) for x in categories],
-                }
-            )
-        return out
+        if self.metadata_fetcher is not None:
+            return self.metadata_fetcher(asin_list)
+        return fetch_book_metadata(self.data_dir / "books.db", asin_list)
 
     def _build_genres_vector(
         self,
@@ -332,52 +291,23 @@ class ContentBasedBookRecommender:
         user_genres_df: Optional[pd.DataFrame],
     ) -> tuple[np.ndarray, bool]:
         """Build weighted genre preference vector from user preference rows."""
-        genres_vec = np.zeros(len(GENRE_VOCAB), dtype=float)
-        if user_genres_df is None or user_genres_df.empty:
-            return genres_vec, False
-        genres_df = user_genres_df
-        uid_col = _infer_column(genres_df, ["user_id", "user", "uid"])
-        if uid_col is not None:
-            genres_df = genres_df[genres_df[uid_col].astype(str) == str(user_id)]
-        genre_col = _infer_column(
-            genres_df, ["genre", "category", "categories", "preference", "name"]
-        )
-        rank_col = _infer_column(
-            genres_df, ["rank", "preference_rank", "order", "priority"]
-        )
-        if genre_col is None or genres_df.empty:
-            return genres_vec, False
-        has_genres = False
-        for _, row in genres_df.iterrows():
-            raw_genre = row.get(genre_col)
-            if raw_genre is None:
-                continue
-            genre_name = str(raw_genre).strip()
-            if not genre_name:
-                continue
-            genre_name = _map_genre_name(genre_name)
-            if not genre_name:
-                continue
-            rank_val = row.get(rank_col) if rank_col is not None else None
-            weight = 1.0
-            try:
-                rank = int(rank_val)
-                if rank == 1:
-                    weight = 3.0
-                elif rank == 2:
-                    weight = 2.0
-            except (TypeError, ValueError):
-                weight = 1.0
-            genres_vec[GENRE_VOCAB.index(genre_name)] += weight
-            has_genres = True
-        return genres_vec, has_genres
+        return genres_vector(UserSignals.from_frames(user_id, user_genres_df, None).genre_ranks)
 
     def _fit_from_json(self) -> None:
         """Load book catalog from existing JSON files and build TF-IDF + scalers."""
+        # Fit-time only: keep pandas and sklearn off the import path of the app.
+        pd = importlib.import_module("pandas")
+        TfidfVectorizer = importlib.import_module(  # pylint: disable=invalid-name
+            "sklearn.feature_extraction.text"
+        ).TfidfVectorizer
+        MinMaxScaler = importlib.import_module(  # pylint: disable=invalid-name
+            "sklearn.preprocessing"
+        ).MinMaxScaler
         reviews_path = self.data_dir / "reviews_top25_books.json"
         spl_path = self.data_dir / "spl_top50_checkouts_in_books.json"
         self._rating_norms["average_rating"] = None
         self._rating_norms["rating_number"] = None
+        self.genre_buckets = None
 
         def _load_json(path: Path) -> list:
             """Load a JSON list file; return empty list when missing/unusable."""
@@ -391,7 +321,7 @@ class ContentBasedBookRecommender:
             """Normalize category payloads to a list of non-empty strings."""
             if cats is None:
                 return []
-            parsed = _safe_json_loads(cats)
+            parsed = safe_json_loads(cats)
             if isinstance(parsed, list):
                 return [str(x) for x in parsed if x is not None and str(x).strip()]
             if isinstance(parsed, str) and parsed.strip():
@@ -425,7 +355,7 @@ class ContentBasedBookRecommender:
 
         books_df = pd.DataFrame(rows)
         books_df["categories_list"] = books_df["categories"].apply(_normalize_cats)
-        books_df["genre_text"] = books_df["categories"].apply(self._prepare_categories)
+        books_df["genre_text"] = books_df["categories"].apply(genre_text)
         self.book_id_to_idx = {str(row["parent_asin"]): i for i, row in books_df.iterrows()}
 
         self.tfidf_vectorizer = TfidfVectorizer(
@@ -455,34 +385,6 @@ class ContentBasedBookRecommender:
 
         self.books_df = books_df
 
-    @staticmethod
-    def _prepare_categories(raw: Any) -> str:
-        """Map raw categories text/list to a pipe-delimited controlled genre set."""
-        parsed = _safe_json_loads(raw)
-        values: List[str] = []
-        if isinstance(parsed, list):
-            values = [str(x) for x in parsed if x is not None]
-        elif isinstance(parsed, str):
-            values = [parsed]
-        else:
-            values = []
-
-        text = _normalize_whitespace(" ".join(values)).lower()
-        if not text:
-            return ""
-
-        matched: List[str] = []
-        for genre in GENRE_VOCAB:
-            keywords = GENRE_KEYWORDS.get(genre, [])
-            for keyword in keywords:
-                if keyword in text:
-                    matched.append(genre)
-                    break
-
-        seen: Set[str] = set()
-        ordered_unique = [g for g in matched if not (g in seen or seen.add(g))]
-        return "|".join(ordered_unique)
-
     @staticmethod
     def _is_cold_start(
         user_id: Any,
@@ -490,47 +392,13 @@ class ContentBasedBookRecommender:
         user_books_df: Optional[pd.DataFrame],
     ) -> bool:
         """Return True when user has no usable genre prefs and no reading history."""
-        has_genres = False
-        if user_genres_df is not None and not user_genres_df.empty:
-            uid_col = _infer_column(user_genres_df, ["user_id", "user", "uid"])
-            if uid_col is None:
-                has_genres = user_genres_df.shape[0] > 0
-            else:
-                has_genres = (
-                    user_genres_df[user_genres_df[uid_col].astype(str) == str(user_id)].shape[0]
-                    > 0
-                )
-
-        has_books = False
-        if user_books_df is not None and not user_books_df.empty:
-            uid_col = _infer_column(user_books_df, ["user_id", "user", "uid"])
-            if uid_col is None:
-                has_books = user_books_df.shape[0] > 0
-            else:
-                has_books = (
-                    user_books_df[user_books_df[uid_col].astype(str) == str(user_id)].shape[0] > 0
-                )
-
-        return (not has_genres) and (not has_books)
+        return UserSignals.from_frames(user_id, user_genres_df, user_books_df).is_cold_start
 
     def _get_read_parent_asins(
         self, user_id: Any, user_books_df: Optional[pd.DataFrame]
     ) -> Set[str]:
         """Extract read/saved parent ASINs for a specific user from an input frame."""
-        if user_books_df is None or user_books_df.empty:
-            return set()
-
-        books_df = user_books_df
-        uid_col = _infer_column(books_df, ["user_id", "user", "uid"])
-        if uid_col is not None:
-            books_df = books_df[books_df[uid_col].astype(str) == str(user_id)]
-
-        asin_col = _infer_column(
-            books_df, ["parent_asin", "asin", "book_id", "book_asin"]
-        )
-        if asin_col is None:
-            return set()
-        return set(books_df[asin_col].dropna().astype(str).tolist())
+        return set(UserSignals.from_frames(user_id, None, user_books_df).read_asins)
 
     def _get_book_indices_for_asins(self, parent_asins: Iterable[str]) -> List[int]:
         """Translate parent ASINs into fitted TF-IDF row indices."""
@@ -562,31 +430,86 @@ class ContentBasedBookRecommender:
         Exceptions:
             RuntimeError: If recommender artifacts have not been fitted/loaded.
         """
-        if self.tfidf_vectorizer is None or self.book_tfidf is None:
-            raise RuntimeError("Call fit() before building user profiles.")
-
-        genres_vec, has_genres = self._build_genres_vector(user_id, user_genres_df)
-
-        if has_genres and np.linalg.norm(genres_vec) > 0:
-            genres_vec = genres_vec / (np.linalg.norm(genres_vec) + 1e-12)
+        return self.build_profile_from_signals(
+            user_id, UserSignals.from_frames(user_id, user_genres_df, user_books_df)
+        )
 
-        read_asins = self._get_read_parent_asins(user_id, user_books_df)
-        read_indices = self._get_book_indices_for_asins(read_asins)
-        has_history = len(read_indices) > 0
+    def build_profile_from_signals(self, user_id: Any, signals: UserSignals) -> np.ndarray:
+        """Build the user profile vector from plain UserSignals (see build_user_profile).
 
-        history_vec = np.zeros(len(GENRE_VOCAB), dtype=float)
-        if has_history:
-            history_mat = self.book_tfidf[read_indices]
-            history_mean = np.asarray(history_mat.mean(axis=0)).reshape(-1)
-            if np.linalg.norm(history_mean) > 0:
-                history_vec = history_mean / (np.linalg.norm(history_mean) + 1e-12)
+        Exceptions:
+            RuntimeError: If recommender artifacts have not been fitted/loaded.
+        """
+        if self.book_tfidf is None:
+            raise RuntimeError("Call fit() before building user profiles.")
 
-        if has_genres and has_history:
-            return 0.7 * genres_vec + 0.3 * history_vec
-        if has_history and not has_genres:
-            return history_vec
-        return genres_vec
+        genres_vec, has_genres = genres_vector(signals.genre_ranks)
+        read_asins = signals.read_asins
+
+        cache = self._user_profile_cache()
+        genres = genre_key(genres_vec) if has_genres else ()
+        fingerprint = cache.fingerprint(read_asins, genres)
+        cache_id = str(user_id)
+        entry = cache.get(cache_id, fingerprint)
+        if entry is None:
+            entry = self._build_profile_entry(
+                cache, cache_id, fingerprint, read_asins, genres, genres_vec, has_genres
+            )
+        return entry.profile.copy()
 
+    def _build_profile_entry(
+        self,
+        cache: UserProfileCache,
+        user_id: str,
+        fingerprint: str,
+        read_asins: frozenset,
+        genres: tuple,
+        genres_vec: np.ndarray,
+        has_genres: bool,
+    ) -> ProfileEntry:
+        """Build and cache a profile, reusing the user's previous library sum when it only grew."""
+        prev = cache.previous(user_id)
+        incremental = (
+            prev is not None
+            and prev.genre_key == genres
+            and prev.read_asins <= read_asins
+        )
+        if incremental:
+            added = self._get_book_indices_for_asins(read_asins - prev.read_asins)
+            history_sum = prev.history_sum.copy()
+            if added:
+                history_sum += np.asarray(self.book_tfidf[added].sum(axis=0), dtype=float).reshape(-1)
+            history_count = prev.history_count + len(added)
+        else:
+            read_indices = self._get_book_indices_for_asins(read_asins)
+            history_sum = np.zeros(self.book_tfidf.shape[1], dtype=float)
+            if read_indices:
+                history_sum += np.asarray(
+                    self.book_tfidf[read_indices].sum(axis=0), dtype=float
+                ).reshape(-1)
+            history_count = len(read_indices)
+
+        entry = ProfileEntry(
+            fingerprint=fingerprint,
+            read_asins=read_asins,
+            genre_key=genres,
+            history_sum=history_sum,
+            history_count=history_count,
+            profile=blend_profile(genres_vec, has_genres, history_sum, history_count),
+        )
+        cache.put(user_id, entry, incremental=incremental)
+        return entry
+
+    def _user_profile_cache(self) -> UserProfileCache:
+        """Return the profile cache for the loaded artifacts (new artifacts -> new cache)."""
+        cache = self._derived.profile_cache
+        if cache is None or not self._derived_is_current("profile_cache"):
+            cache = UserProfileCache(self.profile_cache_size)
+            self._derived.profile_cache = cache
+            self._derived.keys["profile_cache"] = self._artifacts_key()
+        return cache
+
+    @instrumented()
     def recommend(
         self,
         user_id: str,
@@ -605,46 +528,94 @@ class ContentBasedBookRecommender:
         Returns:
             list[dict[str, Any]]: Ranked recommendation payloads.
 
+        Exceptions:
+            RuntimeError: If recommender artifacts are not loaded.
+        """
+        return self.recommend_from_signals(
+            user_id,
+            UserSignals.from_frames(user_id, user_genres_df, user_books_df),
+            top_k=top_k,
+        )
+
+    def recommend_from_signals(
+        self,
+        user_id: str,
+        signals: UserSignals,
+        top_k: int = 40,
+    ) -> List[Dict[str, Any]]:
+        """Generate top-K recommendations from plain UserSignals (no DataFrames).
+
+        Not instrumented: recommend() and recommend_for_user() time each request once.
+
+        Args:
+            user_id: User identifier (profile cache key).
+            signals: The user's library ASINs and ranked genre preferences.
+            top_k: Number of recommendations to return.
+
+        Returns:
+            list[dict[str, Any]]: Ranked recommendation payloads.
+
         Exceptions:
             RuntimeError: If recommender artifacts are not loaded.
         """
         if self.book_tfidf is None:
             raise RuntimeError("Call fit() before calling recommend().")
 
-        read_asins = self._get_read_parent_asins(user_id, user_books_df)
+        read_asins = signals.read_asins
         n_books = self.book_tfidf.shape[0]
+        cold_start = signals.is_cold_start
+
+        k = int(top_k) if top_k is not None else 40
+        k = max(1, k)
+        bucket_hit = self._lookup_genre_bucket(signals, k)
+        if bucket_hit is not None:
+            return self._format_recommendations(*bucket_hit)
 
         if self.books_df is not None:
-            books_df = self.books_df
-            exclude_mask = books_df["parent_asin"].astype(str).isin(
-                {str(a) for a in read_asins}
+            rating_norm = self.books_df["average_rating_norm"].to_numpy(dtype=float)
+            rating_number_norm = self.books_df["rating_number_norm"].to_numpy(dtype=float)
+        else:
+            rating_norm = self._rating_norms["average_rating"]
+            rating_number_norm = self._rating_norms["rating_number"]
+        if rating_norm is None or rating_number_norm is None:
+            raise RuntimeError("Rating norms not loaded.")
+
+        profile: Optional[np.ndarray] = None
+        # pool_idx: global row indices being scored (None = the whole catalog).
+        pool_idx: Optional[np.ndarray] = None
+        if not cold_start:
+            profile = self.build_profile_from_signals(user_id, signals)
+            pool_idx = self._candidate_pool(
+                profile, rating_norm, rating_number_norm, read_asins, top_k=k
+            )
+
+        if self.compact and pool_idx is None and self.books_df is None:
+            return self._format_recommendations(
+                *self._score_compact(profile, read_asins, k)
             )
-            rating_norm = books_df["average_rating_norm"].to_numpy(dtype=float)
-            rating_number_norm = books_df["rating_number_norm"].to_numpy(dtype=float)
+
+        if self.books_df is not None:
+            exclude_mask = self.books_df["parent_asin"].astype(str).isin(
+                {str(a) for a in read_asins}
+            ).to_numpy()
         else:
             exclude_mask = np.zeros(n_books, dtype=bool)
             for asin in read_asins:
                 idx = self.book_id_to_idx.get(str(asin))
                 if idx is not None:
                     exclude_mask[idx] = True
-            rating_norm = self._rating_norms["average_rating"]
-            rating_number_norm = self._rating_norms["rating_number"]
-        if rating_norm is None or rating_number_norm is None:
-            raise RuntimeError("Rating norms not loaded.")
 
-        cold_start = self._is_cold_start(user_id, user_genres_df, user_books_df)
-
-        if cold_start:
+        if profile is None:
             scores = 0.7 * rating_norm + 0.3 * rating_number_norm
         else:
-            profile = self.build_user_profile(
-                user_id=user_id,
-                user_genres_df=user_genres_df if user_genres_df is not None else pd.DataFrame(),
-                user_books_df=user_books_df if user_books_df is not None else pd.DataFrame(),
+            if pool_idx is not None:
+                exclude_mask = exclude_mask[pool_idx]
+                rating_norm = rating_norm[pool_idx]
+                rating_number_norm = rating_number_norm[pool_idx]
+            sim = _cosine_similarity_to_rows(
+                profile,
+                self.book_tfidf if pool_idx is None else self.book_tfidf[pool_idx],
             )
-            sim = cosine_similarity(
-                profile.reshape(1, -1), self.book_tfidf
-            ).reshape(-1)
             if len(read_asins) > 0:
                 sim = sim * 1.5
             scores = (
@@ -655,8 +626,6 @@ class ContentBasedBookRecommender:
 
         scores = np.where(exclude_mask, -np.inf, scores)
 
-        k = int(top_k) if top_k is not None else 40
-        k = max(1, k)
         candidate_idx = np.where(np.isfinite(scores))[0]
         if candidate_idx.size == 0:
             return []
@@ -664,11 +633,95 @@ class ContentBasedBookRecommender:
         candidate_scores = scores[candidate_idx]
         top_local = np.argpartition(-candidate_scores, kth=k - 1)[:k]
         top_local = top_local[np.argsort(-candidate_scores[top_local])]
-        top_idx = candidate_idx[top_local]
+        top_pos = candidate_idx[top_local]
+        top_idx = top_pos if pool_idx is None else pool_idx[top_pos]
+        return self._format_recommendations(top_idx, scores[top_pos])
+
+    def _score_compact(
+        self,
+        profile: Optional[np.ndarray],
+        read_asins: Sequence[str],
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score the full catalog in float32 (see CompactState.top_k).
+
+        Same scores as the float64 path to float32 precision.
+        """
+        similarity_weight = self.weights.genre_similarity * (1.5 if len(read_asins) > 0 else 1.0)
+        excluded = self._get_book_indices_for_asins(read_asins)
+        return self._compact_state().top_k(profile, similarity_weight, excluded, top_k)
+
+    def _compact_state(self) -> CompactState:
+        """Return the float32 scoring state, built once per artifact set."""
+        state = self._derived.compact_state
+        if state is None or not self._derived_is_current("compact_state"):
+            state = CompactState.build(
+                self.book_tfidf,
+                self._rating_norms["average_rating"],
+                self._rating_norms["rating_number"],
+                (self.weights.average_rating, self.weights.rating_number_popularity),
+            )
+            self._derived.compact_state = state
+            self._derived.keys["compact_state"] = self._artifacts_key()
+        return state
+
+    def _artifacts_key(self) -> tuple:
+        """Identity of the loaded artifacts plus weights, for keying derived structures."""
+        return (
+            self.book_tfidf,
+            self.books_df,
+            self._rating_norms["average_rating"],
+            self._rating_norms["rating_number"],
+            self.weights,
+        )
+
+    def _derived_is_current(self, name: str) -> bool:
+        """Return True if self._derived.<name> was built from the currently loaded artifacts.
+
+        Artifacts are compared by identity (the key holds the objects themselves,
+        so a garbage-collected matrix can never alias a freshly loaded one);
+        weights are compared by value.
+        """
+        cached = self._derived.keys.get(name)
+        if cached is None:
+            return False
+        current = self._artifacts_key()
+        return (
+            all(a is b for a, b in zip(cached[:-1], current[:-1]))
+            and cached[-1] == current[-1]
+        )
 
+    def _lookup_genre_bucket(
+        self,
+        signals: UserSignals,
+        top_k: int,
+    ) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """Return precomputed (indices, scores) for users with no library, else None.
+
+        Only users whose profile is their genre preferences alone (or the
+        cold-start blend) can be answered from the table; anyone with books in
+        their library is scored normally.
+        """
+        buckets = self.genre_buckets
+        if buckets is None or signals.read_asins:
+            return None
+        genres_vec, has_genres = genres_vector(signals.genre_ranks)
+        if not has_genres and not signals.is_cold_start:
+            return None
+        return buckets.lookup_genres(
+            genres_vec if has_genres else None, self.weights, self.book_tfidf.shape[0], top_k
+        )
+
+    def _format_recommendations(
+        self,
+        top_idx: np.ndarray,
+        top_scores: np.ndarray,
+    ) -> List[Dict[str, Any]]:
+        """Turn ranked catalog row indices and scores into recommendation payloads."""
         if self.books_df is not None:
+            pd = importlib.import_module("pandas")  # Already loaded: books_df is a DataFrame.
             out = []
-            for i in top_idx.tolist():
+            for i, score in zip(top_idx.tolist(), top_scores.tolist()):
                 row = self.books_df.iloc[int(i)]
                 categories_list = row.get("categories_list", [])
                 if not isinstance(categories_list, list):
@@ -689,19 +742,16 @@ class ContentBasedBookRecommender:
                     "rating_number": int(row.get("rating_number") or 0),
                     "images": None if pd.isna(row.get("images")) else row.get("images"),
                     "categories": [str(x) for x in categories_list],
-                    "score": float(scores[int(i)]),
+                    "score": float(score),
                 })
             return out
 
-        idx_to_asin = [None] * n_books
-        for asin, idx in (self.book_id_to_idx or {}).items():
-            if 0 <= idx < n_books:
-                idx_to_asin[idx] = asin
+        idx_to_asin = self._idx_to_asin()
         asins = [idx_to_asin[i] for i in top_idx.tolist() if idx_to_asin[i]]
         metadata_list = self._fetch_metadata_for_asins(asins)
         meta_by_asin = {str(m.get("parent_asin", "")): m for m in metadata_list}
         out = []
-        for i in top_idx.tolist():
+        for i, score in zip(top_idx.tolist(), top_scores.tolist()):
             asin_str = idx_to_asin[i] if i < len(idx_to_asin) else ""
             m = meta_by_asin.get(asin_str) or {}
             cats = m.get("categories_list") or m.get("categories") or []
@@ -716,10 +766,66 @@ class ContentBasedBookRecommender:
                 "rating_number": int(m.get("rating_number") or 0),
                 "images": m.get("images"),
                 "categories": [str(x) for x in cats],
-                "score": float(scores[int(i)]),
+                "score": float(score),
             })
         return out
 
+    def _idx_to_asin(self) -> List[Optional[str]]:
+        """Return the row index -> parent_asin list, rebuilt only when the mapping changes."""
+        n_books = self.book_tfidf.shape[0] if self.book_tfidf is not None else 0
+        key = (self.book_id_to_idx, len(self.book_id_to_idx or {}), n_books)
+        cached_key = self._derived.keys.get("idx_to_asin")
+        idx_to_asin = self._derived.idx_to_asin
+        if (
+            idx_to_asin is not None
+            and cached_key is not None
+            and cached_key[0] is key[0]
+            and cached_key[1:] == key[1:]
+        ):
+            return idx_to_asin
+        idx_to_asin = [None] * n_books
+        for asin, idx in (self.book_id_to_idx or {}).items():
+            if 0 <= idx < n_books:
+                idx_to_asin[idx] = asin
+        self._derived.idx_to_asin = idx_to_asin
+        self._derived.keys["idx_to_asin"] = key
+        return idx_to_asin
+
+    def _candidate_pool(
+        self,
+        profile: np.ndarray,
+        rating_norm: np.ndarray,
+        rating_number_norm: np.ndarray,
+        read_asins: FrozenSet[str],
+        top_k: int,
+    ) -> Optional[np.ndarray]:
+        """Return candidate row indices for large catalogs, or None to score everything.
+
+        The pool always contains the exhaustive top_k (see candidate_index.py).
+        The index is keyed on the artifacts it was built from, so reloading
+        them (fit()) transparently rebuilds it.
+        """
+        n_books = self.book_tfidf.shape[0]
+        if n_books < max(1, self.candidate_index_min_books) or n_books <= self.candidate_pool_size:
+            return None
+        index = self._derived.candidate_index
+        if index is None or not self._derived_is_current("candidate_index"):
+            prior = (
+                self.weights.average_rating * np.asarray(rating_norm, dtype=float)
+                + self.weights.rating_number_popularity * np.asarray(rating_number_norm, dtype=float)
+            )
+            index = GenreCandidateIndex(self.book_tfidf, prior)
+            self._derived.candidate_index = index
+            self._derived.keys["candidate_index"] = self._artifacts_key()
+        return index.candidates(
+            profile,
+            self.weights.genre_similarity * (1.5 if len(read_asins) > 0 else 1.0),
+            top_k,
+            exclude=self._get_book_indices_for_asins(read_asins),
+            pool_size=self.candidate_pool_size,
+        )
+
+    @instrumented()
     def recommend_for_user(
         self,
         user_email: str,
@@ -741,37 +847,9 @@ class ContentBasedBookRecommender:
         Exceptions:
             RuntimeError: Propagated if underlying recommend() is not initialized.
         """
-        library = user_account.get("library") or {}
-        finished = library.get("finished") or []
-        saved = library.get("saved") or []
-        in_progress = library.get("in_progress") or []
-        finished_ids = list(dict.fromkeys(finished + saved + in_progress))
-
-        if finished_ids:
-            user_books_df = pd.DataFrame(
-                {
-                    "user_id": [user_email] * len(finished_ids),
-                    "parent_asin": list(finished_ids),
-                }
-            )
-        else:
-            user_books_df = None
-
-        if user_genres:
-            genres_df = pd.DataFrame(
-                {
-                    "user_id": [user_email] * len(user_genres),
-                    "genre": [g.get("genre") for g in user_genres],
-                    "rank": [g.get("rank") for g in user_genres],
-                }
-            )
-        else:
-            genres_df = None
-
-        return self.recommend(
-            user_id=user_email,
-            user_genres_df=genres_df,
-            user_books_df=user_books_df,
+        return self.recommend_from_signals(
+            user_email,
+            UserSignals.from_account(user_account, user_genres),
             top_k=top_k,
         )
 
@@ -779,6 +857,7 @@ class ContentBasedBookRecommender:
 class _FallbackBookRecommender:
     """When books.db is missing: return top 50 from reviews JSON (exclude owned)."""
 
+    @instrumented()
     def recommend(
         self,
         user_book_ids: List[str],
@@ -799,11 +878,8 @@ class _FallbackBookRecommender:
         store = backend_storage.get_storage()
         books = store.get_top50_review_books() or []
         owned = {str(b) for b in (user_book_ids or [])}
-        books = [
-            b for b in books
-            if str(b.get("parent_asin", "")) not in owned
-        ]
-        return list(books)[: max(0, top_k)]
+        books = [b for b in books if str(b.get("parent_asin", "")) not in owned]
+        return books[: max(0, top_k)]
 
     def recommend_for_user(
         self,
@@ -812,7 +888,7 @@ class _FallbackBookRecommender:
         user_genres: Optional[List[Dict[str, Any]]],
         top_k: int = 40,
     ) -> List[Dict[str, Any]]:
-        """Fallback wrapper using user library shelves as exclusion history.
+        """Fallback wrapper using user library shelves as exclusion history (timed by recommend()).
 
         Args:
             user_email: User identifier/email (unused but kept for parity).
@@ -857,7 +933,11 @@ def _get_recommender() -> tuple[Any, bool]:
 
 
 class BookRecommender(ContentBasedBookRecommender):
-    """Compatibility recommender supporting both legacy and content-based call styles."""
+    """Compatibility recommender supporting both legacy and content-based call styles.
+
+    Its methods only dispatch, so they are not instrumented: the recommender
+    they reach records the request.
+    """
 
     def __init__(self) -> None:
         """Initialize a content-based instance plus a lazy legacy delegate."""
@@ -10,30 +10,94 @@ All required data is loaded at initialization for fast queries.
 
 import os
 import json
-import sqlite3
+import hashlib
+import importlib
 import numpy as np
-import joblib
 from scipy.sparse import load_npz
 
 from data.scripts.config import PROCESSED_DIR
 from backend.recommender.config import RECOMMENDER_DIR
+from backend.recommender.compact import SCORE_DTYPE, as_compact_csr
+from backend import books_db, config
+from backend.recommender.artifact_cache import local_or_cached
+from backend.instrumentation import instrumented
 from backend.storage import LocalStorage
 
 MODEL_FILE = os.path.join(RECOMMENDER_DIR, "book_recommender_model.pkl")
 MODEL_SCALER_FILE = os.path.join(RECOMMENDER_DIR, "feature_scaler.pkl")
+# Plain-numpy copy of the fitted coefficients and scaler scales (written at fit time),
+# so loading the model does not unpickle sklearn objects. Not committed: it records
+# the digest of the pickles it was made from and is ignored when they change.
+MODEL_COEF_FILE = os.path.join(RECOMMENDER_DIR, "book_recommender_coef.npz")
 
 BOOK_SIM_FILE = os.path.join(PROCESSED_DIR, "book_similarity.npz")
 BOOK_RATINGS_FILE = os.path.join(PROCESSED_DIR, "book_ratings.npz")
 BOOK_ID_MAP_FILE = os.path.join(PROCESSED_DIR, "book_id_to_idx.json")
 BOOK_DB = os.path.join(PROCESSED_DIR, "books.db")
 
-def load_recommender_artifacts(model_file, scaler_file, sim_file, ratings_file, id_map_file):
-    """Load model artifacts and book data required for recommendation."""
+def model_files_digest(model_file, scaler_file):
+    """Return the sha256 of the model and scaler pickles, or None if either is missing."""
+    digest = hashlib.sha256()
+    for path in (model_file, scaler_file):
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except (OSError, TypeError):
+            return None
+    return digest.hexdigest()
+
+
+def save_scaled_coefficients(coef_file, coef, scale, model_file, scaler_file):
+    """Write the numpy coefficient file, stamped with the digest of the pickles it mirrors."""
+    np.savez(
+        coef_file,
+        coef=np.asarray(coef),
+        scale=np.asarray(scale),
+        source=np.array(model_files_digest(model_file, scaler_file) or ""),
+    )
+
+
+def coef_file_is_current(coef_file, model_file, scaler_file):
+    """True when coef_file exists and was written from these model/scaler pickles."""
+    if not coef_file or not os.path.exists(coef_file):
+        return False
+    digest = model_files_digest(model_file, scaler_file)
+    if digest is None:
+        return False
+    try:
+        with np.load(coef_file) as data:
+            return "source" in data.files and str(data["source"]) == digest
+    except (OSError, ValueError):
+        return False
+
+
+def load_scaled_coefficients(model_file, scaler_file, coef_file=None):
+    """Return the logistic coefficients divided by the feature scaler's scales.
+
+    Reads coef_file (numpy only) when it was written from the current pickles;
+    otherwise unpickles the sklearn model and scaler, which imports joblib and
+    sklearn, and rewrites coef_file so the next start can skip them.
+    """
+    if coef_file_is_current(coef_file, model_file, scaler_file):
+        with np.load(coef_file) as data:
+            return data["coef"] / data["scale"]
+    joblib = importlib.import_module("joblib")
     clf = joblib.load(model_file)
-    beta = clf.coef_[0]
     scaler = joblib.load(scaler_file)
-    beta_scaled = beta / scaler.scale_
-    book_similarity = load_npz(sim_file).tocsr()
+    if coef_file:
+        try:
+            save_scaled_coefficients(coef_file, clf.coef_[0], scaler.scale_, model_file, scaler_file)
+        except OSError:
+            pass
+    return clf.coef_[0] / scaler.scale_
+
+
+def load_recommender_artifacts(
+    model_file, scaler_file, sim_file, ratings_file, id_map_file, coef_file=None
+):
+    """Load model artifacts and book data required for recommendation."""
+    beta_scaled = load_scaled_coefficients(model_file, scaler_file, coef_file).astype(SCORE_DTYPE)
+    book_similarity = as_compact_csr(load_npz(sim_file))
     ratings = np.load(ratings_file)
     avg_ratings = ratings["ratings_avg"].astype(np.float32)
     num_ratings = ratings["log_number_ratings"].astype(np.float32)
@@ -43,6 +107,31 @@ def load_recommender_artifacts(model_file, scaler_file, sim_file, ratings_file,
     idx_to_book_id = {v: k for k, v in book_id_to_idx.items()}
     return beta_scaled, book_similarity, popularity_score, book_id_to_idx, idx_to_book_id
 
+def artifact_files():
+    """Return the artifact paths for load_recommender_artifacts.
+
+    Files missing locally are fetched from S3 in AWS mode (BOOK_*_S3_KEY) through
+    the local artifact cache, the model/scaler pickles included, so the numpy
+    coefficient file can be checked against them.
+    """
+    wanted = {
+        BOOK_SIM_FILE: config.BOOK_SIMILARITY_S3_KEY,
+        BOOK_RATINGS_FILE: config.BOOK_RATINGS_S3_KEY,
+        BOOK_ID_MAP_FILE: config.BOOK_ID_TO_IDX_S3_KEY,
+        MODEL_FILE: config.BOOK_RECOMMENDER_MODEL_S3_KEY,
+        MODEL_SCALER_FILE: config.BOOK_RECOMMENDER_SCALER_S3_KEY,
+    }
+    paths = local_or_cached(wanted)
+    return (
+        paths[MODEL_FILE],
+        paths[MODEL_SCALER_FILE],
+        paths[BOOK_SIM_FILE],
+        paths[BOOK_RATINGS_FILE],
+        paths[BOOK_ID_MAP_FILE],
+        MODEL_COEF_FILE,
+    )
+
+
 class BookRecommender:
     """
     Book recommender used by the backend API.
@@ -51,24 +140,35 @@ class BookRecommender:
     to allow fast recommendation queries.
     """
 
-    def __init__(self):
+    def __init__(self, artifacts=None, storage=None):
         """
         Load model artifacts and book data required for recommendation.
 
         Loads the trained logistic regression model, feature scaler,
         book similarity matrix, rating statistics, and book ID mappings.
         Also initializes access to user storage.
+
+        Parameters
+        artifacts : tuple, optional
+            (beta_scaled, book_similarity, popularity_score, book_id_to_idx,
+            idx_to_book_id) as returned by load_recommender_artifacts; loaded
+            from artifact_files() when omitted.
+        storage : object, optional
+            User storage (get_user_books); LocalStorage() when omitted.
         """
+        if artifacts is None:
+            artifacts = load_recommender_artifacts(*artifact_files())
         (self.beta_scaled,
          self.book_similarity,
          self.popularity_score,
          self.book_id_to_idx,
          self.idx_to_book_id,
-         ) = load_recommender_artifacts(
-             MODEL_FILE, MODEL_SCALER_FILE, BOOK_SIM_FILE, BOOK_RATINGS_FILE, BOOK_ID_MAP_FILE
-             )
-        self.storage = LocalStorage()
+         ) = artifacts
+        self.storage = storage if storage is not None else LocalStorage()
+        # (popularity, beta, beta[1], prior, order) built by _prior_order on first use.
+        self._prior_cache = None
 
+    @instrumented()
     def recommend(self, user_id: str, top_k: int = 50):
         """
         Generate top-k book recommendations for a given user.
@@ -95,68 +195,87 @@ class BookRecommender:
         ]
 
         book_indices = np.array(book_indices, dtype=np.int32)
-        lib_size = len(book_indices)
 
-        if lib_size > 0:
-            sim = self.book_similarity[book_indices].sum(axis=0).A1
-            sim /= lib_size
-        else:
-            sim = np.zeros(len(self.popularity_score), dtype=np.float32)
+        top_idx = self._score_sparse_first(book_indices, top_k)
 
-        log_lib_size = np.log1p(lib_size)
+        book_ids = [self.idx_to_book_id[i] for i in top_idx.tolist()]
 
-        beta = self.beta_scaled
+        return self.fetch_books(book_ids)
 
-        scores = (
-            beta[0] * sim +
-            beta[1] * self.popularity_score +
-            beta[2] * np.log1p(sim * log_lib_size)
-        )
+    def _prior_order(self):
+        """Return (prior, order): popularity-only scores and finite books sorted best first.
 
+        prior is beta[1] * popularity (the whole score of a book with zero
+        similarity to the library); order breaks ties by catalog index like
+        top_k_inplace. Rebuilt only when the artifacts or coefficients change.
+        """
+        beta1 = float(self.beta_scaled[1])
+        cached = self._prior_cache
+        # The entry holds the arrays themselves, so a recycled id() can never match.
+        if (
+            cached is not None
+            and cached[0] is self.popularity_score
+            and cached[1] is self.beta_scaled
+            and cached[2] == beta1
+        ):
+            return cached[3], cached[4]
+        prior = np.multiply(self.popularity_score, SCORE_DTYPE(beta1), dtype=SCORE_DTYPE)
+        order = np.argsort(-prior, kind="stable").astype(np.int32)
+        order = order[np.isfinite(prior[order])]
+        self._prior_cache = (self.popularity_score, self.beta_scaled, beta1, prior, order)
+        return prior, order
+
+    def _score_sparse_first(self, book_indices, top_k):
+        """Top-k book indices, scoring only the library's neighbour columns exactly.
+
+        Books with no stored similarity to the library score beta[1] * popularity,
+        so the best of them are a prefix of the precomputed prior order; the
+        candidates are those neighbour columns plus that prefix. Same scores and
+        tie order as scoring every book, but the work is proportional to the
+        neighbour count and top_k instead of the catalog size.
+        """
+        beta = self.beta_scaled
+        prior, order = self._prior_order()
+        lib_size = len(book_indices)
+
+        cand = np.empty(0, dtype=np.int32)
+        cand_scores = np.empty(0, dtype=SCORE_DTYPE)
         if lib_size > 0:
-            scores[book_indices] = -np.inf
+            neighbours = self.book_similarity[book_indices]
+            cand, inverse = np.unique(neighbours.indices, return_inverse=True)
+            cand = cand.astype(np.int32, copy=False)
+            # Mean similarity to the library; float32 accumulation in stored order.
+            sim = np.zeros(cand.shape[0], dtype=SCORE_DTYPE)
+            np.add.at(sim, inverse, neighbours.data.astype(SCORE_DTYPE, copy=False))
+            np.multiply(sim, SCORE_DTYPE(1.0 / lib_size), out=sim)
 
-        top_idx = np.argpartition(scores, -top_k)[-top_k:]
-        top_idx = top_idx[np.argsort(scores[top_idx])[::-1]]
+            cand_scores = prior[cand].copy()
+            cand_scores += sim * SCORE_DTYPE(beta[0])
+            work = np.log1p(sim * SCORE_DTYPE(np.log1p(lib_size)))
+            cand_scores += work * SCORE_DTYPE(beta[2])
+            cand_scores[np.isin(cand, book_indices)] = -np.inf
+            keep = np.isfinite(cand_scores)
+            cand, cand_scores = cand[keep], cand_scores[keep]
 
-        book_ids = [self.idx_to_book_id[i] for i in top_idx]
+        # Zero-similarity tail: the first top_k books in prior order that are
+        # neither neighbours nor in the library.
+        head = order[: top_k + lib_size + cand.shape[0]]
+        taken = np.isin(head, cand) | np.isin(head, book_indices)
+        tail = head[~taken][:top_k]
 
-        return self.fetch_books(book_ids)
+        all_idx = np.concatenate([cand, tail])
+        all_scores = np.concatenate([cand_scores, prior[tail]])
+        # Best score first, ties by catalog index (as top_k_inplace).
+        best = np.lexsort((all_idx, -all_scores))[:top_k]
+        return all_idx[best]
 
     def fetch_books(self, book_ids):
         """
-        Query books.db to retrieve metadata for recommended books.
+        Query books.db to retrieve metadata for recommended books, in rank order.
         """
 
         if not book_ids:
             return []
 
-        placeholders = ",".join(["?"] * len(book_ids))
-
-        query = f"""
-        SELECT
-            parent_asin,
-            title,
-            author_name,
-            average_rating,
-            rating_number,
-            images,
-            categories
-        FROM books
-        WHERE parent_asin IN ({placeholders})
-        """
-
-        with sqlite3.connect(BOOK_DB) as conn:
-            rows = conn.execute(query, book_ids).fetchall()
-
-        columns = [
-            "parent_asin",
-            "title",
-            "author_name",
-            "average_rating",
-            "rating_number",
-            "images",
-            "categories",
-        ]
-
-        return [dict(zip(columns, r)) for r in rows]
+        rows = books_db.fetch_many(BOOK_DB, book_ids, books_db.METADATA_COLUMNS)
+        return [dict(r) for r in rows]
@@ -40,6 +40,7 @@ import joblib
 
 from data.scripts.config import PROCESSED_DIR
 from backend.recommender.config import RECOMMENDER_DIR
+from backend.recommender.book_recommender_backend import save_scaled_coefficients
 
 np.random.seed(42)
 
@@ -226,10 +227,12 @@ def train_logistic_model(
     book_avg_ratings_vector,
     book_number_ratings_vector,
     batch_size=10000,
-    n_neg=5
+    n_neg=5,
+    output_coef_file=None
 ):
     """
-    Train logistic regression model and save model + scaler.
+    Train logistic regression model and save model + scaler
+    (and, with output_coef_file, their coefficients as a numpy .npz).
     """
 
     x_train, y_train = build_training_set(
@@ -253,6 +256,11 @@ def train_logistic_model(
 
     joblib.dump(clf, output_model_file)
     joblib.dump(scaler, output_scaler_file)
+    if output_coef_file:
+        # Numpy-only copy for serving (book_recommender_backend.load_scaled_coefficients).
+        save_scaled_coefficients(
+            output_coef_file, clf.coef_[0], scaler.scale_, output_model_file, output_scaler_file
+        )
 
     return clf, scaler
 
@@ -264,6 +272,7 @@ def main():
 
     output_model_file = os.path.join(RECOMMENDER_DIR, "book_recommender_model.pkl")
     output_model_scaler_file = os.path.join(RECOMMENDER_DIR, "feature_scaler.pkl")
+    output_coef_file = os.path.join(RECOMMENDER_DIR, "book_recommender_coef.npz")
 
     npzfile = np.load(os.path.join(PROCESSED_DIR, "book_ratings.npz"))
     book_avg_ratings_vector = npzfile["ratings_avg"]
@@ -283,7 +292,8 @@ def main():
             book_similarity_matrix=book_similarity_matrix,
             book_avg_ratings_vector=book_avg_ratings_vector,
             book_number_ratings_vector=book_num_ratings_vector,
-            n_neg=20
+            n_neg=20,
+            output_coef_file=output_coef_file
             )
 
 
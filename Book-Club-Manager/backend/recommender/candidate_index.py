@@ -0,0 +1,165 @@
+"""Candidate-generation index for the content-based book recommender.
+
+A book's score is
+
+    prior[i] + scale * cos(profile, row_i) = prior[i] + scale * (p . u_i)
+
+with u_i the unit-normalized TF-IDF row and p the unit profile. The TF-IDF
+space is the fixed 25-term GENRE_VOCAB, so books fall into a modest number of
+groups by genre support (the set of terms they carry). Within a group g, by
+Cauchy-Schwarz and the per-term maxima m_g of the group's unit rows,
+
+    p . u_i <= min(|p restricted to g's terms|, p . m_g) = c_g / scale,
+
+so every book of the group scores at most prior[i] + c_g. GenreCandidateIndex
+keeps each group's books sorted by prior. A query scores a small seed set
+exactly (the head of the global prior order and the head of the most promising
+groups) to get a lower bound on the k-th best score, then keeps, per group,
+only the prefix of books whose prior + c_g can still reach it. Every book left
+out scores below the k-th best, so the pool always contains the exact top-k
+(the recommender rescores the pool); ties at the k-th score may resolve to
+either book, as they may in exhaustive scoring.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+from scipy import sparse
+
+# Term supports are packed into uint64 bit masks.
+_MAX_TERMS = 64
+
+
+class GenreCandidateIndex:
+    """Books grouped by genre support, sorted by a static prior within each group."""
+
+    def __init__(self, book_tfidf: sparse.spmatrix, prior: np.ndarray) -> None:
+        """Build the groups from a (n_books x n_terms) TF-IDF matrix.
+
+        Args:
+            book_tfidf: Sparse non-negative TF-IDF matrix aligned with GENRE_VOCAB columns.
+            prior: Per-book score that does not depend on the user profile.
+
+        Exceptions:
+            ValueError: If prior length does not match the number of books, or
+                the matrix has more than 64 terms.
+        """
+        n_books, n_terms = book_tfidf.shape
+        prior = np.asarray(prior, dtype=float).reshape(-1)
+        if prior.shape[0] != n_books:
+            raise ValueError(
+                f"prior has {prior.shape[0]} entries; expected {n_books} books"
+            )
+        if n_terms > _MAX_TERMS:
+            raise ValueError(f"at most {_MAX_TERMS} terms are supported; got {n_terms}")
+        csr = sparse.csr_matrix(book_tfidf, dtype=float)
+        csr.eliminate_zeros()
+        csr.sort_indices()
+        row_norms = np.sqrt(np.asarray(csr.multiply(csr).sum(axis=1)).reshape(-1))
+        inv_norms = np.divide(1.0, row_norms, out=np.zeros_like(row_norms), where=row_norms > 0)
+        unit = sparse.csr_matrix(sparse.diags(inv_norms) @ csr)
+        nnz_rows = np.repeat(np.arange(n_books), np.diff(unit.indptr))
+
+        masks = np.zeros(n_books, dtype=np.uint64)
+        np.bitwise_or.at(masks, nnz_rows, np.left_shift(np.uint64(1), unit.indices.astype(np.uint64)))
+        group_masks, group_of = np.unique(masks, return_inverse=True)
+        n_groups = group_masks.shape[0]
+
+        self.prior = prior
+        self._unit = unit
+        # Global ordering of every book by prior (descending, stable on index).
+        self.prior_order = np.argsort(-prior, kind="stable").astype(np.int32)
+        # Books sorted by (group, prior descending); group g is books[starts[g]:starts[g + 1]].
+        order = np.lexsort((np.arange(n_books), -prior, group_of))
+        self._books = order.astype(np.int32)
+        self._neg_prior = -prior[order]
+        self._starts = np.concatenate(([0], np.cumsum(np.bincount(group_of, minlength=n_groups))))
+        # Largest unit weight per (group, term); positive exactly on the group's support.
+        self._term_max = np.zeros((n_groups, n_terms))
+        np.maximum.at(self._term_max, (group_of[nnz_rows], unit.indices), unit.data)
+
+    @property
+    def n_books(self) -> int:
+        """Number of books in the catalog."""
+        return int(self._unit.shape[0])
+
+    @property
+    def n_terms(self) -> int:
+        """Number of TF-IDF terms."""
+        return int(self._unit.shape[1])
+
+    @property
+    def n_groups(self) -> int:
+        """Number of distinct genre supports."""
+        return int(self._term_max.shape[0])
+
+    def group_bounds(self, profile: np.ndarray, scale: float) -> np.ndarray:
+        """Return c_g: the most that scale * cosine can add for any book of each group."""
+        profile = np.asarray(profile, dtype=float).reshape(-1)
+        norm = float(np.linalg.norm(profile))
+        if norm <= 0 or scale <= 0:
+            return np.zeros(self.n_groups)
+        unit_profile = np.maximum(profile, 0.0) / norm
+        support_norm = np.sqrt((self._term_max > 0) @ (unit_profile * unit_profile))
+        return float(scale) * np.minimum(support_norm, self._term_max @ unit_profile)
+
+    def candidates(
+        self,
+        profile: np.ndarray,
+        scale: float,
+        top_k: int,
+        exclude: Iterable[int] = (),
+        pool_size: int = 0,
+    ) -> Optional[np.ndarray]:
+        """Return a sorted candidate pool that contains the exact top-k books.
+
+        Args:
+            profile: Dense user profile aligned with the TF-IDF columns.
+            scale: Weight of the cosine similarity in the score.
+            top_k: Number of books the caller will keep.
+            exclude: Book indices that may not be recommended (the library).
+            pool_size: Seed budget for the k-th score bound, split across the
+                profile's genres (the prior head plus one head per group).
+
+        Returns:
+            np.ndarray | None: int32 book indices in ascending order, or None
+            when the whole catalog must be scored (a negative profile weight,
+            where the bound does not hold, or no pruning possible).
+        """
+        profile = np.asarray(profile, dtype=float).reshape(-1)
+        if np.any(profile < 0):
+            return None
+        norm = float(np.linalg.norm(profile))
+        weights = float(scale) * profile / norm if norm > 0 else np.zeros(self.n_terms)
+        excluded = np.unique(np.asarray(list(exclude), dtype=np.int64))
+        top_k = max(1, int(top_k))
+        seed_size = int(pool_size) // (int(np.count_nonzero(profile)) + 1)
+        seed_size = min(self.n_books, max(seed_size, top_k + excluded.size))
+
+        bounds = self.group_bounds(profile, scale)
+        heads = -self._neg_prior[self._starts[:-1]] + bounds
+        n_best = min(seed_size, heads.shape[0])
+        best_groups = np.argpartition(-heads, n_best - 1)[:n_best]
+        seed = np.unique(
+            np.concatenate((self.prior_order[:seed_size], self._books[self._starts[best_groups]]))
+        )
+        seed_scores = self.prior[seed] + self._unit[seed] @ weights
+        seed_scores = seed_scores[~np.isin(seed, excluded)]
+        if seed_scores.size < top_k:
+            return None
+        kth = np.partition(seed_scores, seed_scores.size - top_k)[seed_scores.size - top_k]
+        # Margin for rounding differences with the recommender's own rescoring.
+        kth -= 1e-9 * max(1.0, abs(kth))
+
+        parts = [seed]
+        for g in np.flatnonzero(heads >= kth).tolist():
+            start, end = int(self._starts[g]), int(self._starts[g + 1])
+            # Books of g with prior >= kth - c_g, i.e. -prior <= c_g - kth.
+            stop = start + int(
+                np.searchsorted(self._neg_prior[start:end], bounds[g] - kth, side="right")
+            )
+            parts.append(self._books[start:stop])
+        pool = np.unique(np.concatenate(parts)).astype(np.int32)
+        return pool if pool.shape[0] < self.n_books else None
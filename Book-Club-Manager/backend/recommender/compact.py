@@ -0,0 +1,187 @@
+"""Compact (float32 / int32) scoring helpers shared by the book recommenders.
+
+Full-catalog scoring touches every book on every request, so on a 1M-book
+catalog each float64 temporary is 8 MB of memory traffic. These helpers keep
+scoring in float32, write into per-thread buffers that are allocated once and
+reused, and select the top-k without materialising full-length index arrays.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+SCORE_DTYPE = np.float32
+INDEX_DTYPE = np.int32
+
+
+class ScoreBuffers(threading.local):  # pylint: disable=too-few-public-methods
+    """Per-thread scratch arrays, reused across requests of the same size."""
+
+    def __init__(self) -> None:
+        """Start each thread with no buffers; they are allocated on first use."""
+        super().__init__()
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str, size: int, dtype=SCORE_DTYPE) -> np.ndarray:
+        """Return this thread's buffer for name, reallocating only if size/dtype changed.
+
+        Contents are whatever the previous request left behind; callers must
+        overwrite (np.copyto / out=) before reading.
+        """
+        arr = self._arrays.get(name)
+        if arr is None or arr.shape[0] != size or arr.dtype != np.dtype(dtype):
+            arr = np.empty(size, dtype=dtype)
+            self._arrays[name] = arr
+        return arr
+
+
+SCORE_BUFFERS = ScoreBuffers()
+
+
+def as_compact_csr(matrix: sparse.spmatrix) -> sparse.csr_matrix:
+    """Return matrix as CSR with float32 data and int32 indices (no copy if already so)."""
+    csr = sparse.csr_matrix(matrix)
+    if csr.dtype != SCORE_DTYPE:
+        csr = csr.astype(SCORE_DTYPE)
+    if csr.indices.dtype != INDEX_DTYPE and csr.nnz < np.iinfo(INDEX_DTYPE).max:
+        csr.indices = csr.indices.astype(INDEX_DTYPE)
+        csr.indptr = csr.indptr.astype(INDEX_DTYPE)
+    return csr
+
+
+def row_normalized_csc(matrix: sparse.spmatrix) -> sparse.csc_matrix:
+    """Return a float32 CSC copy with unit-length rows (zero rows stay zero).
+
+    Column j of the result is the posting list of term j, so a profile dot
+    product only walks the columns where the profile is non-zero.
+    """
+    csr = sparse.csr_matrix(matrix, dtype=SCORE_DTYPE, copy=True)
+    sq = csr.multiply(csr).sum(axis=1)
+    norms = np.sqrt(np.asarray(sq, dtype=SCORE_DTYPE).reshape(-1))
+    inv = np.divide(
+        SCORE_DTYPE(1.0), norms, out=np.zeros_like(norms), where=norms > 0
+    )
+    csr.data *= np.repeat(inv, np.diff(csr.indptr))
+    csc = csr.tocsc()
+    csc.indices = csc.indices.astype(INDEX_DTYPE, copy=False)
+    return csc
+
+
+def add_weighted_columns(
+    out: np.ndarray,
+    csc: sparse.csc_matrix,
+    coefficients: np.ndarray,
+) -> None:
+    """In place: out += csc @ coefficients, visiting only non-zero coefficients.
+
+    Row indices are unique within a CSC column, so a fancy-indexed += is exact.
+    Temporaries are posting-list sized, never catalog sized.
+    """
+    coefficients = np.asarray(coefficients).reshape(-1)
+    for j in np.flatnonzero(coefficients).tolist():
+        start, end = csc.indptr[j], csc.indptr[j + 1]
+        if start == end:
+            continue
+        rows = csc.indices[start:end]
+        out[rows] += csc.data[start:end] * SCORE_DTYPE(coefficients[j])
+
+
+def top_k_inplace(
+    scores: np.ndarray,
+    k: int,
+    work: np.ndarray,
+    mask: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (int32 indices, scores) of the k best finite scores, best first.
+
+    Uses preallocated work (same dtype/size as scores) and mask (bool, same
+    size) so the only per-call allocations are k-sized.
+    """
+    n = scores.shape[0]
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=INDEX_DTYPE), np.empty(0, dtype=scores.dtype)
+    k = min(k, n)
+    np.copyto(work, scores)
+    work.partition(n - k)
+    threshold = work[n - k]
+    if not np.isfinite(threshold):
+        np.isfinite(scores, out=mask)
+    else:
+        np.greater_equal(scores, threshold, out=mask)
+    idx = np.flatnonzero(mask).astype(INDEX_DTYPE, copy=False)
+    selected = scores[idx]
+    # Stable sort on -score keeps ties in catalog order; trim tie overflow.
+    order = np.argsort(-selected, kind="stable")[:k]
+    return idx[order], selected[order]
+
+
+@dataclass(frozen=True)
+class CompactState:
+    """float32 scoring inputs for one artifact set, built once and shared by requests.
+
+    Attributes:
+        prior: average_rating and popularity terms of the personalised score.
+        cold: Cold-start blend (0.7 rating + 0.3 popularity).
+        unit_csc: Unit-row TF-IDF in CSC form (see row_normalized_csc).
+    """
+
+    prior: np.ndarray
+    cold: np.ndarray
+    unit_csc: sparse.csc_matrix
+
+    @classmethod
+    def build(
+        cls,
+        book_tfidf: sparse.spmatrix,
+        rating_norm: np.ndarray,
+        rating_number_norm: np.ndarray,
+        prior_weights: Tuple[float, float],
+    ) -> "CompactState":
+        """Build the state from precomputed artifacts and (rating, popularity) weights."""
+        rating_norm = np.asarray(rating_norm, dtype=SCORE_DTYPE)
+        rating_number_norm = np.asarray(rating_number_norm, dtype=SCORE_DTYPE)
+        prior = np.multiply(rating_norm, SCORE_DTYPE(prior_weights[0]))
+        prior += np.multiply(rating_number_norm, SCORE_DTYPE(prior_weights[1]))
+        cold = np.multiply(rating_norm, SCORE_DTYPE(0.7))
+        cold += np.multiply(rating_number_norm, SCORE_DTYPE(0.3))
+        return cls(prior=prior, cold=cold, unit_csc=row_normalized_csc(book_tfidf))
+
+    def top_k(
+        self,
+        profile: Optional[np.ndarray],
+        similarity_weight: float,
+        excluded: Sequence[int],
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score the full catalog into this thread's buffers and return the k best.
+
+        Scores are the cold-start blend when profile is None, otherwise
+        prior + similarity_weight * cosine(profile, book), with the cosine
+        accumulated only over the profile's non-zero genre columns. Excluded
+        rows never make the top k.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: int32 row indices and float32 scores, best first.
+        """
+        n_books = self.prior.shape[0]
+        scores = SCORE_BUFFERS.get("content_scores", n_books)
+        if profile is None:
+            np.copyto(scores, self.cold)
+        else:
+            np.copyto(scores, self.prior)
+            norm = float(np.linalg.norm(profile))
+            if norm > 0:
+                add_weighted_columns(scores, self.unit_csc, np.multiply(profile, similarity_weight / norm))
+        if excluded:
+            scores[np.asarray(excluded, dtype=INDEX_DTYPE)] = -np.inf
+        return top_k_inplace(
+            scores,
+            k,
+            SCORE_BUFFERS.get("content_work", n_books),
+            SCORE_BUFFERS.get("content_mask", n_books, dtype=bool),
+        )
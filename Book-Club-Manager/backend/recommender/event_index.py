@@ -0,0 +1,146 @@
+"""Columnar index over an event pool for the event recommender.
+
+EventRecommender used to copy every event dict, re-normalize its tags and
+parse its timestamp through datetime on every call. EventIndex does that work
+once per events refresh: start timestamps become one float array and each
+event's tags become a bitmask over the pool's tag vocabulary (one uint64 word
+per 64 distinct tags). Scoring a user is then a popcount of
+`masks & user_mask`, the recency curve evaluated on the timestamp array, and
+an argpartition to find the head of the ranking.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# datetime.fromtimestamp accepts years 1..9999; outside that the old per-event
+# path returned no recency bonus, so those timestamps are treated as missing.
+_MIN_TS = -62135596800.0
+_MAX_TS = 253402300799.0
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        """Per-row number of set bits in a (n, w) uint64 array."""
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+else:  # NumPy < 2.0
+    _BYTE_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        """Per-row number of set bits in a (n, w) uint64 array."""
+        as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape[0], -1)
+        return _BYTE_BITS[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+def _event_time(event: Dict[str, Any]) -> float:
+    """Return the event's ttl / expiry / start_time as float seconds, or NaN."""
+    ts = event.get("ttl") or event.get("expiry") or event.get("start_time")
+    if ts is None:
+        return float("nan")
+    try:
+        value = float(ts)
+    except (TypeError, ValueError):
+        return float("nan")
+    return value if _MIN_TS <= value <= _MAX_TS else float("nan")
+
+
+def recency_bonus(start_ts: np.ndarray, now_ts: float) -> np.ndarray:
+    """Vectorized recency curve (see event_recommender._recency_bonus); NaN -> 0."""
+    days = np.maximum((start_ts - now_ts) / 86400.0, 0.0)
+    out = np.where(
+        days <= 14,
+        3.0 - 0.15 * days,
+        np.where(days <= 45, 0.9 - 0.03 * (days - 14), -0.05 * (days - 45)),
+    )
+    out[np.isnan(start_ts)] = 0.0
+    return out
+
+
+def normalize_tags(raw: Any) -> List[str]:
+    """Normalize an event's tags field into a list of strings (no lowercasing).
+
+    Tags are kept in the same case/format as provided (aside from stripping),
+    so they can be compared directly to user preference tags.
+    """
+    if raw is None:
+        return []
+    if isinstance(raw, str):
+        return [raw.strip()] if raw.strip() else []
+    if isinstance(raw, Iterable):
+        out: List[str] = []
+        for t in raw:
+            s = str(t).strip()
+            if s:
+                out.append(s)
+        return out
+    return []
+
+
+class EventIndex:
+    """Event pool with precomputed start times, tag bitmasks and dedup links."""
+
+    def __init__(self, events: Sequence[Dict[str, Any]]) -> None:
+        """Build the index from event dicts (the dicts are kept, not copied)."""
+        self.events: List[Dict[str, Any]] = [e for e in events if isinstance(e, dict)]
+        n = len(self.events)
+        self.vocab: Dict[str, int] = {}
+        tag_bits: List[List[int]] = []
+        for ev in self.events:
+            bits = []
+            for tag in normalize_tags(ev.get("tags")):
+                bits.append(self.vocab.setdefault(tag, len(self.vocab)))
+            tag_bits.append(bits)
+        self.n_words = max(1, (len(self.vocab) + 63) // 64)
+        self.masks = np.zeros((n, self.n_words), dtype=np.uint64)
+        for row, bits in enumerate(tag_bits):
+            for bit in set(bits):
+                self.masks[row, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        self.start_ts = np.array([_event_time(ev) for ev in self.events], dtype=np.float64)
+        # Tie-break key used by the ranking sorts (missing time sorts as 0).
+        self.sort_ts = np.nan_to_num(self.start_ts, nan=0.0)
+        self.links = [
+            str(ev.get("link") or ev.get("event_id") or id(ev)) for ev in self.events
+        ]
+
+    def __len__(self) -> int:
+        """Return the number of indexed events."""
+        return len(self.events)
+
+    def user_mask(self, user_tags: Sequence[Any]) -> np.ndarray:
+        """Bitmask of the user's tags over this pool's vocabulary (unknown tags dropped)."""
+        mask = np.zeros(self.n_words, dtype=np.uint64)
+        for t in user_tags:
+            bit = self.vocab.get(str(t).strip())
+            if bit is not None:
+                mask[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        return mask
+
+    def score(
+        self, user_tags: Sequence[Any], now: datetime
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return (score, tag_overlap, tag_score, recency_score) arrays for all events."""
+        overlap = _popcount(self.masks & self.user_mask(user_tags))
+        tag_score = np.minimum(overlap, 3).astype(np.float64)
+        recency = recency_bonus(self.start_ts, now.timestamp())
+        score = 0.5 + 1.5 * recency + 0.75 * tag_score
+        return score, overlap, tag_score, recency
+
+    @staticmethod
+    def ranked(
+        rows: np.ndarray, keys: Tuple[np.ndarray, ...], need: Optional[int] = None
+    ) -> np.ndarray:
+        """Order rows by keys descending (first key primary), ties in row order.
+
+        With need set, only rows whose primary key reaches the need-th best
+        value are sorted (argpartition), which always includes the first
+        `need` rows of the full ordering.
+        """
+        if need is not None and 0 < need < rows.size:
+            primary = keys[0][rows]
+            kth = np.partition(primary, rows.size - need)[rows.size - need]
+            rows = rows[primary >= kth]
+        # lexsort: last key is primary; negate for descending, row order breaks ties.
+        order = np.lexsort((rows,) + tuple(-k[rows] for k in reversed(keys)))
+        return rows[order]
@@ -9,13 +9,19 @@ This module implements a lightweight scoring-based event recommender that:
 
 It is intentionally simple and stateless: callers provide a pool of candidate
 events (e.g. upcoming events from storage.get_soonest_events) plus user tags
-and receive an ordered list of event dicts.
+and receive an ordered list of event dicts. Callers that rank the same pool
+for many users build an EventIndex once and use recommend_indexed().
 """
 
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Iterable, List, Dict, Any, Set, Tuple
+from typing import List, Dict, Any, Set, Tuple
+
+import numpy as np
+
+from backend.instrumentation import instrumented
+from backend.recommender.event_index import EventIndex, normalize_tags
 
 
 def _recency_bonus(start_ts: float | int | None, now: datetime) -> float:
@@ -42,26 +48,6 @@ def _recency_bonus(start_ts: float | int | None, now: datetime) -> float:
     return -0.05 * (days - 45)  # push farther future down
 
 
-def _normalize_tags(raw: Any) -> List[str]:
-    """Normalize an event's tags field into a list of strings (no lowercasing).
-
-    Tags are kept in the same case/format as provided (aside from stripping),
-    so they can be compared directly to user preference tags.
-    """
-    if raw is None:
-        return []
-    if isinstance(raw, str):
-        return [raw.strip()] if raw.strip() else []
-    if isinstance(raw, Iterable):
-        out: List[str] = []
-        for t in raw:
-            s = str(t).strip()
-            if s:
-                out.append(s)
-        return out
-    return []
-
-
 def _score_event(
     event: Dict[str, Any],
     user_tags: Set[str],
@@ -74,7 +60,7 @@ def _score_event(
     """
     base_score = 0.5
 
-    event_tags = set(_normalize_tags(event.get("tags")))
+    event_tags = set(normalize_tags(event.get("tags")))
     tag_overlap = len(event_tags & user_tags)
     tag_score = float(min(3, tag_overlap))
 
@@ -107,6 +93,7 @@ class EventRecommender:
         """Expose event scoring for callers that need diagnostics."""
         return _score_event(event, user_tags, now=now)
 
+    @instrumented()
     def recommend(
         self,
         events: List[Dict[str, Any]],
@@ -122,121 +109,92 @@ class EventRecommender:
         """
         if not events or top_k <= 0:
             return []
+        return self._rank_indexed(EventIndex(events), user_tags, top_k)
 
-        now = datetime.now(tz=timezone.utc)
-        # Keep tags in the same format as preferences: no lowercasing, just strip.
-        user_tag_set = {str(t).strip() for t in user_tags if str(t).strip()}
+    @instrumented()
+    def recommend_indexed(
+        self,
+        index: EventIndex,
+        user_tags: List[str],
+        top_k: int = 10,
+        now: datetime | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Rank a prebuilt EventIndex for a user; same ordering as recommend().
 
-        # Compute scores for all events
-        scored: List[Dict[str, Any]] = []
-        for ev in events:
-            score, tag_overlap, tag_score, recency_score = _score_event(
-                ev, user_tag_set, now
-            )
-            item = dict(ev)
-            item["_score"] = score
-            item["_tag_overlap"] = tag_overlap
-            item["_tag_score"] = tag_score
-            item["_recency_score"] = recency_score
-            scored.append(item)
-
-        # Sort by recency, city, overlap, score, then start_ts ascending
-        def sort_key(ev: Dict[str, Any]) -> tuple:
-            """Build the primary ranking key for candidate events.
-
-            Args:
-                ev: Event payload augmented with intermediate score fields.
-
-            Returns:
-                tuple: Sort tuple used for descending priority ordering.
-
-            Exceptions:
-                None.
-            """
-            return (
-                ev.get("_recency_score", 0.0),
-                ev.get("_tag_overlap", 0),
-                ev.get("_score", 0.0),
-                ev.get("ttl") or ev.get("expiry") or ev.get("start_time") or 0,
-            )
-
-        ranked = sorted(scored, key=sort_key, reverse=True)
+        Only the returned events are copied (with _score, _tag_overlap,
+        _tag_score and _recency_score added); the pool is scored as arrays.
+        """
+        return self._rank_indexed(index, user_tags, top_k, now)
 
-        # Exploration: separate overlap vs non-overlap pool
-        main_pool = [e for e in ranked if e.get("_tag_overlap", 0) > 0]
-        explore_pool = [e for e in ranked if e.get("_tag_overlap", 0) == 0]
+    def _rank_indexed(
+        self,
+        index: EventIndex,
+        user_tags: List[str],
+        top_k: int,
+        now: datetime | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Body of recommend() and recommend_indexed(), which alone are timed (one sample per call)."""
+        if len(index) == 0 or top_k <= 0:
+            return []
 
-        results: List[Dict[str, Any]] = []
-        seen_links: set[str] = set()
+        now = now or datetime.now(tz=timezone.utc)
+        # Keep tags in the same format as preferences: no lowercasing, just strip.
+        user_tag_set = {str(t).strip() for t in user_tags if str(t).strip()}
+        score, overlap, tag_score, recency = index.score(sorted(user_tag_set), now)
 
-        def get_link(ev: Dict[str, Any]) -> str:
-            """Return a stable deduplication key for an event.
+        # Rank by recency, overlap, score, then start time (all descending).
+        keys = (recency, overlap, score, index.sort_ts)
+        rows = np.arange(len(index))
 
-            Args:
-                ev: Event payload.
+        def ordered(pool: np.ndarray):
+            """Yield pool rows in ranking order, sorting only the head unless more is needed."""
+            head = EventIndex.ranked(pool, keys, need=2 * top_k)
+            yield from head.tolist()
+            if head.size < pool.size:
+                yield from EventIndex.ranked(pool, keys)[head.size:].tolist()
 
-            Returns:
-                str: Link if present, otherwise event_id, otherwise object fallback.
+        # Exploration: separate overlap vs non-overlap pool
+        main_pool = rows[overlap > 0]
+        explore_pool = rows[overlap == 0]
 
-            Exceptions:
-                None.
-            """
-            return str(ev.get("link") or ev.get("event_id") or id(ev))
+        results: List[int] = []
+        seen_links: set[str] = set()
+        links = index.links
 
-        explore_iter = iter(explore_pool)
-        for idx, ev in enumerate(main_pool, start=1):
+        explore_iter = ordered(explore_pool)
+        for idx, r in enumerate(ordered(main_pool), start=1):
             if len(results) >= top_k:
                 break
-            link = get_link(ev)
-            if link in seen_links:
+            if links[r] in seen_links:
                 continue
-            results.append(ev)
-            seen_links.add(link)
+            results.append(r)
+            seen_links.add(links[r])
             if idx % 3 == 0 and len(results) < top_k:
-                try:
-                    e = next(explore_iter)
-                    link_e = get_link(e)
-                    if link_e not in seen_links:
-                        results.append(e)
-                        seen_links.add(link_e)
-                except StopIteration:
-                    pass
-
-        # Fill from explore then from ranked if we still have room
-        if len(results) < top_k:
-            for e in explore_pool:
-                if len(results) >= top_k:
-                    break
-                link_e = get_link(e)
-                if link_e not in seen_links:
+                e = next(explore_iter, None)
+                if e is not None and links[e] not in seen_links:
                     results.append(e)
-                    seen_links.add(link_e)
+                    seen_links.add(links[e])
+
+        # Fill from explore if we still have room. (Every main and explore link
+        # has been considered by then, so there is nothing left to backfill.)
         if len(results) < top_k:
-            for r in ranked:
+            for e in ordered(explore_pool):
                 if len(results) >= top_k:
                     break
-                link_r = get_link(r)
-                if link_r not in seen_links:
-                    results.append(r)
-                    seen_links.add(link_r)
+                if links[e] not in seen_links:
+                    results.append(e)
+                    seen_links.add(links[e])
 
         # Final deterministic ordering by cumulative score, then earliest time
-        def final_sort_key(ev: Dict[str, Any]) -> tuple:
-            """Build final stable sort key after diversification.
-
-            Args:
-                ev: Ranked event payload.
-
-            Returns:
-                tuple: Composite key of score then time signal.
-
-            Exceptions:
-                None.
-            """
-            return (
-                ev.get("_score", 0.0),
-                ev.get("ttl") or ev.get("expiry") or ev.get("start_time") or 0,
-            )
-
-        results = sorted(results, key=final_sort_key, reverse=True)
-        return results[:top_k]
+        results = sorted(
+            results, key=lambda r: (score[r], index.sort_ts[r]), reverse=True
+        )[:top_k]
+        out: List[Dict[str, Any]] = []
+        for r in results:
+            item = dict(index.events[r])
+            item["_score"] = float(score[r])
+            item["_tag_overlap"] = int(overlap[r])
+            item["_tag_score"] = float(tag_score[r])
+            item["_recency_score"] = float(recency[r])
+            out.append(item)
+        return out
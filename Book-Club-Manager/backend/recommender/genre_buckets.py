@@ -0,0 +1,269 @@
+"""Precomputed top-K tables for genre-only and cold-start book recommendations.
+
+Users without a library have a profile that depends only on their ranked genre
+preferences (at most 3 genres, weights 3/2/1 by rank), so there is a small,
+finite set of possible profiles. GenreBuckets stores the exact top-K result of
+ContentBasedBookRecommender.recommend for each of those genre signatures plus
+the cold-start rating blend, and answers those users with a dictionary lookup
+instead of scoring the catalog.
+
+Tables are built by data/scripts/build_recommender_artifacts.py and saved as
+book_genre_buckets.npz next to the other recommender artifacts.
+"""
+
+from __future__ import annotations
+
+from itertools import permutations
+from math import gcd
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+# Key used for the cold-start blend (no genres, no library).
+COLD_START_KEY = ""
+
+# Rank -> weight used by ContentBasedBookRecommender._build_genres_vector.
+_RANK_WEIGHTS = (3, 2, 1)
+
+# Upper bound on the dense (signatures x books) score block built per chunk:
+# 2M float64 scores (16 MB), so 1M-book catalogs score two signatures at a time.
+_MAX_BLOCK_ELEMENTS = 1 << 21
+
+
+def signature_key(genres_vec: np.ndarray) -> Optional[str]:
+    """Return the table key for a raw (unnormalized) genre weight vector.
+
+    Cosine similarity ignores scale, so weights are reduced by their gcd:
+    "Fantasy" at rank 1 and "Fantasy" with no rank share one entry.
+
+    Args:
+        genres_vec: Genre weight vector aligned with GENRE_VOCAB.
+
+    Returns:
+        str | None: "term:weight,..." sorted by term, or None for an all-zero
+        vector or non-integer weights (neither is tabulated).
+    """
+    vec = np.asarray(genres_vec, dtype=float).reshape(-1)
+    terms = np.flatnonzero(vec)
+    if terms.size == 0:
+        return None
+    weights = vec[terms]
+    if np.any(weights < 0) or not np.allclose(weights, np.round(weights)):
+        return None
+    ints = [int(round(w)) for w in weights.tolist()]
+    divisor = 0
+    for w in ints:
+        divisor = gcd(divisor, w)
+    return ",".join(f"{int(t)}:{w // divisor}" for t, w in zip(terms.tolist(), ints))
+
+
+def rank_signatures(n_terms: int, max_genres: int = 3) -> List[np.ndarray]:
+    """Enumerate genre weight vectors reachable from up to max_genres ranked preferences."""
+    out: List[np.ndarray] = []
+    for n in range(1, max_genres + 1):
+        for terms in permutations(range(n_terms), n):
+            vec = np.zeros(n_terms, dtype=float)
+            for term, weight in zip(terms, _RANK_WEIGHTS[:n]):
+                vec[term] += weight
+            out.append(vec)
+    return out
+
+
+class GenreBuckets:
+    """Lookup table of precomputed top-K book indices and scores per signature."""
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        indices: np.ndarray,
+        scores: np.ndarray,
+        weights: Tuple[float, float, float],
+        n_books: int,
+    ) -> None:
+        """Wrap parallel key / (n_keys x K) index and score arrays.
+
+        Args:
+            keys: Signature keys, one per table row.
+            indices: Book row indices, best first; -1 pads short rows.
+            scores: Scores aligned with indices.
+            weights: (genre_similarity, average_rating, rating_number_popularity)
+                used when the table was built.
+            n_books: Catalog size the table was built against.
+        """
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.scores = np.asarray(scores, dtype=float)
+        self.weights = tuple(float(w) for w in weights)
+        self.n_books = int(n_books)
+        self._row_by_key: Dict[str, int] = {str(k): i for i, k in enumerate(keys)}
+
+    @property
+    def top_k(self) -> int:
+        """Number of results stored per signature."""
+        return int(self.indices.shape[1]) if self.indices.ndim == 2 else 0
+
+    def __len__(self) -> int:
+        """Return the number of tabulated signatures."""
+        return len(self._row_by_key)
+
+    def lookup(self, key: Optional[str], top_k: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return (indices, scores) for a signature, or None on a table miss.
+
+        A miss is returned when the key is unknown or top_k exceeds the stored K;
+        callers then score the catalog as usual.
+        """
+        if key is None or top_k > self.top_k:
+            return None
+        row = self._row_by_key.get(key)
+        if row is None:
+            return None
+        idx = self.indices[row, :top_k]
+        valid = idx >= 0
+        return idx[valid], self.scores[row, :top_k][valid]
+
+    def lookup_genres(
+        self,
+        genres_vec: Optional[np.ndarray],
+        weights: Any,
+        n_books: int,
+        top_k: int,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return (indices, scores) for a user without a library, or None on a miss.
+
+        genres_vec is the raw genre weight vector, or None for the cold-start
+        blend. A table built for other weights or another catalog always misses.
+        """
+        if not self.matches(weights, n_books):
+            return None
+        key = COLD_START_KEY if genres_vec is None else signature_key(genres_vec)
+        return self.lookup(key, top_k)
+
+    def matches(self, weights: Any, n_books: int) -> bool:
+        """Return True when the table was built for these weights and catalog size."""
+        current = (
+            float(weights.genre_similarity),
+            float(weights.average_rating),
+            float(weights.rating_number_popularity),
+        )
+        return self.n_books == int(n_books) and np.allclose(self.weights, current)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the table as a compressed .npz file."""
+        keys = [""] * len(self._row_by_key)
+        for key, row in self._row_by_key.items():
+            keys[row] = key
+        np.savez_compressed(
+            path,
+            keys=np.asarray(keys, dtype=str),
+            indices=self.indices,
+            scores=self.scores,
+            weights=np.asarray(self.weights, dtype=float),
+            n_books=np.asarray(self.n_books, dtype=np.int64),
+        )
+
+    @classmethod
+    def load(cls, source: Union[str, Path, BinaryIO]) -> "GenreBuckets":
+        """Load a table written by save()."""
+        with np.load(source) as data:
+            return cls(
+                keys=[str(k) for k in np.asarray(data["keys"]).tolist()],
+                indices=data["indices"],
+                scores=data["scores"],
+                weights=tuple(np.asarray(data["weights"]).tolist()),
+                n_books=int(data["n_books"]),
+            )
+
+
+def _top_k_rows(scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return per-row top-k column indices and scores (best first, -1 padded)."""
+    n_rows, n_cols = scores.shape
+    k = min(top_k, n_cols)
+    part = np.argpartition(-scores, kth=k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    idx = np.full((n_rows, top_k), -1, dtype=np.int32)
+    out_scores = np.full((n_rows, top_k), -np.inf, dtype=float)
+    idx[:, :k] = np.take_along_axis(part, order, axis=1)
+    out_scores[:, :k] = np.take_along_axis(part_scores, order, axis=1)
+    return idx, out_scores
+
+
+def build_genre_buckets(
+    book_tfidf: sparse.spmatrix,
+    rating_norm: np.ndarray,
+    rating_number_norm: np.ndarray,
+    weights: Any,
+    top_k: int = 100,
+    signatures: Optional[Iterable[np.ndarray]] = None,
+    chunk_size: int = 64,
+    max_block_elements: int = _MAX_BLOCK_ELEMENTS,
+) -> GenreBuckets:
+    """Score every genre signature against the catalog and keep the top-K.
+
+    Scores match ContentBasedBookRecommender.recommend for a user with no
+    library: cosine(profile, book) * genre_similarity + the rating prior, and
+    0.7 * rating_norm + 0.3 * rating_number_norm for the cold-start key.
+
+    Args:
+        book_tfidf: Sparse (n_books x n_terms) TF-IDF matrix.
+        rating_norm: Normalized average ratings.
+        rating_number_norm: Normalized rating counts.
+        weights: RecommenderWeights used for scoring.
+        top_k: Results stored per signature.
+        signatures: Genre weight vectors to tabulate; defaults to every
+            1-3 genre ranked preference list.
+        chunk_size: Most signatures scored per dense block.
+        max_block_elements: Cap on signatures x books per block; large
+            catalogs use fewer signatures per block to bound peak memory.
+
+    Returns:
+        GenreBuckets: The populated table.
+    """
+    tfidf = sparse.csr_matrix(book_tfidf, dtype=float)
+    n_books, n_terms = tfidf.shape
+    top_k = max(1, int(top_k))
+    rating_norm = np.asarray(rating_norm, dtype=float).reshape(-1)
+    rating_number_norm = np.asarray(rating_number_norm, dtype=float).reshape(-1)
+    prior = (
+        weights.average_rating * rating_norm
+        + weights.rating_number_popularity * rating_number_norm
+    )
+    row_norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).reshape(-1))
+    inv_row_norms = np.divide(1.0, row_norms, out=np.zeros_like(row_norms), where=row_norms > 0)
+    # Rows scaled to unit length so (unit_rows @ profile) is the cosine similarity.
+    unit_rows = sparse.csr_matrix(tfidf.multiply(inv_row_norms.reshape(-1, 1)))
+
+    keys: List[str] = [COLD_START_KEY]
+    cold = (0.7 * rating_norm + 0.3 * rating_number_norm).reshape(1, -1)
+    idx_parts, score_parts = [], []
+    cold_idx, cold_scores = _top_k_rows(cold, top_k)
+    idx_parts.append(cold_idx)
+    score_parts.append(cold_scores)
+
+    unique: Dict[str, np.ndarray] = {}
+    for vec in signatures if signatures is not None else rank_signatures(n_terms):
+        key = signature_key(vec)
+        if key and key not in unique:
+            unique[key] = np.asarray(vec, dtype=float)
+    items = list(unique.items())
+    step = max(1, min(int(chunk_size), int(max_block_elements) // max(1, n_books)))
+    for start in range(0, len(items), step):
+        chunk = items[start:start + step]
+        profiles = np.vstack([v / np.linalg.norm(v) for _, v in chunk])
+        # (signatures x books), scaled and shifted in place: one block per chunk.
+        scores = np.ascontiguousarray(np.asarray(unit_rows.dot(profiles.T)).T)
+        scores *= weights.genre_similarity
+        scores += prior
+        chunk_idx, chunk_scores = _top_k_rows(scores, top_k)
+        keys.extend(k for k, _ in chunk)
+        idx_parts.append(chunk_idx)
+        score_parts.append(chunk_scores)
+
+    return GenreBuckets(
+        keys=keys,
+        indices=np.vstack(idx_parts),
+        scores=np.vstack(score_parts),
+        weights=(weights.genre_similarity, weights.average_rating, weights.rating_number_popularity),
+        n_books=n_books,
+    )
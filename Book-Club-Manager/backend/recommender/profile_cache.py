@@ -0,0 +1,131 @@
+"""Bounded per-user cache of content-based recommender profiles.
+
+A user's profile is a blend of their genre-preference vector and the mean
+TF-IDF row of the books in their library. Re-recommending after a shelf change
+used to rebuild both from scratch; this cache keeps, per user, the running sum
+of library TF-IDF rows so adding a book costs one sparse row add.
+
+Entries are keyed by a fingerprint of (library ASINs, genre preferences,
+artifact version); a lookup with a different fingerprint is a miss, but the
+previous entry can still seed an incremental update when the library only grew.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AbstractSet, Dict, Optional, Tuple
+
+import numpy as np
+
+# Artifact versions are process-wide so two recommender instances never share one.
+_VERSIONS = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class ProfileEntry:
+    """Cached profile state for one user."""
+
+    fingerprint: str
+    read_asins: frozenset
+    genre_key: Tuple[Tuple[int, float], ...]
+    history_sum: np.ndarray
+    history_count: int
+    profile: np.ndarray
+
+
+def genre_key(genres_vec: np.ndarray) -> Tuple[Tuple[int, float], ...]:
+    """Return a hashable (term index, weight) tuple for the non-zero genre weights."""
+    vec = np.asarray(genres_vec).reshape(-1)
+    return tuple((int(i), float(vec[i])) for i in np.flatnonzero(vec).tolist())
+
+
+def blend_profile(
+    genres_vec: np.ndarray,
+    has_genres: bool,
+    history_sum: np.ndarray,
+    history_count: int,
+) -> np.ndarray:
+    """Blend normalized genre preferences (0.7) with the normalized library mean (0.3)."""
+    if has_genres and np.linalg.norm(genres_vec) > 0:
+        genres_vec = genres_vec / (np.linalg.norm(genres_vec) + 1e-12)
+
+    has_history = history_count > 0
+    history_vec = np.zeros(genres_vec.shape[0], dtype=float)
+    if has_history:
+        history_mean = history_sum / history_count
+        if np.linalg.norm(history_mean) > 0:
+            history_vec = history_mean / (np.linalg.norm(history_mean) + 1e-12)
+
+    if has_genres and has_history:
+        return 0.7 * genres_vec + 0.3 * history_vec
+    if has_history and not has_genres:
+        return history_vec
+    return genres_vec
+
+
+class UserProfileCache:
+    """Thread-safe LRU of ProfileEntry by user, tied to one artifact version."""
+
+    def __init__(self, max_users: int) -> None:
+        """Create an empty cache holding at most max_users entries (0 disables it)."""
+        self.max_users = max(0, int(max_users))
+        self.version = next(_VERSIONS)
+        self._entries: "OrderedDict[str, ProfileEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"hits": 0, "incremental": 0, "misses": 0}
+
+    def fingerprint(self, read_asins: AbstractSet[str], genres: Tuple[Tuple[int, float], ...]) -> str:
+        """Hash library ASINs, genre preferences and the artifact version."""
+        h = hashlib.sha1(usedforsecurity=False)
+        h.update(f"v{self.version}|".encode("utf-8"))
+        for asin in sorted(read_asins):
+            h.update(asin.encode("utf-8"))
+            h.update(b"\0")
+        h.update(b"|")
+        h.update(repr(genres).encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, user_id: str, fingerprint: str) -> Optional[ProfileEntry]:
+        """Return the user's entry if its fingerprint matches, marking it recently used."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry.fingerprint != fingerprint:
+                return None
+            self._entries.move_to_end(user_id)
+            self._stats["hits"] += 1
+            return entry
+
+    def previous(self, user_id: str) -> Optional[ProfileEntry]:
+        """Return the user's last entry regardless of fingerprint (for incremental updates)."""
+        with self._lock:
+            return self._entries.get(user_id)
+
+    def put(self, user_id: str, entry: ProfileEntry, incremental: bool = False) -> None:
+        """Store the user's latest entry, evicting the least recently used user if full."""
+        if self.max_users == 0:
+            return
+        with self._lock:
+            self._stats["incremental" if incremental else "misses"] += 1
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's entry."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def __len__(self) -> int:
+        """Return the number of cached users."""
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit / incremental / miss counters and the current size."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
@@ -0,0 +1,208 @@
+"""Canonical genre vocabulary and per-user recommender inputs.
+
+UserSignals is the plain-Python input of ContentBasedBookRecommender: the
+user's library ASINs and ranked genre preferences. Free-form genre labels are
+mapped onto GENRE_VOCAB, the column order of the book TF-IDF matrix.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+GENRE_VOCAB: List[str] = [
+    "Literature & Fiction",
+    "Children's Books",
+    "Mystery, Thriller & Suspense",
+    "Arts & Photography",
+    "History",
+    "Biographies & Memoirs",
+    "Crafts, Hobbies & Home",
+    "Business & Money",
+    "Politics & Social Sciences",
+    "Growing Up & Facts of Life",
+    "Romance",
+    "Science & Math",
+    "Teen & Young Adult",
+    "Cookbooks, Food & Wine",
+    "Religion & Spirituality",
+    "Poetry",
+    "Comics & Graphic Novels",
+    "Travel",
+    "Fantasy",
+    "Action & Adventure",
+    "Self-Help",
+    "Science Fiction",
+    "Sports & Outdoors",
+    "Classics",
+    "LGBTQ+",
+]
+
+
+GENRE_KEYWORDS: Dict[str, List[str]] = {
+    "Literature & Fiction": ["literature", "fiction"],
+    "Children's Books": ["children", "kids"],
+    "Mystery, Thriller & Suspense": ["mystery", "thriller", "suspense"],
+    "Arts & Photography": ["art", "arts", "photography"],
+    "History": ["history"],
+    "Biographies & Memoirs": ["biography", "memoir"],
+    "Crafts, Hobbies & Home": ["craft", "hobbies", "home"],
+    "Business & Money": ["business", "finance", "money"],
+    "Politics & Social Sciences": ["politics", "social science"],
+    "Growing Up & Facts of Life": ["growing up", "coming of age"],
+    "Romance": ["romance"],
+    "Science & Math": ["science", "math"],
+    "Teen & Young Adult": ["young adult", "teen"],
+    "Cookbooks, Food & Wine": ["cookbook", "food", "wine", "cooking"],
+    "Religion & Spirituality": ["religion", "spirituality"],
+    "Poetry": ["poetry"],
+    "Comics & Graphic Novels": ["comics", "graphic novel"],
+    "Travel": ["travel"],
+    "Fantasy": ["fantasy"],
+    "Action & Adventure": ["adventure", "action"],
+    "Self-Help": ["self help", "self-help"],
+    "Science Fiction": ["science fiction", "sci fi", "sci-fi"],
+    "Sports & Outdoors": ["sports", "outdoor"],
+    "Classics": ["classic"],
+    "LGBTQ+": ["lgbt", "lgbtq"],
+}
+
+
+def _infer_column(df: pd.DataFrame, candidates: Sequence[str]) -> Optional[str]:
+    """Return the first matching dataframe column from candidate names."""
+    lower_to_actual = {c.lower(): c for c in df.columns}
+    for cand in candidates:
+        if cand.lower() in lower_to_actual:
+            return lower_to_actual[cand.lower()]
+    return None
+
+
+def _map_genre_name(raw_genre: str) -> str:
+    """Map free-form genre labels to the canonical recommender vocabulary."""
+    if raw_genre in GENRE_VOCAB:
+        return raw_genre
+    genre_lower = raw_genre.lower()
+    for official, keywords in GENRE_KEYWORDS.items():
+        if official in GENRE_VOCAB and any(keyword in genre_lower for keyword in keywords):
+            return official
+    return ""
+
+
+_GENRE_INDEX: Dict[str, int] = {genre: i for i, genre in enumerate(GENRE_VOCAB)}
+_USER_ID_COLUMNS = ["user_id", "user", "uid"]
+_GENRE_COLUMNS = ["genre", "category", "categories", "preference", "name"]
+_RANK_COLUMNS = ["rank", "preference_rank", "order", "priority"]
+_ASIN_COLUMNS = ["parent_asin", "asin", "book_id", "book_asin"]
+
+
+@dataclass(frozen=True)
+class UserSignals:
+    """Plain-Python recommender inputs for one user.
+
+    This is the request-path input: the service layer builds it straight from
+    the user account, so no DataFrames are created or filtered per call.
+
+    Attributes:
+        read_asins: parent_asins on the user's shelves (history + exclusion).
+        genre_ranks: (genre, rank) preference pairs; rank may be None.
+    """
+
+    read_asins: FrozenSet[str] = frozenset()
+    genre_ranks: Tuple[Tuple[Any, Any], ...] = ()
+
+    @property
+    def is_cold_start(self) -> bool:
+        """True when the user has neither genre preferences nor library books."""
+        return not self.genre_ranks and not self.read_asins
+
+    @classmethod
+    def from_account(
+        cls,
+        user_account: Optional[Dict[str, Any]],
+        user_genres: Optional[List[Dict[str, Any]]] = None,
+    ) -> "UserSignals":
+        """Build signals from a user account (library shelves) and genre preference dicts."""
+        library = (user_account or {}).get("library") or {}
+        read_asins = frozenset(
+            str(asin)
+            for shelf in ("finished", "saved", "in_progress")
+            for asin in (library.get(shelf) or [])
+            if asin is not None
+        )
+        genre_ranks = tuple(
+            (g.get("genre"), g.get("rank")) for g in (user_genres or []) if isinstance(g, dict)
+        )
+        return cls(read_asins=read_asins, genre_ranks=genre_ranks)
+
+    @classmethod
+    def from_frames(
+        cls,
+        user_id: Any,
+        user_genres_df: Optional[pd.DataFrame],
+        user_books_df: Optional[pd.DataFrame],
+    ) -> "UserSignals":
+        """Adapter for the DataFrame API: keep rows for user_id and extract signals.
+
+        Frames without a user-id column are taken to belong to user_id entirely.
+        """
+        genre_ranks: Tuple[Tuple[Any, Any], ...] = ()
+        if user_genres_df is not None and not user_genres_df.empty:
+            genres_df = _rows_for_user(user_genres_df, user_id)
+            genre_col = _infer_column(genres_df, _GENRE_COLUMNS)
+            rank_col = _infer_column(genres_df, _RANK_COLUMNS)
+            n_rows = genres_df.shape[0]
+            genres = genres_df[genre_col].tolist() if genre_col is not None else [None] * n_rows
+            ranks = genres_df[rank_col].tolist() if rank_col is not None else [None] * n_rows
+            genre_ranks = tuple(zip(genres, ranks))
+
+        read_asins: FrozenSet[str] = frozenset()
+        if user_books_df is not None and not user_books_df.empty:
+            books_df = _rows_for_user(user_books_df, user_id)
+            asin_col = _infer_column(books_df, _ASIN_COLUMNS)
+            if asin_col is not None:
+                read_asins = frozenset(books_df[asin_col].dropna().astype(str).tolist())
+        return cls(read_asins=read_asins, genre_ranks=genre_ranks)
+
+
+def _rows_for_user(df: pd.DataFrame, user_id: Any) -> pd.DataFrame:
+    """Filter a frame to user_id when it has a user-id column."""
+    uid_col = _infer_column(df, _USER_ID_COLUMNS)
+    if uid_col is None:
+        return df
+    return df[df[uid_col].astype(str) == str(user_id)]
+
+
+def _rank_weight(rank_val: Any) -> float:
+    """Map a preference rank to its profile weight (1 -> 3, 2 -> 2, otherwise 1)."""
+    try:
+        rank = int(rank_val)
+    except (TypeError, ValueError):
+        return 1.0
+    if rank == 1:
+        return 3.0
+    if rank == 2:
+        return 2.0
+    return 1.0
+
+
+def genres_vector(genre_ranks: Iterable[Tuple[Any, Any]]) -> tuple[np.ndarray, bool]:
+    """Build the weighted genre preference vector from (genre, rank) pairs."""
+    genres_vec = np.zeros(len(GENRE_VOCAB), dtype=float)
+    has_genres = False
+    for raw_genre, rank_val in genre_ranks:
+        if raw_genre is None:
+            continue
+        genre_name = str(raw_genre).strip()
+        if not genre_name:
+            continue
+        genre_name = _map_genre_name(genre_name)
+        if not genre_name:
+            continue
+        genres_vec[_GENRE_INDEX[genre_name]] += _rank_weight(rank_val)
+        has_genres = True
+    return genres_vec, has_genres
@@ -0,0 +1,128 @@
+"""Background refresh jobs, deduplicated per key (one user's recommendations).
+
+on_book_added_to_shelf used to run the book recommender (full-catalog scoring,
+possibly loading artifacts from S3) inside the user's "add to shelf" click.
+RefreshExecutor runs such refreshes on a small thread pool instead:
+
+- At most one job per key is queued or running. Submitting while a job for the
+  key is queued is a no-op; submitting while one is running schedules exactly
+  one more run after it, so the final result reflects the latest library.
+- generation(key) increases each time a job for the key finishes, so callers
+  can key caches on it and pick the new result up without polling storage.
+- is_refreshing(key) lets readers serve the previous result and say it is
+  being updated (stale-while-revalidate).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from backend import config
+
+
+class RefreshExecutor:
+    """Per-key deduplicating wrapper around a thread pool."""
+
+    def __init__(self, max_workers: int = 2) -> None:
+        """Create the executor; the pool threads start on first submit."""
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)), thread_name_prefix="recs-refresh"
+        )
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._queued: Dict[str, Callable[[], None]] = {}
+        self._running: set = set()
+        self._rerun: Dict[str, Callable[[], None]] = {}
+        self._generations: Dict[str, int] = {}
+
+    def submit(self, key: str, job: Callable[[], None]) -> bool:
+        """Schedule job for key unless an equivalent run is already pending.
+
+        Args:
+            key: Dedup key (normalized user id).
+            job: Zero-argument refresh function; exceptions are logged.
+
+        Returns:
+            bool: True if a new run was scheduled (now or after the running one).
+        """
+        with self._lock:
+            if key in self._queued or key in self._rerun:
+                return False
+            if key in self._running:
+                self._rerun[key] = job
+                return True
+            self._queued[key] = job
+        self._pool.submit(self._run, key)
+        return True
+
+    def _run(self, key: str) -> None:
+        """Run the queued job for key, then its follow-up run if one was requested."""
+        with self._lock:
+            job = self._queued.pop(key)
+            self._running.add(key)
+        try:
+            job()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.exception("background refresh for %s failed: %s", key, e)
+        with self._lock:
+            self._running.discard(key)
+            self._generations[key] = self._generations.get(key, 0) + 1
+            follow_up = self._rerun.pop(key, None)
+            if follow_up is not None:
+                self._queued[key] = follow_up
+            self._idle.notify_all()
+        if follow_up is not None:
+            try:
+                self._pool.submit(self._run, key)
+            except RuntimeError:
+                # Pool shut down meanwhile; the next reader reschedules the refresh.
+                with self._lock:
+                    self._queued.pop(key, None)
+                    self._idle.notify_all()
+
+    def is_refreshing(self, key: str) -> bool:
+        """Return True while a job for key is queued or running."""
+        with self._lock:
+            return key in self._queued or key in self._running
+
+    def generation(self, key: str) -> int:
+        """Return how many jobs for key have finished in this process."""
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until no job is queued or running; return False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: not self._queued and not self._running, timeout=timeout
+            )
+
+    def shutdown(self) -> None:
+        """Let queued jobs finish and stop the pool."""
+        self._pool.shutdown(wait=True)
+
+
+_REFRESH_EXECUTOR: Optional[RefreshExecutor] = None
+_REFRESH_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_refresh_executor() -> RefreshExecutor:
+    """Return the process-wide refresh executor, creating it on first use."""
+    global _REFRESH_EXECUTOR  # pylint: disable=global-statement
+    if _REFRESH_EXECUTOR is None:
+        with _REFRESH_EXECUTOR_LOCK:
+            if _REFRESH_EXECUTOR is None:
+                _REFRESH_EXECUTOR = RefreshExecutor(config.RECS_REFRESH_WORKERS)
+    return _REFRESH_EXECUTOR
+
+
+def reset_refresh_executor() -> None:
+    """Wait for and discard the process-wide executor (tests)."""
+    global _REFRESH_EXECUTOR  # pylint: disable=global-statement
+    with _REFRESH_EXECUTOR_LOCK:
+        executor, _REFRESH_EXECUTOR = _REFRESH_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown()
@@ -0,0 +1,192 @@
+"""Request-scoped read-through cache for per-user storage reads.
+
+One Streamlit rerun reads the same user records many times: the feed, library
+and forum tabs each call store.get_user_books(user_id) through several helpers
+(recommender inputs, genre checks, shelf lookups), and is_post_saved /
+is_post_liked call get_user_forums once per rendered post. In AWS mode every
+one of those is a ConsistentRead get_item.
+
+A UnitOfWork (one per rerun, opened by frontend/main.py) memoizes reads made
+through methods decorated with @memoized_read, keyed by (backend, method,
+normalized user id). Methods decorated with @invalidates drop the cached
+entries of the record groups they write, so a rerun always sees its own
+writes. Outside a unit of work both decorators are pass-through, so scripts,
+tests and background threads behave exactly as before.
+
+The unit also counts calls and backend round trips per page (see page()), and
+report() / format_report() give the before/after numbers for one rerun.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import copy
+import functools
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_CURRENT: contextvars.ContextVar[Optional["UnitOfWork"]] = contextvars.ContextVar(
+    "storage_unit_of_work", default=None
+)
+
+
+def _user_key(value: Any) -> str:
+    """Normalize a user id the way the storage backends do (strip + lowercase)."""
+    return str(value or "").strip().lower()
+
+
+class UnitOfWork:
+    """Memoized reads and per-page read counters for one unit of work."""
+
+    def __init__(self, name: str = "rerun") -> None:
+        """Create an empty unit; reads are attributed to page `name` until page() is used."""
+        self.name = name
+        self.current_page = name
+        self._values: Dict[Tuple[Any, ...], Tuple[frozenset, Any]] = {}
+        self._counts: Dict[Tuple[str, str], List[int]] = {}
+
+    def _count(self, method: str, round_trip: bool) -> None:
+        """Record one call (and possibly one backend round trip) for the current page."""
+        counts = self._counts.setdefault((self.current_page, method), [0, 0])
+        counts[0] += 1
+        if round_trip:
+            counts[1] += 1
+
+    def read(self, key: Tuple[Any, ...], groups: frozenset, fetch: Callable[[], Any]) -> Any:
+        """Return a copy of the memoized value for key, fetching it on first use.
+
+        Args:
+            key: (backend, method, user id) cache key.
+            groups: Record groups the value depends on (for invalidation).
+            fetch: Zero-argument function performing the real read.
+
+        Returns:
+            A deep copy of the value, so callers may mutate it freely.
+        """
+        hit = key in self._values
+        self._count(key[1], round_trip=not hit)
+        if not hit:
+            value = fetch()
+            self._values[key] = (groups, copy.deepcopy(value))
+            return value
+        return copy.deepcopy(self._values[key][1])
+
+    def invalidate(self, groups: frozenset) -> None:
+        """Drop every memoized value depending on any of the given groups."""
+        for key in [k for k, (deps, _v) in self._values.items() if deps & groups]:
+            del self._values[key]
+
+    @contextlib.contextmanager
+    def page(self, label: str) -> Iterator[None]:
+        """Attribute reads made inside the block to page `label`."""
+        previous, self.current_page = self.current_page, label
+        try:
+            yield
+        finally:
+            self.current_page = previous
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Return per-page, per-method read counts.
+
+        Returns:
+            list[dict]: Rows with page, method, calls (round trips without the
+            cache) and round_trips (round trips actually made).
+        """
+        return [
+            {"page": page_name, "method": method, "calls": calls, "round_trips": trips}
+            for (page_name, method), (calls, trips) in sorted(self._counts.items())
+        ]
+
+    def format_report(self) -> str:
+        """Return report() as a small text table with per-page totals."""
+        rows = self.report()
+        lines = [f"storage reads for {self.name}: page / method: calls -> round trips"]
+        totals: Dict[str, List[int]] = {}
+        for row in rows:
+            lines.append(
+                f"  {row['page']} / {row['method']}: {row['calls']} -> {row['round_trips']}"
+            )
+            total = totals.setdefault(row["page"], [0, 0])
+            total[0] += row["calls"]
+            total[1] += row["round_trips"]
+        for page_name, (calls, trips) in totals.items():
+            lines.append(f"  {page_name} total: {calls} -> {trips}")
+        return "\n".join(lines)
+
+
+def current_unit() -> Optional[UnitOfWork]:
+    """Return the active unit of work, or None outside one."""
+    return _CURRENT.get()
+
+
+@contextlib.contextmanager
+def unit_of_work(name: str = "rerun") -> Iterator[UnitOfWork]:
+    """Open a unit of work for the enclosed block (nested calls reuse the outer one)."""
+    outer = _CURRENT.get()
+    if outer is not None:
+        yield outer
+        return
+    unit = UnitOfWork(name)
+    token = _CURRENT.set(unit)
+    try:
+        yield unit
+    finally:
+        _CURRENT.reset(token)
+
+
+@contextlib.contextmanager
+def page(label: str) -> Iterator[None]:
+    """Attribute reads in the block to page `label` (no-op outside a unit of work)."""
+    unit = _CURRENT.get()
+    if unit is None:
+        yield
+        return
+    with unit.page(label):
+        yield
+
+
+def memoized_read(*groups: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a storage method `(self, user_id)` so it is memoized per unit of work.
+
+    Args:
+        *groups: Record groups the result depends on (e.g. "user_books").
+    """
+    deps = frozenset(groups)
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        "Wrap fn with the unit-of-work read cache."
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            "Serve repeated reads from the active unit of work."
+            unit = _CURRENT.get()
+            if unit is None or len(args) > 1 or kwargs:
+                return fn(self, *args, **kwargs)
+            key = (type(self).__name__, fn.__name__, _user_key(args[0] if args else None))
+            return unit.read(key, deps, lambda: fn(self, *args))
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates(*groups: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a storage write so it drops memoized reads of the given groups."""
+    touched = frozenset(groups)
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        "Wrap fn so the active unit of work forgets what it writes."
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            "Invalidate after the write, even a failed one (it may be partial)."
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                unit = _CURRENT.get()
+                if unit is not None:
+                    unit.invalidate(touched)
+
+        return wrapper
+
+    return decorator
@@ -23,6 +23,7 @@ from typing import Any
 import bcrypt
 
 from backend.config import BCRYPT_ROUNDS
+from backend.instrumentation import instrument_module
 from backend.storage import get_storage
 from backend.services.recommender_service import ensure_default_recommendations
 
@@ -154,3 +155,6 @@ def get_user(user_id: str) -> dict[str, Any]:
     """
     store = get_storage()
     return store.get_user_account(str(user_id).strip().lower())
+
+
+instrument_module(__name__, "service.auth")
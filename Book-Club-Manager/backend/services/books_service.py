@@ -18,6 +18,7 @@ from typing import Any
 
 from botocore.exceptions import BotoCoreError, ClientError
 
+from backend.instrumentation import instrument_module
 from backend.storage import get_storage
 
 
@@ -133,9 +134,8 @@ def get_book_related_events(parent_asin: str, limit: int = 5) -> list[dict[str,
     """Return upcoming events related to a given book.
 
     This is intended for a Book Detail \"Events\" section. It does **not** scan
-    the full events table; it relies on the events GSI:
-      - Partition key: parent_asin
-      - Sort key: ttl
+    the full events table; storage answers from the shared upcoming-events
+    snapshot (backend/events_pool.py), indexed by parent_asin and sorted by ttl.
 
     Args:
         parent_asin: Book identifier (Amazon parent ASIN).
@@ -143,7 +143,7 @@ def get_book_related_events(parent_asin: str, limit: int = 5) -> list[dict[str,
 
     Returns:
         List of event dicts, ordered soonest-first. Returns [] if no matching
-        events are found or if the GSI is not configured.
+        events are found or the events table is unavailable.
     """
     store = get_storage()
     parent_asin = str(parent_asin or "").strip()
@@ -156,3 +156,6 @@ def get_book_related_events(parent_asin: str, limit: int = 5) -> list[dict[str,
         return []
 
     return list(events_for_book or [])[:limit]
+
+
+instrument_module(__name__, "service.books")
@@ -3,17 +3,18 @@
 This module provides a thin, storage-agnostic interface for working with
 *event objects themselves* (not per-user data):
 
-- Fetching full event details for a given `event_id`.
-- (Future) Querying events by city/genre.
+- Fetching full event details for a given `event_id` (or a batch of them).
+- Querying events by city, or streaming upcoming events page by page.
 
 Per-user saved/registered events live in `backend.services.user_events_service`.
 """
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
 from backend.config import EVENT_RECOMMENDATION_POOL_SIZE
+from backend.instrumentation import instrument_module
 from backend.storage import get_storage
 
 
@@ -31,6 +32,22 @@ def get_event_detail(event_id: str) -> dict[str, Any]:
     return ev or {}
 
 
+def get_event_details_batch(event_ids: list[str]) -> list[dict[str, Any]]:
+    """Return full details for several events in one storage round-trip.
+
+    Args:
+        event_ids: Identifiers of the events to fetch.
+
+    Returns:
+        Event dicts in the order of `event_ids`; unknown ids are omitted.
+    """
+    ids = [str(e).strip() for e in (event_ids or []) if str(e).strip()]
+    if not ids:
+        return []
+    store = get_storage()
+    return list(store.get_events_batch(ids) or [])
+
+
 def get_events_by_city(city_state: str) -> list[dict[str, Any]]:
     """Return events filtered by `city_state` via the storage backend, ordered by soonest start/expiry.
 
@@ -62,3 +79,26 @@ def get_explore_events(limit: int | None = None) -> list[dict[str, Any]]:
     if limit is None:
         limit = EVENT_RECOMMENDATION_POOL_SIZE
     return store.get_soonest_events(limit)
+
+
+def iter_explore_event_pages(
+    page_size: int | None = None, city_state: str | None = None
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield upcoming events page by page for incremental Explore rendering.
+
+    Pages are soonest-first and contain no expired events. In AWS mode each
+    page is one GSI query (the next page is only read when requested).
+
+    Args:
+        page_size: Events per page (default EVENTS_PAGE_SIZE).
+        city_state: Optional exact city/state filter (e.g. "Seattle, WA").
+
+    Returns:
+        Iterator over lists of event dicts.
+    """
+    store = get_storage()
+    city = str(city_state).strip() if city_state else None
+    return store.iter_event_pages(page_size, city_state=city)
+
+
+instrument_module(__name__, "service.events")
@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import time
 
+from backend.instrumentation import instrument_module
 from backend.storage import get_storage
 
 
@@ -79,10 +80,7 @@ def create_post(
             if key_bt not in seen:
                 seen.add(key_bt)
                 norm_tags.append(bt)
-    db = store.load_forum_db()
-    post_id = int(db.get("next_post_id") or 1)
     post = {
-        "id": post_id,
         "title": title,
         "author": user_id,
         "parent_asin": pa,
@@ -95,10 +93,9 @@ def create_post(
         "text": text,
         "comments": [],
     }
-    db.setdefault("posts", []).insert(0, post)
-    db["next_post_id"] = post_id + 1
-    store.save_forum_db(db)
-    return dict(post)
+    # One write: storage assigns the id and indexes the post under its book.
+    post_id = int(store.create_forum_post(post))
+    return {"id": post_id, **post}
 
 
 def add_comment(post_id: int, user_id: str, text: str) -> dict:
@@ -157,7 +154,7 @@ def like_post(post_id: int, user_id: str) -> dict:
     post_id = int(post_id)
     user_id = str(user_id).strip().lower()
     store = get_storage()
-    uf = store.get_user_forums(user_id)
+    uf = dict(store.get_user_forums(user_id) or {})
     liked = list(uf.get("liked_post_ids") or [])
     if post_id in liked:
         liked = [x for x in liked if x != post_id]
@@ -196,7 +193,7 @@ def like_comment(post_id: int, comment_idx: int, user_id: str) -> dict:
     user_id = str(user_id).strip().lower()
     key = f"{post_id}:{comment_idx}"
     store = get_storage()
-    uf = store.get_user_forums(user_id)
+    uf = dict(store.get_user_forums(user_id) or {})
     liked = list(uf.get("liked_comment_ids") or [])
     if key in liked:
         liked = [x for x in liked if x != key]
@@ -230,7 +227,7 @@ def save_post(post_id: int, user_id: str) -> dict:
     """
     user_id = str(user_id).strip().lower()
     store = get_storage()
-    rec = store.get_user_forums(user_id)
+    rec = dict(store.get_user_forums(user_id) or {})
     saved = list(rec.get("saved_forum_post_ids") or [])
     post_id_int = int(post_id)
     if post_id_int in [int(x) for x in saved]:
@@ -270,22 +267,32 @@ def get_post(post_id: int) -> dict:
     return dict(post) if post else {}
 
 
-def get_thread_for_book(parent_asin: str) -> list[dict]:
-    """Return forum posts for a book (by parent_asin or tag match).
+def get_thread_for_book(
+    parent_asin: str, book_title: str | None = None, book_id: int | None = None
+) -> list[dict]:
+    """Return forum posts for a book (by parent_asin, book title or book id), newest first.
 
-    Uses storage's get_forum_thread_for_book (GSI when available).
+    Uses storage's get_forum_thread_for_book: the local book index, or the
+    FORUM_POSTS_GSI / FORUM_POSTS_TITLE_GSI in AWS, so only that book's posts are read.
 
     Args:
-        parent_asin: Book id (matched against post parent_asin and tags).
+        parent_asin: Book id (matched against post parent_asin).
+        book_title: Optional title; also matches posts with that book_title
+            (locally also posts tagged with it).
+        book_id: Optional bootstrap book id; locally matches older posts that
+            only carry book_id.
 
     Returns:
         List of post dicts for that book.
     """
     parent_asin = str(parent_asin or "").strip()
-    if not parent_asin:
+    book_title = str(book_title or "").strip() or None
+    if not parent_asin and not book_title and book_id is None:
         return []
     store = get_storage()
-    return list(store.get_forum_thread_for_book(parent_asin) or [])
+    return list(
+        store.get_forum_thread_for_book(parent_asin, book_title=book_title, book_id=book_id) or []
+    )
 
 
 def filter_posts_by_tag(query: str) -> list[dict]:
@@ -355,7 +362,7 @@ def is_post_saved(user_id: str, post_id: int) -> bool:
     if not user_id:
         return False
     store = get_storage()
-    rec = store.get_user_forums(user_id)
+    rec = store.get_user_forums(user_id) or {}
     saved = rec.get("saved_forum_post_ids") or []
     return post_id_int in [int(x) for x in saved]
 
@@ -375,7 +382,7 @@ def is_post_liked(user_id: str, post_id: int) -> bool:
     if not user_id:
         return False
     store = get_storage()
-    rec = store.get_user_forums(user_id)
+    rec = store.get_user_forums(user_id) or {}
     liked = rec.get("liked_post_ids") or []
     return post_id_int in [int(x) for x in liked]
 
@@ -396,7 +403,7 @@ def get_saved_posts_with_details(user_id: str) -> list[dict]:
     if not user_id:
         return []
     store = get_storage()
-    rec = store.get_user_forums(user_id)
+    rec = store.get_user_forums(user_id) or {}
     saved_ids = [int(x) for x in (rec.get("saved_forum_post_ids") or [])]
     out: list[dict] = []
     for pid in saved_ids:
@@ -404,3 +411,6 @@ def get_saved_posts_with_details(user_id: str) -> list[dict]:
         if post:
             out.append(post)
     return out
+
+
+instrument_module(__name__, "service.forum")
@@ -22,6 +22,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from backend.instrumentation import instrument_module
 from backend.services import books_service
 from backend.storage import get_storage
 from backend.services.recommender_service import on_book_added_to_shelf
@@ -398,3 +399,6 @@ def remove_book_from_shelf(user_id: str, shelf: str, parent_asin: str) -> dict[s
     _drop_genres_only_from_removed_book(rec, parent_asin, store)
     store.save_user_books(user_id, rec)
     return dict(rec)
+
+
+instrument_module(__name__, "service.library")
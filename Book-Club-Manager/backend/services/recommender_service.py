@@ -2,7 +2,9 @@
 
 Recommendations are stored in user_recommendations (not user_books).
 - Books: 50 items. Re-run after every ADDS_BEFORE_BOOK_RERUN (3) adds to shelf (see on_book_added_to_shelf).
-  Book recommender uses only the user's library (books on shelves).
+  Book recommender uses only the user's library (books on shelves). With RECS_REFRESH_ASYNC the
+  re-run happens on a background pool (backend/refresh_executor.py); readers keep getting the
+  previous list until the new one is saved (stale-while-revalidate).
 - Events: 10 items. Re-run when events_soonest_expiry is past (lazy refresh when reading).
   Event recommender uses only the user's genre_preferences.
 
@@ -22,12 +24,15 @@ from backend.config import (
     ADDS_BEFORE_BOOK_RERUN,
     RECOMMENDED_BOOKS_SIZE,
     RECOMMENDED_EVENTS_SIZE,
+    RECS_REFRESH_ASYNC,
 )
+from backend.instrumentation import instrument_module
 from backend.recommender.book_recommender import (
     BookRecommender,
     _FallbackBookRecommender,
 )
 from backend.recommender.event_recommender import EventRecommender
+from backend.refresh_executor import get_refresh_executor
 from backend.storage import get_storage
 
 
@@ -264,14 +269,15 @@ def get_event_recommendations(user_id: str, top_k: int | None = None) -> list[di
         return []
 
     store = get_storage()
-    # Pull a reasonably sized pool of upcoming events; recommender will re-rank.
+    # Rank a reasonably sized pool of upcoming events; the pool's EventIndex is
+    # built once per events refresh and shared by every user.
     pool_size = max(top_k * 4, 40)
-    events = store.get_soonest_events(pool_size) or []
-    if not events:
+    index = store.get_soonest_events_index(pool_size)
+    if index is None or len(index) == 0:
         return []
 
     recommender = EventRecommender()
-    ranked = recommender.recommend(events, user_tags=user_tags, top_k=top_k)
+    ranked = recommender.recommend_indexed(index, user_tags=user_tags, top_k=top_k)
     return ranked[:top_k]
 
 
@@ -331,6 +337,11 @@ def get_recommended_books_for_user(user_id: str | None = None) -> list[dict]:
     rec = store.get_user_recommendations(user_id) or {}
     books = list(rec.get("recommended_books") or [])
 
+    if books and _book_refresh_outstanding(rec) and not book_recommendations_refreshing(user_id):
+        # A requested refresh was never saved (e.g. the process restarted); serve the
+        # stored list and start it again.
+        schedule_book_refresh(user_id)
+
     if not books:
         # Run book recommender once and cache result.
         books = _ui_shape_recommended_books(get_book_recommendations(user_id))[
@@ -435,11 +446,77 @@ def ensure_default_recommendations(user_id: str) -> None:
     store.save_user_recommendations(user_id, rec)
 
 
+def _apply_book_rows(rec: dict, book_rows: list[dict], book_source: str, book_err: str) -> None:
+    """Store a book recommender result (UI shape, source, error, timestamp) in rec."""
+    books = _ui_shape_recommended_books(book_rows or [])
+    if books:
+        rec["recommended_books"] = books[:RECOMMENDED_BOOKS_SIZE]
+    rec["book_updated_at"] = int(time.time())
+    rec["book_recs_source"] = book_source
+    if book_err:
+        rec["book_recs_error"] = book_err
+    else:
+        rec.pop("book_recs_error", None)
+
+
+def _book_refresh_outstanding(rec: dict) -> bool:
+    """Return True if rec records a refresh request newer than its book list."""
+    requested = int(rec.get("book_refresh_requested_at") or 0)
+    return requested > 0 and requested >= int(rec.get("book_updated_at") or 0)
+
+
+def refresh_book_recommendations(user_id: str) -> None:
+    """Re-run the book recommender for one user and save the result.
+
+    Runs on the refresh executor. The recommendations record is re-read after
+    scoring, so counter updates made while the recommender ran are kept.
+    """
+    user_id = str(user_id).strip().lower()
+    if not user_id:
+        return
+    book_rows, book_source, book_err = _run_book_recommender(
+        user_id, top_k=RECOMMENDED_BOOKS_SIZE
+    )
+    store = get_storage()
+    rec = store.get_user_recommendations(user_id) or {}
+    _apply_book_rows(rec, book_rows, book_source, book_err)
+    rec.pop("book_refresh_requested_at", None)
+    store.save_user_recommendations(user_id, rec)
+
+
+def schedule_book_refresh(user_id: str) -> bool:
+    """Queue refresh_book_recommendations for the user (deduplicated per user).
+
+    Returns:
+        bool: True if a new run was scheduled.
+    """
+    user_id = str(user_id).strip().lower()
+    if not user_id:
+        return False
+    return get_refresh_executor().submit(
+        user_id, lambda: refresh_book_recommendations(user_id)
+    )
+
+
+def book_recommendations_refreshing(user_id: str | None) -> bool:
+    """Return True while a background book refresh for the user is queued or running."""
+    user_id = str(user_id or "").strip().lower()
+    return bool(user_id) and get_refresh_executor().is_refreshing(user_id)
+
+
+def book_recommendations_generation(user_id: str | None) -> int:
+    """Return how many background book refreshes for the user finished in this process."""
+    user_id = str(user_id or "").strip().lower()
+    return get_refresh_executor().generation(user_id) if user_id else 0
+
+
 def on_book_added_to_shelf(user_id: str) -> None:
     """Hook to call after a book is added to a shelf.
 
     Increments adds_since_last_book_run; when it reaches ADDS_BEFORE_BOOK_RERUN (3),
-    re-runs the book recommender and resets the counter. Called from library_service.
+    resets the counter and re-runs the book recommender: on the refresh executor
+    when RECS_REFRESH_ASYNC is set (the stored list is served until the new one is
+    saved), otherwise inline. Called from library_service.
     """
     user_id = str(user_id).strip().lower()
     if not user_id:
@@ -449,20 +526,20 @@ def on_book_added_to_shelf(user_id: str) -> None:
     adds = int(rec.get("adds_since_last_book_run") or 0) + 1
     rec["adds_since_last_book_run"] = adds
     if adds >= ADDS_BEFORE_BOOK_RERUN:
+        rec["adds_since_last_book_run"] = 0
+        if RECS_REFRESH_ASYNC:
+            rec["book_refresh_requested_at"] = int(time.time())
+            store.save_user_recommendations(user_id, rec)
+            schedule_book_refresh(user_id)
+            return
         # Always refresh the cached recommendations when the threshold is reached.
         # The fallback recommender is still personalized (it excludes owned books),
         # so it's safe and desirable to overwrite existing lists even in fallback.
         book_rows, book_source, book_err = _run_book_recommender(
             user_id, top_k=RECOMMENDED_BOOKS_SIZE
         )
-        books = _ui_shape_recommended_books(book_rows or [])
-        if books:
-            rec["recommended_books"] = books[:RECOMMENDED_BOOKS_SIZE]
-        rec["book_updated_at"] = int(time.time())
-        rec["book_recs_source"] = book_source
-        if book_err:
-            rec["book_recs_error"] = book_err
-        else:
-            rec.pop("book_recs_error", None)
-        rec["adds_since_last_book_run"] = 0
+        _apply_book_rows(rec, book_rows, book_source, book_err)
     store.save_user_recommendations(user_id, rec)
+
+
+instrument_module(__name__, "service.recommender")
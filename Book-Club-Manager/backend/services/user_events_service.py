@@ -14,6 +14,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from backend.instrumentation import instrument_module
 from backend.services import events_service
 from backend.storage import get_storage
 
@@ -117,8 +118,8 @@ def is_event_saved(user_id: str, event_id: str) -> bool:
 def get_saved_events_with_details(user_id: str) -> list[dict[str, Any]]:
     """Return the user's saved events as full event dicts for UI display.
 
-    Fetches saved event IDs, then loads each event's full details. Events that
-    no longer exist in the catalog are omitted from the result.
+    Fetches saved event IDs, then loads all of their details in one batch.
+    Events that no longer exist in the catalog are omitted from the result.
 
     Args:
         user_id: User email/identifier.
@@ -129,9 +130,9 @@ def get_saved_events_with_details(user_id: str) -> list[dict[str, Any]]:
     user_id = str(user_id).strip().lower()
     rec = get_user_events(user_id)
     event_ids = rec.get("events") or []
-    out: list[dict[str, Any]] = []
-    for eid in event_ids:
-        ev = events_service.get_event_detail(eid)
-        if ev:
-            out.append(ev)
-    return out
+    if not event_ids:
+        return []
+    return [ev for ev in events_service.get_event_details_batch(event_ids) if ev]
+
+
+instrument_module(__name__, "service.user_events")
@@ -10,19 +10,34 @@
 # must degrade gracefully across local files, sqlite, DynamoDB, and S3.
 # pylint: disable=too-many-lines,too-many-public-methods,too-many-nested-blocks,broad-exception-caught
 
+import copy
+import heapq
+import importlib
 import json
 import logging
 import os
+import threading
+import time
 from decimal import Decimal
 from typing import Any, Optional
 
-import boto3
-from boto3.dynamodb.conditions import Key
-from boto3.dynamodb.types import TypeDeserializer
-import pandas as pd
-
 from backend import config as _config
-from backend.forum_store import load_forum_store, save_forum_store
+from backend import forum_store as _forum_store
+from backend.forum_store import ForumBookIndex, load_forum_store, save_forum_store
+from backend.dynamo_batch import (
+    batch_get_items,
+    batch_write_items,
+    decode_item,
+    decode_value,
+    encode_item,
+    map_concurrently,
+    projection,
+)
+from backend.events_pool import day_bucket, get_events_pool
+from backend.instrumentation import instrument_class
+from backend.metadata_cache import IncompleteFetch, get_metadata_cache
+from backend.request_cache import invalidates, memoized_read
+from backend.write_behind import get_write_behind, peek_write_behind
 from backend.user_store import (
     load_user_store,
     save_user_accounts,
@@ -32,6 +47,30 @@ from backend.user_store import (
 )
 
 
+# boto3 and pandas are imported on first use: local mode never needs boto3, and
+# pandas is only used for parquet shards. Together they add ~0.6s to a cold start
+# (benchmarks/import_time.py). `storage.boto3` and `storage.pd` still resolve,
+# through __getattr__ below.
+_LAZY_MODULES = {"boto3": "boto3", "pd": "pandas"}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the lazily loaded modules (storage.boto3, storage.pd) on first access."""
+    if name not in _LAZY_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(_LAZY_MODULES[name])
+
+
+def _boto3() -> Any:
+    """Return the boto3 module (imported on first call)."""
+    return importlib.import_module("boto3")
+
+
+def Key(name: str) -> Any:  # pylint: disable=invalid-name
+    """Return boto3's Key(name) condition builder (boto3 imported on first call)."""
+    return importlib.import_module("boto3.dynamodb.conditions").Key(name)
+
+
 def _from_dynamo(obj: Any) -> Any:
     """Convert DynamoDB item to JSON-friendly types (Decimal -> int/float)."""
     if obj is None:
@@ -45,6 +84,26 @@ def _from_dynamo(obj: Any) -> Any:
     return obj
 
 
+_DYNAMO_CLIENTS: dict[Any, Any] = {}
+
+
+def _dynamo_client():
+    """Return a reused low-level DynamoDB client for the configured region.
+
+    Clients are thread-safe and expensive to build, so one is kept per
+    (factory, region); keying on boto3.client lets tests that swap it get a
+    fresh client.
+    """
+    key = (_boto3().client, getattr(_config, "AWS_REGION", None))
+    client = _DYNAMO_CLIENTS.get(key)
+    if client is None:
+        if len(_DYNAMO_CLIENTS) > 8:
+            _DYNAMO_CLIENTS.clear()
+        client = _boto3().client("dynamodb", region_name=key[1])
+        _DYNAMO_CLIENTS[key] = client
+    return client
+
+
 def _to_dynamo(obj: Any) -> Any:
     """Convert JSON data to DynamoDB types (float -> Decimal)."""
     if isinstance(obj, float):
@@ -57,6 +116,14 @@ def _to_dynamo(obj: Any) -> Any:
     return obj
 
 
+def _flush_write_behind(table_name: str, key_attr: str, items: list) -> list:
+    """Write queued user items with BatchWriteItem; return key values left unwritten."""
+    unprocessed = batch_write_items(
+        _dynamo_client(), table_name, [encode_item(_to_dynamo(item)) for item in items]
+    )
+    return [decode_value(item.get(key_attr)) for item in unprocessed]
+
+
 def _forum_post_to_item(post: dict, pk: str, sk: str, pk_value: str) -> dict:
     """Build a DynamoDB-put_item compatible dict. pk/sk are key attributes; table expects String (S) for both."""
     raw_id = post.get("id") or post.get("post_id") or post.get("sk") or 0
@@ -69,6 +136,12 @@ def _forum_post_to_item(post: dict, pk: str, sk: str, pk_value: str) -> dict:
     item["post_id"] = post_id
     item[pk] = str(pk_value)
     item[sk] = str(post_id)
+    # Partition key of FORUM_POSTS_TITLE_GSI; omitted when empty (GSI keys cannot be "").
+    title_key = _forum_store.book_title_key(post.get("book_title"))
+    if title_key:
+        item["book_title_key"] = title_key
+    else:
+        item.pop("book_title_key", None)
     return item
 
 
@@ -129,7 +202,7 @@ def get_book_details(
             raise RuntimeError("DATA_BUCKET env not set")
         path = f"s3://{bucket}/{prefix.rstrip('/')}/{shard}.parquet"
 
-    df = pd.read_parquet(path, engine=engine)
+    df = importlib.import_module("pandas").read_parquet(path, engine=engine)
     if "parent_asin" not in df.columns:
         return None
     match = df[df["parent_asin"] == parent_asin]
@@ -148,13 +221,21 @@ def get_book_metadata(parent_asin: str) -> Optional[dict[str, Any]]:
     """
     Get book metadata without description from DynamoDB. Intended for homepage, library, etc.
     """
-    # Pin region so local dev doesn't depend on AWS default region.
-    dynamodb = boto3.resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
-    table = dynamodb.Table(BOOKS_TABLE)
     try:
-        resp = table.get_item(Key={"parent_asin": parent_asin})
+        return _read_book_metadata(parent_asin)
     except Exception:
         return None
+
+
+def _read_book_metadata(parent_asin: str) -> Optional[dict[str, Any]]:
+    """
+    Read book metadata from DynamoDB: None only when the item does not exist.
+    DynamoDB errors (throttling, timeouts) propagate so callers can tell them apart.
+    """
+    # Pin region so local dev doesn't depend on AWS default region.
+    dynamodb = _boto3().resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
+    table = dynamodb.Table(BOOKS_TABLE)
+    resp = table.get_item(Key={"parent_asin": parent_asin})
     item = resp.get("Item")
     if item is None:
         return None
@@ -166,7 +247,7 @@ def get_event_details(event_id: str) -> Optional[dict[str, Any]]:
     """
     Get all event details from DynamoDB.
     """
-    dynamodb = boto3.resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
+    dynamodb = _boto3().resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
     table = dynamodb.Table(EVENTS_TABLE)
     try:
         resp = table.get_item(Key={"event_id": event_id})
@@ -195,7 +276,7 @@ def increment_library_actions_since_recs(
     - Assumes USER_LIBRARY_TABLE has partition key `user_id`.
     - Does not run the recommender; callers decide what to do.
     """
-    dynamodb = boto3.resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
+    dynamodb = _boto3().resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
     table = dynamodb.Table(USER_LIBRARY_TABLE)
 
     try:
@@ -230,7 +311,7 @@ def reset_library_actions_since_recs(
     Reset the user's library action counter back to 0.
     Returns True on success, False otherwise.
     """
-    dynamodb = boto3.resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
+    dynamodb = _boto3().resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
     table = dynamodb.Table(USER_LIBRARY_TABLE)
     try:
         table.update_item(
@@ -316,6 +397,53 @@ def get_form_thread(_parent_asin: str) -> Optional[dict[str, Any]]:
 # get_top50_review_books() from here (local file vs S3).
 # ---------------------------------------------------------------------------
 
+def _iter_pages(call, **kwargs):
+    """Yield the Items of each page of a DynamoDB query/scan, following LastEvaluatedKey.
+
+    Args:
+        call: Bound table.query or table.scan.
+        **kwargs: Request parameters passed on every page.
+
+    Yields:
+        list: Raw items of one page (may be empty when a filter removed them all).
+    """
+    while True:
+        resp = call(**kwargs)
+        yield resp.get("Items", [])
+        last_key = resp.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+_WRITE_GENERATIONS: dict[str, int] = {}
+_WRITE_GENERATIONS_LOCK = threading.Lock()
+
+
+def note_write(kind: str) -> None:
+    """Record that this process wrote `kind` data (e.g. "forum"); see write_generation."""
+    with _WRITE_GENERATIONS_LOCK:
+        _WRITE_GENERATIONS[kind] = _WRITE_GENERATIONS.get(kind, 0) + 1
+
+
+def write_generation(kind: str) -> int:
+    """Return how many writes of `kind` this process has made (a cache-key ingredient).
+
+    Caches derived from storage (e.g. the frontend bootstrap) compare it to the
+    value they were built with to notice writes without re-reading the data.
+    """
+    return _WRITE_GENERATIONS.get(kind, 0)
+
+
+def file_stamp(path) -> Optional[tuple]:
+    """Return (mtime_ns, size) of a file, or None when it is missing/unreadable."""
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def get_storage():
     """Return LocalStorage or CloudStorage based on APP_ENV (use cloud when APP_ENV=aws)."""
     if getattr(_config, "IS_AWS", False):
@@ -338,20 +466,45 @@ class LocalStorage:
     _cache: dict[str, Any] = {}
 
     def _load_json_file(self, path, *, cache_key: str) -> Any:
-        """Load JSON from disk with a simple in-process cache."""
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        """Load JSON from disk with an in-process cache, re-read when the file's mtime changes."""
+        stamp = file_stamp(path)
+        cached = self._cache.get(cache_key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        data = None
         try:
-            if not path or not path.exists():
-                self._cache[cache_key] = None
-                return None
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self._cache[cache_key] = data
-            return data
+            if stamp is not None:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
         except (OSError, ValueError, TypeError):
-            self._cache[cache_key] = None
-            return None
+            data = None
+        self._cache[cache_key] = (stamp, data)
+        return data
+
+    def bootstrap_sources(self):
+        """Return the local files each frontend bootstrap section is read from.
+
+        Returns:
+            dict: {"books" | "events" | "forum": [Path, ...]}; the bootstrap cache
+            rebuilds a section when one of its files' mtime changes.
+        """
+        processed = getattr(_config, "PROCESSED_DIR", None)
+        reviews = globals().get("REVIEWS_TOP50_BOOKS_LOCAL_PATH") or getattr(
+            _config, "REVIEWS_TOP50_BOOKS_LOCAL_PATH", None
+        )
+        return {
+            "books": [
+                p
+                for p in (
+                    reviews,
+                    processed / "reviews_top25_books.json",
+                    processed / "spl_top50_checkouts_in_books.json",
+                )
+                if p
+            ],
+            "events": [processed / "book_events_clean.json"],
+            "forum": [_forum_store.FORUM_DB_PATH],
+        }
 
     def get_top50_review_books(self):
         """Return list of book dicts from reviews_top50_books.json (local path)."""
@@ -370,10 +523,12 @@ class LocalStorage:
             return data["books"]
         return []
 
+    @memoized_read("user_account", "user_books", "user_events", "user_forums")
     def load_user_store(self, _email=None):
         """Load full user store from local JSON (email ignored; all users in files)."""
         return load_user_store()
 
+    @invalidates("user_books")
     def save_user_books(self, user_id_or_store, rec=None):
         """Persist user books to local JSON storage.
 
@@ -395,6 +550,7 @@ class LocalStorage:
         else:
             save_user_books(user_id_or_store)
 
+    @invalidates("user_events")
     def save_user_clubs(self, store):
         """Persist all users' saved clubs from a combined store.
 
@@ -409,6 +565,7 @@ class LocalStorage:
         """
         save_user_clubs(store)
 
+    @invalidates("user_forums")
     def save_user_forum(self, store):
         """Persist all users' forum metadata from a combined store.
 
@@ -423,6 +580,7 @@ class LocalStorage:
         """
         save_user_forum(store)
 
+    @memoized_read("user_account")
     def get_user_account(self, user_id):
         """Fetch a local user account by ID/email.
 
@@ -440,6 +598,7 @@ class LocalStorage:
         store = self.load_user_store()
         return ((store.get("accounts") or {}).get("users") or {}).get(str(user_id).strip().lower())
 
+    @memoized_read("user_books")
     def get_user_books(self, user_id):
         """Fetch local user books/preferences, returning defaults when missing.
 
@@ -458,6 +617,7 @@ class LocalStorage:
         store = self.load_user_store()
         return (store.get("books") or {}).get(str(user_id).strip().lower()) or _default_books_record()
 
+    @invalidates("user_account")
     def save_user_account(self, record):
         """Save a single local user account record.
 
@@ -476,6 +636,7 @@ class LocalStorage:
         users[uid] = record
         save_user_accounts(store)
 
+    @memoized_read("user_events")
     def get_user_events(self, user_id):
         """Fetch saved event IDs for a local user.
 
@@ -494,6 +655,7 @@ class LocalStorage:
         clubs = (store.get("clubs") or {}).get(str(user_id).strip().lower()) or {}
         return {"events": clubs.get("club_ids", [])}
 
+    @invalidates("user_events")
     def save_user_events(self, user_id, data):
         """Persist saved event IDs for a local user.
 
@@ -523,6 +685,7 @@ class LocalStorage:
         store.setdefault("clubs", {})[uid] = {"club_ids": events}
         save_user_clubs(store)
 
+    @memoized_read("user_forums")
     def get_user_forums(self, user_id):
         """Fetch local forum metadata for a user.
 
@@ -540,6 +703,7 @@ class LocalStorage:
         store = self.load_user_store()
         return (store.get("forum") or {}).get(str(user_id).strip().lower()) or {}
 
+    @invalidates("user_forums")
     def save_user_forums(self, user_id, data):
         """Persist local forum metadata for a user.
 
@@ -585,7 +749,9 @@ class LocalStorage:
         if not db:
             return
         save_forum_store(db)
+        note_write("forum")
 
+    @memoized_read("user_recommendations")
     def get_user_recommendations(self, user_id):
         """Fetch locally cached recommendations for one user.
 
@@ -616,6 +782,7 @@ class LocalStorage:
         except (OSError, ValueError, TypeError):
             return None
 
+    @invalidates("user_recommendations")
     def save_user_recommendations(self, user_id, rec):
         """Persist locally cached recommendations for one user.
 
@@ -653,6 +820,25 @@ class LocalStorage:
         except (OSError, ValueError, TypeError):
             return
 
+    def _load_upcoming_events(self):
+        """Read every event from book_events_clean.json (loader for the events pool).
+
+        Exceptions:
+            OSError/ValueError from reading the file; the pool logs them and keeps
+            its previous snapshot.
+        """
+        path = getattr(_config, "PROCESSED_DIR", None) / "book_events_clean.json"
+        if not path.exists():
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else []
+
+    def _events_snapshot(self):
+        """Return the shared upcoming-events snapshot for the local events file."""
+        path = getattr(_config, "PROCESSED_DIR", None) / "book_events_clean.json"
+        return get_events_pool(f"local:{path}", self._load_upcoming_events).snapshot()
+
     def get_soonest_events(self, limit=10):
         """Return soonest local events sorted by ttl/expiry.
 
@@ -660,21 +846,17 @@ class LocalStorage:
             limit: Maximum number of events to return.
 
         Returns:
-            list: Sorted event dicts (possibly empty).
+            list: Sorted event dicts (possibly empty); expired events are skipped.
 
         Exceptions:
             None. Invalid/missing data files return an empty list.
         """
-        path = getattr(_config, "PROCESSED_DIR", None) / "book_events_clean.json"
-        data = self._load_json_file(path, cache_key="book_events_clean")
-        if not isinstance(data, list):
-            return []
         # Match CloudStorage semantics: return soonest by ttl (ascending).
-        items = sorted(
-            (e for e in data if isinstance(e, dict)),
-            key=lambda x: int(x.get("ttl") or x.get("expiry") or 0),
-        )
-        return items[: max(0, int(limit))]
+        return self._events_snapshot().soonest(limit)
+
+    def get_soonest_events_index(self, limit=10):
+        """Return the EventIndex over get_soonest_events(limit), shared per events refresh."""
+        return self._events_snapshot().event_index(limit)
 
     def get_book_metadata(self, parent_asin):
         """Resolve local book metadata by parent ASIN/source ID.
@@ -763,10 +945,42 @@ class LocalStorage:
         eid = str(event_id or "").strip()
         if not eid:
             return None
-        for e in self.get_soonest_events(500) or []:
-            if str(e.get("event_id") or "").strip() == eid:
-                return dict(e)
-        return None
+        return self._events_snapshot().get(eid)
+
+    def get_events_batch(self, event_ids):
+        """Resolve several local events by ID, preserving the order of `event_ids`.
+
+        Args:
+            event_ids: Event identifiers.
+
+        Returns:
+            list: Event payloads for the IDs found (unknown IDs are omitted).
+
+        Exceptions:
+            None.
+        """
+        ids = [str(e or "").strip() for e in (event_ids or [])]
+        found = self._events_snapshot().get_many([e for e in ids if e])
+        return [dict(found[e]) for e in ids if e in found]
+
+    def iter_event_pages(self, page_size=None, *, city_state=None, parent_asin=None):
+        """Yield upcoming local events page by page (soonest first).
+
+        Same API as CloudStorage.iter_event_pages, served from the in-memory
+        events snapshot.
+
+        Args:
+            page_size: Events per page (default EVENTS_PAGE_SIZE).
+            city_state: Only events in this city/state.
+            parent_asin: Only events for this book.
+
+        Yields:
+            list: Event dicts of one page.
+        """
+        size = max(1, int(page_size or getattr(_config, "EVENTS_PAGE_SIZE", 50)))
+        yield from self._events_snapshot().pages(
+            size, city_state=city_state, parent_asin=parent_asin
+        )
 
     def get_events_by_city(self, city_state):
         """Filter local events by exact `city_state`.
@@ -783,40 +997,57 @@ class LocalStorage:
         city_state = str(city_state or "").strip()
         if not city_state:
             return []
-        events = [
-            e
-            for e in (self.get_soonest_events(500) or [])
-            if str(e.get("city_state") or "").strip() == city_state
-        ]
-        return events
-
-    def get_forum_post(self, _post_id):
+        return self._events_snapshot().for_city(city_state)
+
+    def get_forum_post(self, post_id):
         """Return one forum post by ID in local mode.
 
         Args:
             post_id: Forum post identifier.
 
         Returns:
-            None: Local mode currently does not implement this lookup.
+            dict | None: A copy of the post (safe to edit), or None when not found.
 
         Exceptions:
-            None.
+            None. Read/parse errors return None.
         """
-        return None
+        try:
+            post = self._forum_index().get(post_id)
+        except (OSError, ValueError, TypeError):
+            return None
+        return copy.deepcopy(post) if post is not None else None
 
-    def update_forum_post(self, _post_id, _post):
-        """Update one forum post in local mode.
+    def update_forum_post(self, post_id, post):
+        """Replace one forum post in the local forum file.
 
         Args:
             post_id: Forum post identifier.
             post: Updated post payload.
 
         Returns:
-            None.
+            None. Unknown post ids are ignored.
 
         Exceptions:
-            None. This local placeholder is currently a no-op.
+            OSError if the forum file cannot be written.
         """
+        pid = int(post_id)
+        stamp = file_stamp(_forum_store.FORUM_DB_PATH)
+        db = load_forum_store([])
+        item = {**post, "id": pid}
+        for i, existing in enumerate(db["posts"]):
+            if str(existing.get("id")) == str(pid):
+                db["posts"][i] = item
+                break
+        else:
+            return None
+        save_forum_store(db)
+        note_write("forum")
+        index = self._cached_forum_index(stamp)
+        if index is not None:
+            index.replace(item)
+        else:
+            index = ForumBookIndex(db["posts"])
+        self._cache["forum_index"] = (file_stamp(_forum_store.FORUM_DB_PATH), index)
         return None
 
     def get_spl_top50_checkout_books(self):
@@ -839,19 +1070,72 @@ class LocalStorage:
             return data.get("books") or data.get("items") or []
         return []
 
-    def get_forum_thread_for_book(self, _parent_asin):
-        """Return forum posts linked to a book in local mode.
+    def _cached_forum_index(self, stamp: Optional[tuple]) -> Optional[ForumBookIndex]:
+        """Return the cached forum index if it was built from the file at stamp."""
+        cached = self._cache.get("forum_index")
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        return None
+
+    def _forum_index(self) -> ForumBookIndex:
+        """Return the book index of the forum file, rebuilt when the file changes."""
+        stamp = file_stamp(_forum_store.FORUM_DB_PATH)
+        index = self._cached_forum_index(stamp)
+        if index is not None:
+            return index
+        index = ForumBookIndex(load_forum_store([]).get("posts") or [])
+        self._cache["forum_index"] = (stamp, index)
+        return index
+
+    def get_forum_thread_for_book(self, parent_asin, book_title=None, book_id=None):
+        """Return forum posts linked to a book in local mode, newest first.
 
         Args:
             parent_asin: Parent ASIN identifier.
+            book_title: Optional title; also matches older posts that only carry
+                the book's title (book_title or a tag).
+            book_id: Optional bootstrap book id; matches older posts that only
+                carry book_id.
 
         Returns:
-            list: Empty list (not implemented in local mode).
+            list: Copies of the matching posts (possibly empty).
 
         Exceptions:
-            None.
+            None. Read/parse errors return an empty list.
         """
-        return []
+        try:
+            posts = self._forum_index().thread(parent_asin, book_title, book_id)
+        except (OSError, ValueError, TypeError):
+            return []
+        return [dict(p) for p in posts]
+
+    def create_forum_post(self, post):
+        """Assign the next post id to a new post and persist it.
+
+        Args:
+            post: New post payload (without id).
+
+        Returns:
+            int: The id given to the post.
+
+        Exceptions:
+            OSError if the forum file cannot be written.
+        """
+        stamp = file_stamp(_forum_store.FORUM_DB_PATH)
+        db = load_forum_store([])
+        post_id = int(db.get("next_post_id") or 1)
+        item = {**post, "id": post_id}
+        db["posts"].insert(0, item)
+        db["next_post_id"] = post_id + 1
+        save_forum_store(db)
+        note_write("forum")
+        index = self._cached_forum_index(stamp)
+        if index is not None:
+            index.add(item)
+        else:
+            index = ForumBookIndex(db["posts"])
+        self._cache["forum_index"] = (file_stamp(_forum_store.FORUM_DB_PATH), index)
+        return post_id
 
     def get_forum_thread(self, _parent_asin):
         """Return forum thread wrapper for a book in local mode.
@@ -883,12 +1167,7 @@ class LocalStorage:
         pid = str(parent_asin or "").strip()
         if not pid:
             return []
-        events = [
-            e
-            for e in (self.get_soonest_events(500) or [])
-            if str(e.get("parent_asin") or "").strip() == pid
-        ]
-        return events[: max(0, int(limit))]
+        return self._events_snapshot().for_book(pid, limit=limit)
 
 
 class CloudStorage:
@@ -904,7 +1183,7 @@ class CloudStorage:
             boto3/botocore exceptions may be raised by client initialization.
         """
         # Always pin region so local dev doesn't depend on AWS CLI default region.
-        return boto3.resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
+        return _boto3().resource("dynamodb", region_name=getattr(_config, "AWS_REGION", None))
 
     def _s3(self):
         """Create an S3 client pinned to configured region.
@@ -916,7 +1195,7 @@ class CloudStorage:
             boto3/botocore exceptions may be raised by client initialization.
         """
         # Always pin region (bucket is regional and credentials may have default region elsewhere).
-        return boto3.client("s3", region_name=getattr(_config, "AWS_REGION", None))
+        return _boto3().client("s3", region_name=getattr(_config, "AWS_REGION", None))
 
     def _table(self, config_attr: str, env_fallback: str):
         """Resolve and return a DynamoDB table object.
@@ -934,6 +1213,31 @@ class CloudStorage:
         name = getattr(_config, config_attr, None) or os.getenv(config_attr, env_fallback)
         return self._dynamo().Table(name)
 
+    def bootstrap_sources(self):
+        """Return the local files each frontend bootstrap section is read from.
+
+        Returns:
+            dict: Always empty; AWS data has no local mtimes, so the bootstrap
+            cache relies on write generations and its max age instead.
+        """
+        return {}
+
+    def _put_user_item(self, table, key_attr: str, item: dict) -> None:
+        """Put a per-user item now, or queue it when write-behind is enabled."""
+        if getattr(_config, "WRITE_BEHIND_ENABLED", False):
+            get_write_behind(_flush_write_behind).put(table.name, key_attr, item)
+        else:
+            table.put_item(Item=item)
+
+    def _get_user_item(self, table, key_attr: str, user_id: str, **kwargs) -> Optional[dict]:
+        """Get a per-user item, preferring a write still held by the write-behind queue."""
+        queue = peek_write_behind()
+        if queue is not None:
+            item = queue.pending(table.name, user_id)
+            if item is not None:
+                return item
+        return table.get_item(Key={key_attr: user_id}, **kwargs).get("Item")
+
     def get_top50_review_books(self):
         """Return list of book dicts from S3 (reviews_top50_books.json)."""
         bucket = getattr(_config, "DATA_BUCKET", None) or os.getenv("DATA_BUCKET")
@@ -954,6 +1258,7 @@ class CloudStorage:
             return data["books"]
         return []
 
+    @memoized_read("user_account", "user_books", "user_events", "user_forums")
     def load_user_store(self, email=None):
         """Build a store-like dict for one user from DynamoDB (for frontend compatibility)."""
         email = (email or "").strip().lower()
@@ -984,6 +1289,7 @@ class CloudStorage:
             "forum": {email: forum_rec},
         }
 
+    @memoized_read("user_books")
     def get_user_books(self, user_id: str) -> Optional[dict]:
         """Get user library + genre_preferences from DynamoDB user_books table."""
         if not user_id:
@@ -992,8 +1298,7 @@ class CloudStorage:
         pk = getattr(_config, "USER_BOOKS_PK", "user_email").strip() or "user_email"
         try:
             table = self._table("USER_BOOKS_TABLE", "user_books")
-            resp = table.get_item(Key={pk: user_id}, ConsistentRead=True)
-            item = resp.get("Item")
+            item = self._get_user_item(table, pk, user_id, ConsistentRead=True)
             if not item:
                 return None
             out = _from_dynamo(item)
@@ -1018,6 +1323,7 @@ class CloudStorage:
             logging.warning("get_user_books failed for %s: %s", user_id, e)
             return None
 
+    @invalidates("user_books")
     def save_user_books(self, user_id_or_store, rec=None) -> None:
         """Persist one user's books (user_id, rec) or full store['books'] dict."""
         pk = getattr(_config, "USER_BOOKS_PK", "user_email").strip() or "user_email"
@@ -1047,7 +1353,7 @@ class CloudStorage:
                         item["library"][shelf] = tokens
                     else:
                         item["library"][shelf] = []
-                table.put_item(Item=item)
+                self._put_user_item(table, pk, item)
             except Exception as e:
                 logging.warning("save_user_books failed for %s: %s", user_id, e)
         else:
@@ -1055,6 +1361,7 @@ class CloudStorage:
                 if uid:
                     self.save_user_books(uid, r)
 
+    @invalidates("user_events")
     def save_user_clubs(self, store) -> None:
         """Persist store['clubs'] to DynamoDB user_events (events = list of event_id strings)."""
         for uid, rec in (store.get("clubs") or {}).items():
@@ -1066,12 +1373,14 @@ class CloudStorage:
                 ]
                 self.save_user_events(str(uid).strip().lower(), {"events": events})
 
+    @invalidates("user_forums")
     def save_user_forum(self, store) -> None:
         """Persist store['forum'] to DynamoDB user_forums."""
         for uid, data in (store.get("forum") or {}).items():
             if uid:
                 self.save_user_forums(str(uid).strip().lower(), data)
 
+    @memoized_read("user_recommendations")
     def get_user_recommendations(self, user_id: str) -> Optional[dict]:
         """Fetch a user's recommendation payload from DynamoDB.
 
@@ -1089,13 +1398,13 @@ class CloudStorage:
         user_id = str(user_id).strip().lower()
         try:
             table = self._table("USER_RECOMMENDATIONS_TABLE", "user_recommendations")
-            resp = table.get_item(Key={"user_email": user_id})
-            item = resp.get("Item")
+            item = self._get_user_item(table, "user_email", user_id)
             return _from_dynamo(item) if item else None
         except Exception as e:
             logging.warning("get_user_recommendations failed for %s: %s", user_id, e)
             return None
 
+    @invalidates("user_recommendations")
     def save_user_recommendations(self, user_id: str, rec: dict) -> None:
         """Persist a user's recommendation payload to DynamoDB.
 
@@ -1115,40 +1424,219 @@ class CloudStorage:
         try:
             table = self._table("USER_RECOMMENDATIONS_TABLE", "user_recommendations")
             item = {"user_email": user_id, **rec}
-            table.put_item(Item=_to_dynamo(item))
+            self._put_user_item(table, "user_email", _to_dynamo(item))
         except Exception as e:
             logging.warning("save_user_recommendations failed for %s: %s", user_id, e)
 
-    def get_soonest_events(self, limit: int = 10) -> list:
-        """Return soonest-upcoming events (by ttl).
+    def _load_upcoming_events(self) -> list:
+        """Read up to EVENTS_POOL_MAX_EVENTS soonest events (loader for the events pool).
 
-        Tries the configured EVENTS_GSI query first, and falls back to a table
-        scan when GSI query is unavailable (for example due to IAM/index config).
+        Pages through the configured EVENTS_GSI query (`ttl > now`) first. When
+        that query is unavailable (for example due to IAM/index config) it reads
+        the day-bucket GSI, and only scans the table when neither works.
+
+        Exceptions:
+            boto3/botocore errors when the scan fails too; the pool logs them and
+            keeps its previous snapshot.
         """
+        cap = max(1, int(getattr(_config, "EVENTS_POOL_MAX_EVENTS", 2000)))
         gsi = getattr(_config, "EVENTS_GSI", None) or os.getenv("EVENTS_GSI", "").strip() or None
+        if gsi:
+            try:
+                items: list = []
+                for page in self._query_event_pages(gsi, "type", "event", attributes=()):
+                    items.extend(page)
+                    if len(items) >= cap:
+                        break
+                return items[:cap]
+            except Exception as e:
+                # Fallback keeps Explore Events usable even when Query on GSI is denied.
+                logging.warning("events GSI query failed, trying day buckets: %s", e)
+        bucket_gsi = (
+            getattr(_config, "EVENTS_DAY_BUCKET_GSI", None)
+            or os.getenv("EVENTS_DAY_BUCKET_GSI", "").strip()
+            or None
+        )
+        if bucket_gsi:
+            try:
+                return self._load_from_day_buckets(bucket_gsi, cap)
+            except Exception as e:
+                logging.warning("events day-bucket query failed, scanning instead: %s", e)
+        return self._scan_upcoming_events(cap)
+
+    def _scan_upcoming_events(self, cap, now=None) -> list:
+        """Degraded last resort: scan for `ttl > now` events, bounded in reads.
+
+        Stops once EVENTS_SCAN_FACTOR * cap events were read or after
+        EVENTS_SCAN_MAX_PAGES pages, so a large table is never read in full on
+        each pool refresh; the result is the soonest `cap` of what was read,
+        which may miss sooner events further into the table.
+        """
+        cutoff = int(time.time() if now is None else now)
+        want = cap * max(1, int(getattr(_config, "EVENTS_SCAN_FACTOR", 3)))
+        max_pages = max(1, int(getattr(_config, "EVENTS_SCAN_MAX_PAGES", 10)))
+        logging.error(
+            "events pool DEGRADED: no usable events GSI (EVENTS_GSI / EVENTS_DAY_BUCKET_GSI); "
+            "scanning the events table for up to %d events / %d pages",
+            want,
+            max_pages,
+        )
+        table = self._table("EVENTS_TABLE", "events")
+        items: list = []
+        pages = _iter_pages(
+            table.scan,
+            FilterExpression="#t > :now",
+            ExpressionAttributeNames={"#t": "ttl"},
+            ExpressionAttributeValues={":now": cutoff},
+        )
+        for n_pages, page in enumerate(pages, start=1):
+            items.extend(page)
+            if len(items) >= want or n_pages >= max_pages:
+                pages.close()
+                break
+        items.sort(key=lambda x: int(x.get("ttl") or x.get("expiry") or 0))
+        return _from_dynamo(items[:cap])
+
+    def _load_from_day_buckets(self, gsi, cap, now=None) -> list:
+        """Read up to `cap` upcoming events from the day-bucket GSI, soonest first.
+
+        Queries the `day#YYYYMMDD` buckets from today through
+        EVENTS_DAY_BUCKET_DAYS ahead with `ttl > now`, DYNAMO_BATCH_MAX_WORKERS
+        buckets at a time in parallel, and stops after the wave that reaches
+        `cap`. Each bucket comes back sorted by ttl; the results are merged by ttl.
+        """
+        cutoff = int(time.time() if now is None else now)
+        days = max(1, int(getattr(_config, "EVENTS_DAY_BUCKET_DAYS", 120)))
+        buckets = [day_bucket(cutoff + d * 86400) for d in range(days)]
+        wave = max(1, int(getattr(_config, "DYNAMO_BATCH_MAX_WORKERS", 4)))
+        client = _dynamo_client()
+        table_name = self._table("EVENTS_TABLE", "events").name
+
+        def read_bucket(bucket: str) -> list:
+            """Return every upcoming event in one day bucket (all pages)."""
+            pages = _iter_pages(
+                client.query,
+                TableName=table_name,
+                IndexName=gsi,
+                KeyConditionExpression="#b = :b AND #t > :now",
+                ExpressionAttributeNames={"#b": "day_bucket", "#t": "ttl"},
+                ExpressionAttributeValues={":b": {"S": bucket}, ":now": {"N": str(cutoff)}},
+                ScanIndexForward=True,
+            )
+            return [decode_item(item) for page in pages for item in page]
+
+        items: list = []
+        for start in range(0, len(buckets), wave):
+            parts = map_concurrently(read_bucket, buckets[start:start + wave])
+            items.extend(heapq.merge(*parts, key=lambda x: int(x.get("ttl") or 0)))
+            if len(items) >= cap:
+                break
+        return items[:cap]
+
+    def _query_event_pages(
+        self, gsi, key_name, key_value, *, page_size=None, attributes=None, now=None
+    ):
+        """Yield non-empty pages of upcoming events from an events GSI, soonest first.
+
+        The key condition is `key_name = key_value AND ttl > now`, so expired
+        items that DynamoDB TTL has not deleted yet are never read.
+
+        Args:
+            gsi: Index name (partition key `key_name`, sort key `ttl`).
+            key_name: Partition key attribute of the index.
+            key_value: Partition key value.
+            page_size: Query Limit per request (None lets DynamoDB fill 1 MB pages).
+            attributes: Attributes to project; None uses EVENT_LIST_PROJECTION, () reads all.
+            now: Epoch seconds for the ttl cutoff (default: current time).
+        """
+        if attributes is None:
+            attributes = getattr(_config, "EVENT_LIST_PROJECTION", None)
+        kwargs = {
+            "IndexName": gsi,
+            "KeyConditionExpression": Key(key_name).eq(key_value)
+            & Key("ttl").gt(int(time.time() if now is None else now)),
+            "ScanIndexForward": True,
+            **projection(attributes),
+        }
+        if page_size:
+            kwargs["Limit"] = int(page_size)
+        for items in _iter_pages(self._table("EVENTS_TABLE", "events").query, **kwargs):
+            if items:
+                yield _from_dynamo(items)
+
+    def iter_event_pages(self, page_size=None, *, city_state=None, parent_asin=None):
+        """Yield upcoming events page by page (soonest first) for streaming UIs.
+
+        Reads the city_state / parent_asin / ttl GSI with a `ttl > now` key
+        condition and the list-view projection, following LastEvaluatedKey.
+        Without the matching GSI the in-memory events snapshot is paged instead.
+
+        Args:
+            page_size: Events per page (default EVENTS_PAGE_SIZE).
+            city_state: Only events in this city/state.
+            parent_asin: Only events for this book.
+
+        Yields:
+            list: Event dicts of one page.
+
+        Exceptions:
+            None. A failing query ends the stream early (logged).
+        """
+        size = max(1, int(page_size or getattr(_config, "EVENTS_PAGE_SIZE", 50)))
+        if city_state is not None:
+            key_name, key_value, attr = "city_state", str(city_state).strip(), "EVENTS_CITY_STATE_GSI"
+        elif parent_asin is not None:
+            key_name, key_value, attr = "parent_asin", str(parent_asin).strip(), "EVENTS_PARENT_ASIN_GSI"
+        else:
+            key_name, key_value, attr = "type", "event", "EVENTS_GSI"
+        if not key_value:
+            return
+        gsi = getattr(_config, attr, None) or os.getenv(attr, "").strip() or None
+        if not gsi:
+            yield from self._events_snapshot().pages(
+                size, city_state=city_state, parent_asin=parent_asin
+            )
+            return
         try:
-            table = self._table("EVENTS_TABLE", "events")
-            if gsi:
-                try:
-                    resp = table.query(
-                        IndexName=gsi,
-                        KeyConditionExpression=Key("type").eq("event"),
-                        Limit=limit,
-                        ScanIndexForward=True,
-                    )
-                    return _from_dynamo(resp.get("Items", []))
-                except Exception:
-                    # Fallback keeps Explore Events usable even when Query on GSI is denied.
-                    pass
-            resp = table.scan(Limit=min(limit * 3, 200))
-            items = resp.get("Items", [])
-            items = sorted(
-                items,
-                key=lambda x: int(x.get("ttl") or x.get("expiry") or 0),
-            )[:limit]
-            return _from_dynamo(items)
-        except Exception:
-            return []
+            yield from self._query_event_pages(gsi, key_name, key_value, page_size=size)
+        except Exception as e:
+            logging.warning("iter_event_pages(%s=%s) failed: %s", key_name, key_value, e)
+
+    def _events_from_index(self, key_name: str, value: str, limit=None) -> list:
+        """Answer a by-city / by-book read from the snapshot, or page its GSI when truncated.
+
+        A snapshot holding EVENTS_POOL_MAX_EVENTS events may be missing later
+        events, so the GSI is read instead (all pages, or until `limit`).
+        """
+        snap = self._events_snapshot()
+        if len(snap) < max(1, int(getattr(_config, "EVENTS_POOL_MAX_EVENTS", 2000))):
+            if key_name == "city_state":
+                return snap.for_city(value, limit=limit)
+            return snap.for_book(value, limit=limit)
+        out: list = []
+        pages = self.iter_event_pages(**{key_name: value})
+        for page in pages:
+            out.extend(page)
+            if limit is not None and len(out) >= limit:
+                pages.close()
+                break
+        return out if limit is None else out[: max(0, int(limit))]
+
+    def _events_snapshot(self):
+        """Return the shared upcoming-events snapshot for the events table."""
+        name = getattr(_config, "EVENTS_TABLE", None) or os.getenv("EVENTS_TABLE", "events")
+        return get_events_pool(f"dynamodb:{name}", self._load_upcoming_events).snapshot()
+
+    def get_soonest_events(self, limit: int = 10) -> list:
+        """Return soonest-upcoming events (by ttl) from the shared events snapshot.
+
+        Expired events are skipped; an unavailable events table returns [].
+        """
+        return self._events_snapshot().soonest(limit)
+
+    def get_soonest_events_index(self, limit: int = 10):
+        """Return the EventIndex over get_soonest_events(limit), shared per events refresh."""
+        return self._events_snapshot().event_index(limit)
 
     def get_book_metadata(self, parent_asin: str):
         """Fetch book metadata from the shared DynamoDB metadata helper.
@@ -1160,59 +1648,62 @@ class CloudStorage:
             dict | None: Book metadata record when found.
 
         Exceptions:
-            None. The delegated helper returns None on failures.
+            None. DynamoDB failures are logged and return None.
         """
-        return get_book_metadata(parent_asin)
+        if not parent_asin:
+            return get_book_metadata(parent_asin)
+        # Served from the process-wide metadata cache; misses (and not-found
+        # results, briefly) go to DynamoDB once. Errors are not cached, so a
+        # throttled read does not hide the book for the negative TTL.
+        try:
+            return get_metadata_cache().get_one(parent_asin, _read_book_metadata)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning("get_book_metadata(%s) failed: %s", parent_asin, e)
+            return None
     def get_books_metadata_batch(self, parent_asins: list[str]) -> dict[str, dict]:
         """Batch fetch book metadata from DynamoDB by parent_asin.
 
         Returns mapping parent_asin -> metadata dict for items that exist.
-        Uses BatchGetItem (up to 100 keys/request).
+        Cached ASINs are answered from the metadata cache; only misses are
+        sent to BatchGetItem (up to 100 keys/request).
         """
         ids = [str(x).strip() for x in (parent_asins or []) if str(x).strip()]
         if not ids:
             return {}
         # Deduplicate while preserving order (stable).
         ids = list(dict.fromkeys(ids))
+        return get_metadata_cache().get_many(ids, self._fetch_books_metadata_batch)
+
+    def _fetch_books_metadata_batch(self, ids: list[str]) -> dict[str, dict]:
+        """BatchGetItem the given (deduplicated) parent_asins in parallel 100-key chunks.
+
+        Unprocessed keys are retried with backoff; keys still unread afterwards
+        raise IncompleteFetch (with the items that were read) so the metadata
+        cache does not remember them as missing.
+        """
         out: dict[str, dict] = {}
-        try:
-            client = boto3.client(
-                "dynamodb", region_name=getattr(_config, "AWS_REGION", None)
-            )
-            table = self._table("BOOKS_TABLE", "books").name
-            # DynamoDB BatchGetItem limit: 100 keys.
-            for i in range(0, len(ids), 100):
-                chunk = ids[i : i + 100]
-                req = {
-                    table: {
-                        "Keys": [{"parent_asin": {"S": pid}} for pid in chunk]
-                    }
-                }
-                resp = client.batch_get_item(RequestItems=req)
-                items = (resp.get("Responses") or {}).get(table) or []
-                # items are in Dynamo wire format; reuse boto3 TypeDeserializer via resource
-                # by round-tripping through Table? We'll do lightweight manual decode via _from_dynamo
-                # by first converting attribute values with boto3.dynamodb.types.TypeDeserializer if available.
-                try:
-                    deser = TypeDeserializer()
-
-                    def _decode_item(it: dict, _deser: TypeDeserializer = deser) -> dict:
-                        """Decode one DynamoDB wire-format item to plain Python values."""
-                        return {k: _deser.deserialize(v) for k, v in it.items()}
-
-                    decoded = [_decode_item(it) for it in items]
-                except Exception:
-                    decoded = items  # best-effort; may already be plain dicts in some envs
-                for it in decoded:
-                    try:
-                        meta = _from_dynamo(it)
-                    except Exception:
-                        meta = it
-                    pid = str((meta or {}).get("parent_asin") or "").strip()
-                    if pid:
-                        out[pid] = dict(meta)
-        except Exception as e:
-            logging.warning("get_books_metadata_batch failed: %s", e)
+        if not ids:
+            return out
+        table = self._table("BOOKS_TABLE", "books").name
+        result = batch_get_items(
+            _dynamo_client(),
+            table,
+            [{"parent_asin": {"S": pid}} for pid in ids],
+            attributes=getattr(_config, "BOOK_METADATA_PROJECTION", None),
+        )
+        for meta in result.items:
+            # Items are decoded already; _from_dynamo catches stray Decimals.
+            meta = _from_dynamo(meta)
+            if not isinstance(meta, dict):
+                continue
+            pid = str(meta.get("parent_asin") or "").strip()
+            if pid:
+                out[pid] = dict(meta)
+        if result.unprocessed:
+            unresolved = [
+                str(decode_item(k).get("parent_asin") or "") for k in result.unprocessed
+            ]
+            raise IncompleteFetch(out, unresolved)
         return out
     def get_book_details(self, parent_asin: str):
         """Fetch detailed book data from shared detail helper.
@@ -1229,7 +1720,7 @@ class CloudStorage:
         return get_book_details(parent_asin)
 
     def get_event_details(self, event_id: str):
-        """Fetch one event record by ID from shared helper.
+        """Fetch one event record by ID, from the events snapshot or the shared helper.
 
         Args:
             event_id: Event identifier.
@@ -1240,25 +1731,59 @@ class CloudStorage:
         Exceptions:
             None. The delegated helper returns None on failures.
         """
+        event = self._events_snapshot().get(event_id)
+        if event is not None:
+            return event
         return get_event_details(event_id)
 
-    def get_events_by_city(self, city_state: str) -> list:
-        """Query events by city_state using EVENTS_CITY_STATE_GSI if set."""
-        gsi = getattr(_config, "EVENTS_CITY_STATE_GSI", None) or os.getenv("EVENTS_CITY_STATE_GSI", "").strip() or None
-        if not gsi:
+    def get_events_batch(self, event_ids: list[str]) -> list:
+        """Fetch several events by ID, preserving the order of `event_ids`.
+
+        IDs in the events snapshot are answered from memory; the rest are read
+        with BatchGetItem (100 keys per request, unprocessed keys retried).
+
+        Args:
+            event_ids: Event identifiers.
+
+        Returns:
+            list: Event payloads for the IDs found (unknown IDs are omitted).
+
+        Exceptions:
+            None. Backend failures omit the affected events.
+        """
+        ids = [str(e or "").strip() for e in (event_ids or [])]
+        wanted = list(dict.fromkeys(e for e in ids if e))
+        if not wanted:
             return []
-        try:
-            table = self._table("EVENTS_TABLE", "events")
-            resp = table.query(
-                IndexName=gsi,
-                KeyConditionExpression=Key("city_state").eq(city_state),
-                Limit=100,
-                ScanIndexForward=True,
-            )
-            return _from_dynamo(resp.get("Items", []))
-        except Exception:
+        found = self._events_snapshot().get_many(wanted)
+        missing = [e for e in wanted if e not in found]
+        if missing:
+            try:
+                result = batch_get_items(
+                    _dynamo_client(),
+                    self._table("EVENTS_TABLE", "events").name,
+                    [{"event_id": {"S": e}} for e in missing],
+                )
+                for item in result.items:
+                    item = _from_dynamo(item)
+                    if isinstance(item, dict) and item.get("event_id"):
+                        found[str(item["event_id"]).strip()] = item
+                if result.unprocessed:
+                    logging.warning(
+                        "get_events_batch: %d event ids unprocessed", len(result.unprocessed)
+                    )
+            except Exception as e:
+                logging.warning("get_events_batch failed: %s", e)
+        return [dict(found[e]) for e in ids if e in found]
+
+    def get_events_by_city(self, city_state: str) -> list:
+        """Return upcoming events in `city_state` (exact match) from the events snapshot."""
+        city_state = str(city_state or "").strip()
+        if not city_state:
             return []
+        return self._events_from_index("city_state", city_state)
 
+    @memoized_read("user_account")
     def get_user_account(self, user_id: str) -> Optional[dict]:
         """Fetch one user account record from DynamoDB.
 
@@ -1283,6 +1808,7 @@ class CloudStorage:
         except Exception:
             return None
 
+    @invalidates("user_account")
     def save_user_account(self, record: dict) -> None:
         """Persist one user account record to DynamoDB.
 
@@ -1308,6 +1834,7 @@ class CloudStorage:
         except Exception:
             pass
 
+    @memoized_read("user_events")
     def get_user_events(self, user_id: str) -> Optional[dict]:
         """Fetch saved events payload for one user from DynamoDB.
 
@@ -1326,12 +1853,12 @@ class CloudStorage:
         try:
             pk = getattr(_config, "USER_EVENTS_PK", "user_id")
             table = self._table("USER_EVENTS_TABLE", "user_events")
-            resp = table.get_item(Key={pk: user_id}, ConsistentRead=True)
-            item = resp.get("Item")
+            item = self._get_user_item(table, pk, user_id, ConsistentRead=True)
             return _from_dynamo(item) if item else None
         except Exception:
             return None
 
+    @invalidates("user_events")
     def save_user_events(self, user_id: str, data: dict) -> None:
         """Persist saved events payload for one user to DynamoDB.
 
@@ -1364,7 +1891,7 @@ class CloudStorage:
                     if s:
                         cleaned.append(s)
                 item["events"] = cleaned
-            table.put_item(Item=item)
+            self._put_user_item(table, pk, item)
         except Exception as e:
             logging.warning("save_user_events failed: %s", e)
 
@@ -1429,6 +1956,8 @@ class CloudStorage:
                 )
         except Exception as e:
             logging.warning("save_forum_db failed: %s", e)
+        # Also after a partial failure: readers must re-read what actually landed.
+        note_write("forum")
 
     def get_forum_post(self, post_id) -> Optional[dict]:
         """Fetch one forum post from DynamoDB by post ID.
@@ -1481,7 +2010,9 @@ class CloudStorage:
             table.put_item(Item=_forum_post_to_item(post, pk, sk, pk_value))
         except Exception as e:
             logging.warning("update_forum_post failed: %s", e)
+        note_write("forum")
 
+    @memoized_read("user_forums")
     def get_user_forums(self, user_id: str) -> Optional[dict]:
         """Fetch user forum metadata from DynamoDB.
 
@@ -1499,12 +2030,12 @@ class CloudStorage:
         user_id = str(user_id).strip().lower()
         try:
             table = self._table("USER_FORUMS_TABLE", "user_forums")
-            resp = table.get_item(Key={"user_email": user_id})
-            item = resp.get("Item")
+            item = self._get_user_item(table, "user_email", user_id)
             return _from_dynamo(item) if item else None
         except Exception:
             return None
 
+    @invalidates("user_forums")
     def save_user_forums(self, user_id: str, data: dict) -> None:
         """Persist user forum metadata to DynamoDB.
 
@@ -1523,7 +2054,7 @@ class CloudStorage:
         user_id = str(user_id).strip().lower()
         try:
             table = self._table("USER_FORUMS_TABLE", "user_forums")
-            table.put_item(Item={"user_email": user_id, **data})
+            self._put_user_item(table, "user_email", {"user_email": user_id, **data})
         except Exception:
             pass
 
@@ -1537,38 +2068,99 @@ class CloudStorage:
         if not bucket:
             return []
         try:
-            s3 = boto3.client("s3")
+            s3 = _boto3().client("s3")
             resp = s3.get_object(Bucket=bucket, Key=key)
             data = json.loads(resp["Body"].read().decode("utf-8"))
         except Exception:
             return []
         return data if isinstance(data, list) else data.get("books", data.get("items", []))
 
-    def get_forum_thread_for_book(self, parent_asin: str) -> list:
-        """Fetch forum posts for a given book using the configured GSI.
+    def get_forum_thread_for_book(
+        self, parent_asin: str, book_title: Optional[str] = None, book_id: Optional[int] = None
+    ) -> list:
+        """Fetch forum posts for a given book using the configured GSIs, newest first.
+
+        Posts are read from FORUM_POSTS_GSI by parent_asin and, when book_title is
+        given, from FORUM_POSTS_TITLE_GSI by normalized title (book_title_key), so
+        posts written without a parent_asin are found too.
 
         Args:
             parent_asin: Parent ASIN identifier.
+            book_title: Optional title; matched against book_title_key.
+            book_id: Accepted for parity with LocalStorage; bootstrap book ids are
+                not indexed in DynamoDB.
 
         Returns:
-            list: Matching forum post payloads (possibly empty).
+            list: Matching forum post payloads (possibly empty), without duplicates.
 
         Exceptions:
-            None. Missing GSI/errors return an empty list.
+            None. Missing GSIs/errors return what the other lookup found.
         """
+        _ = book_id
+        lookups = []
+        pid = str(parent_asin or "").strip()
         gsi = getattr(_config, "FORUM_POSTS_GSI", None) or os.getenv("FORUM_POSTS_GSI", "").strip() or None
-        if not gsi:
-            return []
-        try:
-            table = self._table("FORUM_POSTS_TABLE", "forum_posts")
-            resp = table.query(
-                IndexName=gsi,
-                KeyConditionExpression=Key("parent_asin").eq(parent_asin),
-                Limit=50,
-            )
-            return _from_dynamo(resp.get("Items", []))
-        except Exception:
+        if gsi and pid:
+            lookups.append((gsi, "parent_asin", pid))
+        title_key = _forum_store.book_title_key(book_title)
+        title_gsi = getattr(_config, "FORUM_POSTS_TITLE_GSI", None)
+        if title_gsi and title_key:
+            lookups.append((title_gsi, "book_title_key", title_key))
+        if not lookups:
             return []
+        by_id: dict = {}
+        for index_name, attr, value in lookups:
+            try:
+                table = self._table("FORUM_POSTS_TABLE", "forum_posts")
+                items: list = []
+                for page in _iter_pages(
+                    table.query,
+                    IndexName=index_name,
+                    KeyConditionExpression=Key(attr).eq(value),
+                    Limit=50,
+                ):
+                    items.extend(page)
+                posts = _from_dynamo(items)
+            except Exception as e:
+                logging.warning("forum thread lookup on %s failed: %s", index_name, e)
+                continue
+            for post in posts:
+                by_id.setdefault(post.get("id"), post)
+        posts = list(by_id.values())
+        posts.sort(key=lambda p: int(p.get("created_at") or 0), reverse=True)
+        return posts
+
+    def create_forum_post(self, post: dict) -> int:
+        """Assign the next post id to a new post and write only that post.
+
+        The id comes from an atomic increment of the next_post_id counter row, so
+        concurrent writers never share an id and no other post is rewritten.
+
+        Args:
+            post: New post payload (without id).
+
+        Returns:
+            int: The id given to the post.
+
+        Exceptions:
+            boto3/botocore errors propagate (nothing is written when the counter fails).
+        """
+        pk = getattr(_config, "FORUM_POSTS_PK", "pk")
+        sk = getattr(_config, "FORUM_POSTS_SK", "sk")
+        pk_value = getattr(_config, "FORUM_POSTS_PK_VALUE", "POST")
+        meta_pk = getattr(_config, "FORUM_POSTS_META_PK", "META")
+        next_sk = getattr(_config, "FORUM_POSTS_NEXT_ID_SK", "next_post_id")
+        table = self._table("FORUM_POSTS_TABLE", "forum_posts")
+        resp = table.update_item(
+            Key={pk: str(meta_pk), sk: str(next_sk)},
+            UpdateExpression="SET next_post_id = if_not_exists(next_post_id, :first) + :one",
+            ExpressionAttributeValues={":first": 1, ":one": 1},
+            ReturnValues="UPDATED_NEW",
+        )
+        post_id = int(_from_dynamo((resp.get("Attributes") or {}).get("next_post_id")) or 2) - 1
+        table.put_item(Item=_forum_post_to_item({**post, "id": post_id}, pk, sk, pk_value))
+        note_write("forum")
+        return post_id
 
     def get_forum_thread(self, parent_asin: str) -> Optional[dict]:
         """Fetch a forum thread wrapper for one book.
@@ -1586,7 +2178,7 @@ class CloudStorage:
         return {"posts": posts} if posts else None
 
     def get_events_for_book(self, parent_asin: str, limit: int = 10) -> list:
-        """Fetch upcoming events related to a book via events GSI.
+        """Return upcoming events related to a book from the events snapshot.
 
         Args:
             parent_asin: Parent ASIN identifier.
@@ -1596,23 +2188,14 @@ class CloudStorage:
             list: Matching event payloads (possibly empty).
 
         Exceptions:
-            None. Missing GSI/errors return an empty list.
+            None. An unavailable events table returns an empty list.
         """
-        gsi = (
-            getattr(_config, "EVENTS_PARENT_ASIN_GSI", None)
-            or os.getenv("EVENTS_PARENT_ASIN_GSI", "").strip()
-            or None
-        )
-        if not gsi:
-            return []
-        try:
-            table = self._table("EVENTS_TABLE", "events")
-            resp = table.query(
-                IndexName=gsi,
-                KeyConditionExpression=Key("parent_asin").eq(parent_asin),
-                Limit=limit,
-                ScanIndexForward=True,
-            )
-            return _from_dynamo(resp.get("Items", []))
-        except Exception:
+        pid = str(parent_asin or "").strip()
+        if not pid:
             return []
+        return self._events_from_index("parent_asin", pid, limit=limit)
+
+
+# Time every backend method (backend/instrumentation.py).
+instrument_class(LocalStorage, "storage.local")
+instrument_class(CloudStorage, "storage.cloud")
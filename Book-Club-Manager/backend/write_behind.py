@@ -0,0 +1,198 @@
+"""Optional write-behind queue for per-user activity writes (AWS mode).
+
+A shelf change used to cost several synchronous DynamoDB puts on the click
+path (user_books, then user_recommendations), and forum likes/saves and event
+saves each did their own put. With config.WRITE_BEHIND_ENABLED, CloudStorage
+hands those puts to a WriteBehindQueue instead:
+
+- Writes are keyed by (table, primary key value). A later write to the same
+  record within the window replaces the earlier one (the storage layer always
+  puts whole items), so a burst of clicks becomes one put per record.
+- A background thread flushes every config.WRITE_BEHIND_WINDOW_SECONDS with
+  BatchWriteItem (backend/dynamo_batch.batch_write_items, 25 items per request,
+  throttled items retried). Items that still fail are re-queued unless a newer
+  write for the record arrived meanwhile.
+- Reads consult pending() first: queued and in-flight items, and items flushed
+  less than config.WRITE_BEHIND_SETTLE_SECONDS ago (for tables read without
+  ConsistentRead), are served from this overlay, so the writing session always
+  reads its own writes.
+- close() (registered with atexit) stops the thread and flushes what is left.
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend import config
+
+# flush_fn(table_name, key_attr, items) -> key values of items that could not be written.
+FlushFn = Callable[[str, str, List[Dict[str, Any]]], List[str]]
+
+
+class WriteBehindQueue:  # pylint: disable=too-many-instance-attributes
+    """Coalescing per-record write buffer with a background flusher and a read overlay."""
+
+    def __init__(
+        self,
+        flush_fn: FlushFn,
+        window_seconds: float = 0.5,
+        settle_seconds: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+        start_thread: bool = True,
+    ) -> None:
+        """Create an empty queue.
+
+        Args:
+            flush_fn: Writes a list of plain items to one table and returns the
+                key values of the ones that failed.
+            window_seconds: How long writes are collected before a flush.
+            settle_seconds: How long flushed items stay in the read overlay.
+            clock: Monotonic clock (tests pass a fake).
+            start_thread: Start the background flusher on first put; tests pass
+                False and call flush() directly.
+        """
+        self._flush_fn = flush_fn
+        self.window_seconds = max(0.0, float(window_seconds))
+        self.settle_seconds = max(0.0, float(settle_seconds))
+        self._clock = clock
+        self._start_thread = start_thread
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Tuple[str, Dict[str, Any]]] = {}
+        self._in_flight: Dict[Tuple[str, str], Tuple[str, Dict[str, Any]]] = {}
+        self._recent: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.puts = 0
+        self.flushed = 0
+
+    def put(self, table_name: str, key_attr: str, item: Dict[str, Any]) -> None:
+        """Queue a whole-item put, replacing any queued put for the same record.
+
+        Args:
+            table_name: DynamoDB table name.
+            key_attr: Partition key attribute; item[key_attr] identifies the record.
+            item: Whole item to put (plain Python values).
+        """
+        key = str(item.get(key_attr, ""))
+        with self._lock:
+            self._pending[(table_name, key)] = (key_attr, copy.deepcopy(item))
+            self.puts += 1
+            if self._start_thread and self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="write-behind", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def pending(self, table_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the newest unsettled write for a record, or None."""
+        k = (table_name, str(key))
+        with self._lock:
+            entry = self._pending.get(k) or self._in_flight.get(k)
+            item = entry[1] if entry is not None else None
+            if item is None and k in self._recent:
+                flushed_at, recent = self._recent[k]
+                if self._clock() - flushed_at < self.settle_seconds:
+                    item = recent
+            return copy.deepcopy(item) if item is not None else None
+
+    def flush(self) -> int:
+        """Write everything queued now; return the number of items written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._in_flight.update(batch)
+            by_table: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any]]]] = {}
+            for (table_name, key), (key_attr, item) in batch.items():
+                by_table.setdefault((table_name, key_attr), []).append((key, item))
+            written = requeued = 0
+            for (table_name, key_attr), entries in by_table.items():
+                try:
+                    items = [item for _key, item in entries]
+                    failed = {str(k) for k in self._flush_fn(table_name, key_attr, items) or []}
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logging.warning("write-behind flush to %s failed: %s", table_name, e)
+                    failed = {key for key, _item in entries}
+                now = self._clock()
+                with self._lock:
+                    for key, item in entries:
+                        k = (table_name, key)
+                        self._in_flight.pop(k, None)
+                        if key in failed:
+                            # Keep the write unless a newer one for the record is queued.
+                            if k not in self._pending:
+                                self._pending[k] = (key_attr, item)
+                                requeued += 1
+                        else:
+                            written += 1
+                            self._recent[k] = (now, item)
+                    self._prune_recent(now)
+            if requeued:
+                logging.warning("write-behind: %d item(s) re-queued after a failed flush", requeued)
+                self._wake.set()
+            self.flushed += written
+            return written
+
+    def _prune_recent(self, now: float) -> None:
+        """Drop settled entries from the overlay (caller holds the lock)."""
+        for k in [k for k, (t, _item) in self._recent.items() if now - t >= self.settle_seconds]:
+            del self._recent[k]
+
+    def _run(self) -> None:
+        """Background loop: wait for a write, collect for one window, flush."""
+        while not self._stop.is_set():
+            self._wake.wait()
+            if self._stop.wait(self.window_seconds):
+                break
+            self._wake.clear()
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background thread and flush whatever is still queued."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(1.0, self.window_seconds * 4))
+        self.flush()
+
+
+_WRITE_BEHIND: Optional[WriteBehindQueue] = None
+_WRITE_BEHIND_LOCK = threading.Lock()
+
+
+def get_write_behind(flush_fn: FlushFn) -> WriteBehindQueue:
+    """Return the process-wide queue, creating it (and its atexit flush) on first use."""
+    global _WRITE_BEHIND  # pylint: disable=global-statement
+    if _WRITE_BEHIND is None:
+        with _WRITE_BEHIND_LOCK:
+            if _WRITE_BEHIND is None:
+                _WRITE_BEHIND = WriteBehindQueue(
+                    flush_fn,
+                    window_seconds=config.WRITE_BEHIND_WINDOW_SECONDS,
+                    settle_seconds=config.WRITE_BEHIND_SETTLE_SECONDS,
+                )
+                atexit.register(_WRITE_BEHIND.close)
+    return _WRITE_BEHIND
+
+
+def peek_write_behind() -> Optional[WriteBehindQueue]:
+    """Return the process-wide queue if one was created, without creating it."""
+    return _WRITE_BEHIND
+
+
+def reset_write_behind() -> None:
+    """Flush and discard the process-wide queue (tests, or before shutdown)."""
+    global _WRITE_BEHIND  # pylint: disable=global-statement
+    with _WRITE_BEHIND_LOCK:
+        queue, _WRITE_BEHIND = _WRITE_BEHIND, None
+    if queue is not None:
+        atexit.unregister(queue.close)
+        queue.close()
@@ -0,0 +1,5 @@
+"""Performance benchmarks: standalone scripts, synthetic data and baseline comparison.
+
+The pytest-benchmark suite that uses this package lives in tests/benchmarks/
+and is only collected with RUN_BENCHMARKS=1.
+"""
@@ -0,0 +1,592 @@
+"""
+In-memory stand-ins for the DynamoDB and S3 calls CloudStorage makes.
+
+The load test (benchmarks/load_test.py) runs CloudStorage against these
+instead of AWS so that AWS-mode code paths (metadata cache, events pool,
+request cache, write-behind, BatchGetItem fan-out) can be exercised locally.
+`AwsStandIn.install()` swaps `boto3.resource` / `boto3.client` for the
+stand-ins and switches config to AWS mode until the block exits.
+
+Supported surface (what backend/storage.py uses):
+
+- Table: get_item, put_item, update_item (`SET a = :v` and
+  `SET a = if_not_exists(a, :x) + :y` clauses), query and scan with
+  Limit / ExclusiveStartKey paging, ProjectionExpression, and key conditions
+  given either as boto3 `Key(...)` conditions or as expression strings.
+- Client: query (wire-format values), batch_get_item, batch_write_item.
+- S3: put_object, head_object and get_object (Range, IfMatch) on an in-memory bucket.
+
+Every call sleeps a configurable latency so caching and batching changes show
+up in the numbers the way network round trips would. Book detail shards are
+written as local parquet files and read through get_book_details(local_dir=...)
+because pandas reads `s3://` paths through s3fs, which cannot be intercepted.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import functools
+import hashlib
+import io
+import re
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import boto3
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from backend import config
+from backend import storage
+from backend.dynamo_batch import decode_item, decode_value, encode_item
+from backend.events_pool import day_bucket
+from benchmarks import synthetic
+
+# (attribute, operator, operands) with operator one of = < <= > >= BETWEEN begins_with.
+Condition = Tuple[str, str, Tuple[Any, ...]]
+
+_COMPARE_RE = re.compile(r"^(\S+)\s*(<=|>=|=|<|>)\s*(\S+)$")
+_BEGINS_RE = re.compile(r"^begins_with\s*\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)$", re.IGNORECASE)
+_BETWEEN_RE = re.compile(r"^(\S+)\s+BETWEEN\s+(\S+)$", re.IGNORECASE)
+_SET_IF_NOT_EXISTS_RE = re.compile(
+    r"^(\S+)\s*=\s*if_not_exists\(\s*(\S+)\s*,\s*(:\w+)\s*\)\s*\+\s*(:\w+)$", re.IGNORECASE
+)
+_SET_VALUE_RE = re.compile(r"^(\S+)\s*=\s*(:\w+)$")
+# Commas between SET clauses (not the ones inside if_not_exists(...)).
+_CLAUSE_SPLIT_RE = re.compile(r",(?![^()]*\))")
+
+
+def default_schemas() -> Dict[str, Tuple[Tuple[str, ...], Dict[str, Tuple[str, Optional[str]]]]]:
+    """Return {table name: (key attributes, {index name: (partition key, sort key)})} from config."""
+    events_indexes = {
+        config.EVENTS_GSI: ("type", "ttl"),
+        config.EVENTS_CITY_STATE_GSI: ("city_state", "ttl"),
+        config.EVENTS_PARENT_ASIN_GSI: ("parent_asin", "ttl"),
+        config.EVENTS_DAY_BUCKET_GSI: ("day_bucket", "ttl"),
+    }
+    forum_indexes = {
+        config.FORUM_POSTS_GSI: ("parent_asin", config.FORUM_POSTS_SK),
+        config.FORUM_POSTS_TITLE_GSI: ("book_title_key", config.FORUM_POSTS_SK),
+        config.FORUM_POSTS_CREATED_AT_GSI: (config.FORUM_POSTS_PK, "created_at"),
+    }
+    return {
+        config.BOOKS_TABLE: (("parent_asin",), {}),
+        config.EVENTS_TABLE: (("event_id",), {k: v for k, v in events_indexes.items() if k}),
+        config.FORUM_POSTS_TABLE: (
+            (config.FORUM_POSTS_PK, config.FORUM_POSTS_SK),
+            {k: v for k, v in forum_indexes.items() if k},
+        ),
+        config.USER_ACCOUNTS_TABLE: ((config.USER_ACCOUNTS_PK,), {}),
+        config.USER_BOOKS_TABLE: ((config.USER_BOOKS_PK,), {}),
+        config.USER_EVENTS_TABLE: ((config.USER_EVENTS_PK,), {}),
+        config.USER_FORUMS_TABLE: (("user_email",), {}),
+        config.USER_RECOMMENDATIONS_TABLE: (("user_email",), {}),
+        storage.USER_LIBRARY_TABLE: (("user_id",), {}),
+    }
+
+
+def _sort_value(value: Any) -> Tuple[int, Any]:
+    """Order numbers before strings and None last, like a mixed-type sort key would."""
+    if value is None:
+        return (2, "")
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, str(value))
+
+
+# Key condition operators: (item value, operands) -> bool.
+_KEY_CONDITIONS = {
+    "=": lambda value, operands: value == operands[0],
+    "<": lambda value, operands: value < operands[0],
+    "<=": lambda value, operands: value <= operands[0],
+    ">": lambda value, operands: value > operands[0],
+    ">=": lambda value, operands: value >= operands[0],
+    "BETWEEN": lambda value, operands: operands[0] <= value <= operands[1],
+    "begins_with": lambda value, operands: str(value).startswith(str(operands[0])),
+}
+
+
+def _matches(item: Dict[str, Any], conditions: Sequence[Condition]) -> bool:
+    """Return True if item satisfies every key condition."""
+    for attr, op, operands in conditions:
+        if attr not in item:
+            return False
+        check = _KEY_CONDITIONS.get(op)
+        try:
+            if check is not None and not check(item[attr], operands):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+def condition_from_boto3(cond: Any) -> List[Condition]:
+    """Flatten a boto3 Key(...) condition (possibly combined with &) into conditions."""
+    expr = cond.get_expression()
+    if expr["operator"] == "AND":
+        left, right = expr["values"]
+        return condition_from_boto3(left) + condition_from_boto3(right)
+    key, *operands = expr["values"]
+    return [(key.name, expr["operator"], tuple(operands))]
+
+
+def condition_from_string(
+    expression: str,
+    names: Optional[Dict[str, str]] = None,
+    values: Optional[Dict[str, Any]] = None,
+) -> List[Condition]:
+    """Parse a KeyConditionExpression string (`#b = :b AND #t > :now`, BETWEEN, begins_with).
+
+    Values are plain Python or wire format ({"N": "1"}), as the resource and
+    client APIs pass them respectively.
+    """
+    names = names or {}
+    values = values or {}
+
+    def name(token: str) -> str:
+        "Resolve a #placeholder."
+        return names.get(token, token)
+
+    def value(token: str) -> Any:
+        "Resolve a :placeholder."
+        return decode_value(values[token])
+
+    parts = re.split(r"\s+AND\s+", expression.strip(), flags=re.IGNORECASE)
+    out: List[Condition] = []
+    i = 0
+    while i < len(parts):
+        part = parts[i].strip().strip("()").strip()
+        between = _BETWEEN_RE.match(part)
+        begins = _BEGINS_RE.match(parts[i].strip())
+        compare = _COMPARE_RE.match(part)
+        if between and i + 1 < len(parts):
+            upper = parts[i + 1].strip().strip("()").strip()
+            out.append((name(between.group(1)), "BETWEEN", (value(between.group(2)), value(upper))))
+            i += 2
+            continue
+        if begins:
+            out.append((name(begins.group(1)), "begins_with", (value(begins.group(2)),)))
+        elif compare:
+            out.append((name(compare.group(1)), compare.group(2), (value(compare.group(3)),)))
+        else:
+            raise ValueError(f"unsupported key condition: {parts[i]!r}")
+        i += 1
+    return out
+
+
+def _project(item: Dict[str, Any], projection: Optional[str], names: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Return a copy of item limited to a ProjectionExpression (all attributes when None)."""
+    if not projection:
+        return copy.deepcopy(item)
+    names = names or {}
+    wanted = [names.get(a.strip(), a.strip()) for a in projection.split(",") if a.strip()]
+    return {a: copy.deepcopy(item[a]) for a in wanted if a in item}
+
+
+class StandInTable:
+    """One DynamoDB table (and its GSIs) held in memory."""
+
+    def __init__(
+        self,
+        name: str,
+        key_attrs: Sequence[str],
+        indexes: Optional[Dict[str, Tuple[str, Optional[str]]]] = None,
+        latency_s: float = 0.0,
+    ) -> None:
+        """Create an empty table keyed by key_attrs."""
+        self.name = name
+        self.key_attrs = tuple(key_attrs)
+        self.indexes = dict(indexes or {})
+        self.latency_s = latency_s
+        self.calls: Dict[str, int] = {}
+        self._items: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _call(self, op: str) -> None:
+        """Count a request and wait one simulated round trip."""
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+        if self.latency_s > 0:
+            time.sleep(self.latency_s)
+
+    def _key(self, item: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Return the primary key tuple of an item or Key dict."""
+        return tuple(decode_value(item.get(a)) for a in self.key_attrs)
+
+    def __len__(self) -> int:
+        """Return the number of stored items."""
+        return len(self._items)
+
+    def get_item(
+        self,
+        Key: Dict[str, Any],  # pylint: disable=invalid-name
+        ProjectionExpression: Optional[str] = None,  # pylint: disable=invalid-name
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,  # pylint: disable=invalid-name
+        **_kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Return {"Item": item} or {} when the key is absent."""
+        self._call("get_item")
+        with self._lock:
+            item = self._items.get(self._key(Key))
+            if item is None:
+                return {}
+            return {"Item": _project(item, ProjectionExpression, ExpressionAttributeNames)}
+
+    def put_item(self, Item: Dict[str, Any], **_kwargs: Any) -> Dict[str, Any]:  # pylint: disable=invalid-name
+        """Store (replace) a whole item."""
+        self._call("put_item")
+        self.load([Item])
+        return {}
+
+    def load(self, items: Sequence[Dict[str, Any]]) -> None:
+        """Store items without simulated latency (seeding)."""
+        with self._lock:
+            for item in items:
+                self._items[self._key(item)] = copy.deepcopy(dict(item))
+
+    def update_item(
+        self,
+        Key: Dict[str, Any],  # pylint: disable=invalid-name
+        UpdateExpression: str,  # pylint: disable=invalid-name
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,  # pylint: disable=invalid-name
+        ReturnValues: str = "NONE",  # pylint: disable=invalid-name
+        **_kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Apply SET clauses (plain values and if_not_exists(...) + increments) atomically."""
+        self._call("update_item")
+        values = ExpressionAttributeValues or {}
+        expression = re.sub(r"^\s*SET\s+", "", UpdateExpression, flags=re.IGNORECASE)
+        with self._lock:
+            key = self._key(Key)
+            item = self._items.setdefault(key, copy.deepcopy(dict(Key)))
+            updated: Dict[str, Any] = {}
+            for clause in (c.strip() for c in _CLAUSE_SPLIT_RE.split(expression)):
+                counter = _SET_IF_NOT_EXISTS_RE.match(clause)
+                plain = _SET_VALUE_RE.match(clause)
+                if counter:
+                    attr, source, default, inc = counter.groups()
+                    base = item.get(source, values[default])
+                    item[attr] = base + values[inc]
+                elif plain:
+                    attr, placeholder = plain.groups()
+                    item[attr] = copy.deepcopy(values[placeholder])
+                else:
+                    raise ValueError(f"unsupported update clause: {clause!r}")
+                updated[attr] = item[attr]
+            if ReturnValues == "ALL_NEW":
+                return {"Attributes": copy.deepcopy(item)}
+            if ReturnValues == "UPDATED_NEW":
+                return {"Attributes": copy.deepcopy(updated)}
+            return {}
+
+    def _page(
+        self,
+        items: List[Dict[str, Any]],
+        key_attrs: Tuple[str, ...],
+        limit: Optional[int],
+        start_key: Optional[Dict[str, Any]],
+        projection: Optional[str],
+        names: Optional[Dict[str, str]],
+    ) -> Dict[str, Any]:
+        """Slice one page of already ordered items, with LastEvaluatedKey when more remain."""
+        if start_key:
+            start = tuple(decode_value(start_key.get(a)) for a in key_attrs)
+            for pos, item in enumerate(items):
+                if tuple(item.get(a) for a in key_attrs) == start:
+                    items = items[pos + 1 :]
+                    break
+        page = items if not limit else items[: int(limit)]
+        out: Dict[str, Any] = {
+            "Items": [_project(item, projection, names) for item in page],
+            "Count": len(page),
+        }
+        if limit and len(items) > int(limit):
+            out["LastEvaluatedKey"] = {a: page[-1].get(a) for a in key_attrs if a in page[-1]}
+        return out
+
+    def query(
+        self,
+        KeyConditionExpression: Any,  # pylint: disable=invalid-name
+        IndexName: Optional[str] = None,  # pylint: disable=invalid-name
+        ScanIndexForward: bool = True,  # pylint: disable=invalid-name
+        Limit: Optional[int] = None,  # pylint: disable=invalid-name
+        ExclusiveStartKey: Optional[Dict[str, Any]] = None,  # pylint: disable=invalid-name
+        ProjectionExpression: Optional[str] = None,  # pylint: disable=invalid-name
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,  # pylint: disable=invalid-name
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,  # pylint: disable=invalid-name
+        **_kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Return one page of items matching the key condition, ordered by the sort key."""
+        self._call("query")
+        if IndexName is not None and IndexName not in self.indexes:
+            raise ClientError(
+                {"Error": {"Code": "ValidationException", "Message": f"no index {IndexName}"}},
+                "Query",
+            )
+        if isinstance(KeyConditionExpression, str):
+            conditions = condition_from_string(
+                KeyConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues
+            )
+        else:
+            conditions = condition_from_boto3(KeyConditionExpression)
+        if IndexName is not None:
+            partition, sort = self.indexes[IndexName]
+        else:
+            partition = self.key_attrs[0]
+            sort = self.key_attrs[1] if len(self.key_attrs) > 1 else None
+        key_attrs = tuple(dict.fromkeys(self.key_attrs + tuple(a for a in (partition, sort) if a)))
+        with self._lock:
+            matched = [item for item in self._items.values() if _matches(item, conditions)]
+        if sort:
+            matched.sort(key=lambda item: _sort_value(item.get(sort)), reverse=not ScanIndexForward)
+        return self._page(
+            matched, key_attrs, Limit, ExclusiveStartKey, ProjectionExpression, ExpressionAttributeNames
+        )
+
+    def scan(
+        self,
+        Limit: Optional[int] = None,  # pylint: disable=invalid-name
+        ExclusiveStartKey: Optional[Dict[str, Any]] = None,  # pylint: disable=invalid-name
+        ProjectionExpression: Optional[str] = None,  # pylint: disable=invalid-name
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,  # pylint: disable=invalid-name
+        **_kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Return one page of all items in primary-key order."""
+        self._call("scan")
+        with self._lock:
+            items = [self._items[k] for k in sorted(self._items, key=lambda k: [_sort_value(v) for v in k])]
+        return self._page(
+            items, self.key_attrs, Limit, ExclusiveStartKey, ProjectionExpression, ExpressionAttributeNames
+        )
+
+
+class StandInDynamoResource:
+    """`boto3.resource("dynamodb")` replacement: Table(name) returns a StandInTable."""
+
+    def __init__(self, latency_s: float = 0.0) -> None:
+        """Create tables lazily with the key schemas from default_schemas()."""
+        self.latency_s = latency_s
+        self._schemas = default_schemas()
+        self._tables: Dict[str, StandInTable] = {}
+        self._lock = threading.Lock()
+
+    def Table(self, name: str) -> StandInTable:  # pylint: disable=invalid-name
+        """Return the table called name, creating it on first use."""
+        with self._lock:
+            table = self._tables.get(name)
+            if table is None:
+                key_attrs, indexes = self._schemas.get(name, (("id",), {}))
+                table = self._tables[name] = StandInTable(name, key_attrs, indexes, self.latency_s)
+            return table
+
+    def calls(self) -> Dict[str, int]:
+        """Return request counts as {"table.operation": n}."""
+        with self._lock:
+            tables = list(self._tables.values())
+        return {
+            f"{t.name}.{op}": n for t in tables for op, n in sorted(t.calls.items())
+        }
+
+
+class StandInDynamoClient:
+    """`boto3.client("dynamodb")` replacement speaking wire format over the resource's tables."""
+
+    def __init__(self, resource: StandInDynamoResource) -> None:
+        """Share tables with resource."""
+        self.resource = resource
+
+    def query(self, TableName: str, **kwargs: Any) -> Dict[str, Any]:  # pylint: disable=invalid-name
+        """Query with wire-format values; returns wire-format items."""
+        if "ExclusiveStartKey" in kwargs:
+            kwargs["ExclusiveStartKey"] = decode_item(kwargs["ExclusiveStartKey"])
+        resp = self.resource.Table(TableName).query(**kwargs)
+        resp["Items"] = [encode_item(item) for item in resp["Items"]]
+        if "LastEvaluatedKey" in resp:
+            resp["LastEvaluatedKey"] = encode_item(resp["LastEvaluatedKey"])
+        return resp
+
+    def batch_get_item(self, RequestItems: Dict[str, Any]) -> Dict[str, Any]:  # pylint: disable=invalid-name
+        """Read every requested key (one simulated round trip per table)."""
+        responses: Dict[str, List[Dict[str, Any]]] = {}
+        for table_name, request in RequestItems.items():
+            table = self.resource.Table(table_name)
+            table._call("batch_get_item")  # pylint: disable=protected-access
+            found = []
+            for key in request.get("Keys") or []:
+                with table._lock:  # pylint: disable=protected-access
+                    item = table._items.get(table._key(key))  # pylint: disable=protected-access
+                if item is not None:
+                    found.append(
+                        encode_item(
+                            _project(
+                                item,
+                                request.get("ProjectionExpression"),
+                                request.get("ExpressionAttributeNames"),
+                            )
+                        )
+                    )
+            responses[table_name] = found
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+    def batch_write_item(self, RequestItems: Dict[str, Any]) -> Dict[str, Any]:  # pylint: disable=invalid-name
+        """Apply every PutRequest (one simulated round trip per table)."""
+        for table_name, requests in RequestItems.items():
+            table = self.resource.Table(table_name)
+            table._call("batch_write_item")  # pylint: disable=protected-access
+            table.load([decode_item(r["PutRequest"]["Item"]) for r in requests if "PutRequest" in r])
+        return {"UnprocessedItems": {}}
+
+
+class StandInS3:
+    """`boto3.client("s3")` replacement holding objects in memory."""
+
+    def __init__(self, latency_s: float = 0.0) -> None:
+        """Create an empty object store."""
+        self.latency_s = latency_s
+        self._objects: Dict[Tuple[str, str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket: str, Key: str, Body: Any, **_kwargs: Any) -> Dict[str, Any]:  # pylint: disable=invalid-name
+        """Store an object (str or bytes body)."""
+        if self.latency_s > 0:
+            time.sleep(self.latency_s)
+        data = Body.encode("utf-8") if isinstance(Body, str) else bytes(Body)
+        with self._lock:
+            self._objects[(Bucket, Key)] = data
+        return {}
+
+    def _object(self, bucket: str, key: str, code: str, operation: str) -> bytes:
+        """Return the stored bytes, or raise a ClientError with code like S3."""
+        if self.latency_s > 0:
+            time.sleep(self.latency_s)
+        with self._lock:
+            data = self._objects.get((bucket, key))
+        if data is None:
+            raise ClientError({"Error": {"Code": code, "Message": f"{bucket}/{key}"}}, operation)
+        return data
+
+    def head_object(self, Bucket: str, Key: str, **_kwargs: Any) -> Dict[str, Any]:  # pylint: disable=invalid-name
+        """Return ContentLength and ETag (quoted MD5); a missing key raises 404 like S3."""
+        data = self._object(Bucket, Key, "404", "HeadObject")
+        return {"ContentLength": len(data), "ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def get_object(  # pylint: disable=invalid-name
+        self,
+        Bucket: str,
+        Key: str,
+        Range: Optional[str] = None,
+        IfMatch: Optional[str] = None,
+        **_kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Return {"Body": stream}, honouring Range ("bytes=a-b") and IfMatch; missing keys raise NoSuchKey."""
+        data = self._object(Bucket, Key, "NoSuchKey", "GetObject")
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if IfMatch is not None and IfMatch != etag:
+            raise ClientError({"Error": {"Code": "PreconditionFailed", "Message": Key}}, "GetObject")
+        if Range:
+            start, end = (int(x) for x in Range.split("=", 1)[1].split("-", 1))
+            data = data[start : end + 1]
+        return {"Body": io.BytesIO(data), "ContentLength": len(data), "ETag": etag}
+
+
+class AwsStandIn:
+    """DynamoDB + S3 stand-ins plus the local directory holding book detail shards."""
+
+    def __init__(self, dynamo_latency_ms: float = 0.0, s3_latency_ms: float = 0.0) -> None:
+        """Create empty stand-ins with the given simulated per-request latencies."""
+        self.dynamo = StandInDynamoResource(dynamo_latency_ms / 1000.0)
+        self.client = StandInDynamoClient(self.dynamo)
+        self.s3 = StandInS3(s3_latency_ms / 1000.0)
+        # Owned for the stand-in's lifetime; removed by close() / the with block.
+        self._shard_dir = tempfile.TemporaryDirectory(  # pylint: disable=consider-using-with
+            prefix="bookish-standin-"
+        )
+        self.shard_dir = self._shard_dir.name
+
+    def __enter__(self) -> "AwsStandIn":
+        """Return the stand-in; leaving the with block removes the shard directory."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Remove the shard directory."""
+        self.close()
+
+    def seed(
+        self,
+        n_books: int,
+        forum: Dict[str, Any],
+        events: List[Dict[str, Any]],
+    ) -> None:
+        """Load synthetic books (table, shards, top-50 lists), events and forum posts."""
+        books = [synthetic.book_record(i) for i in range(n_books)]
+        self.dynamo.Table(config.BOOKS_TABLE).load(
+            [{k: v for k, v in b.items() if k != "description"} for b in books]
+        )
+        df = pd.DataFrame(books)
+        df["shard"] = df["parent_asin"].map(storage._get_shard_key)  # pylint: disable=protected-access
+        for shard, part in df.groupby("shard"):
+            part.drop(columns=["shard"]).to_parquet(f"{self.shard_dir}/{shard}.parquet", index=False)
+        top = pd.DataFrame(books).nlargest(50, "rating_number").to_json(orient="records")
+        self.s3.put_object(Bucket=config.DATA_BUCKET, Key=config.REVIEWS_TOP50_BOOKS_S3_KEY, Body=top)
+        self.s3.put_object(Bucket=config.DATA_BUCKET, Key=config.TOP50_BOOKS_S3_KEY, Body=top)
+
+        self.dynamo.Table(config.EVENTS_TABLE).load(
+            [{**e, "type": "event", "day_bucket": day_bucket(int(e["ttl"]))} for e in events]
+        )
+
+        pk, sk = config.FORUM_POSTS_PK, config.FORUM_POSTS_SK
+        posts_table = self.dynamo.Table(config.FORUM_POSTS_TABLE)
+        posts_table.load(
+            [
+                storage._forum_post_to_item(p, pk, sk, config.FORUM_POSTS_PK_VALUE)  # pylint: disable=protected-access
+                for p in forum["posts"]
+            ]
+        )
+        posts_table.load(
+            [
+                {
+                    pk: config.FORUM_POSTS_META_PK,
+                    sk: config.FORUM_POSTS_NEXT_ID_SK,
+                    "next_post_id": forum["next_post_id"],
+                }
+            ]
+        )
+
+    @contextlib.contextmanager
+    def install(self) -> Iterator["AwsStandIn"]:
+        """Route boto3 and CloudStorage to the stand-ins (and APP_ENV=aws) inside the block."""
+        real_resource, real_client = boto3.resource, boto3.client
+        real_details = storage.get_book_details
+        real_env = (config.IS_AWS, config.IS_LOCAL)
+
+        def resource(service: str, *_args: Any, **_kwargs: Any) -> Any:
+            "Return the DynamoDB stand-in."
+            if service != "dynamodb":
+                raise ValueError(f"no stand-in for resource {service!r}")
+            return self.dynamo
+
+        def client(service: str, *_args: Any, **_kwargs: Any) -> Any:
+            "Return the DynamoDB or S3 client stand-in."
+            if service == "dynamodb":
+                return self.client
+            if service == "s3":
+                return self.s3
+            raise ValueError(f"no stand-in for client {service!r}")
+
+        boto3.resource, boto3.client = resource, client
+        storage.get_book_details = functools.partial(real_details, local_dir=self.shard_dir)
+        config.IS_AWS, config.IS_LOCAL = True, False
+        try:
+            yield self
+        finally:
+            boto3.resource, boto3.client = real_resource, real_client
+            storage.get_book_details = real_details
+            config.IS_AWS, config.IS_LOCAL = real_env
+
+    def close(self) -> None:
+        """Remove the shard directory."""
+        self._shard_dir.cleanup()
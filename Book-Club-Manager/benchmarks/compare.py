@@ -0,0 +1,114 @@
+"""
+Compare two pytest-benchmark JSON files and flag regressions.
+
+A baseline is the file written by the benchmark suite with --benchmark-json
+(see tests/benchmarks/conftest.py). Benchmarks are matched by name; one whose
+chosen statistic (median by default) grew by more than --threshold (a
+fraction: 0.15 = 15% slower) is a regression, and the command exits with
+status 1 so CI can fail on it. Benchmarks present in only one file are
+listed but never fail the comparison.
+
+Usage (from Book-Club-Manager/):
+    python -m benchmarks.compare benchmarks/baselines/main.json current.json
+    python -m benchmarks.compare old.json new.json --threshold 0.25 --stat mean
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+STATS = ("min", "max", "mean", "median")
+
+
+def load_results(path: Path | str, stat: str = "median") -> Dict[str, float]:
+    """Return {benchmark name: stat in seconds} from a pytest-benchmark JSON file."""
+    with Path(path).open("r", encoding="utf-8") as file_obj:
+        data = json.load(file_obj)
+    out: Dict[str, float] = {}
+    for bench in data.get("benchmarks") or []:
+        name = bench.get("fullname") or bench.get("name")
+        value = (bench.get("stats") or {}).get(stat)
+        if name and value is not None:
+            out[str(name)] = float(value)
+    return out
+
+
+def compare(
+    baseline: Dict[str, float],
+    current: Dict[str, float],
+    threshold: float = 0.15,
+) -> List[Dict[str, Any]]:
+    """Return one row per benchmark: name, baseline, current, change and status.
+
+    change is current / baseline - 1 (None when either side is missing);
+    status is "regression", "improved" (faster by more than threshold), "ok",
+    "new" or "missing".
+    """
+    rows: List[Dict[str, Any]] = []
+    for name in sorted(set(baseline) | set(current)):
+        base = baseline.get(name)
+        cur = current.get(name)
+        change: Optional[float] = None
+        if base is None:
+            status = "new"
+        elif cur is None:
+            status = "missing"
+        else:
+            change = (cur / base - 1.0) if base > 0 else 0.0
+            if change > threshold:
+                status = "regression"
+            elif change < -threshold:
+                status = "improved"
+            else:
+                status = "ok"
+        rows.append(
+            {"name": name, "baseline": base, "current": cur, "change": change, "status": status}
+        )
+    return rows
+
+
+def _fmt_ms(seconds: Optional[float]) -> str:
+    """Format seconds as milliseconds, or '-' when missing."""
+    return "-" if seconds is None else f"{seconds * 1000.0:.3f}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse arguments, print the comparison table and return the exit status."""
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions against a baseline")
+    parser.add_argument("baseline", help="Baseline pytest-benchmark JSON file")
+    parser.add_argument("current", help="Current pytest-benchmark JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.15, help="Allowed slowdown as a fraction (default 0.15)"
+    )
+    parser.add_argument("--stat", choices=STATS, default="median", help="Statistic to compare")
+    args = parser.parse_args(argv)
+
+    rows = compare(
+        load_results(args.baseline, args.stat),
+        load_results(args.current, args.stat),
+        args.threshold,
+    )
+    width = max([len(r["name"]) for r in rows] + [9])
+    print(f"{'benchmark':<{width}} {'base ms':>10} {'now ms':>10} {'change':>8}  status")
+    for row in rows:
+        change = "-" if row["change"] is None else f"{row['change'] * 100.0:+.1f}%"
+        print(
+            f"{row['name']:<{width}} {_fmt_ms(row['baseline']):>10} "
+            f"{_fmt_ms(row['current']):>10} {change:>8}  {row['status']}"
+        )
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(
+            f"{len(regressions)} regression(s) beyond {args.threshold * 100.0:.0f}% ({args.stat})",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
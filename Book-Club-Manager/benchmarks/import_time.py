@@ -0,0 +1,123 @@
+"""
+Import-time budget for the Streamlit entrypoint (cold start of a worker).
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters, takes
+the fastest of --repeat runs, and prints the slowest modules by cumulative
+time. The check fails (exit status 1) when the import takes longer than
+--budget-ms or when any --forbid package was imported: pandas, sklearn,
+joblib and boto3 must stay off the import path and load on first use
+(pandas/sklearn only at fit time, boto3 only in AWS mode).
+
+Usage (from Book-Club-Manager/):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module backend.services.recommender_service --budget-ms 400
+    IMPORT_TIME_BUDGET_MS=800 python -m benchmarks.import_time --top 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_MODULE = "frontend.main"
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+DEFAULT_FORBIDDEN = ("pandas", "sklearn", "joblib", "boto3")
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[float, float]]:
+    """Return {module: (self ms, cumulative ms)} from -X importtime output.
+
+    Other stderr lines (warnings, log output) are ignored.
+    """
+    out: Dict[str, Tuple[float, float]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Header line ("self [us] | cumulative | imported package").
+        out[parts[2].strip()] = (self_us / 1000.0, cumulative_us / 1000.0)
+    return out
+
+
+def measure(module: str, env: Optional[Dict[str, str]] = None) -> Dict[str, Tuple[float, float]]:
+    """Import module in a fresh interpreter and return its parsed import times."""
+    run_env = dict(os.environ if env is None else env)
+    run_env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(PROJECT_ROOT), run_env.get("PYTHONPATH", "")) if p
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(PROJECT_ROOT),
+        env=run_env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def check(
+    times: Dict[str, Tuple[float, float]],
+    module: str,
+    budget_ms: float,
+    forbidden: Sequence[str] = DEFAULT_FORBIDDEN,
+) -> List[str]:
+    """Return the budget violations (empty when the import is within budget)."""
+    problems: List[str] = []
+    total = times.get(module, (0.0, 0.0))[1]
+    if total > budget_ms:
+        problems.append(f"import {module} took {total:.0f} ms (budget {budget_ms:.0f} ms)")
+    loaded = {name.split(".")[0] for name in times}
+    for name in forbidden:
+        if name in loaded:
+            problems.append(f"import {module} loaded {name}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse arguments, measure, print the slowest modules and return the exit status."""
+    parser = argparse.ArgumentParser(description="Check the cold import time of the app")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="Module to import")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="Allowed cumulative import time (default IMPORT_TIME_BUDGET_MS or 1500)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs; the fastest is used")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument(
+        "--forbid",
+        nargs="*",
+        default=list(DEFAULT_FORBIDDEN),
+        help="Packages that must not be imported (default: pandas sklearn joblib boto3)",
+    )
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.module) for _ in range(max(1, args.repeat))]
+    times = min(runs, key=lambda t: t.get(args.module, (0.0, float("inf")))[1])
+    print(f"{'cumulative ms':>13} {'self ms':>8}  module")
+    for name, (self_ms, cumulative_ms) in sorted(
+        times.items(), key=lambda kv: kv[1][1], reverse=True
+    )[: args.top]:
+        print(f"{cumulative_ms:>13.1f} {self_ms:>8.1f}  {name}")
+    problems = check(times, args.module, args.budget_ms, args.forbid)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,492 @@
+"""
+Load test: concurrent simulated users driving journeys through the service layer.
+
+Each virtual user signs in once, then repeatedly picks a journey (weighted)
+and runs its steps the way the Streamlit pages call the services, one
+request-cache unit of work per step (one rerun):
+
+- sign_in:    auth_service.login_user (bcrypt check, account read)
+- feed:       recommended books + events, newest forum posts
+- book_hub:   books_service.get_book_hub (details, forum thread, related events)
+- add_book:   library_service.add_book_to_library (and the recommender hook)
+- like_post:  forum_service.like_post
+- save_event: user_events_service.add_event_for_user
+
+Backends:
+
+- local: LocalStorage with its JSON files redirected to a temporary
+  directory seeded with synthetic books, events and forum posts.
+- aws:   CloudStorage against the in-memory DynamoDB/S3 stand-ins in
+  benchmarks/aws_standin.py, with simulated per-request latency.
+
+Users run as threads of one process (shared caches and pools, like one
+Streamlit server) or as separate processes (like several instances; with
+--backend aws each process has its own stand-in). The report gives
+throughput, p50/p95/p99 latency and error rate per step; in thread mode it
+also lists the storage/service operations that took the most time (from
+backend/instrumentation.py).
+
+Usage (from Book-Club-Manager/):
+    python -m benchmarks.load_test --users 8 --duration 30
+    python -m benchmarks.load_test --backend aws --users 32 --duration 60 --ops 15
+    python -m benchmarks.load_test --backend aws --mode process --users 4 --json run.json
+
+BCRYPT_ROUNDS (env, default 12) dominates sign_in; lower it to focus on storage.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from backend import config, forum_store, instrumentation, user_store
+from backend.refresh_executor import get_refresh_executor
+from backend.request_cache import unit_of_work
+from backend.services import (
+    auth_service,
+    books_service,
+    forum_service,
+    library_service,
+    recommender_service,
+    user_events_service,
+)
+from backend.write_behind import reset_write_behind
+from benchmarks import synthetic
+from benchmarks.aws_standin import AwsStandIn
+
+PASSWORD = "load-test-password"
+
+# (step, seconds, error message or "")
+Sample = Tuple[str, float, str]
+
+
+@dataclass
+class LoadOptions:  # pylint: disable=too-many-instance-attributes
+    """Settings of one load-test run (picklable for process workers); a flat record of CLI options."""
+
+    backend: str = "local"
+    users: int = 8
+    mode: str = "thread"
+    duration: float = 30.0
+    iterations: int = 0
+    books: int = 10_000
+    events: int = 500
+    posts: int = 2_000
+    dynamo_latency_ms: float = 4.0
+    s3_latency_ms: float = 20.0
+    think_ms: float = 0.0
+    seed: int = 0
+    workdir: str = ""
+
+
+@dataclass
+class _Catalog:
+    """Ids the journeys pick from."""
+
+    book_ids: List[str]
+    event_ids: List[str]
+    post_ids: List[int]
+
+
+def _user_email(n: int) -> str:
+    """Return the email of virtual user n."""
+    return f"load-user-{n:04d}@example.com"
+
+
+def _step_feed(user: str, _rng: random.Random, _catalog: _Catalog) -> None:
+    """Load the feed: book and event recommendations plus newest posts."""
+    recommender_service.get_recommended_books_for_user(user)
+    recommender_service.get_recommended_events_for_user(user)
+    forum_service.get_posts_sorted("newest")
+
+
+def _step_book_hub(_user: str, rng: random.Random, catalog: _Catalog) -> None:
+    """Open a random book's hub page."""
+    books_service.get_book_hub(rng.choice(catalog.book_ids))
+
+
+def _step_add_book(user: str, rng: random.Random, catalog: _Catalog) -> None:
+    """Put a random book on a random shelf."""
+    shelf = rng.choice(("saved", "in_progress", "finished"))
+    library_service.add_book_to_library(user, rng.choice(catalog.book_ids), shelf)
+
+
+def _step_like_post(user: str, rng: random.Random, catalog: _Catalog) -> None:
+    """Toggle the like on a random forum post."""
+    forum_service.like_post(rng.choice(catalog.post_ids), user)
+
+
+def _step_save_event(user: str, rng: random.Random, catalog: _Catalog) -> None:
+    """Save a random event."""
+    user_events_service.add_event_for_user(user, rng.choice(catalog.event_ids))
+
+
+STEPS: Dict[str, Callable[[str, random.Random, _Catalog], None]] = {
+    "feed": _step_feed,
+    "book_hub": _step_book_hub,
+    "add_book": _step_add_book,
+    "like_post": _step_like_post,
+    "save_event": _step_save_event,
+}
+
+# name -> (weight, steps)
+JOURNEYS: Dict[str, Tuple[int, Tuple[str, ...]]] = {
+    "browse": (5, ("feed", "book_hub", "book_hub", "feed")),
+    "shelve": (3, ("feed", "book_hub", "add_book", "feed")),
+    "social": (2, ("feed", "like_post", "save_event")),
+}
+
+
+def _seed_local(workdir: Path, opts: LoadOptions) -> _Catalog:
+    """Write the synthetic local data files (100 books, events, forum) into workdir."""
+    workdir.mkdir(parents=True, exist_ok=True)
+    books = [synthetic.book_record(i) for i in range(100)]
+    events = synthetic.event_pool(opts.events, n_books=100, seed=opts.seed)
+    forum = synthetic.forum_db(opts.posts, n_books=100, seed=opts.seed)
+    files = {
+        "reviews_top50_books.json": books[:50],
+        "spl_top50_checkouts_in_books.json": books[50:],
+        "book_events_clean.json": events,
+        "forum_posts.json": forum,
+    }
+    for name, data in files.items():
+        (workdir / name).write_text(json.dumps(data), encoding="utf-8")
+    return _Catalog(
+        [b["parent_asin"] for b in books],
+        [e["event_id"] for e in events],
+        [p["id"] for p in forum["posts"]],
+    )
+
+
+@contextlib.contextmanager
+def _local_paths(workdir: Path) -> Iterator[None]:
+    """Point LocalStorage's JSON files at workdir inside the block."""
+    targets: Dict[Any, Dict[str, Path]] = {
+        config: {
+            "PROCESSED_DIR": workdir,
+            "USERS_DIR": workdir,
+            "USER_ACCOUNTS_PATH": workdir / "user_accounts.json",
+            "USER_BOOKS_PATH": workdir / "user_books.json",
+            "USER_CLUBS_PATH": workdir / "user_clubs.json",
+            "USER_FORUM_PATH": workdir / "user_forum.json",
+            "FORUM_DB_PATH": workdir / "forum_posts.json",
+            "USER_RECOMMENDATIONS_PATH": workdir / "user_recommendations.json",
+            "USER_EVENTS_PATH": workdir / "user_events.json",
+            "REVIEWS_TOP50_BOOKS_LOCAL_PATH": workdir / "reviews_top50_books.json",
+        },
+        user_store: {
+            "PROCESSED_DIR": workdir,
+            "USER_ACCOUNTS_PATH": workdir / "user_accounts.json",
+            "USER_BOOKS_PATH": workdir / "user_books.json",
+            "USER_CLUBS_PATH": workdir / "user_clubs.json",
+            "USER_FORUM_PATH": workdir / "user_forum.json",
+        },
+        forum_store: {"PROCESSED_DIR": workdir, "FORUM_DB_PATH": workdir / "forum_posts.json"},
+    }
+    saved = {
+        (module, name): getattr(module, name) for module, attrs in targets.items() for name in attrs
+    }
+    env = (config.IS_AWS, config.IS_LOCAL)
+    for module, attrs in targets.items():
+        for name, value in attrs.items():
+            setattr(module, name, value)
+    config.IS_AWS, config.IS_LOCAL = False, True
+    try:
+        yield
+    finally:
+        for (module, name), value in saved.items():
+            setattr(module, name, value)
+        config.IS_AWS, config.IS_LOCAL = env
+
+
+@contextlib.contextmanager
+def prepared_backend(opts: LoadOptions, seed_local: bool = True) -> Iterator[_Catalog]:
+    """Set up the chosen backend with synthetic data and yield the ids journeys use.
+
+    Local data lives in opts.workdir; seed_local=False (process workers) reuses
+    the files the parent wrote. The aws stand-in is always seeded, since it is
+    in-memory and per process.
+    """
+    if opts.backend == "local":
+        workdir = Path(opts.workdir)
+        catalog = _seed_local(workdir, opts) if seed_local else None
+        with _local_paths(workdir):
+            if catalog is None:
+                catalog = _local_catalog(workdir)
+            yield catalog
+        return
+    events = synthetic.event_pool(opts.events, n_books=opts.books, seed=opts.seed)
+    forum = synthetic.forum_db(opts.posts, n_books=opts.books, seed=opts.seed)
+    with AwsStandIn(opts.dynamo_latency_ms, opts.s3_latency_ms) as standin:
+        standin.seed(opts.books, forum, events)
+        with standin.install():
+            yield _Catalog(
+                [synthetic.book_id(i) for i in range(opts.books)],
+                [e["event_id"] for e in events],
+                [p["id"] for p in forum["posts"]],
+            )
+
+
+def _local_catalog(workdir: Path) -> _Catalog:
+    """Re-read the ids of a local data directory seeded by _seed_local."""
+    def load(name: str) -> Any:
+        "Read one seeded file."
+        return json.loads((workdir / name).read_text(encoding="utf-8"))
+
+    books = load("reviews_top50_books.json") + load("spl_top50_checkouts_in_books.json")
+    return _Catalog(
+        [b["parent_asin"] for b in books],
+        [e["event_id"] for e in load("book_events_clean.json")],
+        [p["id"] for p in load("forum_posts.json")["posts"]],
+    )
+
+
+def create_users(first: int, count: int) -> None:
+    """Sign up virtual users first .. first+count-1 (not timed)."""
+    for n in range(first, first + count):
+        try:
+            auth_service.create_user(_user_email(n), PASSWORD)
+        except ValueError:
+            pass  # Already exists (e.g. local files reused).
+
+
+def _timed(step: str, fn: Callable[[], None], samples: List[Sample]) -> None:
+    """Run one step as one rerun and record its latency and error."""
+    error = ""
+    start = time.perf_counter()
+    try:
+        with unit_of_work(step):
+            fn()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error = f"{type(e).__name__}: {e}"
+    samples.append((step, time.perf_counter() - start, error))
+
+
+def run_user(n: int, opts: LoadOptions, catalog: _Catalog, deadline: float) -> List[Sample]:
+    """Drive virtual user n until the deadline (or opts.iterations journeys)."""
+    rng = random.Random(opts.seed * 100_003 + n)
+    user = _user_email(n)
+    names = list(JOURNEYS)
+    weights = [JOURNEYS[name][0] for name in names]
+    samples: List[Sample] = []
+    _timed("sign_in", lambda: auth_service.login_user(user, PASSWORD), samples)
+    done = 0
+    while time.monotonic() < deadline and (opts.iterations <= 0 or done < opts.iterations):
+        journey = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        failed = False
+        for step in JOURNEYS[journey][1]:
+            _timed(step, lambda s=step: STEPS[s](user, rng, catalog), samples)
+            failed = failed or bool(samples[-1][2])
+            if opts.think_ms > 0:
+                time.sleep(opts.think_ms / 1000.0)
+        samples.append((f"journey.{journey}", time.perf_counter() - start, "failed" if failed else ""))
+        done += 1
+    return samples
+
+
+def _process_worker(
+    first: int, count: int, opts: LoadOptions
+) -> Tuple[List[Sample], Dict[str, Any], float]:
+    """Process entry point: prepare the backend, run `count` users on threads.
+
+    Returns the samples, the operation snapshot and the seconds spent running
+    (setup excluded).
+    """
+    with prepared_backend(opts, seed_local=False) as catalog:
+        if opts.backend != "local":
+            create_users(first, count)
+        instrumentation.get_registry().reset()
+        start = time.perf_counter()
+        samples = _run_threads(range(first, first + count), opts, catalog)
+        elapsed = time.perf_counter() - start
+        return samples, instrumentation.get_registry().snapshot(), elapsed
+
+
+def _run_threads(user_ids: range, opts: LoadOptions, catalog: _Catalog) -> List[Sample]:
+    """Run one thread per virtual user and return all samples."""
+    deadline = time.monotonic() + (opts.duration if opts.iterations <= 0 else 10**9)
+    results: List[List[Sample]] = [[] for _ in user_ids]
+
+    def target(slot: int, n: int) -> None:
+        "Thread body."
+        results[slot] = run_user(n, opts, catalog, deadline)
+
+    threads = [
+        threading.Thread(target=target, args=(slot, n), name=f"load-user-{n}")
+        for slot, n in enumerate(user_ids)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    get_refresh_executor().wait(timeout=30)
+    reset_write_behind()
+    return [s for part in results for s in part]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    """Aggregate samples into per-step stats, throughput and error rates."""
+    registry = instrumentation.Registry(sample_size=max(1, len(samples)))
+    first_errors: Dict[str, str] = {}
+    for step, seconds, error in samples:
+        registry.record(step, seconds, bool(error))
+        if error and step not in first_errors:
+            first_errors[step] = error
+    steps = registry.snapshot()
+    for step, stats in steps.items():
+        stats["error_rate"] = round(stats["errors"] / stats["count"], 4) if stats["count"] else 0.0
+        stats["per_second"] = round(stats["count"] / elapsed, 2) if elapsed > 0 else 0.0
+        if step in first_errors:
+            stats["first_error"] = first_errors[step]
+    requests = [s for s in samples if not s[0].startswith("journey.")]
+    journeys = [s for s in samples if s[0].startswith("journey.")]
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": len(requests),
+        "requests_per_second": round(len(requests) / elapsed, 2) if elapsed > 0 else 0.0,
+        "journeys": len(journeys),
+        "journeys_per_second": round(len(journeys) / elapsed, 2) if elapsed > 0 else 0.0,
+        "error_rate": round(sum(1 for s in requests if s[2]) / len(requests), 4) if requests else 0.0,
+        "steps": steps,
+    }
+
+
+def run(opts: LoadOptions) -> Dict[str, Any]:
+    """Prepare the backend, run the load and return the summary (plus top operations)."""
+    with contextlib.ExitStack() as stack:
+        if not opts.workdir:
+            opts.workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="bookish-load-"))
+        if opts.mode == "process":
+            per = [opts.users // max(1, _cpu_slots(opts)) for _ in range(_cpu_slots(opts))]
+            for i in range(opts.users - sum(per)):
+                per[i] += 1
+            if opts.backend == "local":
+                with prepared_backend(opts):
+                    create_users(0, opts.users)
+            ctx = multiprocessing.get_context("spawn")
+            samples: List[Sample] = []
+            ops: Dict[str, Any] = {}
+            elapsed = 0.0
+            with ProcessPoolExecutor(max_workers=len(per), mp_context=ctx) as pool:
+                firsts = [sum(per[:i]) for i in range(len(per))]
+                futures = [
+                    pool.submit(_process_worker, first, count, opts)
+                    for first, count in zip(firsts, per)
+                    if count
+                ]
+                for future in futures:
+                    part, snapshot, seconds = future.result()
+                    samples.extend(part)
+                    _merge_ops(ops, snapshot)
+                    elapsed = max(elapsed, seconds)
+        else:
+            with prepared_backend(opts) as catalog:
+                create_users(0, opts.users)
+                instrumentation.get_registry().reset()
+                start = time.perf_counter()
+                samples = _run_threads(range(opts.users), opts, catalog)
+                elapsed = time.perf_counter() - start
+                ops = instrumentation.get_registry().snapshot()
+    summary = summarize(samples, elapsed)
+    summary["options"] = asdict(opts)
+    summary["operations"] = ops
+    return summary
+
+
+def _cpu_slots(opts: LoadOptions) -> int:
+    """Return the number of worker processes (one per CPU, at most one per user)."""
+    return max(1, min(opts.users, multiprocessing.cpu_count()))
+
+
+def _merge_ops(into: Dict[str, Any], snapshot: Dict[str, Any]) -> None:
+    """Add one process's operation counts, errors and totals (percentiles are not mergeable)."""
+    for op, stats in snapshot.items():
+        row = into.setdefault(op, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        row["count"] += stats["count"]
+        row["errors"] += stats["errors"]
+        row["total_ms"] = round(row["total_ms"] + stats["total_ms"], 3)
+        row["max_ms"] = max(row["max_ms"], stats["max_ms"])
+        row["mean_ms"] = round(row["total_ms"] / row["count"], 3) if row["count"] else 0.0
+
+
+def print_report(summary: Dict[str, Any], top_ops: int = 10) -> None:
+    """Print the per-step table, totals and the slowest operations."""
+    print(
+        f"{'step':<18} {'count':>7} {'err %':>6} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'mean ms':>8}"
+    )
+    for step, s in summary["steps"].items():
+        print(
+            f"{step:<18} {s['count']:>7} {s['error_rate'] * 100:>6.1f} {s['per_second']:>8.2f} "
+            f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['mean_ms']:>8.1f}"
+        )
+    print(
+        f"\n{summary['requests']} requests, {summary['journeys']} journeys in "
+        f"{summary['elapsed_s']:.1f}s: {summary['requests_per_second']:.1f} req/s, "
+        f"{summary['journeys_per_second']:.2f} journeys/s, "
+        f"error rate {summary['error_rate'] * 100:.2f}%"
+    )
+    errors = {k: v["first_error"] for k, v in summary["steps"].items() if "first_error" in v}
+    for step, error in errors.items():
+        print(f"  first {step} error: {error}")
+    ops = sorted(summary["operations"].items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+    if ops and top_ops > 0:
+        print(f"\n{'operation':<52} {'count':>7} {'errors':>6} {'total ms':>10} {'mean ms':>8}")
+        for op, s in ops[:top_ops]:
+            print(f"{op:<52} {s['count']:>7} {s['errors']:>6} {s['total_ms']:>10.1f} {s['mean_ms']:>8.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse arguments, run the load test and print (and optionally save) the report."""
+    parser = argparse.ArgumentParser(description="Concurrent user-journey load test")
+    parser.add_argument("--backend", choices=("local", "aws"), default="local")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent virtual users")
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument(
+        "--iterations", type=int, default=0, help="Journeys per user (overrides --duration)"
+    )
+    parser.add_argument("--books", type=int, default=10_000, help="Catalog size (aws backend)")
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--posts", type=int, default=2_000)
+    parser.add_argument("--dynamo-latency-ms", type=float, default=4.0)
+    parser.add_argument("--s3-latency-ms", type=float, default=20.0)
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pause between steps")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ops", type=int, default=10, help="Slowest operations to list")
+    parser.add_argument("--json", help="Also write the full summary to this file")
+    args = parser.parse_args(argv)
+
+    opts = LoadOptions(
+        backend=args.backend,
+        users=max(1, args.users),
+        mode=args.mode,
+        duration=args.duration,
+        iterations=args.iterations,
+        books=args.books,
+        events=args.events,
+        posts=args.posts,
+        dynamo_latency_ms=args.dynamo_latency_ms,
+        s3_latency_ms=args.s3_latency_ms,
+        think_ms=args.think_ms,
+        seed=args.seed,
+    )
+    summary = run(opts)
+    print_report(summary, args.ops)
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Microbenchmark: per-call input overhead of the content-based recommender.
+
+Compares the DataFrame API (recommend() with user_genres_df / user_books_df,
+as recommend_for_user used to build them) against the typed UserSignals path
+that recommend_for_user and the service layer now use. A tiny catalog and a
+disabled profile cache keep scoring cost negligible, so the difference is the
+input handling itself.
+
+Usage (from Book-Club-Manager/):
+    python -m benchmarks.recommender_inputs
+    python -m benchmarks.recommender_inputs --calls 2000 --library 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from backend.recommender.book_recommender import (
+    GENRE_VOCAB,
+    ContentBasedBookRecommender,
+    UserSignals,
+)
+
+
+def _recommender(n_books: int = 500) -> ContentBasedBookRecommender:
+    """Build a small precomputed-mode recommender with metadata stubbed out."""
+    rng = np.random.default_rng(0)
+    n_terms = len(GENRE_VOCAB)
+    rec = ContentBasedBookRecommender(profile_cache_size=0, metadata_fetcher=lambda asins: [])
+    rec.load_arrays(
+        sparse.csr_matrix(rng.random((n_books, n_terms)) * (rng.random((n_books, n_terms)) > 0.9)),
+        {f"B{i:06d}": i for i in range(n_books)},
+        rng.random(n_books),
+        rng.random(n_books),
+    )
+    return rec
+
+
+def _per_call_us(fn: Callable[[], object], calls: int) -> List[float]:
+    """Return per-call wall time in microseconds (after a short warm-up)."""
+    for _ in range(min(20, calls)):
+        fn()
+    out = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - start) * 1e6)
+    return out
+
+
+def main() -> None:
+    """Run both input paths and print median / p95 per-call latency."""
+    parser = argparse.ArgumentParser(description="Recommender input-path overhead benchmark")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--library", type=int, default=30, help="Books on the user's shelves")
+    args = parser.parse_args()
+
+    rec = _recommender()
+    user = "bench@example.com"
+    library = [f"B{i:06d}" for i in range(args.library)]
+    account = {"library": {"finished": library, "saved": [], "in_progress": []}}
+    genres = [{"genre": "Fantasy", "rank": 1}, {"genre": "Romance", "rank": 2}]
+
+    def _dataframe_path() -> object:
+        """Old recommend_for_user: build frames, filter them back by user_id."""
+        books_df = pd.DataFrame({"user_id": [user] * len(library), "parent_asin": library})
+        genres_df = pd.DataFrame(
+            {
+                "user_id": [user] * len(genres),
+                "genre": [g["genre"] for g in genres],
+                "rank": [g["rank"] for g in genres],
+            }
+        )
+        return rec.recommend(user, genres_df, books_df, top_k=50)
+
+    def _signals_path() -> object:
+        """Typed path: plain lists straight into UserSignals."""
+        return rec.recommend_from_signals(user, UserSignals.from_account(account, genres), top_k=50)
+
+    print(f"{'path':<12} {'median us':>10} {'p95 us':>10}")
+    for name, fn in (("dataframe", _dataframe_path), ("signals", _signals_path)):
+        timings = sorted(_per_call_us(fn, args.calls))
+        p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+        print(f"{name:<12} {statistics.median(timings):>10.1f} {p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Microbenchmark: float64 vs compact (float32 / int32) book recommender scoring.
+
+Builds a synthetic precomputed catalog, then times ContentBasedBookRecommender
+.recommend() and the logistic book_recommender_backend scorer in both modes.
+For each it reports latency (median / p95 over --repeat calls, after one
+warm-up call that allocates the per-thread buffers) and the peak Python-heap
+allocation per call measured with tracemalloc.
+
+Metadata lookups are stubbed out, so only scoring and top-k are measured.
+
+Usage (from Book-Club-Manager/):
+    python -m benchmarks.recommender_scoring
+    python -m benchmarks.recommender_scoring --books 1000000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from benchmarks.synthetic import backend_recommender, content_recommender, synthetic_catalog
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Time fn and record its peak traced allocation (both after one warm-up call)."""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(0.95 * len(timings)))],
+        "peak_alloc_mb": peak / 1e6,
+    }
+
+
+def run(n_books: int, repeat: int, top_k: int = 50) -> List[Dict[str, object]]:
+    """Run every scenario and return one result row per (scorer, mode)."""
+    catalog = synthetic_catalog(n_books)
+    library = [f"B{i:08d}" for i in range(0, min(n_books, 200), 20)]
+    genres_df = pd.DataFrame(
+        [
+            {"user_id": "bench", "genre": "Fantasy", "rank": 1},
+            {"user_id": "bench", "genre": "Romance", "rank": 2},
+        ]
+    )
+    books_df = pd.DataFrame({"user_id": "bench", "parent_asin": library})
+    results: List[Dict[str, object]] = []
+    for compact in (False, True):
+        mode = "compact" if compact else "float64"
+        content = content_recommender(catalog, compact)
+        scenarios = {
+            "content_cold_start": lambda r=content: r.recommend("bench", None, None, top_k),
+            "content_personalized": lambda r=content: r.recommend("bench", genres_df, books_df, top_k),
+        }
+        # "float64" here means float64 artifacts (beta, similarity, popularity).
+        backend = backend_recommender(catalog, compact, library)
+        scenarios["logistic_backend"] = lambda r=backend: r.recommend("bench", top_k)
+        for name, fn in scenarios.items():
+            row: Dict[str, object] = {"scenario": name, "mode": mode, "n_books": n_books}
+            row.update(_measure(fn, repeat))
+            results.append(row)
+    return results
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description="Book recommender scoring microbenchmark")
+    parser.add_argument("--books", type=int, default=200_000, help="Synthetic catalog size")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed calls per scenario")
+    parser.add_argument("--top-k", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<22} {'mode':<8} {'median ms':>10} {'p95 ms':>9} {'peak MB':>9}")
+    for row in run(args.books, args.repeat, args.top_k):
+        print(
+            f"{row['scenario']:<22} {row['mode']:<8} {row['median_ms']:>10.2f} "
+            f"{row['p95_ms']:>9.2f} {row['peak_alloc_mb']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
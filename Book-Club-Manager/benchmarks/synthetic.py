@@ -0,0 +1,215 @@
+"""
+Synthetic data for the benchmarks: catalogs, user libraries, forum DBs, event pools.
+
+Everything is generated from a seeded numpy RNG, so two runs on the same
+machine see identical inputs and their timings can be compared. Sizes are
+parameters; the pytest-benchmark suite (tests/benchmarks/) uses catalogs of
+10k, 100k and 1M books.
+
+LocalStandIn is an in-memory storage backend exposing the subset of the
+LocalStorage/CloudStorage API that the benchmarked service functions call,
+so service benchmarks measure service code rather than disk or network.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from backend.recommender import book_recommender_backend
+from backend.recommender.book_recommender import GENRE_VOCAB, ContentBasedBookRecommender
+
+CATALOG_SIZES = (10_000, 100_000, 1_000_000)
+
+_CITIES = ("Seattle, WA", "Bellevue, WA", "Redmond, WA", "Tacoma, WA", "Everett, WA")
+
+
+def book_id(i: int) -> str:
+    """Return the synthetic parent_asin of book i."""
+    return f"B{i:08d}"
+
+
+def synthetic_catalog(n_books: int, seed: int = 0) -> Dict[str, object]:
+    """Return a random TF-IDF matrix (1-3 genres per book) and rating norms."""
+    rng = np.random.default_rng(seed)
+    n_terms = len(GENRE_VOCAB)
+    per_book = rng.integers(1, 4, size=n_books)
+    rows = np.repeat(np.arange(n_books), per_book)
+    cols = rng.integers(0, n_terms, size=rows.size)
+    tfidf = sparse.csr_matrix(
+        (rng.random(rows.size), (rows, cols)), shape=(n_books, n_terms)
+    )
+    tfidf.sum_duplicates()
+    return {
+        "tfidf": tfidf,
+        "rating_norm": rng.random(n_books),
+        "rating_number_norm": rng.random(n_books),
+        "book_id_to_idx": {book_id(i): i for i in range(n_books)},
+    }
+
+
+def content_recommender(catalog: Dict[str, object], compact: bool) -> ContentBasedBookRecommender:
+    """Build a precomputed-mode recommender over the synthetic catalog."""
+    rec = ContentBasedBookRecommender(
+        compact=compact, candidate_index_min_books=10**12, metadata_fetcher=lambda asins: []
+    )
+    rec.load_arrays(
+        catalog["tfidf"],  # type: ignore[arg-type]
+        catalog["book_id_to_idx"],  # type: ignore[arg-type]
+        catalog["rating_norm"],  # type: ignore[arg-type]
+        catalog["rating_number_norm"],  # type: ignore[arg-type]
+    )
+    return rec
+
+
+def backend_recommender(catalog: Dict[str, object], compact: bool, library: List[str]):
+    """Build a logistic-model recommender without loading model files."""
+    dtype = np.float32 if compact else np.float64
+    ids = catalog["book_id_to_idx"]
+    n_books = len(ids)  # type: ignore[arg-type]
+    # ~20 stored neighbours per book, like the pruned item-item similarity artifact.
+    rng = np.random.default_rng(1)
+    rows = np.repeat(np.arange(n_books), 20)
+    book_similarity = sparse.csr_matrix(
+        (rng.random(rows.size).astype(dtype), (rows, rng.integers(0, n_books, rows.size))),
+        shape=(n_books, n_books),
+    )
+    popularity_score = np.log1p(np.asarray(catalog["rating_norm"], dtype=dtype) * 100)
+    artifacts = (
+        np.array([1.2, 0.8, 0.3], dtype=dtype),
+        book_similarity,
+        popularity_score,
+        ids,
+        {v: k for k, v in ids.items()},  # type: ignore[attr-defined]
+    )
+
+    class _Storage:  # pylint: disable=too-few-public-methods
+        """Storage stub returning a fixed library."""
+
+        def get_user_books(self, _user_id):
+            """Return the benchmark library."""
+            return library
+
+    rec = book_recommender_backend.BookRecommender(artifacts=artifacts, storage=_Storage())
+    rec.fetch_books = lambda book_ids: book_ids
+    return rec
+
+
+def book_record(i: int) -> Dict[str, Any]:
+    """Return a books-table style metadata dict for book i."""
+    genres = [GENRE_VOCAB[(i * 7 + k) % len(GENRE_VOCAB)] for k in range(1 + i % 3)]
+    return {
+        "parent_asin": book_id(i),
+        "title": f"Synthetic Book {i}",
+        "author_name": f"Author {i % 997}",
+        "images": f"https://example.invalid/covers/{i}.jpg",
+        "average_rating": round(1.0 + (i % 40) / 10.0, 1),
+        "rating_number": (i * 37) % 5000,
+        "categories": genres,
+        "description": f"Description of synthetic book {i}. " * 4,
+    }
+
+
+def user_library(n_books: int, size: int = 60, seed: int = 0) -> Dict[str, Any]:
+    """Return a user_books record with `size` random books spread over the three shelves."""
+    rng = np.random.default_rng(seed)
+    picks = [book_id(int(i)) for i in rng.choice(n_books, size=min(size, n_books), replace=False)]
+    third = len(picks) // 3
+    return {
+        "library": {
+            "saved": picks[:third],
+            "in_progress": picks[third : 2 * third],
+            "finished": picks[2 * third :],
+        },
+        "genre_preferences": list(GENRE_VOCAB[:3]),
+    }
+
+
+def forum_db(n_posts: int, n_books: int = 10_000, seed: int = 0) -> Dict[str, Any]:
+    """Return a forum DB dict ({"posts": [...], "next_post_id": n}) with posts newest first."""
+    rng = np.random.default_rng(seed)
+    now = int(time.time())
+    likes = rng.integers(0, 500, size=n_posts)
+    posts: List[Dict[str, Any]] = []
+    for i in range(n_posts, 0, -1):
+        posts.append(
+            {
+                "id": i,
+                "title": f"Thread {i}",
+                "author": f"reader{i % 311}@example.com",
+                "text": f"Thoughts on chapter {i % 30}. " * 6,
+                "tags": [GENRE_VOCAB[i % len(GENRE_VOCAB)], GENRE_VOCAB[(i * 3) % len(GENRE_VOCAB)]],
+                "parent_asin": book_id(i % max(1, n_books)),
+                "likes": int(likes[i - 1]),
+                "liked_by": [],
+                "comments": [],
+                "created_at": now - (n_posts - i) * 60,
+            }
+        )
+    return {"posts": posts, "next_post_id": n_posts + 1}
+
+
+def event_pool(n_events: int, n_books: int = 10_000, seed: int = 0) -> List[Dict[str, Any]]:
+    """Return upcoming event dicts (tags, ttl within the next 90 days, linked book)."""
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    offsets = rng.integers(3600, 90 * 86400, size=n_events)
+    events: List[Dict[str, Any]] = []
+    for i in range(n_events):
+        events.append(
+            {
+                "event_id": f"evt-{i:07d}",
+                "title": f"Book Club Meetup {i}",
+                "description": "Monthly discussion.",
+                "tags": [GENRE_VOCAB[(i * k) % len(GENRE_VOCAB)] for k in (1, 5)],
+                "ttl": int(now + offsets[i]),
+                "city_state": _CITIES[i % len(_CITIES)],
+                "parent_asin": book_id(i % max(1, n_books)),
+            }
+        )
+    return events
+
+
+class LocalStandIn:
+    """In-memory storage backend for service benchmarks (no disk, no network)."""
+
+    def __init__(
+        self,
+        n_books: int,
+        users: Optional[Dict[str, Dict[str, Any]]] = None,
+        forum: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Serve n_books synthetic books, the given user_books records and forum DB."""
+        self.n_books = n_books
+        self.users = users or {}
+        self.forum = forum or {"posts": [], "next_post_id": 1}
+
+    def _index(self, parent_asin: str) -> Optional[int]:
+        """Return the book index encoded in a synthetic parent_asin, or None."""
+        try:
+            i = int(str(parent_asin)[1:])
+        except ValueError:
+            return None
+        return i if 0 <= i < self.n_books else None
+
+    def get_book_details(self, parent_asin: str) -> Optional[Dict[str, Any]]:
+        """Return the full record of a synthetic book."""
+        i = self._index(parent_asin)
+        return book_record(i) if i is not None else None
+
+    def get_book_metadata(self, parent_asin: str) -> Optional[Dict[str, Any]]:
+        """Return the metadata of a synthetic book (same as details here)."""
+        return self.get_book_details(parent_asin)
+
+    def get_user_books(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the user's user_books record."""
+        rec = self.users.get(str(user_id).strip().lower())
+        return copy.deepcopy(rec) if rec is not None else None
+
+    def load_forum_db(self) -> Dict[str, Any]:
+        """Return the forum DB (shared, as LocalStorage's cached copy is)."""
+        return self.forum
@@ -4,6 +4,8 @@ Run once (or when books.db is updated). Writes to data/processed/:
   - book_tfidf.npz       (sparse TF-IDF matrix)
   - book_id_to_idx.json  (parent_asin -> row index)
   - book_rating_norms.npz (average_rating_norm, rating_number_norm arrays)
+  - book_genre_buckets.npz (top-K per genre-preference combination + cold start)
+  - manifest.json        (sha256 and size of the files above, checked by the artifact cache)
 
 At runtime the recommender loads these and queries books.db only for top-k metadata.
 
@@ -26,6 +28,8 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.preprocessing import MinMaxScaler
 
 CHUNK_SIZE = 50_000
+# Results stored per genre signature; requests for more fall back to full scoring.
+GENRE_BUCKET_TOP_K = 100
 
 
 def _prepare_categories(raw: Any, genre_vocab: list[str]) -> str:
@@ -59,6 +63,7 @@ def main() -> None:
 
     config_module = importlib.import_module("backend.config")
     recommender_module = importlib.import_module("backend.recommender.book_recommender")
+    buckets_module = importlib.import_module("backend.recommender.genre_buckets")
     processed_dir = config_module.PROCESSED_DIR
     genre_vocab = recommender_module.GENRE_VOCAB
 
@@ -158,6 +163,34 @@ def main() -> None:
     )
     print(f"Wrote {processed_dir / 'book_tfidf.npz'}, book_id_to_idx.json, book_rating_norms.npz")
 
+    print(f"Building genre buckets (top {GENRE_BUCKET_TOP_K} per genre combination)...")
+    buckets = buckets_module.build_genre_buckets(
+        book_tfidf,
+        average_rating_norm,
+        rating_number_norm,
+        recommender_module.RecommenderWeights(),
+        top_k=GENRE_BUCKET_TOP_K,
+    )
+    buckets.save(processed_dir / "book_genre_buckets.npz")
+    print(f"Wrote {processed_dir / 'book_genre_buckets.npz'} ({len(buckets)} signatures)")
+
+    # Checksums the runtime artifact cache verifies downloads against; upload
+    # manifest.json next to the artifacts (BOOK_RECOMMENDER_MANIFEST_S3_KEY).
+    cache_module = importlib.import_module("backend.recommender.artifact_cache")
+    cache_module.write_manifest(
+        [
+            processed_dir / name
+            for name in (
+                "book_tfidf.npz",
+                "book_id_to_idx.json",
+                "book_rating_norms.npz",
+                "book_genre_buckets.npz",
+            )
+        ],
+        processed_dir / "manifest.json",
+    )
+    print(f"Wrote {processed_dir / 'manifest.json'}")
+
 
 if __name__ == "__main__":
     main()
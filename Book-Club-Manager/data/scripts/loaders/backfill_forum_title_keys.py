@@ -0,0 +1,83 @@
+"""
+Backfill `book_title_key` on existing forum posts in DynamoDB (one-time).
+
+The app reads a book's discussion thread from two GSIs on the forum_posts
+table: parent_asin (FORUM_POSTS_GSI) and book_title_key (FORUM_POSTS_TITLE_GSI).
+New posts get book_title_key when they are written; this script scans the
+table once and sets it on older posts that carry a book_title but no key, so
+posts written before parent_asin was stored still show up on the book page.
+
+Usage:
+    python -m data.scripts.loaders.backfill_forum_title_keys
+    python -m data.scripts.loaders.backfill_forum_title_keys --dry-run
+
+Requires: boto3, AWS credentials configured.
+"""
+
+import argparse
+import os
+
+import boto3
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TABLE_NAME = os.getenv("FORUM_POSTS_TABLE", "forum_posts")
+PK = os.getenv("FORUM_POSTS_PK", "pk").strip() or "pk"
+SK = os.getenv("FORUM_POSTS_SK", "sk").strip() or "sk"
+
+
+def title_key(title: object) -> str:
+    """Normalize a book title (matches backend.forum_store.book_title_key)."""
+    return " ".join(str(title or "").split()).casefold()
+
+
+def missing_title_key(item: dict) -> str:
+    """Return the book_title_key an item should get, or "" when it needs no update."""
+    key = title_key(item.get("book_title"))
+    if not key or item.get("book_title_key") == key:
+        return ""
+    return key
+
+
+def backfill_forum_title_keys(table=None, dry_run: bool = False) -> int:
+    """Set book_title_key on forum posts missing it. Returns the number of items updated."""
+    table = table or boto3.resource("dynamodb").Table(TABLE_NAME)
+    scan_kwargs = {
+        "ProjectionExpression": "#pk, #sk, book_title, book_title_key",
+        "ExpressionAttributeNames": {"#pk": PK, "#sk": SK},
+    }
+    updated = 0
+    while True:
+        resp = table.scan(**scan_kwargs)
+        for item in resp.get("Items", []):
+            key = missing_title_key(item)
+            if not key:
+                continue
+            if not dry_run:
+                table.update_item(
+                    Key={PK: item[PK], SK: item[SK]},
+                    UpdateExpression="SET book_title_key = :k",
+                    ExpressionAttributeValues={":k": key},
+                )
+            updated += 1
+        last = resp.get("LastEvaluatedKey")
+        if not last:
+            return updated
+        scan_kwargs["ExclusiveStartKey"] = last
+
+
+def main() -> None:
+    """Backfill book_title_key on the forum_posts table."""
+    parser = argparse.ArgumentParser(description="Set book_title_key on existing forum posts")
+    parser.add_argument("--dry-run", action="store_true", help="Count posts to update without writing")
+    args = parser.parse_args()
+
+    print(f"Backfilling book_title_key on DynamoDB table '{TABLE_NAME}'")
+    updated = backfill_forum_title_keys(dry_run=args.dry_run)
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"{verb} {updated} posts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+"""
+Parallel, rate-limited, resumable DynamoDB bulk writes shared by the loaders.
+
+The books and events loaders used to write from one thread, opening a new
+batch_writer per batch, and `clear_table` scanned and deleted serially.
+BulkLoader instead:
+
+- splits the SQLite key range into contiguous segments (`split_key_range`)
+  and loads each segment on its own worker thread, which reads through its own
+  SQLite connection and sends BatchWriteItem requests of up to 25 items;
+- re-sends UnprocessedItems with backoff, and paces requests with an AIMD
+  token bucket (`AdaptiveRateLimiter`) that starts at the target WCU, halves
+  on throttling and creeps back up while writes succeed;
+- records the last key written per segment in a JSON checkpoint file, so an
+  interrupted load resumes where each segment stopped;
+- clears a table with a parallel-segment Scan (Segment / TotalSegments).
+
+Only the low-level client calls batch_write_item and scan are used, so any
+stand-in exposing those two methods can be used in tests.
+"""
+
+import json
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+MAX_BATCH_WRITE = 25  # DynamoDB batch_write_item limit
+_THROTTLE_CODES = (
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+)
+
+KeyRange = tuple[Optional[str], Optional[str]]
+
+
+# Scalar (Python types, encoder) pairs in match order: bool before int, since bool is an int.
+_SCALAR_WIRE: tuple = (
+    (type(None), lambda value: {"NULL": True}),
+    (bool, lambda value: {"BOOL": value}),
+    ((int, float, Decimal), lambda value: {"N": str(value)}),
+    (str, lambda value: {"S": value}),
+)
+
+
+def to_wire(value: Any) -> dict:
+    """Convert a Python value to a DynamoDB wire-format attribute value."""
+    if isinstance(value, dict):
+        return {"M": {str(k): to_wire(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [to_wire(v) for v in value]}
+    for types, encode in _SCALAR_WIRE:
+        if isinstance(value, types):
+            return encode(value)
+    return {"S": str(value)}
+
+
+def wire_item(item: dict) -> dict:
+    """Convert a plain item dict to wire format."""
+    return {k: to_wire(v) for k, v in item.items()}
+
+
+def _write_units(wire: dict) -> int:
+    """Approximate write capacity units for one item (1 WCU per started KB)."""
+    return max(1, math.ceil(len(json.dumps(wire, separators=(",", ":"))) / 1024))
+
+
+def _is_throttle(error: Exception) -> bool:
+    """True when a client error is DynamoDB throttling (retryable)."""
+    code = ""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = str((response.get("Error") or {}).get("Code") or "")
+    text = code or f"{type(error).__name__} {error}"
+    return any(c in text for c in _THROTTLE_CODES)
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[list]:
+    """Yield lists of up to size items."""
+    batch: list = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class AdaptiveRateLimiter:  # pylint: disable=too-many-instance-attributes
+    """Token bucket of write units per second with AIMD adjustment.
+
+    The rate starts at the target, is halved (down to min_rate) whenever
+    DynamoDB throttles, and grows by 5% of the target per successful request.
+    A target of 0 disables pacing.
+    """
+
+    def __init__(
+        self,
+        target_per_second: float,
+        min_rate: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Start with a full one-second bucket at the target rate."""
+        self.target = max(0.0, float(target_per_second))
+        self.min_rate = min(float(min_rate), self.target) if self.target else 0.0
+        self.rate = self.target
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.rate
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, units: int) -> None:
+        """Take units from the bucket, sleeping off any deficit."""
+        if not self.target:
+            return
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= units
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+
+    def throttled(self) -> None:
+        """Multiplicative decrease after a throttled request."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def succeeded(self) -> None:
+        """Additive increase after a fully processed request."""
+        with self._lock:
+            self.rate = min(self.target, self.rate + self.target * 0.05)
+
+
+class Checkpoint:
+    """JSON file with the key ranges of a load and the last key written in each.
+
+    Without a path the checkpoint is kept in memory only.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """Load existing progress from path when the file exists."""
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._state: dict = {"segments": None, "last_key": {}, "done": []}
+        if self.path and self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self._state.update(json.load(f))
+
+    @property
+    def segments(self) -> Optional[list[KeyRange]]:
+        """Key ranges recorded by the first run, or None."""
+        segs = self._state.get("segments")
+        return [tuple(s) for s in segs] if segs is not None else None
+
+    def start(self, segments: Sequence[KeyRange]) -> list[KeyRange]:
+        """Record the key ranges of a new load, or return the ones of the load being resumed."""
+        with self._lock:
+            if self._state.get("segments") is None:
+                self._state["segments"] = [list(s) for s in segments]
+                self._save()
+        return self.segments or []
+
+    def resume_after(self, sid: str) -> Optional[str]:
+        """Last key written in the segment, or None."""
+        with self._lock:
+            return self._state["last_key"].get(sid)
+
+    def is_done(self, sid: str) -> bool:
+        """True when the segment finished in an earlier run."""
+        with self._lock:
+            return sid in self._state["done"]
+
+    def advance(self, sid: str, last_key: str) -> None:
+        """Record that every key up to last_key in the segment was written."""
+        with self._lock:
+            self._state["last_key"][sid] = last_key
+            self._save()
+
+    def mark_done(self, sid: str) -> None:
+        """Record that the segment is complete."""
+        with self._lock:
+            if sid not in self._state["done"]:
+                self._state["done"].append(sid)
+            self._save()
+
+    def _save(self) -> None:
+        """Atomically rewrite the checkpoint file. Caller holds the lock."""
+        if not self.path:
+            return
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._state, f)
+        os.replace(tmp, self.path)
+
+
+def segment_id(segment: KeyRange) -> str:
+    """Stable name of a key range, used as the checkpoint key."""
+    after, upto = segment
+    return f"{after or ''}..{upto or ''}"
+
+
+def split_key_range(
+    conn: sqlite3.Connection,
+    table: str,
+    key: str,
+    parts: int,
+    where: str = "1=1",
+    limit: Optional[int] = None,
+) -> list[KeyRange]:
+    """Split the first `limit` (or all) rows, ordered by key, into contiguous ranges.
+
+    Args:
+        conn: Open SQLite connection.
+        table: Table to read.
+        key: Unique, indexed key column.
+        parts: Number of ranges wanted (fewer when there are fewer rows).
+        where: SQL filter applied to the rows.
+        limit: Only cover the first `limit` keys.
+
+    Returns:
+        (after, upto] ranges with about equal row counts; `after` is None for the first.
+    """
+    total = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}").fetchone()[0]
+    if limit is not None:
+        total = min(total, max(0, int(limit)))
+    if total <= 0:
+        return []
+    parts = max(1, min(int(parts), total))
+    ranges: list[KeyRange] = []
+    after: Optional[str] = None
+    for i in range(1, parts + 1):
+        offset = (total * i) // parts - 1
+        upto = conn.execute(
+            f"SELECT {key} FROM {table} WHERE {where} ORDER BY {key} LIMIT 1 OFFSET ?",
+            (offset,),
+        ).fetchone()[0]
+        ranges.append((after, upto))
+        after = upto
+    return ranges
+
+
+def iter_sqlite_range(
+    db_path: Path,
+    sql: str,
+    key: str,
+    after: Optional[str],
+    upto: Optional[str],
+    to_item: Callable[[sqlite3.Row], dict],
+) -> Iterator[dict]:
+    """Yield to_item(row) for rows with after < key <= upto, in key order.
+
+    `sql` is a SELECT ending in a WHERE clause; the range conditions and the
+    ORDER BY are appended. Each call opens its own connection (one per worker).
+    """
+    conds, params = [], []
+    if after is not None:
+        conds.append(f"{key} > ?")
+        params.append(after)
+    if upto is not None:
+        conds.append(f"{key} <= ?")
+        params.append(upto)
+    query = sql + "".join(f" AND {c}" for c in conds) + f" ORDER BY {key}"
+    # An abandoned generator may be finalised on another thread.
+    with closing(sqlite3.connect(db_path, check_same_thread=False)) as conn:
+        conn.row_factory = sqlite3.Row
+        for row in conn.execute(query, params):
+            yield to_item(row)
+
+
+@dataclass
+class LoadStats:
+    """Counters of a bulk load or clear."""
+
+    written: int = 0
+    deleted: int = 0
+    requests: int = 0
+    throttled_items: int = 0
+    segments_skipped: int = 0
+
+
+class BulkLoader:  # pylint: disable=too-many-instance-attributes
+    """Writes and deletes DynamoDB items with parallel workers, pacing and checkpoints."""
+
+    def __init__(
+        self,
+        client: Any,
+        table_name: str,
+        workers: int = 4,
+        target_wcu: float = 0,
+        max_attempts: int = 10,
+        checkpoint: Optional[Checkpoint] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        progress: Optional[Callable[[LoadStats], None]] = None,
+        progress_every: int = 10000,
+    ) -> None:
+        """Configure the loader.
+
+        Args:
+            client: Low-level DynamoDB client (thread-safe).
+            table_name: Target table.
+            workers: Worker threads (segments loaded / scanned concurrently).
+            target_wcu: Write units per second to aim for (0 = unpaced).
+            max_attempts: Requests per batch including UnprocessedItems retries.
+            checkpoint: Progress file for resumable loads (in-memory when None).
+            sleep: Sleep function (tests pass a no-op).
+            progress: Called with the stats about every progress_every items.
+            progress_every: Items between progress calls.
+        """
+        self.client = client
+        self.table_name = table_name
+        self.workers = max(1, int(workers))
+        self.max_attempts = max(1, int(max_attempts))
+        self.checkpoint = checkpoint or Checkpoint()
+        self.limiter = AdaptiveRateLimiter(target_wcu, sleep=sleep)
+        self.stats = LoadStats()
+        self._sleep = sleep
+        self._progress = progress
+        self._progress_every = max(1, int(progress_every))
+        self._lock = threading.Lock()
+
+    def _count(self, field: str, n: int) -> None:
+        """Add n to a stats counter and report progress on every progress_every boundary."""
+        with self._lock:
+            before = self.stats.written + self.stats.deleted
+            setattr(self.stats, field, getattr(self.stats, field) + n)
+            after = self.stats.written + self.stats.deleted
+        if self._progress and after // self._progress_every > before // self._progress_every:
+            self._progress(self.stats)
+
+    def _write_batch(self, requests: list[dict]) -> None:
+        """Send one BatchWriteItem, re-sending UnprocessedItems until all are written.
+
+        Raises:
+            RuntimeError: Items were still unprocessed after max_attempts requests.
+            Exception: Non-throttling client errors propagate.
+        """
+        pending = requests
+        for attempt in range(self.max_attempts):
+            if attempt:
+                ceiling = min(2.0, 0.05 * (2 ** (attempt - 1)))
+                self._sleep(random.uniform(ceiling / 2, ceiling))
+            self.limiter.acquire(sum(_write_units(r) for r in pending))
+            with self._lock:
+                self.stats.requests += 1
+            try:
+                resp = self.client.batch_write_item(RequestItems={self.table_name: pending})
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                if not _is_throttle(e):
+                    raise
+                self.limiter.throttled()
+                self._count("throttled_items", len(pending))
+                continue
+            unprocessed = (resp.get("UnprocessedItems") or {}).get(self.table_name) or []
+            if not unprocessed:
+                self.limiter.succeeded()
+                return
+            self.limiter.throttled()
+            self._count("throttled_items", len(unprocessed))
+            pending = unprocessed
+        raise RuntimeError(
+            f"{len(pending)} items still unprocessed after {self.max_attempts} attempts"
+        )
+
+    def write_items(self, items: Iterable[dict], key: str, segment: str = "all") -> int:
+        """Write plain item dicts in 25-item batches, checkpointing each batch's last key.
+
+        Args:
+            items: Items in ascending `key` order (so the checkpoint can resume).
+            key: Partition key attribute.
+            segment: Checkpoint name of this stream.
+
+        Returns:
+            Number of items written.
+        """
+        written = 0
+        for batch in _chunks(items, MAX_BATCH_WRITE):
+            self._write_batch([{"PutRequest": {"Item": wire_item(i)}} for i in batch])
+            written += len(batch)
+            self._count("written", len(batch))
+            self.checkpoint.advance(segment, str(batch[-1][key]))
+        self.checkpoint.mark_done(segment)
+        return written
+
+    def load_segments(
+        self,
+        segments: Sequence[KeyRange],
+        read_segment: Callable[[Optional[str], Optional[str]], Iterable[dict]],
+        key: str,
+    ) -> LoadStats:
+        """Load key ranges concurrently, one worker per range at a time.
+
+        When the checkpoint belongs to an interrupted run, its ranges are used
+        instead of `segments`; finished ranges are skipped and the others
+        restart after their last written key.
+
+        Args:
+            segments: (after, upto] key ranges, e.g. from split_key_range.
+            read_segment: read_segment(after, upto) yields items in key order.
+            key: Partition key attribute of the items.
+
+        Returns:
+            The loader's stats.
+        """
+        ranges = self.checkpoint.start(segments)
+
+        def run(seg: KeyRange) -> None:
+            """Load one range, resuming after its checkpointed key."""
+            sid = segment_id(seg)
+            if self.checkpoint.is_done(sid):
+                self._count("segments_skipped", 1)
+                return
+            after = self.checkpoint.resume_after(sid) or seg[0]
+            self.write_items(read_segment(after, seg[1]), key, sid)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk-load") as ex:
+            list(ex.map(run, ranges))
+        return self.stats
+
+    def clear(self, key_names: Sequence[str], total_segments: Optional[int] = None) -> int:
+        """Delete every item with a parallel-segment Scan.
+
+        Args:
+            key_names: Primary key attributes (projected by the scan).
+            total_segments: Scan segments (default: workers); each runs on its own thread.
+
+        Returns:
+            Number of items deleted.
+        """
+        total = max(1, int(total_segments or self.workers))
+        names = {f"#k{i}": k for i, k in enumerate(key_names)}
+
+        def run(seg: int) -> int:
+            """Scan one segment and delete what it returns."""
+            kwargs: dict = {
+                "TableName": self.table_name,
+                "Segment": seg,
+                "TotalSegments": total,
+                "ProjectionExpression": ", ".join(names),
+                "ExpressionAttributeNames": names,
+            }
+            deleted = 0
+            while True:
+                resp = self.client.scan(**kwargs)
+                for batch in _chunks(resp.get("Items", []), MAX_BATCH_WRITE):
+                    self._write_batch(
+                        [{"DeleteRequest": {"Key": {k: it[k] for k in key_names}}} for it in batch]
+                    )
+                    deleted += len(batch)
+                    self._count("deleted", len(batch))
+                last = resp.get("LastEvaluatedKey")
+                if not last:
+                    return deleted
+                kwargs["ExclusiveStartKey"] = last
+
+        with ThreadPoolExecutor(max_workers=min(total, self.workers), thread_name_prefix="bulk-clear") as ex:
+            return sum(ex.map(run, range(total)))
+
+    def stats_dict(self) -> dict:
+        """Return the stats as a plain dict (for logging)."""
+        with self._lock:
+            return asdict(self.stats)
@@ -1,11 +1,16 @@
 """
 Load books from books.db to DynamoDB (without description column).
 
+The parent_asin range is split across --workers threads (see bulk_loader.py),
+writes are paced to --target-wcu, and with --checkpoint FILE an interrupted
+load resumes where it stopped when run again with the same file.
+
 Usage:
     python -m data.scripts.loaders.load_books_to_dynamodb [--limit N]
     python -m data.scripts.loaders.load_books_to_dynamodb --all
     python -m data.scripts.loaders.load_books_to_dynamodb --all --create-table
     python -m data.scripts.loaders.load_books_to_dynamodb --all --clear-table
+    python -m data.scripts.loaders.load_books_to_dynamodb --all --workers 8 --checkpoint books.ckpt.json
 
 Requires: boto3, AWS credentials configured (env vars or ~/.aws/credentials)
 """
@@ -14,13 +19,22 @@ import argparse
 import json
 import os
 import sqlite3
+from contextlib import closing
 from decimal import Decimal
+from functools import partial
 from pathlib import Path
 
 import boto3
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
+from data.scripts.loaders.bulk_loader import (
+    BulkLoader,
+    Checkpoint,
+    iter_sqlite_range,
+    split_key_range,
+)
+
 load_dotenv()
 
 # Paths
@@ -34,9 +48,18 @@ BOOKS_DB = Path(os.getenv("BOOKS_DB_PATH", str(PROCESSED_DIR / "books.db")))
 
 # DynamoDB
 TABLE_NAME = os.getenv("BOOKS_TABLE", "books")
-BATCH_SIZE = 25  # DynamoDB batch_write_item limit
 READ_CAPACITY = int(os.getenv("DYNAMODB_READ_CAPACITY", "5"))
 WRITE_CAPACITY = int(os.getenv("DYNAMODB_WRITE_CAPACITY", "25"))
+# Parallel writer threads and the write rate (WCU/s) the loader paces itself to.
+LOAD_WORKERS = int(os.getenv("DYNAMODB_LOAD_WORKERS", "4"))
+TARGET_WCU = float(os.getenv("DYNAMODB_TARGET_WCU", str(WRITE_CAPACITY)))
+
+BOOKS_SELECT_SQL = """
+    SELECT parent_asin, title, author_name, average_rating, rating_number,
+           images, categories, title_author_key
+    FROM books
+    WHERE parent_asin IS NOT NULL AND TRIM(parent_asin) != ''
+"""
 
 # Default book cover when images is missing (env override supported)
 DEFAULT_BOOK_IMAGE_URL = os.getenv(
@@ -45,22 +68,19 @@ DEFAULT_BOOK_IMAGE_URL = os.getenv(
 )
 
 
-def clear_table(table_name: str = TABLE_NAME) -> None:
-    """Delete all items in the books table (scan + batch delete). Use before reloading a smaller catalog."""
-    dynamodb = boto3.resource("dynamodb")
-    table = dynamodb.Table(table_name)
-    deleted = 0
-    while True:
-        resp = table.scan(ProjectionExpression="parent_asin")
-        items = resp.get("Items", [])
-        if not items:
-            break
-        with table.batch_writer() as writer:
-            for item in items:
-                writer.delete_item(Key={"parent_asin": item["parent_asin"]})
-                deleted += 1
-        if deleted % 10000 == 0 and deleted > 0:
-            print(f"  Deleted {deleted:,} items...")
+def clear_table(table_name: str = TABLE_NAME, workers: int = LOAD_WORKERS, client=None) -> None:
+    """Delete all items in the books table (parallel-segment scan + batch delete).
+
+    Use before reloading a smaller catalog.
+    """
+    loader = BulkLoader(
+        client or boto3.client("dynamodb"),
+        table_name,
+        workers=workers,
+        target_wcu=TARGET_WCU,
+        progress=lambda st: print(f"  Deleted {st.deleted:,} items..."),
+    )
+    deleted = loader.clear(["parent_asin"])
     print(f"Cleared table '{table_name}' ({deleted:,} items deleted)")
 
 
@@ -114,50 +134,45 @@ def load_books_to_dynamodb(
     db_path: Path = BOOKS_DB,
     table_name: str = TABLE_NAME,
     limit: int | None = 100,
+    workers: int = LOAD_WORKERS,
+    target_wcu: float = TARGET_WCU,
+    checkpoint_path: Path | None = None,
+    client=None,
 ) -> int:
-    """Load books from books.db to DynamoDB (without description)."""
+    """Load books from books.db to DynamoDB (without description).
+
+    The first `limit` parent_asins (all when None) are split into `workers`
+    ranges written concurrently. With checkpoint_path, progress is saved after
+    every batch and a rerun skips what was already written.
+
+    Returns:
+        Number of items written by this run.
+    """
     if not db_path.exists():
         raise FileNotFoundError(f"Books DB not found: {db_path}")
 
-    dynamodb = boto3.resource("dynamodb")
-    table = dynamodb.Table(table_name)
-
-    with sqlite3.connect(db_path) as conn:
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        sql = """
-            SELECT parent_asin, title, author_name, average_rating, rating_number,
-                   images, categories, title_author_key
-            FROM books
-            WHERE parent_asin IS NOT NULL AND TRIM(parent_asin) != ''
-            ORDER BY parent_asin
-        """
-        if limit is not None:
-            sql += " LIMIT ?"
-            cur.execute(sql, (limit,))
-        else:
-            cur.execute(sql)
-
-        written = 0
-        batch = []
-        for row in cur:
-            batch.append(row)
-            if len(batch) >= BATCH_SIZE:
-                with table.batch_writer() as writer:
-                    for r in batch:
-                        writer.put_item(Item=row_to_item(r))
-                        written += 1
-                batch = []
-                if written % 10000 == 0 and written > 0:
-                    print(f"  Loaded {written:,} books...")
-
-        if batch:
-            with table.batch_writer() as writer:
-                for r in batch:
-                    writer.put_item(Item=row_to_item(r))
-                    written += 1
-
-    return written
+    with closing(sqlite3.connect(db_path)) as conn:
+        segments = split_key_range(
+            conn,
+            "books",
+            "parent_asin",
+            workers,
+            where="parent_asin IS NOT NULL AND TRIM(parent_asin) != ''",
+            limit=limit,
+        )
+
+    loader = BulkLoader(
+        client or boto3.client("dynamodb"),
+        table_name,
+        workers=workers,
+        target_wcu=target_wcu,
+        checkpoint=Checkpoint(checkpoint_path),
+        progress=lambda st: print(f"  Loaded {st.written:,} books..."),
+    )
+    read_segment = partial(
+        iter_sqlite_range, db_path, BOOKS_SELECT_SQL, "parent_asin", to_item=row_to_item
+    )
+    return loader.load_segments(segments, read_segment, key="parent_asin").written
 
 
 def main() -> None:
@@ -171,18 +186,27 @@ def main() -> None:
         action="store_true",
         help="Delete all items in the table before loading (use when replacing with a smaller catalog)",
     )
+    parser.add_argument("--workers", type=int, default=LOAD_WORKERS, help="Parallel writer threads")
+    parser.add_argument(
+        "--target-wcu", type=float, default=TARGET_WCU, help="Write units per second to pace to (0 = unpaced)"
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path, default=None, help="Progress file; rerun with the same file to resume"
+    )
     args = parser.parse_args()
 
     if args.create_table:
         ensure_table_exists()
 
     if args.clear_table:
-        clear_table()
+        clear_table(workers=args.workers)
 
     limit = None if args.all else (args.limit if args.limit is not None else 100)
     msg = "all" if limit is None else f"first {limit}"
     print(f"Loading {msg} books from {BOOKS_DB} to DynamoDB table '{TABLE_NAME}' (no description)")
-    written = load_books_to_dynamodb(limit=limit)
+    written = load_books_to_dynamodb(
+        limit=limit, workers=args.workers, target_wcu=args.target_wcu, checkpoint_path=args.checkpoint
+    )
     print(f"Loaded {written} books")
 
 
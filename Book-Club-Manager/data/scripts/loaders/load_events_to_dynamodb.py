@@ -6,6 +6,10 @@ data/processed/book_events_clean.json, sets TTL to event start time
 (start_iso as epoch seconds), and upserts each record. Items expire when the
 event starts. Enable TTL on the table in AWS Console with attribute name "ttl".
 
+Each item also gets `day_bucket` = "day#YYYYMMDD" (UTC day of its ttl). A GSI
+with partition key day_bucket and sort key ttl (EVENTS_DAY_BUCKET_GSI) lets the
+app read the soonest events a few days at a time without a table scan.
+
 Usage:
     python -m data.scripts.load_events_to_dynamodb
     python -m data.scripts.load_events_to_dynamodb --limit 10
@@ -23,6 +27,8 @@ from pathlib import Path
 import boto3
 from dotenv import load_dotenv
 
+from data.scripts.loaders.bulk_loader import BulkLoader
+
 load_dotenv()
 
 # Paths
@@ -39,11 +45,14 @@ EVENTS_JSON = Path(
 
 # DynamoDB (table must already exist)
 TABLE_NAME = os.getenv("EVENTS_TABLE", "events")
-BATCH_SIZE = 25
+# Write rate (WCU/s) the loader paces itself to (0 = unpaced).
+TARGET_WCU = float(os.getenv("DYNAMODB_TARGET_WCU", "25"))
 
 # Default values for events table
 DEFAULT_PARENT_ASIN = "NO_PARENT_ASIN"
 DEFAULT_EVENT_TYPE = "event"
+# Partition key prefix of the day-bucket GSI (matches backend.events_pool.day_bucket)
+DAY_BUCKET_PREFIX = "day#"
 
 def ttl_seconds_from_start_iso(start_iso: str) -> int | None:
     """Return Unix timestamp (seconds) for TTL: when the event starts. None if invalid."""
@@ -59,6 +68,12 @@ def ttl_seconds_from_start_iso(start_iso: str) -> int | None:
         return None
 
 
+def day_bucket_from_ttl(ttl: int) -> str:
+    """Return the "day#YYYYMMDD" bucket (UTC) for an epoch-seconds ttl."""
+    day = datetime.fromtimestamp(int(ttl), tz=timezone.utc).strftime("%Y%m%d")
+    return f"{DAY_BUCKET_PREFIX}{day}"
+
+
 def event_id_from_link(link: str) -> str:
     """Deterministic 16-char hex from link (matches clean_book_events)."""
     return hashlib.sha256(str(link or "").encode("utf-8")).hexdigest()[:16]
@@ -114,6 +129,7 @@ def record_to_item(record: dict) -> dict:
         item["parent_asin"] = parent_asin
     if ttl is not None:
         item["ttl"] = ttl
+        item["day_bucket"] = day_bucket_from_ttl(ttl)
     return item
 
 
@@ -123,6 +139,8 @@ def load_events_to_dynamodb(
     json_path: Path = EVENTS_JSON,
     table_name: str = TABLE_NAME,
     limit: int | None = None,
+    target_wcu: float = TARGET_WCU,
+    client=None,
 ) -> int:
     """Load events from cleaned JSON to DynamoDB. Returns number of items written."""
     if not json_path.exists():
@@ -135,34 +153,23 @@ def load_events_to_dynamodb(
     if limit is not None:
         records = records[:limit]
 
-    dynamodb = boto3.resource("dynamodb")
-    table = dynamodb.Table(table_name)
-    written = 0
-    batch = []
-
+    items = []
     for record in records:
         # Require link, title, and a valid start time/ttl; skip incomplete events
         if not _str_val(record.get("link")) or not _str_val(record.get("title")):
             continue
         if record.get("ttl") is None or not _str_val(record.get("start_iso")):
             continue
-        batch.append(record_to_item(record))
-        if len(batch) >= BATCH_SIZE:
-            with table.batch_writer() as writer:
-                for item in batch:
-                    writer.put_item(Item=item)
-                    written += 1
-            batch = []
-            if written % 50 == 0 and written > 0:
-                print(f"  Loaded {written} events...")
-
-    if batch:
-        with table.batch_writer() as writer:
-            for item in batch:
-                writer.put_item(Item=item)
-                written += 1
-
-    return written
+        items.append(record_to_item(record))
+
+    loader = BulkLoader(
+        client or boto3.client("dynamodb"),
+        table_name,
+        target_wcu=target_wcu,
+        progress=lambda st: print(f"  Loaded {st.written} events..."),
+        progress_every=50,
+    )
+    return loader.write_items(items, key="event_id", segment="events")
 
 
 def main() -> None:
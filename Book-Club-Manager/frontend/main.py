@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import logging
 
 import streamlit as st
 import streamlit.components.v1 as components
 
-from backend import config
-from backend.data_loader import books_to_ui_shape, build_ui_bootstrap
+from backend import config, metadata_cache
+from backend.bootstrap_cache import get_bootstrap_cache, section_key
+from backend.data_loader import books_to_ui_shape, build_books_bootstrap, build_clubs_bootstrap
+from backend.instrumentation import get_registry, trace
+from backend.request_cache import page, unit_of_work
 from backend.services import books_service, events_service
 from backend.services.recommender_service import (
+    book_recommendations_generation,
+    book_recommendations_refreshing,
     get_recommended_books_for_user,
     get_recommended_events_for_user,
 )
@@ -35,6 +41,7 @@ from frontend.pages.forums import (
 )
 from frontend.pages.my_events import _sync_user_clubs_and_save
 from frontend.pages.tabs import render_tabs
+from frontend.ui.components import render_debug_panel
 from frontend.ui.styles import inject_styles
 
 RECOMMENDER_AVAILABLE = True
@@ -44,10 +51,14 @@ RECOMMENDER_AVAILABLE = True
 _FEED_CACHE_TTL = 300
 
 
-@st.cache_data(ttl=_FEED_CACHE_TTL, show_spinner=False)
-def _cached_aws_bootstrap():
-    """Load bootstrap data from AWS once per TTL; avoids refetch on every rerun (e.g. carousel)."""
+def _load_bootstrap_books() -> dict:
+    """Build the books bootstrap section: trending books (reviews + SPL) in UI shape.
+
+    Also returns `extended_books_by_source_id`, which adds the SPL trending list
+    so the detail page can resolve books from any feed section.
+    """
     raw_books = books_service.get_trending_books_reviews(50) or []
+    spl: list[dict] = []
     try:
         spl = books_service.get_trending_books_spl(50) or []
         seen = {b.get("parent_asin") or b.get("source_id") for b in raw_books}
@@ -58,11 +69,49 @@ def _cached_aws_bootstrap():
                 raw_books.append(b)
     except (RuntimeError, ValueError, TypeError, KeyError):
         pass
-    events = events_service.get_explore_events(36) or []
-    storage = get_storage()
-    forum_db = storage.load_forum_db()
-    forum_posts_raw = forum_db.get("posts", []) if isinstance(forum_db, dict) else []
-    return build_ui_bootstrap(raw_books, events, forum_posts_raw)
+    data = build_books_bootstrap(raw_books)
+    extended_books_by_source_id = dict(data["books_by_source_id"])
+    for b in books_to_ui_shape(spl, 50):
+        if b.get("source_id"):
+            extended_books_by_source_id[str(b["source_id"])] = b
+    data["extended_books_by_source_id"] = extended_books_by_source_id
+    return data
+
+
+def _bootstrap_books(storage) -> tuple[dict, tuple]:
+    """Return the cached books section (rebuilt when its data files or writes change).
+
+    Also returns the stamp of this build of the section (see
+    BootstrapCache.get_stamped), which keys the sections derived from it.
+    """
+    return get_bootstrap_cache().get_stamped(
+        "books", section_key(storage, "books"), _load_bootstrap_books
+    )
+
+
+def _bootstrap_events(storage, books: list[dict], books_stamp: tuple) -> dict:
+    """Return the cached events section (clubs, neighborhoods) for the given books section."""
+    # Clubs link to books by id, so a rebuilt books section rebuilds the clubs too.
+    key = (section_key(storage, "events"), books_stamp)
+    return get_bootstrap_cache().get(
+        "events",
+        key,
+        lambda: build_clubs_bootstrap(events_service.get_explore_events(36) or [], books),
+    )
+
+
+def _bootstrap_forum(storage) -> dict:
+    """Return the cached forum store, shared by every rerun: treat it as read-only.
+
+    Write paths (frontend/pages/forums.py) save an edited copy instead of
+    mutating it; saves bump the forum write generation and rebuild the cached one.
+    """
+    forum_db = get_bootstrap_cache().get(
+        "forum", section_key(storage, "forum"), storage.load_forum_db
+    )
+    if not isinstance(forum_db, dict):
+        forum_db = {"posts": [], "next_post_id": 1}
+    return forum_db
 
 
 @st.cache_data(ttl=_FEED_CACHE_TTL, show_spinner=False)
@@ -76,9 +125,11 @@ def _cached_spl_trending():
 
 
 @st.cache_data(ttl=_FEED_CACHE_TTL, show_spinner=False)
-def _cached_book_recommendations(user_email: str):
+def _cached_book_recommendations(user_email: str, refresh_generation: int = 0):  # pylint: disable=unused-argument
     """Recommendations by user so we don't refetch on every interaction.
 
+    refresh_generation (finished background refreshes for the user) is part of
+    the cache key, so a completed refresh is picked up on the next rerun.
     Returns a dict so callers can key further caches off book_updated_at.
     """
     email = (user_email or "").strip().lower()
@@ -90,6 +141,21 @@ def _cached_book_recommendations(user_email: str):
     }
 
 
+def _book_recommendations(user_email: str) -> dict:
+    """Cached recommendations plus whether a background refresh is still running."""
+    payload = dict(
+        _cached_book_recommendations(user_email, book_recommendations_generation(user_email)) or {}
+    )
+    payload["refreshing"] = book_recommendations_refreshing(user_email)
+    return payload
+
+
+@st.cache_data(show_spinner=False)
+def _warm_metadata_cache() -> int:
+    """Preload popular book metadata into the process-wide cache once per server process."""
+    return metadata_cache.warm_up(get_storage())
+
+
 def init_session(books: list[dict]) -> None:
     """Initialize required Streamlit session-state defaults."""
     st.session_state.setdefault("signed_in", False)
@@ -155,41 +221,37 @@ def handle_query_navigation(
 
 
 def main() -> None:
-    """Run the Streamlit app entrypoint and render all tabs."""
+    """Run the Streamlit app entrypoint and render all tabs.
+
+    The whole rerun is one storage unit of work: repeated per-user reads are
+    served once (backend/request_cache.py) and the rerun's own writes
+    invalidate them. Timed operations are traced per rerun and shown in the
+    debug panel when INSTRUMENTATION_DEBUG_PANEL is set or the URL has ?debug=1.
+    """
+    with unit_of_work("rerun") as unit, trace("rerun") as rerun_trace:
+        try:
+            _render_app()
+        finally:
+            if config.STORAGE_READ_REPORT:
+                logging.info("%s", unit.format_report())
+    if config.INSTRUMENTATION_DEBUG_PANEL or st.query_params.get("debug") == "1":
+        render_debug_panel(rerun_trace, get_registry())
+
+
+def _render_app() -> None:
+    """Render one rerun of the app (see main)."""
     st.set_page_config(page_title="Bookish", page_icon="📚", layout="wide")
     inject_styles()
     storage = get_storage()
-    # Data from services (AWS) or local files: one place to see where bootstrap data comes from.
-    if getattr(config, "IS_AWS", False):
-        data = _cached_aws_bootstrap()
-    else:
-        # Keep local mode close to AWS by using services + build_ui_bootstrap too.
-        raw_books = books_service.get_trending_books_reviews(50) or []
-        try:
-            spl = books_service.get_trending_books_spl(50) or []
-            seen = {b.get("parent_asin") or b.get("source_id") for b in raw_books}
-            for b in spl:
-                aid = b.get("parent_asin") or b.get("source_id")
-                if aid and aid not in seen:
-                    seen.add(aid)
-                    raw_books.append(b)
-        except (RuntimeError, ValueError, TypeError, KeyError):
-            pass
-        events = events_service.get_explore_events(36) or []
-        forum_db = storage.load_forum_db()
-        forum_posts_raw = forum_db.get("posts", []) if isinstance(forum_db, dict) else []
-        data = build_ui_bootstrap(raw_books, events, forum_posts_raw)
+    _warm_metadata_cache()
+    # Books are needed on every page; events and forum are loaded when a page uses them.
+    # All three come from the bootstrap cache, so reruns with unchanged data are cheap.
+    data, books_stamp = _bootstrap_books(storage)
     books = data["books"]
     books_by_id = data["books_by_id"]
     books_by_source_id = data["books_by_source_id"]
-    # Include SPL trending (and other feed lists) so detail page can resolve books from any section
-    extended_books_by_source_id = dict(books_by_source_id)
-    for b in books_to_ui_shape(_cached_spl_trending(), 50):
-        if b.get("source_id"):
-            extended_books_by_source_id[str(b["source_id"])] = b
-    events = data["clubs"]
+    extended_books_by_source_id = data["extended_books_by_source_id"]
     genres = data["genres"]
-    neighborhoods = data["neighborhoods"]
     init_session(books)
 
     st.sidebar.title("Bookish")
@@ -231,9 +293,6 @@ def main() -> None:
                 "saved_forum_post_ids": [],
             }
 
-    forum_store = storage.load_forum_db()
-    forum_posts_data = forum_store["posts"]
-    forum_post_ids = {int(p["id"]) for p in forum_posts_data if "id" in p}
     if st.session_state.get("show_genre_onboarding") and st.session_state.get("signed_in"):
         if current_user is None:
             email = st.session_state.get("user_email", "")
@@ -250,18 +309,24 @@ def main() -> None:
         render_genre_onboarding(genres=GENRE_DROPDOWN_OPTIONS, current_user=current_user, store=store)
         return
     if st.session_state.get("show_book_detail_page"):
-        render_book_detail_page(
-            books=books,
-            books_by_id=books_by_id,
-            extended_books_by_source_id=extended_books_by_source_id,
-            current_user=current_user,
-            forum_store=forum_store,
-            forum_posts_data=forum_posts_data,
-            clear_aws_bootstrap_cache=_cached_aws_bootstrap.clear,
-            clear_book_recs_cache=_cached_book_recommendations.clear,
-        )
+        # The detail page reads only this book's thread from the storage index.
+        with page("book_detail"):
+            render_book_detail_page(
+                books=books,
+                books_by_id=books_by_id,
+                extended_books_by_source_id=extended_books_by_source_id,
+                current_user=current_user,
+                clear_aws_bootstrap_cache=get_bootstrap_cache().invalidate,
+                clear_book_recs_cache=_cached_book_recommendations.clear,
+            )
         return
+    forum_store = _bootstrap_forum(storage)
+    forum_posts_data = forum_store.get("posts") or []
+    forum_post_ids = {int(p["id"]) for p in forum_posts_data if "id" in p}
 
+    club_data = _bootstrap_events(storage, books, books_stamp)
+    events = club_data["clubs"]
+    neighborhoods = club_data["neighborhoods"]
     tabs = st.tabs(["Feed", "Explore Events", "My Events", "Library", "Forum"])
     handle_query_navigation(books_by_id, forum_post_ids)
     if st.session_state.get("jump_to_forum_detail"):
@@ -324,7 +389,7 @@ def main() -> None:
         extended_books_by_source_id=extended_books_by_source_id,
         recommender_available=RECOMMENDER_AVAILABLE,
         cached_spl_trending=_cached_spl_trending,
-        cached_book_recommendations=_cached_book_recommendations,
+        cached_book_recommendations=_book_recommendations,
         resolve_recommended_books=resolve_recommended_books,
         get_recommended_events_for_user=get_recommended_events_for_user,
         format_when=_format_when,
@@ -334,6 +399,6 @@ def main() -> None:
         format_post_time=_format_post_time,
         format_comment_time=_format_comment_time,
         forum_preview_text=_forum_preview_text,
-        clear_aws_bootstrap_cache=_cached_aws_bootstrap.clear,
+        clear_aws_bootstrap_cache=get_bootstrap_cache().invalidate,
         genre_dropdown_options=GENRE_DROPDOWN_OPTIONS,
     )
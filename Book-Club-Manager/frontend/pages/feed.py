@@ -12,7 +12,9 @@ import streamlit as st
 
 from backend.config import BOOK_DESCRIPTION_PREVIEW_CHARS
 from backend.data_loader import books_to_ui_shape
+from backend.forum_store import ForumBookIndex
 from backend.services import books_service
+from backend.services import forum_service
 from backend.services import library_service
 from backend.storage import get_book_details as storage_get_book_details
 from backend.storage import get_storage
@@ -144,6 +146,7 @@ def _render_feed_tab(
         st.subheader("Recommended for you")
         recommendation_rows: list[dict] = []
         rec_updated_at = 0
+        rec_refreshing = False
         user_email = ""
         if recommender_available:
             try:
@@ -155,6 +158,7 @@ def _render_feed_tab(
                 payload = cached_book_recommendations(user_email) or {}
                 rec_updated_at = int(payload.get("book_updated_at") or 0)
                 recommendation_rows = list(payload.get("recommended_books") or [])
+                rec_refreshing = bool(payload.get("refreshing"))
             except (RuntimeError, ValueError, KeyError):
                 recommendation_rows = []
                 rec_updated_at = 0
@@ -184,6 +188,8 @@ def _render_feed_tab(
                 top_k=50,
             )
             st.session_state[resolved_cache_key] = recommended_books
+        if rec_refreshing:
+            st.caption("Updating your recommendations…")
         if recommended_books:
             render_book_carousel(
                 section_key="recommended_feed",
@@ -419,10 +425,13 @@ def render_book_detail_page(
     clear_aws_bootstrap_cache: Callable[[], None] | None = None,
     clear_book_recs_cache: Callable[[], None] | None = None,
 ) -> None:
-    """Render Book Detail page with library and related forum discussions."""
-    _ = store
-    forum_store = forum_store or {"posts": [], "next_post_id": 1}
-    forum_posts_data = forum_posts_data or []
+    """Render Book Detail page with library and related forum discussions.
+
+    The book's discussions come from the storage book index (one lookup) unless
+    `forum_posts_data` is passed; `forum_store` is no longer used, since new
+    posts are written on their own with create_forum_post.
+    """
+    _ = store, forum_store
     if st.button("← Back to Feed"):
         st.session_state["show_book_detail_page"] = False
         st.rerun()
@@ -635,18 +644,17 @@ def render_book_detail_page(
 
     st.divider()
     st.subheader("Discussions for this book")
-    related_posts: list[dict] = []
-    book_title_lower = str(book["title"]).strip().lower()
-    for post in forum_posts_data:
-        post_book_id = post.get("book_id")
-        post_book_title = str(post.get("book_title") or "").strip().lower()
-        tag_hit = any(
-            book_title_lower == str(t).strip().lower() for t in post.get("tags", [])
+    # Bootstrap-only books have a placeholder source_id; those match by title/book id only.
+    thread_asin = str(book.get("source_id") or "").strip()
+    if thread_asin.startswith("_idx_"):
+        thread_asin = ""
+    if forum_posts_data is None:
+        thread = forum_service.get_thread_for_book(
+            thread_asin, book_title=book["title"], book_id=book.get("id")
         )
-        id_hit = post_book_id is not None and int(post_book_id) == int(book["id"])
-        title_hit = post_book_title == book_title_lower
-        if (id_hit or title_hit or tag_hit) and can_view_forum_post(post, current_user):
-            related_posts.append(post)
+    else:
+        thread = ForumBookIndex(forum_posts_data).thread(thread_asin, book["title"], book.get("id"))
+    related_posts = [post for post in thread if can_view_forum_post(post, current_user)]
 
     if related_posts:
         for post in related_posts:
@@ -693,14 +701,13 @@ def render_book_detail_page(
             if tag and tag not in tags:
                 tags.append(tag)
 
-        forum_store["posts"].insert(
-            0,
+        get_storage().create_forum_post(
             {
-                "id": int(forum_store["next_post_id"]),
                 "title": post_title.strip(),
                 "author": st.session_state.get("user_name", "User"),
                 "genre": book["genres"][0] if book.get("genres") else None,
                 "book_id": int(book["id"]),
+                "parent_asin": thread_asin or None,
                 "book_title": book["title"],
                 "tags": tags,
                 "replies": 0,
@@ -709,10 +716,8 @@ def render_book_detail_page(
                 "created_at": int(time.time()),
                 "preview": post_text.strip(),
                 "comments": [],
-            },
+            }
         )
-        forum_store["next_post_id"] = int(forum_store["next_post_id"]) + 1
-        get_storage().save_forum_db(forum_store)
         if clear_aws_bootstrap_cache is not None:
             clear_aws_bootstrap_cache()
         for k in (
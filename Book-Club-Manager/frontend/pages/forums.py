@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import copy
 import time
 from datetime import datetime
 from typing import Callable
@@ -87,6 +88,21 @@ def filter_posts_by_tag_query(posts: list[dict], query: str) -> list[dict]:
     return out
 
 
+def _editable_post(forum_store: dict, post_id: int) -> tuple[dict, dict]:
+    """Return (store, post): a copy of forum_store in which post `post_id` may be edited.
+
+    The forum store comes from the bootstrap cache and is shared by every rerun,
+    so write paths copy the posts list and the one post they change, then save
+    the copy; the cached store is rebuilt from the saved data.
+    """
+    posts = list(forum_store.get("posts") or [])
+    for i, post in enumerate(posts):
+        if int(post.get("id", -1)) == int(post_id):
+            posts[i] = copy.deepcopy(post)
+            return {**forum_store, "posts": posts}, posts[i]
+    raise KeyError(post_id)
+
+
 def _render_forum_tab(
     *,
     tab,
@@ -188,13 +204,14 @@ def _render_forum_detail(
             "Unlike post" if liked else "Like post",
             key=f"like_post_{int(selected_post['id'])}",
         ):
+            updated, post = _editable_post(forum_store, selected_post["id"])
             if liked:
-                selected_post["liked_by"] = [u for u in liked_by if u != email]
-                selected_post["likes"] = max(0, int(selected_post.get("likes", 0)) - 1)
+                post["liked_by"] = [u for u in liked_by if u != email]
+                post["likes"] = max(0, int(post.get("likes", 0)) - 1)
             else:
-                selected_post.setdefault("liked_by", []).append(email)
-                selected_post["likes"] = int(selected_post.get("likes", 0)) + 1
-            get_storage().save_forum_db(forum_store)
+                post.setdefault("liked_by", []).append(email)
+                post["likes"] = int(post.get("likes", 0)) + 1
+            get_storage().save_forum_db(updated)
             st.rerun()
 
         saved_ids = current_user.get("saved_forum_post_ids", [])
@@ -235,13 +252,15 @@ def _render_forum_detail(
                 f"{'Unlike' if c_liked else 'Like'} comment ({int(comment.get('likes', 0))})",
                 key=f"like_comment_{int(selected_post['id'])}_{idx}",
             ):
+                updated, post = _editable_post(forum_store, selected_post["id"])
+                edited = post["comments"][idx]
                 if c_liked:
-                    comment["liked_by"] = [u for u in c_liked_by if u != email]
-                    comment["likes"] = max(0, int(comment.get("likes", 0)) - 1)
+                    edited["liked_by"] = [u for u in c_liked_by if u != email]
+                    edited["likes"] = max(0, int(edited.get("likes", 0)) - 1)
                 else:
-                    comment.setdefault("liked_by", []).append(email)
-                    comment["likes"] = int(comment.get("likes", 0)) + 1
-                get_storage().save_forum_db(forum_store)
+                    edited.setdefault("liked_by", []).append(email)
+                    edited["likes"] = int(edited.get("likes", 0)) + 1
+                get_storage().save_forum_db(updated)
                 st.session_state["active_tab_after_save"] = "forum"
                 st.rerun()
         else:
@@ -261,7 +280,8 @@ def _render_forum_detail(
             submit_reply = st.form_submit_button("Reply")
     if submit_reply:
         if reply.strip():
-            selected_post.setdefault("comments", []).append(
+            updated, post = _editable_post(forum_store, selected_post["id"])
+            post.setdefault("comments", []).append(
                 {
                     "author": st.session_state.get("user_name", "User"),
                     "text": reply.strip(),
@@ -270,8 +290,8 @@ def _render_forum_detail(
                     "created_at": int(time.time()),
                 }
             )
-            selected_post["replies"] = len(selected_post.get("comments", []))
-            get_storage().save_forum_db(forum_store)
+            post["replies"] = len(post.get("comments", []))
+            get_storage().save_forum_db(updated)
             st.session_state["forum_reply_clear_key"] = reply_key
             st.session_state["active_tab_after_save"] = "forum"
             st.rerun()
@@ -316,26 +336,30 @@ def _render_forum_create_and_list(
                     tag = raw_tag.strip()
                     if tag and tag not in tags:
                         tags.append(tag)
-                forum_store["posts"].insert(
-                    0,
+                next_post_id = int(forum_store.get("next_post_id") or 1)
+                new_post = {
+                    "id": next_post_id,
+                    "title": post_title.strip(),
+                    "author": st.session_state.get("user_name", "User"),
+                    "genre": None,
+                    "book_id": None,
+                    "book_title": None,
+                    "tags": tags,
+                    "replies": 0,
+                    "likes": 0,
+                    "liked_by": [],
+                    "created_at": int(time.time()),
+                    "preview": post_text.strip(),
+                    "comments": [],
+                }
+                # Save a new store; the cached one is shared across reruns.
+                get_storage().save_forum_db(
                     {
-                        "id": int(forum_store["next_post_id"]),
-                        "title": post_title.strip(),
-                        "author": st.session_state.get("user_name", "User"),
-                        "genre": None,
-                        "book_id": None,
-                        "book_title": None,
-                        "tags": tags,
-                        "replies": 0,
-                        "likes": 0,
-                        "liked_by": [],
-                        "created_at": int(time.time()),
-                        "preview": post_text.strip(),
-                        "comments": [],
-                    },
+                        **forum_store,
+                        "posts": [new_post, *(forum_store.get("posts") or [])],
+                        "next_post_id": next_post_id + 1,
+                    }
                 )
-                forum_store["next_post_id"] = int(forum_store["next_post_id"]) + 1
-                get_storage().save_forum_db(forum_store)
                 clear_aws_bootstrap_cache()
                 st.session_state["forum_form_clear_next"] = True
                 st.session_state["active_tab_after_save"] = "forum"
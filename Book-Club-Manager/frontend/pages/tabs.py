@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Callable
 
+from backend.request_cache import page
+
 from .explore_events import _render_explore_events_tab
 from .feed import _render_feed_tab
 from .forums import _render_forum_tab
@@ -40,57 +42,66 @@ def render_tabs(
     clear_aws_bootstrap_cache: Callable[[], None],
     genre_dropdown_options: list[str],
 ) -> None:
-    """Render all main tabs (Feed, Explore Events, My Events, Library, Forum)."""
-    _render_feed_tab(
-        tab=tabs[0],
-        books=books,
-        genres=genres,
-        events=events,
-        current_user=current_user,
-        store=store,
-        books_by_source_id=books_by_source_id,
-        recommender_available=recommender_available,
-        cached_spl_trending=cached_spl_trending,
-        cached_book_recommendations=cached_book_recommendations,
-        resolve_recommended_books_fn=resolve_recommended_books,
-        get_recommended_events_for_user=get_recommended_events_for_user,
-        format_when=format_when,
-        sync_user_clubs_and_save=sync_user_clubs_and_save,
-        genre_dropdown_options=genre_dropdown_options,
-    )
-    _render_explore_events_tab(
-        tab=tabs[1],
-        events=events,
-        neighborhoods=neighborhoods,
-        current_user=current_user,
-        store=store,
-        format_when=format_when,
-        sync_user_clubs_and_save=sync_user_clubs_and_save,
-    )
-    _render_my_events_tab(
-        tab=tabs[2],
-        events=events,
-        current_user=current_user,
-        store=store,
-        format_when=format_when,
-        sync_user_clubs_and_save=sync_user_clubs_and_save,
-    )
-    _render_library_tab(
-        tab=tabs[3],
-        books_by_id=books_by_id,
-        books_by_source_id=extended_books_by_source_id or books_by_source_id,
-        current_user=current_user,
-    )
-    _render_forum_tab(
-        tab=tabs[4],
-        current_user=current_user,
-        store=store,
-        forum_store=forum_store,
-        forum_posts_data=forum_posts_data,
-        can_view_forum_post_fn=can_view_forum_post,
-        build_post_tags_fn=build_post_tags,
-        format_post_time=format_post_time,
-        format_comment_time=format_comment_time,
-        forum_preview_text=forum_preview_text,
-        clear_aws_bootstrap_cache=clear_aws_bootstrap_cache,
-    )
+    """Render all main tabs (Feed, Explore Events, My Events, Library, Forum).
+
+    Each tab runs under its own page label so the storage read report of the
+    rerun (backend/request_cache.py) is broken down per tab.
+    """
+    with page("feed"):
+        _render_feed_tab(
+            tab=tabs[0],
+            books=books,
+            genres=genres,
+            events=events,
+            current_user=current_user,
+            store=store,
+            books_by_source_id=books_by_source_id,
+            recommender_available=recommender_available,
+            cached_spl_trending=cached_spl_trending,
+            cached_book_recommendations=cached_book_recommendations,
+            resolve_recommended_books_fn=resolve_recommended_books,
+            get_recommended_events_for_user=get_recommended_events_for_user,
+            format_when=format_when,
+            sync_user_clubs_and_save=sync_user_clubs_and_save,
+            genre_dropdown_options=genre_dropdown_options,
+        )
+    with page("explore_events"):
+        _render_explore_events_tab(
+            tab=tabs[1],
+            events=events,
+            neighborhoods=neighborhoods,
+            current_user=current_user,
+            store=store,
+            format_when=format_when,
+            sync_user_clubs_and_save=sync_user_clubs_and_save,
+        )
+    with page("my_events"):
+        _render_my_events_tab(
+            tab=tabs[2],
+            events=events,
+            current_user=current_user,
+            store=store,
+            format_when=format_when,
+            sync_user_clubs_and_save=sync_user_clubs_and_save,
+        )
+    with page("library"):
+        _render_library_tab(
+            tab=tabs[3],
+            books_by_id=books_by_id,
+            books_by_source_id=extended_books_by_source_id or books_by_source_id,
+            current_user=current_user,
+        )
+    with page("forum"):
+        _render_forum_tab(
+            tab=tabs[4],
+            current_user=current_user,
+            store=store,
+            forum_store=forum_store,
+            forum_posts_data=forum_posts_data,
+            can_view_forum_post_fn=can_view_forum_post,
+            build_post_tags_fn=build_post_tags,
+            format_post_time=format_post_time,
+            format_comment_time=format_comment_time,
+            forum_preview_text=forum_preview_text,
+            clear_aws_bootstrap_cache=clear_aws_bootstrap_cache,
+        )
@@ -106,3 +106,27 @@ def render_book_carousel(
         ):
             st.session_state[page_state_key] = min(total_pages - 1, current_page + 1)
             st.rerun()
+
+
+def render_debug_panel(rerun_trace, registry) -> None:
+    """Render the hidden timings panel: this rerun's slowest operations plus process-wide stats.
+
+    Args:
+        rerun_trace: backend.instrumentation.Trace of the current rerun.
+        registry: backend.instrumentation.Registry with per-operation stats.
+    """
+    spans = rerun_trace.rows()
+    top_level_ms = sum(s["duration_ms"] for s in spans if s["depth"] == 0)
+    with st.sidebar.expander("Debug: timings", expanded=False):
+        st.caption(f"This rerun: {len(spans)} timed operations, {top_level_ms:.1f} ms at top level.")
+        st.markdown("**Slowest operations this rerun**")
+        st.table(rerun_trace.slowest(15))
+        st.markdown("**All operations (since process start)**")
+        st.table([{"op": op, **stats} for op, stats in registry.snapshot().items()])
+        st.download_button(
+            "Download timings (JSON)",
+            registry.to_json(),
+            file_name="timings.json",
+            mime="application/json",
+        )
+        st.code(registry.to_prometheus(), language="text")
@@ -0,0 +1,205 @@
+"""
+Tests for Book-Club-Manager.backend.recommender.artifact_cache.
+
+These tests verify:
+- Objects are downloaded with ranged GETs into a per-ETag directory and
+  reused (HEAD only) by a new cache instance, as after a restart
+- Downloads are checked against the manifest sha256 or the ETag MD5, and
+  failed verification leaves nothing in the cache
+- A new upload gets a new version directory and old versions are pruned
+- Missing optional artifacts map to None; S3 outages fall back to the cache
+- fit() loads the content-based artifacts through the cache in AWS mode
+- ML_ARTIFACTS_BUCKET takes precedence over DATA_BUCKET everywhere
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+
+class _ClientError(Exception):
+    """botocore-style error carrying response["Error"]["Code"]."""
+
+    def __init__(self, code: str) -> None:
+        "Helper for init."
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class _FakeS3:
+    """In-memory S3 client recording calls (head_object, ranged get_object)."""
+
+    def __init__(self) -> None:
+        "Helper for init."
+        self.objects: dict[str, bytes] = {}
+        self.calls: list[tuple[str, str, str]] = []
+        self.down = False
+
+    def head_object(self, Bucket, Key):  # type: ignore[no-untyped-def]  # noqa: N803
+        "Helper for head object."
+        self.calls.append(("head", Key, ""))
+        if self.down:
+            raise _ClientError("ServiceUnavailable")
+        if Key not in self.objects:
+            raise _ClientError("404")
+        data = self.objects[Key]
+        return {"ContentLength": len(data), "ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):  # type: ignore[no-untyped-def]  # noqa: N803
+        "Helper for get object."
+        self.calls.append(("get", Key, Range or ""))
+        if Key not in self.objects:
+            raise _ClientError("NoSuchKey")
+        data = self.objects[Key]
+        if IfMatch is not None and IfMatch.strip('"') != hashlib.md5(data).hexdigest():
+            raise _ClientError("PreconditionFailed")
+        if Range:
+            start, end = (int(x) for x in Range.split("=", 1)[1].split("-", 1))
+            data = data[start : end + 1]
+        return {"Body": io.BytesIO(data)}
+
+
+def _cache(tmp_path, s3, **kwargs):  # type: ignore[no-untyped-def]
+    "Helper for cache."
+    from backend.recommender.artifact_cache import ArtifactCache
+
+    kwargs.setdefault("part_size", 1024)
+    return ArtifactCache(tmp_path / "cache", s3=s3, manifest_key="art/manifest.json", **kwargs)
+
+
+def test_ranged_download_is_reused_after_restart(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    "Test ranged download is reused after restart."
+    s3 = _FakeS3()
+    payload = bytes(range(256)) * 40  # 10240 bytes -> 10 parts of 1 KiB
+    s3.objects["art/book_tfidf.npz"] = payload
+
+    path = _cache(tmp_path, s3).ensure("bucket", "art/book_tfidf.npz")
+
+    assert path.read_bytes() == payload
+    assert path.parent.name == hashlib.md5(payload).hexdigest()
+    ranges = sorted(r for op, _key, r in s3.calls if op == "get" and r)
+    assert len(ranges) == 10 and ranges[0] == "bytes=0-1023"
+    assert json.loads((path.parent / "meta.json").read_text())["verified_by"] == "etag"
+
+    s3.calls.clear()
+    again = _cache(tmp_path, s3).ensure("bucket", "art/book_tfidf.npz")
+    assert again == path
+    assert [op for op, key, _r in s3.calls if key == "art/book_tfidf.npz"] == ["head"]
+
+
+def test_verification_failure_leaves_no_file(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    "Test verification failure leaves no file."
+    from backend.recommender.artifact_cache import ArtifactCacheError
+
+    s3 = _FakeS3()
+    s3.objects["art/norms.npz"] = b"norms" * 100
+    s3.objects["art/manifest.json"] = json.dumps(
+        {"norms.npz": {"sha256": "0" * 64, "size": 500}}
+    ).encode()
+
+    with pytest.raises(ArtifactCacheError, match="manifest"):
+        _cache(tmp_path, s3).ensure("bucket", "art/norms.npz")
+    assert not [p for p in (tmp_path / "cache").rglob("*") if p.is_file() and p.name != ".lock"]
+
+    s3.objects["art/manifest.json"] = json.dumps(
+        {"norms.npz": {"sha256": hashlib.sha256(b"norms" * 100).hexdigest(), "size": 500}}
+    ).encode()
+    path = _cache(tmp_path, s3).ensure("bucket", "art/norms.npz")
+    assert json.loads((path.parent / "meta.json").read_text())["verified_by"] == "manifest"
+
+
+def test_new_versions_prune_old_ones_and_outages_use_cache(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    "Test new versions prune old ones and outages use cache."
+    s3 = _FakeS3()
+    cache = _cache(tmp_path, s3, keep_versions=2)
+    paths = []
+    for version in range(3):
+        s3.objects["art/ids.json"] = json.dumps({"v": version}).encode()
+        paths.append(cache.ensure("bucket", "art/ids.json"))
+    assert len({p.parent for p in paths}) == 3
+    assert not paths[0].exists() and paths[1].exists() and paths[2].exists()
+
+    s3.down = True
+    assert cache.ensure("bucket", "art/ids.json").read_bytes() == b'{"v": 2}'
+
+
+def test_missing_optional_artifacts_and_multipart_etag(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    "Test missing optional artifacts and multipart etag."
+    from backend.recommender import artifact_cache
+
+    s3 = _FakeS3()
+    s3.objects["art/a.npz"] = b"a" * 10
+    out = _cache(tmp_path, s3).ensure_many("bucket", ["art/a.npz"], optional=["art/buckets.npz"])
+    assert out["art/buckets.npz"] is None
+    with pytest.raises(artifact_cache.ArtifactNotFoundError):
+        _cache(tmp_path, s3).ensure("bucket", "art/missing.npz")
+
+    blob = tmp_path / "blob.bin"
+    blob.write_bytes(b"x" * 2500)
+    parts = [hashlib.md5(b"x" * n).digest() for n in (1000, 1000, 500)]
+    assert artifact_cache.multipart_etag(blob, 1000) == f"{hashlib.md5(b''.join(parts)).hexdigest()}-3"
+
+
+def test_fit_loads_precomputed_artifacts_through_cache(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    "Test fit loads precomputed artifacts through cache."
+    from backend import config
+    from backend.recommender import book_recommender
+
+    tfidf = sparse.random(5, len(book_recommender.GENRE_VOCAB), density=0.3, format="csr", random_state=0)
+    tfidf_buf, norms_buf = io.BytesIO(), io.BytesIO()
+    sparse.save_npz(tfidf_buf, tfidf)
+    np.savez(norms_buf, average_rating_norm=np.linspace(0, 1, 5), rating_number_norm=np.ones(5))
+    s3 = _FakeS3()
+    s3.objects[book_recommender.BOOK_TFIDF_S3_KEY] = tfidf_buf.getvalue()
+    s3.objects[book_recommender.BOOK_RATING_NORMS_S3_KEY] = norms_buf.getvalue()
+    s3.objects[book_recommender.BOOK_ID_TO_IDX_ARTIFACT_S3_KEY] = json.dumps(
+        {f"A{i}": i for i in range(5)}
+    ).encode()
+    cache = _cache(tmp_path, s3)
+    monkeypatch.setattr(book_recommender, "IS_AWS", True)
+    monkeypatch.setattr(config, "ML_ARTIFACTS_BUCKET", "bucket")
+    monkeypatch.setattr(config, "DATA_BUCKET", "data-bucket")
+    monkeypatch.setattr(book_recommender, "get_artifact_cache", lambda: cache)
+
+    rec = book_recommender.ContentBasedBookRecommender(data_dir=tmp_path / "empty")
+    rec.fit()
+
+    assert rec.book_id_to_idx == {f"A{i}": i for i in range(5)}
+    assert rec.book_tfidf.shape == tfidf.shape
+    assert rec.books_df is None
+    assert (tmp_path / "cache" / "bucket" / book_recommender.BOOK_TFIDF_S3_KEY).is_dir()
+
+
+def test_artifacts_bucket_prefers_ml_artifacts_bucket(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    "Test artifacts bucket prefers ml artifacts bucket."
+    from backend import config
+    from backend.recommender import artifact_cache
+
+    monkeypatch.setattr(config, "ML_ARTIFACTS_BUCKET", "ml-bucket")
+    monkeypatch.setattr(config, "DATA_BUCKET", "data-bucket")
+    assert artifact_cache.artifacts_bucket() == "ml-bucket"
+
+    seen: list[str] = []
+
+    class _Cache:
+        "Helper for  cache."
+
+        def ensure_many(self, bucket, keys, optional=()):  # type: ignore[no-untyped-def]
+            "Helper for ensure many."
+            seen.append(bucket)
+            return {k: tmp_path / k for k in [*keys, *optional]}
+
+    monkeypatch.setattr(config, "IS_AWS", True)
+    monkeypatch.setattr(artifact_cache, "get_artifact_cache", lambda: _Cache())
+    artifact_cache.local_or_cached({tmp_path / "missing.npz": "art/missing.npz"})
+    assert artifact_cache.main([]) == 0
+    assert seen == ["ml-bucket", "ml-bucket"]
+
+    monkeypatch.setattr(config, "ML_ARTIFACTS_BUCKET", "")
+    assert artifact_cache.artifacts_bucket() == "data-bucket"
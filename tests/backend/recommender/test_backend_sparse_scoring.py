@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from backend.recommender.book_recommender_backend import BookRecommender
+from backend.recommender.compact import SCORE_DTYPE
+
+
+def _make_rec(n_books: int, beta, seed: int = 0, ties: bool = False):
+    "Helper for make rec."
+    rng = np.random.default_rng(seed)
+    rows = np.repeat(np.arange(n_books), 8)
+    cols = rng.integers(0, n_books, size=rows.size)
+    sim = sparse.csr_matrix(
+        (rng.random(rows.size).astype(np.float32), (rows, cols)), shape=(n_books, n_books)
+    )
+    rec = BookRecommender.__new__(BookRecommender)
+    rec.beta_scaled = np.array(beta, dtype=np.float32)
+    rec.book_similarity = sim
+    pop = rng.integers(0, 5, size=n_books) if ties else rng.random(n_books)
+    rec.popularity_score = pop.astype(np.float32)
+    rec.book_id_to_idx = {f"b{i}": i for i in range(n_books)}
+    rec.idx_to_book_id = {i: f"b{i}" for i in range(n_books)}
+    rec.storage = MagicMock()
+    rec._prior_cache = None
+    rec.fetch_books = lambda ids: ids  # type: ignore[assignment]
+    return rec
+
+
+def _dense_top_k(rec, library, top_k):
+    "Helper for dense top k (the full-catalog scorer this path replaces)."
+    beta = rec.beta_scaled
+    idx = np.array([rec.book_id_to_idx[b] for b in library], dtype=np.int32)
+    scores = rec.popularity_score * SCORE_DTYPE(beta[1])
+    if idx.size:
+        nb = rec.book_similarity[idx]
+        sim = np.zeros_like(scores)
+        np.add.at(sim, nb.indices, nb.data)
+        sim *= SCORE_DTYPE(1.0 / idx.size)
+        scores = scores + sim * SCORE_DTYPE(beta[0])
+        scores = scores + np.log1p(sim * SCORE_DTYPE(np.log1p(idx.size))) * SCORE_DTYPE(beta[2])
+        scores[idx] = -np.inf
+    order = np.lexsort((np.arange(scores.size), -scores))
+    return [rec.idx_to_book_id[i] for i in order[:top_k] if np.isfinite(scores[i])]
+
+
+@pytest.mark.parametrize("beta", [(2.0, 0.5, 1.0), (0.3, -0.7, 2.0), (-1.0, 0.2, -0.5)])
+@pytest.mark.parametrize("lib_size", [0, 1, 5, 40])
+def test_sparse_first_matches_full_catalog_scoring(beta, lib_size) -> None:
+    "Test sparse first matches full catalog scoring."
+    rec = _make_rec(500, beta, seed=lib_size, ties=lib_size % 2 == 1)
+    library = [f"b{i}" for i in range(0, 4 * lib_size, 4)]
+    rec.storage.get_user_books.return_value = library
+    assert rec.recommend("u", top_k=25) == _dense_top_k(rec, library, 25)
+
+
+def test_prior_order_is_cached_until_artifacts_change() -> None:
+    "Test prior order is cached until artifacts change."
+    rec = _make_rec(50, (1.0, 1.0, 1.0))
+    _, order = rec._prior_order()
+    assert rec._prior_order()[1] is order
+    rec.beta_scaled = np.array((1.0, -1.0, 1.0), dtype=np.float32)
+    _, flipped = rec._prior_order()
+    assert flipped[0] == order[-1]
+    # A new popularity array (even one that reuses a freed id) rebuilds the order.
+    rec.popularity_score = -rec.popularity_score
+    assert rec._prior_order()[1][0] == order[0]
+
+
+def _dump_model(tmp_path, coef, scale):  # type: ignore[no-untyped-def]
+    "Helper for dump model (joblib pickles of a fitted-looking model and scaler)."
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+
+    clf, scaler = LogisticRegression(), StandardScaler()
+    clf.coef_ = np.array([coef], dtype=np.float64)
+    scaler.scale_ = np.array(scale, dtype=np.float64)
+    model_file, scaler_file = tmp_path / "model.pkl", tmp_path / "scaler.pkl"
+    joblib.dump(clf, model_file)
+    joblib.dump(scaler, scaler_file)
+    return model_file, scaler_file
+
+
+def test_coef_file_is_ignored_when_pickles_change(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test coef file is ignored when pickles change."
+    import importlib as _importlib
+
+    from backend.recommender import book_recommender_backend as backend
+
+    coef_file = tmp_path / "coef.npz"
+    model_file, scaler_file = _dump_model(tmp_path, [1.0, 2.0, 3.0], [1.0, 2.0, 4.0])
+    backend.save_scaled_coefficients(coef_file, [1.0, 2.0, 3.0], [1.0, 2.0, 4.0], model_file, scaler_file)
+    assert backend.coef_file_is_current(coef_file, model_file, scaler_file)
+
+    real_import = _importlib.import_module
+    unpickled: list[str] = []
+    monkeypatch.setattr(
+        backend.importlib, "import_module", lambda name: unpickled.append(name) or real_import(name)
+    )
+    np.testing.assert_allclose(
+        backend.load_scaled_coefficients(model_file, scaler_file, coef_file), [1.0, 1.0, 0.75]
+    )
+    assert unpickled == []
+
+    # Retrained pickles: the stale coef file loses, and is rewritten from them.
+    _dump_model(tmp_path, [4.0, 4.0, 4.0], [2.0, 2.0, 2.0])
+    assert not backend.coef_file_is_current(coef_file, model_file, scaler_file)
+    np.testing.assert_allclose(
+        backend.load_scaled_coefficients(model_file, scaler_file, coef_file), [2.0, 2.0, 2.0]
+    )
+    assert unpickled == ["joblib"]
+    assert backend.coef_file_is_current(coef_file, model_file, scaler_file)
+
+    # A coef file without a source digest (or without pickles to check) is not trusted.
+    np.savez(coef_file, coef=np.ones(3), scale=np.ones(3))
+    assert not backend.coef_file_is_current(coef_file, model_file, scaler_file)
+    assert not backend.coef_file_is_current(coef_file, tmp_path / "missing.pkl", scaler_file)
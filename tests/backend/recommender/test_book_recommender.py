@@ -219,3 +219,17 @@ def test_cold_start_detection(fitted_recommender: BookRecommender) -> None:
     books_this_user = pd.DataFrame({"user_id": ["u9"], "parent_asin": ["A001"]})
     assert br._is_cold_start("u9", pd.DataFrame(), books_this_user) is False
 
+
+
+def test_cosine_similarity_to_rows_matches_sklearn(fitted_recommender: BookRecommender) -> None:
+    "Test cosine similarity to rows matches sklearn."
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    from backend.recommender.book_recommender import _cosine_similarity_to_rows
+
+    profile = np.arange(len(GENRE_VOCAB), dtype=float) % 3
+    tfidf = fitted_recommender.book_tfidf
+    expected = cosine_similarity(profile.reshape(1, -1), tfidf).reshape(-1)
+    np.testing.assert_allclose(_cosine_similarity_to_rows(profile, tfidf), expected)
+    np.testing.assert_allclose(_cosine_similarity_to_rows(profile, tfidf.toarray()), expected)
+    assert not _cosine_similarity_to_rows(np.zeros(len(GENRE_VOCAB)), tfidf).any()
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import importlib
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def _mod():
+    "Helper for  mod."
+    m = importlib.import_module("backend.recommender.book_recommender")
+    return importlib.reload(m)
+
+
+def _one_genre_catalog(n_books: int, n_terms: int, seed: int = 0):
+    "Helper for one genre catalog."
+    rng = np.random.default_rng(seed)
+    cols = rng.integers(0, n_terms, size=n_books)
+    tfidf = sparse.csr_matrix(
+        (np.ones(n_books), (np.arange(n_books), cols)), shape=(n_books, n_terms)
+    )
+    return tfidf, rng.random(n_books), rng.random(n_books)
+
+
+def _multi_genre_catalog(n_books: int, n_terms: int, seed: int = 0):
+    "Helper for multi genre catalog."
+    rng = np.random.default_rng(seed)
+    rows, cols, vals = [], [], []
+    for i in range(n_books):
+        genres = rng.choice(n_terms, size=int(rng.integers(1, 5)), replace=False)
+        rows.extend([i] * len(genres))
+        cols.extend(genres.tolist())
+        vals.extend(rng.random(len(genres)).tolist())
+    tfidf = sparse.csr_matrix((vals, (rows, cols)), shape=(n_books, n_terms))
+    return tfidf, rng.random(n_books), rng.random(n_books)
+
+
+def _exhaustive_top(tfidf, prior, profile, scale, top_k, exclude=()):
+    "Helper for exhaustive top."
+    unit = tfidf.toarray()
+    norms = np.linalg.norm(unit, axis=1, keepdims=True)
+    unit = np.divide(unit, norms, out=np.zeros_like(unit), where=norms > 0)
+    scores = prior + scale * (unit @ (profile / np.linalg.norm(profile)))
+    scores[list(exclude)] = -np.inf
+    return np.argsort(-scores, kind="stable")[:top_k]
+
+
+def test_group_bounds_cap_every_book_similarity() -> None:
+    "Test group bounds cap every book similarity."
+    from backend.recommender.candidate_index import GenreCandidateIndex
+
+    tfidf, rating, _ = _multi_genre_catalog(300, 8, seed=1)
+    index = GenreCandidateIndex(tfidf, rating)
+    profile = np.random.default_rng(2).random(8)
+    bounds = index.group_bounds(profile, 0.5)
+
+    dense = tfidf.toarray()
+    unit = dense / np.linalg.norm(dense, axis=1, keepdims=True)
+    sims = 0.5 * unit @ (profile / np.linalg.norm(profile))
+    for g in range(index.n_groups):
+        books = index._books[index._starts[g]:index._starts[g + 1]]
+        assert np.all(sims[books] <= bounds[g] + 1e-12)
+        assert np.all(np.diff(rating[books]) <= 0)
+
+
+def test_candidates_contain_exact_top_k_on_multi_genre_catalogs() -> None:
+    "Test candidates contain exact top k on multi genre catalogs."
+    from backend.recommender.candidate_index import GenreCandidateIndex
+
+    for seed in range(5):
+        tfidf, rating, popularity = _multi_genre_catalog(3000, 12, seed=seed)
+        prior = 0.3 * rating + 0.2 * popularity
+        index = GenreCandidateIndex(tfidf, prior)
+        rng = np.random.default_rng(100 + seed)
+        profile = np.zeros(12)
+        profile[rng.choice(12, size=3, replace=False)] = rng.random(3) + 0.1
+        library = rng.choice(3000, size=5, replace=False).tolist()
+
+        pool = index.candidates(profile, 0.75, 40, exclude=library, pool_size=400)
+        expected = _exhaustive_top(tfidf, prior, profile, 0.75, 40, exclude=library)
+
+        assert pool.size < 3000
+        assert np.all(np.diff(pool) > 0)
+        assert set(expected.tolist()) <= set(pool.tolist())
+
+
+def test_candidates_skip_negative_profiles() -> None:
+    "Test candidates skip negative profiles."
+    from backend.recommender.candidate_index import GenreCandidateIndex
+
+    tfidf, rating, _ = _one_genre_catalog(100, 4)
+    index = GenreCandidateIndex(tfidf, rating)
+    assert index.candidates(np.array([1.0, -0.5, 0.0, 0.0]), 0.5, 10) is None
+
+
+def test_candidate_index_rejects_misaligned_prior() -> None:
+    "Test candidate index rejects misaligned prior."
+    from backend.recommender.candidate_index import GenreCandidateIndex
+
+    tfidf, _, _ = _one_genre_catalog(10, 3)
+    try:
+        GenreCandidateIndex(tfidf, np.zeros(9))
+    except ValueError as exc:
+        assert "expected 10" in str(exc)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_recommend_with_candidate_index_matches_exhaustive_scoring() -> None:
+    "Test recommend with candidate index matches exhaustive scoring."
+    br = _mod()
+    n_books = 2000
+    tfidf, rating, popularity = _multi_genre_catalog(n_books, len(br.GENRE_VOCAB), seed=3)
+
+    def _make(min_books: int):
+        "Helper for make."
+        rec = br.ContentBasedBookRecommender(
+            candidate_index_min_books=min_books, candidate_pool_size=120
+        )
+        rec.book_tfidf = tfidf
+        rec.book_id_to_idx = {f"A{i}": i for i in range(n_books)}
+        rec._rating_norm = rating
+        rec._rating_number_norm = popularity
+        rec._fetch_metadata_for_asins = lambda asins: [  # type: ignore[assignment]
+            {"parent_asin": a} for a in asins
+        ]
+        return rec
+
+    genres_df = pd.DataFrame([
+        {"user_id": "u", "genre": g, "rank": r}
+        for r, g in enumerate(br.GENRE_VOCAB[:3], start=1)
+    ])
+    books_df = pd.DataFrame([{"user_id": "u", "parent_asin": f"A{i}"} for i in (5, 50, 500, 999, 1500)])
+    exhaustive = _make(10**9).recommend("u", genres_df, books_df, top_k=40)
+    indexed_rec = _make(1)
+    indexed = indexed_rec.recommend("u", genres_df, books_df, top_k=40)
+
+    assert indexed_rec._derived.candidate_index is not None
+    assert [r["parent_asin"] for r in indexed] == [r["parent_asin"] for r in exhaustive]
+    assert [r["score"] for r in indexed] == [r["score"] for r in exhaustive]
+    assert "A5" not in [r["parent_asin"] for r in indexed]
+
+    # Second call reuses the index instead of rebuilding it.
+    index = indexed_rec._derived.candidate_index
+    indexed_rec.recommend("u", genres_df, books_df, top_k=10)
+    assert indexed_rec._derived.candidate_index is index
+
+
+def test_small_catalog_skips_candidate_index() -> None:
+    "Test small catalog skips candidate index."
+    br = _mod()
+    tfidf, rating, popularity = _one_genre_catalog(50, len(br.GENRE_VOCAB))
+    rec = br.ContentBasedBookRecommender()
+    rec.book_tfidf = tfidf
+    rec.book_id_to_idx = {f"A{i}": i for i in range(50)}
+    rec._rating_norm = rating
+    rec._rating_number_norm = popularity
+    rec._fetch_metadata_for_asins = lambda asins: []  # type: ignore[assignment]
+
+    genres_df = pd.DataFrame([{"user_id": "u", "genre": "Fantasy", "rank": 1}])
+    out = rec.recommend("u", genres_df, None, top_k=5)
+    assert len(out) == 5
+    assert rec._derived.candidate_index is None
+
+
+def test_precomputed_artifacts_recommend_for_user_uses_candidate_index(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    "Test precomputed artifacts recommend for user uses candidate index."
+    import json
+
+    br = _mod()
+    n_books = 300
+    tfidf, rating, popularity = _one_genre_catalog(n_books, len(br.GENRE_VOCAB), seed=5)
+    sparse.save_npz(str(tmp_path / "book_tfidf.npz"), tfidf)
+    (tmp_path / "book_id_to_idx.json").write_text(json.dumps({f"A{i}": i for i in range(n_books)}))
+    np.savez(
+        tmp_path / "book_rating_norms.npz",
+        average_rating_norm=rating,
+        rating_number_norm=popularity,
+    )
+    rec = br.ContentBasedBookRecommender(
+        data_dir=tmp_path, candidate_index_min_books=1, candidate_pool_size=60
+    )
+    rec.fit()
+    rec._fetch_metadata_for_asins = lambda asins: [  # type: ignore[assignment]
+        {"parent_asin": a} for a in asins
+    ]
+    assert rec.tfidf_vectorizer is None
+
+    out = rec.recommend_for_user(
+        "u@example.com",
+        {"library": {"finished": ["A1"], "saved": ["A2"]}},
+        [{"genre": "Fantasy", "rank": 1}],
+        top_k=5,
+    )
+
+    assert len(out) == 5
+    assert not {"A1", "A2"} & {r["parent_asin"] for r in out}
+    assert rec._derived.candidate_index is not None
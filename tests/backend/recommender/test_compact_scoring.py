@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import importlib
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+
+def _mod():
+    "Helper for  mod."
+    m = importlib.import_module("backend.recommender.book_recommender")
+    return importlib.reload(m)
+
+
+def _make_rec(br, compact: bool, n_books: int = 500):
+    "Helper for make rec."
+    rng = np.random.default_rng(7)
+    n_terms = len(br.GENRE_VOCAB)
+    rows = np.repeat(np.arange(n_books), 2)
+    cols = rng.integers(0, n_terms, size=rows.size)
+    tfidf = sparse.csr_matrix((rng.random(rows.size), (rows, cols)), shape=(n_books, n_terms))
+    rec = br.ContentBasedBookRecommender(
+        compact=compact, metadata_fetcher=lambda asins: [{"parent_asin": a} for a in asins]
+    )
+    rec.load_arrays(
+        tfidf, {f"A{i}": i for i in range(n_books)}, rng.random(n_books), rng.random(n_books)
+    )
+    return rec
+
+
+def test_top_k_inplace_orders_and_skips_non_finite() -> None:
+    "Test top k inplace orders and skips non finite."
+    from backend.recommender.compact import top_k_inplace
+
+    scores = np.array([0.1, 0.9, -np.inf, 0.5, 0.7], dtype=np.float32)
+    work = np.empty_like(scores)
+    mask = np.empty(scores.shape, dtype=bool)
+    idx, vals = top_k_inplace(scores, 3, work, mask)
+    assert idx.dtype == np.int32
+    assert idx.tolist() == [1, 4, 3]
+    assert vals.tolist() == pytest.approx([0.9, 0.7, 0.5])
+    # k larger than the finite count drops excluded books.
+    idx, _ = top_k_inplace(scores, 5, work, mask)
+    assert idx.tolist() == [1, 4, 3, 0]
+
+
+def test_row_normalized_csc_and_add_weighted_columns_match_dense() -> None:
+    "Test row normalized csc and add weighted columns match dense."
+    from backend.recommender.compact import add_weighted_columns, row_normalized_csc
+
+    m = sparse.csr_matrix(np.array([[1.0, 0.0, 1.0], [0.0, 0.0, 0.0], [0.0, 3.0, 4.0]]))
+    csc = row_normalized_csc(m)
+    assert csc.dtype == np.float32
+    coef = np.array([0.0, 2.0, 1.0])
+    out = np.ones(3, dtype=np.float32)
+    add_weighted_columns(out, csc, coef)
+    expected = 1.0 + np.array([1 / np.sqrt(2), 0.0, 2 * 0.6 + 0.8])
+    assert out.tolist() == pytest.approx(expected.tolist(), rel=1e-6)
+
+
+def test_compact_recommend_matches_float64_path() -> None:
+    "Test compact recommend matches float64 path."
+    br = _mod()
+    genres_df = pd.DataFrame(
+        [{"user_id": "u", "genre": "Fantasy", "rank": 1}, {"user_id": "u", "genre": "History", "rank": 2}]
+    )
+    books_df = pd.DataFrame([{"user_id": "u", "parent_asin": "A3"}, {"user_id": "u", "parent_asin": "A9"}])
+    wide = _make_rec(br, compact=False)
+    compact = _make_rec(br, compact=True)
+    assert compact.book_tfidf.dtype == np.float32
+    assert compact._rating_norm.dtype == np.float32
+
+    for g, b in ((None, None), (genres_df, None), (genres_df, books_df)):
+        expected = wide.recommend("u", g, b, top_k=15)
+        got = compact.recommend("u", g, b, top_k=15)
+        assert [r["parent_asin"] for r in got] == [r["parent_asin"] for r in expected]
+        assert [r["score"] for r in got] == pytest.approx([r["score"] for r in expected], rel=1e-5)
+    assert "A3" not in [r["parent_asin"] for r in compact.recommend("u", genres_df, books_df, top_k=15)]
+
+
+def test_score_buffers_are_reused_per_thread() -> None:
+    "Test score buffers are reused per thread."
+    from backend.recommender.compact import SCORE_BUFFERS
+
+    first = SCORE_BUFFERS.get("test_buf", 10)
+    assert SCORE_BUFFERS.get("test_buf", 10) is first
+    assert SCORE_BUFFERS.get("test_buf", 11) is not first
+
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(SCORE_BUFFERS.get("test_buf", 11)))
+    t.start()
+    t.join()
+    assert seen[0] is not SCORE_BUFFERS.get("test_buf", 11)
@@ -14,20 +14,20 @@ def _mod():
     return importlib.reload(m)
 
 
-def test_safe_json_loads_and_prepare_categories_keywords() -> None:
-    "Test safe json loads and prepare categories keywords."
+def test_safe_json_loads_and_genre_text_keywords() -> None:
+    "Test safe json loads and genre text keywords."
     br = _mod()
 
-    assert br._safe_json_loads(None) is None
-    assert br._safe_json_loads([1, 2]) == [1, 2]
-    assert br._safe_json_loads({"a": 1}) == {"a": 1}
-    assert br._safe_json_loads(b'["a", "b"]') == ["a", "b"]
+    assert br.safe_json_loads(None) is None
+    assert br.safe_json_loads([1, 2]) == [1, 2]
+    assert br.safe_json_loads({"a": 1}) == {"a": 1}
+    assert br.safe_json_loads(b'["a", "b"]') == ["a", "b"]
     # invalid JSON -> returns original string
-    assert br._safe_json_loads("{not json") == "{not json"
+    assert br.safe_json_loads("{not json") == "{not json"
 
     # Keyword mapping and de-dupe ordering
     raw = ["Sci-Fi", "science fiction", "Romance", None, "romance"]
-    text = br.ContentBasedBookRecommender._prepare_categories(raw)
+    text = br.genre_text(raw)
     # Should map to official genres, unique, and joined by "|"
     assert "Science Fiction" in text
     assert "Romance" in text
@@ -63,8 +63,6 @@ def _make_precomputed_rec(br) -> Any:
     rec.book_id_to_idx = {"A1": 0, "A2": 1, "A3": 2}
     rec._rating_norm = np.array([0.2, 0.5, 0.9])
     rec._rating_number_norm = np.array([0.9, 0.2, 0.1])
-    # avoid hitting fit() checks inside build_user_profile
-    rec.tfidf_vectorizer = object()  # type: ignore[assignment]
     return rec
 
 
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+import backend.recommender.event_recommender as er
+from backend.recommender.event_index import EventIndex
+
+
+def _events(n: int = 60, n_tags: int = 90):
+    "Helper for events."
+    rng = np.random.default_rng(3)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+    out = []
+    for i in range(n):
+        tags = [f"T{j}" for j in rng.choice(n_tags, size=rng.integers(0, 4), replace=False)]
+        out.append({"event_id": f"e{i}", "tags": tags, "ttl": base + float(rng.integers(-3, 80)) * 86400})
+    out.append({"event_id": "bad-ts", "tags": "T1", "ttl": "not-a-number"})
+    out.append({"event_id": "huge-ts", "tags": ["T2", " T2 "], "ttl": 1e15})
+    return out
+
+
+def test_index_scores_match_per_event_scoring() -> None:
+    "Test index scores match per event scoring."
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    events = _events()
+    index = EventIndex(events)
+    assert index.n_words == 2  # more than 64 distinct tags
+    user_tags = {"T1", "T2", "T70", "T89", "unknown"}
+    score, overlap, tag_score, recency = index.score(sorted(user_tags), now)
+    for i, ev in enumerate(events):
+        expected = er._score_event(ev, user_tags, now)
+        assert (score[i], overlap[i], tag_score[i], recency[i]) == pytest.approx(expected)
+
+
+def test_ranked_head_is_prefix_of_full_order() -> None:
+    "Test ranked head is prefix of full order."
+    rng = np.random.default_rng(0)
+    primary = rng.integers(0, 5, size=40).astype(float)
+    secondary = rng.random(40)
+    rows = np.arange(40)
+    full = EventIndex.ranked(rows, (primary, secondary))
+    head = EventIndex.ranked(rows, (primary, secondary), need=7)
+    assert head.size >= 7
+    assert head.tolist() == full[: head.size].tolist()
+    assert full.tolist() == sorted(range(40), key=lambda r: (-primary[r], -secondary[r], r))
+
+
+def test_recommend_indexed_reuses_one_index_across_users() -> None:
+    "Test recommend indexed reuses one index across users."
+    now = datetime.now(tz=timezone.utc)
+    events = [
+        {"event_id": f"e{i}", "tags": [f"T{i % 5}"], "ttl": (now + timedelta(days=i)).timestamp()}
+        for i in range(30)
+    ]
+    index = EventIndex(events)
+    rec = er.EventRecommender()
+    for tags in (["T0"], ["T1", "T3"], ["nope"]):
+        got = rec.recommend_indexed(index, tags, top_k=8, now=now)
+        assert [e["event_id"] for e in got] == [
+            e["event_id"] for e in rec.recommend(events, tags, top_k=8)
+        ]
+        assert all("_score" in e for e in got)
+    # The pool's dicts are not modified.
+    assert all("_score" not in e for e in events)
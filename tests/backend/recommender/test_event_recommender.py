@@ -3,7 +3,7 @@ Tests for Book-Club-Manager.backend.recommender.event_recommender.
 
 Focus:
 - _recency_bonus behavior across time ranges and invalid inputs.
-- _normalize_tags for None, string, iterables, and non-iterables.
+- normalize_tags for None, string, iterables, and non-iterables.
 - _score_event: tag overlap and recency contributions.
 - EventRecommender.recommend: ranking, exploration mixing, and duplicate-link suppression.
 """
@@ -56,12 +56,12 @@ def test_recency_bonus_varies_across_time_ranges() -> None:
 
 def test_normalize_tags_handles_various_inputs() -> None:
     "Test normalize tags handles various inputs."
-    assert er._normalize_tags(None) == []
-    assert er._normalize_tags("") == []
-    assert er._normalize_tags(" Tag ") == ["Tag"]
-    assert er._normalize_tags(["A", "  B  ", ""]) == ["A", "B"]
+    assert er.normalize_tags(None) == []
+    assert er.normalize_tags("") == []
+    assert er.normalize_tags(" Tag ") == ["Tag"]
+    assert er.normalize_tags(["A", "  B  ", ""]) == ["A", "B"]
     # Non-iterable other than str yields empty list.
-    assert er._normalize_tags(123) == []
+    assert er.normalize_tags(123) == []
 
 
 def test_score_event_combines_tags_and_recency() -> None:
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+
+def _mod():
+    "Helper for  mod."
+    m = importlib.import_module("backend.recommender.book_recommender")
+    return importlib.reload(m)
+
+
+def _make_rec(br, n_books: int = 300, seed: int = 1):
+    "Helper for make rec."
+    rng = np.random.default_rng(seed)
+    n_terms = len(br.GENRE_VOCAB)
+    rows, cols = [], []
+    for i in range(n_books):
+        for j in rng.choice(n_terms, size=rng.integers(1, 4), replace=False):
+            rows.append(i)
+            cols.append(int(j))
+    rec = br.ContentBasedBookRecommender()
+    rec.book_tfidf = sparse.csr_matrix(
+        (rng.random(len(rows)), (rows, cols)), shape=(n_books, n_terms)
+    )
+    rec.book_id_to_idx = {f"A{i}": i for i in range(n_books)}
+    rec._rating_norm = rng.random(n_books)
+    rec._rating_number_norm = rng.random(n_books)
+    rec._fetch_metadata_for_asins = lambda asins: [  # type: ignore[assignment]
+        {"parent_asin": a} for a in asins
+    ]
+    return rec
+
+
+def _build(rec, top_k: int = 20):
+    "Helper for build."
+    from backend.recommender.genre_buckets import build_genre_buckets
+
+    return build_genre_buckets(
+        rec.book_tfidf, rec._rating_norm, rec._rating_number_norm, rec.weights, top_k=top_k
+    )
+
+
+def test_signature_key_normalizes_scale_and_skips_untabulated() -> None:
+    "Test signature key normalizes scale and skips untabulated."
+    from backend.recommender.genre_buckets import signature_key
+
+    a = np.zeros(5)
+    a[[1, 3]] = [3.0, 2.0]
+    assert signature_key(a) == "1:3,3:2"
+    assert signature_key(a * 2) == "1:3,3:2"
+    single = np.zeros(5)
+    single[4] = 3.0
+    assert signature_key(single) == "4:1"
+    assert signature_key(np.zeros(5)) is None
+    assert signature_key(np.array([0.5, 0.0, 0.0])) is None
+
+
+def test_rank_signatures_cover_one_to_three_ranked_genres() -> None:
+    "Test rank signatures cover one to three ranked genres."
+    from backend.recommender.genre_buckets import rank_signatures
+
+    sigs = rank_signatures(4)
+    assert len(sigs) == 4 + 4 * 3 + 4 * 3 * 2
+    assert all(sorted(v[v > 0].tolist(), reverse=True) in ([3.0], [3.0, 2.0], [3.0, 2.0, 1.0]) for v in sigs)
+
+
+def test_genre_only_and_cold_start_users_served_from_table() -> None:
+    "Test genre only and cold start users served from table."
+    br = _mod()
+    rec = _make_rec(br)
+    genres_df = pd.DataFrame(
+        [
+            {"user_id": "u", "genre": "Fantasy", "rank": 1},
+            {"user_id": "u", "genre": "Romance", "rank": 2},
+            {"user_id": "u", "genre": "History", "rank": 3},
+        ]
+    )
+    exhaustive = rec.recommend("u", genres_df, None, top_k=10)
+    exhaustive_cold = rec.recommend("u", None, None, top_k=10)
+
+    rec.genre_buckets = _build(rec)
+    # The table answers without touching the TF-IDF matrix.
+    rec.build_profile_from_signals = None  # type: ignore[assignment]
+    table = rec.recommend("u", genres_df, None, top_k=10)
+    table_cold = rec.recommend("u", None, None, top_k=10)
+
+    assert [r["parent_asin"] for r in table] == [r["parent_asin"] for r in exhaustive]
+    assert [r["score"] for r in table] == pytest.approx([r["score"] for r in exhaustive])
+    assert [r["parent_asin"] for r in table_cold] == [r["parent_asin"] for r in exhaustive_cold]
+
+
+def test_block_cap_splits_chunks_without_changing_tables() -> None:
+    "Test block cap splits chunks without changing tables."
+    from backend.recommender.genre_buckets import build_genre_buckets
+
+    br = _mod()
+    rec = _make_rec(br)
+    args = (rec.book_tfidf, rec._rating_norm, rec._rating_number_norm, rec.weights)
+    default = build_genre_buckets(*args, top_k=10)
+    # Room for one signature per block.
+    capped = build_genre_buckets(*args, top_k=10, max_block_elements=rec.book_tfidf.shape[0])
+
+    assert capped._row_by_key == default._row_by_key
+    np.testing.assert_array_equal(capped.indices, default.indices)
+    np.testing.assert_allclose(capped.scores, default.scores)
+
+
+def test_table_misses_fall_back_to_scoring() -> None:
+    "Test table misses fall back to scoring."
+    br = _mod()
+    rec = _make_rec(br)
+    rec.genre_buckets = _build(rec, top_k=5)
+    calls = []
+    orig = rec.build_profile_from_signals
+
+    def _profile(user_id, signals):  # type: ignore[no-untyped-def]
+        "Helper for profile."
+        calls.append(user_id)
+        return orig(user_id, signals)
+
+    rec.build_profile_from_signals = _profile  # type: ignore[assignment]
+    genres_df = pd.DataFrame([{"user_id": "u", "genre": "Fantasy", "rank": 1}])
+    books_df = pd.DataFrame([{"user_id": "u", "parent_asin": "A1"}])
+
+    # top_k larger than the stored K
+    assert len(rec.recommend("u", genres_df, None, top_k=8)) == 8
+    # users with a library are always scored
+    out = rec.recommend("u", genres_df, books_df, top_k=3)
+    assert "A1" not in [r["parent_asin"] for r in out]
+    assert calls == ["u", "u"]
+
+    # Weights changed since the table was built -> ignored.
+    rec.weights = br.RecommenderWeights(genre_similarity=0.9, average_rating=0.05, rating_number_popularity=0.05)
+    rec.recommend("u", genres_df, None, top_k=3)
+    assert len(calls) == 3
+
+
+def test_genre_buckets_round_trip_and_load_precomputed(tmp_path) -> None:
+    "Test genre buckets round trip and load precomputed."
+    from backend.recommender.genre_buckets import COLD_START_KEY, GenreBuckets
+
+    br = _mod()
+    rec = _make_rec(br, n_books=40)
+    buckets = _build(rec, top_k=50)
+    sparse.save_npz(tmp_path / "book_tfidf.npz", rec.book_tfidf)
+    (tmp_path / "book_id_to_idx.json").write_text(
+        pd.Series(rec.book_id_to_idx).to_json(), encoding="utf-8"
+    )
+    np.savez(
+        tmp_path / "book_rating_norms.npz",
+        average_rating_norm=rec._rating_norm,
+        rating_number_norm=rec._rating_number_norm,
+    )
+    buckets.save(tmp_path / "book_genre_buckets.npz")
+
+    loaded = GenreBuckets.load(tmp_path / "book_genre_buckets.npz")
+    assert len(loaded) == len(buckets)
+    # Catalog smaller than K: rows are padded and lookup trims the padding.
+    idx, scores = loaded.lookup(COLD_START_KEY, 50)
+    assert idx.size == 40 and np.all(np.diff(scores) <= 0)
+    assert loaded.lookup("no-such-key", 5) is None
+
+    fresh = br.ContentBasedBookRecommender(data_dir=tmp_path)
+    fresh.fit()
+    assert fresh.genre_buckets is not None
+    assert fresh.genre_buckets.matches(fresh.weights, 40)
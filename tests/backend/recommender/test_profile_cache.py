@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import importlib
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def _mod():
+    "Helper for  mod."
+    m = importlib.import_module("backend.recommender.book_recommender")
+    return importlib.reload(m)
+
+
+def _make_rec(br, **kwargs):
+    "Helper for make rec."
+    rng = np.random.default_rng(11)
+    n_books, n_terms = 60, len(br.GENRE_VOCAB)
+    rec = br.ContentBasedBookRecommender(**kwargs)
+    rec.book_tfidf = sparse.csr_matrix(rng.random((n_books, n_terms)) * (rng.random((n_books, n_terms)) > 0.8))
+    rec.book_id_to_idx = {f"A{i}": i for i in range(n_books)}
+    rec._rating_norm = rng.random(n_books)
+    rec._rating_number_norm = rng.random(n_books)
+    return rec
+
+
+def _frames(asins, genres=("Fantasy",)):
+    "Helper for frames."
+    books = pd.DataFrame({"user_id": "u", "parent_asin": list(asins)})
+    prefs = pd.DataFrame(
+        [{"user_id": "u", "genre": g, "rank": i} for i, g in enumerate(genres, start=1)]
+    )
+    return prefs, books
+
+
+def _uncached_profile(br, rec, prefs, books):
+    "Helper for uncached profile."
+    fresh = _make_rec(br, profile_cache_size=0)
+    fresh.book_tfidf = rec.book_tfidf
+    return fresh.build_user_profile("u", prefs, books)
+
+
+def test_profile_cache_hits_for_same_library() -> None:
+    "Test profile cache hits for same library."
+    br = _mod()
+    rec = _make_rec(br)
+    prefs, books = _frames(["A1", "A2"])
+    first = rec.build_user_profile("u", prefs, books)
+    second = rec.build_user_profile("u", prefs, books)
+    np.testing.assert_allclose(first, second)
+    stats = rec._user_profile_cache().stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    # Returned vectors are copies; callers cannot corrupt the cache.
+    second[:] = 0
+    np.testing.assert_allclose(rec.build_user_profile("u", prefs, books), first)
+
+
+def test_adding_a_book_updates_profile_incrementally() -> None:
+    "Test adding a book updates profile incrementally."
+    br = _mod()
+    rec = _make_rec(br)
+    prefs, books = _frames(["A1", "A2"])
+    rec.build_user_profile("u", prefs, books)
+
+    prefs, grown = _frames(["A1", "A2", "A7", "unknown"])
+    profile = rec.build_user_profile("u", prefs, grown)
+    stats = rec._user_profile_cache().stats()
+    assert stats["incremental"] == 1 and stats["misses"] == 1
+    np.testing.assert_allclose(profile, _uncached_profile(br, rec, prefs, grown), rtol=1e-12)
+    assert rec._user_profile_cache().previous("u").history_count == 3
+
+
+def test_removed_book_or_changed_genres_rebuild_profile() -> None:
+    "Test removed book or changed genres rebuild profile."
+    br = _mod()
+    rec = _make_rec(br)
+    prefs, books = _frames(["A1", "A2", "A3"])
+    rec.build_user_profile("u", prefs, books)
+
+    prefs, shrunk = _frames(["A1", "A3"])
+    np.testing.assert_allclose(
+        rec.build_user_profile("u", prefs, shrunk), _uncached_profile(br, rec, prefs, shrunk)
+    )
+    prefs2, _ = _frames(["A1", "A3"], genres=("Romance", "Fantasy"))
+    np.testing.assert_allclose(
+        rec.build_user_profile("u", prefs2, shrunk), _uncached_profile(br, rec, prefs2, shrunk)
+    )
+    assert rec._user_profile_cache().stats()["misses"] == 3
+
+
+def test_profile_cache_is_bounded_and_reset_with_artifacts() -> None:
+    "Test profile cache is bounded and reset with artifacts."
+    br = _mod()
+    rec = _make_rec(br, profile_cache_size=2)
+    for user in ("a", "b", "c"):
+        books = pd.DataFrame({"user_id": user, "parent_asin": ["A1"]})
+        rec.build_user_profile(user, pd.DataFrame(), books)
+    cache = rec._user_profile_cache()
+    assert len(cache) == 2
+    assert cache.previous("a") is None
+
+    old_version = cache.version
+    rec.book_tfidf = sparse.csr_matrix(rec.book_tfidf * 2.0)
+    assert rec._user_profile_cache() is not cache
+    assert rec._user_profile_cache().version > old_version
+    assert len(rec._user_profile_cache()) == 0
+
+
+def test_fingerprint_depends_on_library_genres_and_version() -> None:
+    "Test fingerprint depends on library genres and version."
+    from backend.recommender.profile_cache import UserProfileCache
+
+    a, b = UserProfileCache(10), UserProfileCache(10)
+    fp = a.fingerprint(frozenset({"A1", "A2"}), ((3, 3.0),))
+    assert fp == a.fingerprint(frozenset({"A2", "A1"}), ((3, 3.0),))
+    assert fp != a.fingerprint(frozenset({"A1"}), ((3, 3.0),))
+    assert fp != a.fingerprint(frozenset({"A1", "A2"}), ((4, 3.0),))
+    assert fp != b.fingerprint(frozenset({"A1", "A2"}), ((3, 3.0),))
+    assert a.get("u", fp) is None
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import importlib
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def _mod():
+    "Helper for  mod."
+    m = importlib.import_module("backend.recommender.book_recommender")
+    return importlib.reload(m)
+
+
+def _make_rec(br):
+    "Helper for make rec."
+    rng = np.random.default_rng(5)
+    n_books, n_terms = 80, len(br.GENRE_VOCAB)
+    rec = br.ContentBasedBookRecommender()
+    rec.book_tfidf = sparse.csr_matrix(rng.random((n_books, n_terms)) * (rng.random((n_books, n_terms)) > 0.85))
+    rec.book_id_to_idx = {f"A{i}": i for i in range(n_books)}
+    rec._rating_norm = rng.random(n_books)
+    rec._rating_number_norm = rng.random(n_books)
+    rec._fetch_metadata_for_asins = lambda asins: [  # type: ignore[assignment]
+        {"parent_asin": a} for a in asins
+    ]
+    return rec
+
+
+def test_user_signals_from_account_and_frames_agree() -> None:
+    "Test user signals from account and frames agree."
+    br = _mod()
+    account = {"library": {"finished": ["A1"], "saved": ["A2", None], "in_progress": ["A1", "A3"]}}
+    genres = [{"genre": "Fantasy", "rank": 1}, {"genre": "Romance", "rank": 2}]
+    signals = br.UserSignals.from_account(account, genres)
+    assert signals.read_asins == frozenset({"A1", "A2", "A3"})
+    assert signals.genre_ranks == (("Fantasy", 1), ("Romance", 2))
+    assert not signals.is_cold_start
+
+    genres_df = pd.DataFrame(
+        [
+            {"user_id": "u", "genre": "Fantasy", "rank": 1},
+            {"user_id": "other", "genre": "Poetry", "rank": 1},
+            {"user_id": "u", "genre": "Romance", "rank": 2},
+        ]
+    )
+    books_df = pd.DataFrame({"user_id": ["u", "u", "u", "x"], "parent_asin": ["A1", "A2", "A3", "A9"]})
+    assert br.UserSignals.from_frames("u", genres_df, books_df) == signals
+    assert br.UserSignals.from_account({}, None).is_cold_start
+
+
+def test_genres_vector_weights_ranks_and_skips_unknown_genres() -> None:
+    "Test genres vector weights ranks and skips unknown genres."
+    br = _mod()
+    vec, has = br.genres_vector([("Fantasy", 1), ("sci-fi", 2), ("Knitting?", 1), (None, 1), ("Poetry", "x")])
+    assert has
+    assert vec[br.GENRE_VOCAB.index("Fantasy")] == 3.0
+    assert vec[br.GENRE_VOCAB.index("Science Fiction")] == 2.0
+    assert vec[br.GENRE_VOCAB.index("Poetry")] == 1.0
+    assert vec.sum() == 6.0
+    assert br.genres_vector([])[1] is False
+
+
+def test_recommend_for_user_builds_no_dataframes(monkeypatch) -> None:
+    "Test recommend for user builds no dataframes."
+    br = _mod()
+    rec = _make_rec(br)
+    account = {"library": {"finished": ["A4"], "saved": [], "in_progress": []}}
+    genres = [{"genre": "Fantasy", "rank": 1}]
+    expected = rec.recommend(
+        "u",
+        pd.DataFrame([{"user_id": "u", "genre": "Fantasy", "rank": 1}]),
+        pd.DataFrame([{"user_id": "u", "parent_asin": "A4"}]),
+        top_k=10,
+    )
+
+    def _no_frames(*_args, **_kwargs):  # type: ignore[no-untyped-def]
+        "Helper for no frames."
+        raise AssertionError("DataFrame adapter used on the request path")
+
+    monkeypatch.setattr(br.UserSignals, "from_frames", classmethod(_no_frames))
+    got = rec.recommend_for_user("u", account, genres, top_k=10)
+    assert [r["parent_asin"] for r in got] == [r["parent_asin"] for r in expected]
+    assert "A4" not in [r["parent_asin"] for r in got]
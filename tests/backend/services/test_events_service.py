@@ -3,8 +3,10 @@ Tests for backend.services.events_service.
 
 Covers:
 - get_event_detail: success, not found (None), normalizes event_id
+- get_event_details_batch: one storage call, normalizes ids, empty input
 - get_events_by_city: success returns list, empty list
 - get_explore_events: with limit, without limit (uses EVENT_RECOMMENDATION_POOL_SIZE)
+- iter_explore_event_pages: delegates to storage paging, normalizes city
 """
 
 import sys
@@ -81,6 +83,26 @@ class TestGetEventDetail(unittest.TestCase):
         store.get_event_details.assert_called_once_with("ev2")
 
 
+@patch("backend.services.events_service.get_storage")
+class TestGetEventDetailsBatch(unittest.TestCase):
+    """Tests for get_event_details_batch."""
+
+    def test_one_storage_call_in_order(self, mock_get_storage: MagicMock) -> None:
+        "Test one storage call in order."
+        store = MagicMock()
+        store.get_events_batch.return_value = [{"event_id": "ev2"}, {"event_id": "ev1"}]
+        mock_get_storage.return_value = store
+
+        result = events_service.get_event_details_batch([" ev2 ", "ev1", ""])
+        self.assertEqual([e["event_id"] for e in result], ["ev2", "ev1"])
+        store.get_events_batch.assert_called_once_with(["ev2", "ev1"])
+
+    def test_empty_ids_skip_storage(self, mock_get_storage: MagicMock) -> None:
+        "Test empty ids skip storage."
+        self.assertEqual(events_service.get_event_details_batch([]), [])
+        mock_get_storage.assert_not_called()
+
+
 @patch("backend.services.events_service.get_storage")
 class TestGetEventsByCity(unittest.TestCase):
     """Tests for get_events_by_city."""
@@ -147,5 +169,20 @@ class TestGetExploreEvents(unittest.TestCase):
         store.get_soonest_events.assert_called_once_with(EVENT_RECOMMENDATION_POOL_SIZE)
 
 
+@patch("backend.services.events_service.get_storage")
+class TestIterExploreEventPages(unittest.TestCase):
+    """Tests for iter_explore_event_pages."""
+
+    def test_delegates_to_storage_pages(self, mock_get_storage: MagicMock) -> None:
+        "Test delegates to storage pages."
+        store = MagicMock()
+        store.iter_event_pages.return_value = iter([[{"event_id": "a1"}], [{"event_id": "a2"}]])
+        mock_get_storage.return_value = store
+
+        pages = list(events_service.iter_explore_event_pages(1, city_state=" Seattle, WA "))
+        self.assertEqual(len(pages), 2)
+        store.iter_event_pages.assert_called_once_with(1, city_state="Seattle, WA")
+
+
 if __name__ == "__main__":
     unittest.main()
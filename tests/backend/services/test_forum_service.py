@@ -44,7 +44,7 @@ class TestCreatePost(unittest.TestCase):
         "Test creates post and persists."
         store = MagicMock()
         store.get_book_metadata.return_value = None
-        store.load_forum_db.return_value = {"next_post_id": 1, "posts": []}
+        store.create_forum_post.return_value = 1
         mock_get_storage.return_value = store
 
         result = forum_service.create_post("alice@example.com", "My Title", "Body text")
@@ -56,10 +56,11 @@ class TestCreatePost(unittest.TestCase):
         self.assertEqual(result["replies"], 0)
         self.assertEqual(result["likes"], 0)
         self.assertEqual(result["created_at"], 1000)
-        store.save_forum_db.assert_called_once()
-        db = store.save_forum_db.call_args[0][0]
-        self.assertEqual(db["next_post_id"], 2)
-        self.assertEqual(len(db["posts"]), 1)
+        # One write of just the new post; the forum is neither loaded nor rewritten.
+        store.create_forum_post.assert_called_once()
+        self.assertEqual(store.create_forum_post.call_args[0][0]["title"], "My Title")
+        store.load_forum_db.assert_not_called()
+        store.save_forum_db.assert_not_called()
 
     def test_empty_title_raises(
         self, mock_time: MagicMock, mock_get_storage: MagicMock
@@ -85,7 +86,7 @@ class TestCreatePost(unittest.TestCase):
         "Test normalizes user id and tags."
         store = MagicMock()
         store.get_book_metadata.return_value = None
-        store.load_forum_db.return_value = {"next_post_id": 5, "posts": []}
+        store.create_forum_post.return_value = 5
         mock_get_storage.return_value = store
 
         result = forum_service.create_post(
@@ -100,7 +101,7 @@ class TestCreatePost(unittest.TestCase):
         "Test looks up book title when parent asin set."
         store = MagicMock()
         store.get_book_metadata.return_value = {"title": "The Book"}
-        store.load_forum_db.return_value = {"next_post_id": 1, "posts": []}
+        store.create_forum_post.return_value = 1
         mock_get_storage.return_value = store
 
         result = forum_service.create_post(
@@ -116,7 +117,7 @@ class TestCreatePost(unittest.TestCase):
         "Test continues when book metadata raises."
         store = MagicMock()
         store.get_book_metadata.side_effect = OSError("fail")
-        store.load_forum_db.return_value = {"next_post_id": 1, "posts": []}
+        store.create_forum_post.return_value = 1
         mock_get_storage.return_value = store
 
         result = forum_service.create_post(
@@ -195,6 +196,18 @@ class TestLikePost(unittest.TestCase):
         uf = store.save_user_forums.call_args[0][1]
         self.assertEqual(uf["liked_post_ids"], [])
 
+    def test_first_like_without_user_forums_record(self, mock_get_storage: MagicMock) -> None:
+        "Test first like without user forums record."
+        store = MagicMock()
+        store.get_user_forums.return_value = None
+        store.get_forum_post.return_value = {"id": 1, "likes": 2}
+        mock_get_storage.return_value = store
+
+        result = forum_service.like_post(1, "u@x.com")
+
+        self.assertEqual(result["likes"], 3)
+        store.save_user_forums.assert_called_once_with("u@x.com", {"liked_post_ids": [1]})
+
     def test_post_not_found_raises(self, mock_get_storage: MagicMock) -> None:
         "Test post not found raises."
         store = MagicMock()
@@ -338,6 +351,16 @@ class TestGetThreadForBook(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]["parent_asin"], "B1")
 
+    def test_passes_book_title_to_storage(self, mock_get_storage: MagicMock) -> None:
+        "Test passes book title to storage."
+        store = MagicMock()
+        store.get_forum_thread_for_book.return_value = [{"id": 2, "book_title": "Dune"}]
+        mock_get_storage.return_value = store
+
+        result = forum_service.get_thread_for_book("", book_title=" Dune ")
+        self.assertEqual(result, [{"id": 2, "book_title": "Dune"}])
+        store.get_forum_thread_for_book.assert_called_once_with("", book_title="Dune", book_id=None)
+
     def test_empty_parent_asin_returns_empty_list(self, mock_get_storage: MagicMock) -> None:
         "Test empty parent asin returns empty list."
         mock_get_storage.return_value = MagicMock()
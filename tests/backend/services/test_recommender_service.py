@@ -12,6 +12,7 @@ Covers:
 - refresh_and_save_recommendations: writes both books and events plus timestamps.
 - ensure_default_recommendations: idempotent seeding when no prefs or existing recs.
 - on_book_added_to_shelf: increments counter and triggers recompute at threshold.
+- Background book refresh: deduplicated per user, stale list served while it runs.
 """
 
 import sys
@@ -136,6 +137,7 @@ _stub_boto3_for_recommender()
 
 import importlib
 import backend.services.recommender_service as rs  # noqa: E402
+from backend.recommender.event_index import EventIndex  # noqa: E402
 
 # Ensure we are testing the current implementation on disk, not a stale import.
 rs = importlib.reload(rs)  # type: ignore[assignment]
@@ -192,20 +194,26 @@ def test_get_event_recommendations_uses_genre_prefs_and_event_pool(
         "library": {},
         "genre_preferences": ["Fantasy"],
     }
-    store.get_soonest_events.return_value = [
-        {"event_id": "e1", "tags": ["Fantasy"]},
-        {"event_id": "e2", "tags": ["Other"]},
-    ]
+    index = EventIndex(
+        [
+            {"event_id": "e1", "tags": ["Fantasy"]},
+            {"event_id": "e2", "tags": ["Other"]},
+        ]
+    )
+    store.get_soonest_events_index.return_value = index
     mock_get_storage.return_value = store
     inst = MagicMock()
     mock_event_rec_cls.return_value = inst
-    inst.recommend.return_value = [{"event_id": "e1"}]
+    inst.recommend_indexed.return_value = [{"event_id": "e1"}]
 
     out = rs.get_event_recommendations("User@Email.com", top_k=3)
 
-    inst.recommend.assert_called_once()
-    args, kwargs = inst.recommend.call_args
+    inst.recommend_indexed.assert_called_once()
+    args, kwargs = inst.recommend_indexed.call_args
+    assert args[0] is index
     assert kwargs["top_k"] == 3
+    store.get_soonest_events_index.assert_called_once_with(40)
+    store.get_soonest_events.assert_not_called()
     assert out == [{"event_id": "e1"}]
 
 
@@ -230,7 +238,7 @@ def test_get_event_recommendations_early_return_cases() -> None:
     ) as m_get_storage:
         m_build.return_value = ({"u@x.com": [{"genre": "Fantasy"}]}, {}, False, True)
         store = MagicMock()
-        store.get_soonest_events.return_value = []
+        store.get_soonest_events_index.return_value = EventIndex([])
         m_get_storage.return_value = store
         assert rs.get_event_recommendations("u@x.com", top_k=5) == []
 
@@ -454,6 +462,7 @@ def test_ensure_default_recommendations_seeds_when_no_prefs_or_existing(mock_get
     assert rec["recommended_events"] == [{"event_id": "e1"}]
 
 
+@patch("backend.services.recommender_service.RECS_REFRESH_ASYNC", False)
 @patch("backend.services.recommender_service.get_storage")
 def test_on_book_added_to_shelf_increments_and_triggers_recompute(mock_get_storage: MagicMock) -> None:
     "Test on book added to shelf increments and triggers recompute."
@@ -496,6 +505,78 @@ def test_on_book_added_to_shelf_increments_and_triggers_recompute(mock_get_stora
     assert rec["book_recs_source"] == "ml"
 
 
+@patch("backend.services.recommender_service.RECS_REFRESH_ASYNC", True)
+@patch("backend.services.recommender_service.get_storage")
+def test_on_book_added_to_shelf_refreshes_in_background(mock_get_storage: MagicMock) -> None:
+    "Test on book added to shelf refreshes in background."
+    import threading
+
+    from backend.refresh_executor import get_refresh_executor
+
+    saved: Dict[str, Any] = {
+        "adds_since_last_book_run": rs.ADDS_BEFORE_BOOK_RERUN - 1,
+        "recommended_books": [{"id": 7, "title": "Old", "author": "A", "cover": "c"}],
+        "book_updated_at": 1,
+    }
+
+    def save(_uid: str, rec: dict) -> None:
+        "Helper for save."
+        saved.clear()
+        saved.update(rec)
+
+    store = MagicMock()
+    store.get_user_recommendations.side_effect = lambda _uid: dict(saved)
+    store.save_user_recommendations.side_effect = save
+    store.get_user_account.return_value = {"email": "user@example.com"}
+    store.get_user_books.return_value = {"genre_preferences": ["Fantasy"]}
+    mock_get_storage.return_value = store
+
+    release = threading.Event()
+    runs: List[int] = []
+
+    def slow_recommender(_uid: str, top_k: int) -> tuple:
+        "Helper for slow recommender."
+        runs.append(top_k)
+        release.wait(5)
+        return ([{"id": 1, "title": "New", "author": "A", "cover": "c"}], "content", "")
+
+    with patch("backend.services.recommender_service._run_book_recommender", side_effect=slow_recommender):
+        rs.on_book_added_to_shelf("User@example.com")
+        # The click returns at once; readers get the previous list meanwhile.
+        assert saved["adds_since_last_book_run"] == 0
+        assert rs.book_recommendations_refreshing("user@example.com")
+        assert [b["id"] for b in rs.get_recommended_books_for_user("user@example.com")] == [7]
+        assert rs.schedule_book_refresh("user@example.com") is True  # one follow-up run
+        assert rs.schedule_book_refresh("user@example.com") is False  # deduplicated
+        release.set()
+        assert get_refresh_executor().wait(5)
+
+    assert len(runs) == 2
+    assert rs.book_recommendations_generation("user@example.com") == 2
+    assert not rs.book_recommendations_refreshing("user@example.com")
+    assert [b["id"] for b in saved["recommended_books"]] == [1]
+    assert "book_refresh_requested_at" not in saved
+    assert saved["book_recs_source"] == "content"
+
+
+@patch("backend.services.recommender_service.get_storage")
+def test_get_recommended_books_restarts_lost_refresh(mock_get_storage: MagicMock) -> None:
+    "Test get recommended books restarts lost refresh."
+    store = MagicMock()
+    store.get_user_account.return_value = {"email": "user@example.com"}
+    store.get_user_books.return_value = {"genre_preferences": ["Fantasy"]}
+    store.get_user_recommendations.return_value = {
+        "recommended_books": [{"id": 7, "title": "Old", "author": "A", "cover": "c"}],
+        "book_updated_at": 10,
+        "book_refresh_requested_at": 20,
+    }
+    mock_get_storage.return_value = store
+    with patch("backend.services.recommender_service.schedule_book_refresh") as mock_schedule:
+        out = rs.get_recommended_books_for_user("user@example.com")
+    assert [b["id"] for b in out] == [7]
+    mock_schedule.assert_called_once_with("user@example.com")
+
+
 @patch("backend.services.recommender_service.get_storage")
 def test_ui_shape_recommended_books_enriches_and_parses_genres(mock_get_storage: MagicMock) -> None:
     """_ui_shape_recommended_books should enrich sparse rows and normalize genres/cover/rating."""
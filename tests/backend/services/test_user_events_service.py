@@ -185,7 +185,7 @@ class TestIsEventSaved(unittest.TestCase):
 
 @patch("backend.services.user_events_service.get_storage")
 class TestGetSavedEventsWithDetails(unittest.TestCase):
-    """Tests for get_saved_events_with_details (imports get_event_detail from events_service)."""
+    """Tests for get_saved_events_with_details (imports get_event_details_batch from events_service)."""
 
     def test_returns_event_details_in_order(self, mock_get_storage: MagicMock) -> None:
         "Test returns event details in order."
@@ -193,12 +193,13 @@ class TestGetSavedEventsWithDetails(unittest.TestCase):
         store.get_user_events.return_value = {"events": ["ev1", "ev2"]}
         mock_get_storage.return_value = store
         with patch(
-            "backend.services.events_service.get_event_detail"
-        ) as mock_get_event_detail:
-            mock_get_event_detail.side_effect = lambda eid: (
-                {"event_id": eid, "title": f"Event {eid}"}
-            )
+            "backend.services.events_service.get_event_details_batch"
+        ) as mock_get_batch:
+            mock_get_batch.side_effect = lambda eids: [
+                {"event_id": eid, "title": f"Event {eid}"} for eid in eids
+            ]
             result = user_events_service.get_saved_events_with_details("u@x.com")
+        mock_get_batch.assert_called_once_with(["ev1", "ev2"])
 
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0]["event_id"], "ev1")
@@ -210,11 +211,9 @@ class TestGetSavedEventsWithDetails(unittest.TestCase):
         store.get_user_events.return_value = {"events": ["ev1", "ev2"]}
         mock_get_storage.return_value = store
         with patch(
-            "backend.services.events_service.get_event_detail"
-        ) as mock_get_event_detail:
-            mock_get_event_detail.side_effect = lambda eid: (
-                {"event_id": eid} if eid == "ev1" else {}
-            )
+            "backend.services.events_service.get_event_details_batch"
+        ) as mock_get_batch:
+            mock_get_batch.return_value = [{"event_id": "ev1"}, {}]
             result = user_events_service.get_saved_events_with_details("u@x.com")
 
         self.assertEqual(len(result), 1)
@@ -0,0 +1,184 @@
+"""
+Tests for Book-Club-Manager.backend.books_db.
+
+These tests verify:
+- Single and batched lookups against a read-only pooled connection.
+- Connection reuse per thread and reopening when books.db is rebuilt.
+- Connections of finished threads are closed; the file is re-stat'ed once per interval.
+- Column validation and query timing counters.
+"""
+
+import gc
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from backend import books_db
+
+
+def _write_db(db_path: Path, rows) -> None:
+    "Helper for write db."
+    if db_path.exists():
+        db_path.unlink()
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE books (parent_asin TEXT PRIMARY KEY, title TEXT, author_name TEXT, "
+        "average_rating REAL, rating_number INTEGER, description TEXT, images TEXT, "
+        "categories TEXT, title_author_key TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO books (parent_asin, title) VALUES (?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    "Helper for fresh pool."
+    books_db.close_all()
+    books_db.reset_query_stats()
+    yield
+    books_db.close_all()
+
+
+def test_fetch_one_and_many_reuse_one_connection(tmp_path: Path) -> None:
+    "Test fetch one and many reuse one connection."
+    db_path = tmp_path / "books.db"
+    _write_db(db_path, [("A", "Alpha"), ("B", "Beta"), ("C", "Gamma")])
+
+    row = books_db.fetch_one(db_path, "B")
+    assert row is not None and row["title"] == "Beta"
+    assert books_db.fetch_one(db_path, "missing") is None
+
+    rows = books_db.fetch_many(db_path, ["C", "missing", "A", "C", None])
+    assert [r["parent_asin"] for r in rows] == ["C", "A"]
+    assert books_db.fetch_many(db_path, []) == []
+
+    stats = books_db.query_stats()
+    assert stats["connections_opened"] == 1
+    assert stats["queries"] == 3 and stats["batch_queries"] == 1
+    assert stats["rows"] == 3
+    assert stats["total_ms"] >= stats["max_ms"] >= 0.0
+
+
+def test_pooled_connection_is_read_only(tmp_path: Path) -> None:
+    "Test pooled connection is read only."
+    db_path = tmp_path / "books.db"
+    _write_db(db_path, [("A", "Alpha")])
+    with pytest.raises(sqlite3.Error):
+        books_db.connection(db_path).execute("DELETE FROM books")
+
+
+def test_rebuilt_db_opens_new_connection(tmp_path: Path, monkeypatch) -> None:
+    "Test rebuilt db opens new connection."
+    monkeypatch.setattr(books_db.config, "BOOKS_DB_STAT_INTERVAL_S", 0.0)
+    db_path = tmp_path / "books.db"
+    _write_db(db_path, [("A", "Old")])
+    assert books_db.fetch_one(db_path, "A")["title"] == "Old"
+
+    _write_db(db_path, [("A", "New"), ("B", "Added")])
+    st = db_path.stat()
+    os.utime(db_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert books_db.fetch_one(db_path, "A")["title"] == "New"
+    assert books_db.query_stats()["connections_opened"] == 2
+
+
+def test_each_thread_gets_its_own_connection(tmp_path: Path) -> None:
+    "Test each thread gets its own connection."
+    db_path = tmp_path / "books.db"
+    _write_db(db_path, [("A", "Alpha")])
+    seen = []
+
+    def _worker() -> None:
+        "Helper for worker."
+        seen.append(books_db.fetch_one(db_path, "A")["title"])
+        seen.append(books_db.connection(db_path))
+
+    thread = threading.Thread(target=_worker)
+    thread.start()
+    thread.join()
+    assert seen[0] == "Alpha"
+    assert seen[1] is not books_db.connection(db_path)
+
+
+def test_finished_thread_connection_is_closed(tmp_path: Path) -> None:
+    "Test finished thread connection is closed."
+    db_path = tmp_path / "books.db"
+    _write_db(db_path, [("A", "Alpha")])
+    conns = []
+
+    def _worker() -> None:
+        "Helper for worker."
+        books_db.fetch_one(db_path, "A")
+        conns.append(books_db.connection(db_path))
+
+    for _ in range(3):
+        thread = threading.Thread(target=_worker)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    for conn in conns:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    stats = books_db.query_stats()
+    assert stats["connections_opened"] == stats["connections_closed"] == 3
+
+
+def test_file_is_restated_once_per_interval(tmp_path: Path, monkeypatch) -> None:
+    "Test file is restated once per interval."
+    db_path = tmp_path / "books.db"
+    _write_db(db_path, [("A", "Alpha")])
+    calls = []
+    real_signature = books_db._file_signature
+    monkeypatch.setattr(books_db, "_file_signature", lambda p: calls.append(p) or real_signature(p))
+    monkeypatch.setattr(books_db.config, "BOOKS_DB_STAT_INTERVAL_S", 3600.0)
+
+    for _ in range(5):
+        books_db.fetch_one(db_path, "A")
+    assert len(calls) == 1
+
+    monkeypatch.setattr(books_db.config, "BOOKS_DB_STAT_INTERVAL_S", 0.0)
+    books_db.fetch_one(db_path, "A")
+    assert len(calls) == 2
+    assert books_db.query_stats()["connections_opened"] == 1
+
+
+def test_close_all_closes_other_threads_connections(tmp_path: Path) -> None:
+    "Test close all closes other threads connections."
+    db_path = tmp_path / "books.db"
+    _write_db(db_path, [("A", "Alpha")])
+    ready, done = threading.Event(), threading.Event()
+    conns = []
+
+    def _worker() -> None:
+        "Helper for worker."
+        conns.append(books_db.connection(db_path))
+        ready.set()
+        done.wait(5)
+
+    thread = threading.Thread(target=_worker)
+    thread.start()
+    ready.wait(5)
+    books_db.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conns[0].execute("SELECT 1")
+    done.set()
+    thread.join()
+
+
+def test_unknown_columns_and_missing_file_raise(tmp_path: Path) -> None:
+    "Test unknown columns and missing file raise."
+    db_path = tmp_path / "books.db"
+    _write_db(db_path, [("A", "Alpha")])
+    with pytest.raises(ValueError):
+        books_db.fetch_one(db_path, "A", ["title; DROP TABLE books"])
+    with pytest.raises(ValueError):
+        books_db.fetch_many(db_path, ["A"], ["title"])
+    with pytest.raises(OSError):
+        books_db.fetch_one(tmp_path / "absent.db", "A")
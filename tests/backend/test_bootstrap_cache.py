@@ -0,0 +1,140 @@
+"""
+Tests for Book-Club-Manager.backend.bootstrap_cache.
+
+These tests verify:
+- Sections are served from the cache while their key is unchanged
+- A changed key, invalidate() or the max age rebuilds a section, and
+  get_stamped gives each build its own stamp
+- section_key follows local file mtimes and storage write generations
+- LocalStorage re-reads cached JSON files when they change on disk
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+
+
+def _import_storage():
+    "Helper for  import storage."
+    return importlib.reload(importlib.import_module("backend.storage"))
+
+
+def test_bootstrap_cache_hits_until_key_changes_or_expires() -> None:
+    "Test bootstrap cache hits until key changes or expires."
+    from backend.bootstrap_cache import BootstrapCache
+
+    now = [0.0]
+    cache = BootstrapCache(60, clock=lambda: now[0])
+    builds = []
+
+    def build():
+        "Helper for build."
+        builds.append(1)
+        return {"n": len(builds)}
+
+    first = cache.get("books", ("k", 1), build)
+    assert cache.get("books", ("k", 1), build) is first
+    assert len(builds) == 1
+
+    assert cache.get("books", ("k", 2), build)["n"] == 2
+    now[0] = 61.0
+    assert cache.get("books", ("k", 2), build)["n"] == 3
+    cache.invalidate("books")
+    assert cache.get("books", ("k", 2), build)["n"] == 4
+    cache.get("forum", "f", build)
+    cache.invalidate()
+    assert cache.get("forum", "f", build)["n"] == 6
+
+
+def test_get_stamped_changes_stamp_on_every_rebuild() -> None:
+    "Test get stamped changes stamp on every rebuild."
+    from backend.bootstrap_cache import BootstrapCache
+
+    cache = BootstrapCache(60)
+    value, stamp = cache.get_stamped("books", "k", lambda: ["a"])
+    assert cache.get_stamped("books", "k", lambda: ["b"]) == (value, stamp)
+    cache.invalidate("books")
+    rebuilt, new_stamp = cache.get_stamped("books", "k", lambda: ["c"])
+    assert rebuilt == ["c"]
+    assert new_stamp != stamp and new_stamp[0] == "k"
+    assert cache.get("books", "k", lambda: ["d"]) is rebuilt
+
+
+def test_bootstrap_cache_does_not_store_failed_builds() -> None:
+    "Test bootstrap cache does not store failed builds."
+    from backend.bootstrap_cache import BootstrapCache
+
+    cache = BootstrapCache(60)
+
+    def boom():
+        "Helper for boom."
+        raise RuntimeError("down")
+
+    try:
+        cache.get("events", 1, boom)
+    except RuntimeError:
+        pass
+    assert cache.get("events", 1, lambda: "ok") == "ok"
+
+
+def test_section_key_tracks_file_mtimes_and_writes(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test section key tracks file mtimes and writes."
+    storage = _import_storage()
+    from backend import bootstrap_cache
+    from backend import config as cfg
+
+    importlib.reload(bootstrap_cache)
+    monkeypatch.setattr(cfg, "PROCESSED_DIR", tmp_path, raising=False)
+    monkeypatch.setattr(cfg, "FORUM_DB_PATH", tmp_path / "forum_posts.json", raising=False)
+    monkeypatch.setattr(cfg, "REVIEWS_TOP50_BOOKS_LOCAL_PATH", tmp_path / "reviews_top50_books.json", raising=False)
+    ls = storage.LocalStorage()
+
+    events_path = tmp_path / "book_events_clean.json"
+    k0 = bootstrap_cache.section_key(ls, "events")
+    events_path.write_text("[]", encoding="utf-8")
+    k1 = bootstrap_cache.section_key(ls, "events")
+    assert k1 != k0
+    assert bootstrap_cache.section_key(ls, "events") == k1
+    os.utime(events_path, ns=(1, 1))
+    assert bootstrap_cache.section_key(ls, "events") != k1
+
+    forum_key = bootstrap_cache.section_key(ls, "forum")
+    books_key = bootstrap_cache.section_key(ls, "books")
+    storage.note_write("forum")
+    assert bootstrap_cache.section_key(ls, "forum") != forum_key
+    assert bootstrap_cache.section_key(ls, "books") == books_key
+
+    # Backends without local files (AWS) key on the write generation only.
+    assert storage.CloudStorage().bootstrap_sources() == {}
+    assert bootstrap_cache.section_key(object(), "forum") == ((), storage.write_generation("forum"))
+
+
+def test_local_forum_save_bumps_write_generation(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test local forum save bumps write generation."
+    storage = _import_storage()
+    calls = []
+    monkeypatch.setattr(storage, "save_forum_store", calls.append)
+    before = storage.write_generation("forum")
+    storage.LocalStorage().save_forum_db({"posts": [], "next_post_id": 1})
+    storage.LocalStorage().save_forum_db({})
+    assert storage.write_generation("forum") == before + 1
+    assert len(calls) == 1
+
+
+def test_local_storage_rereads_changed_json_file(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test local storage rereads changed json file."
+    storage = _import_storage()
+    from backend import config as cfg
+
+    monkeypatch.setattr(cfg, "PROCESSED_DIR", tmp_path, raising=False)
+    monkeypatch.setattr(storage.LocalStorage, "_cache", {})
+    path = tmp_path / "spl_top50_checkouts_in_books.json"
+    ls = storage.LocalStorage()
+    assert ls.get_spl_top50_checkout_books() == []
+
+    path.write_text(json.dumps([{"parent_asin": "A"}]), encoding="utf-8")
+    assert ls.get_spl_top50_checkout_books() == [{"parent_asin": "A"}]
+    path.write_text(json.dumps([{"parent_asin": "A"}, {"parent_asin": "B"}]), encoding="utf-8")
+    assert len(ls.get_spl_top50_checkout_books()) == 2
@@ -0,0 +1,149 @@
+"""
+Tests for Book-Club-Manager.backend.dynamo_batch.
+
+An in-memory BatchGetItem stand-in (moto-style: enforces the 100-key limit,
+applies ProjectionExpression, and throttles by returning UnprocessedKeys)
+verifies that chunked, concurrent reads are complete and that keys left
+unprocessed are reported rather than dropped.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+import types
+from unittest.mock import patch
+
+from backend import dynamo_batch
+
+
+class _ThrottlingDynamo:
+    "In-memory BatchGetItem stand-in that serves at most `per_call` keys per request."
+
+    def __init__(self, items, per_call: int = 30, fail_first: int = 0) -> None:
+        "Support __init__ for test doubles."
+        self.items = {i["parent_asin"]["S"]: i for i in items}
+        self.per_call = per_call
+        self.fail_first = fail_first
+        self.calls = 0
+        self.max_keys_seen = 0
+        self._lock = threading.Lock()
+
+    def batch_get_item(self, RequestItems):  # type: ignore[no-untyped-def] # pylint: disable=invalid-name
+        "Helper for batch get item."
+        (table, req), = RequestItems.items()
+        keys = req["Keys"]
+        with self._lock:
+            self.calls += 1
+            self.max_keys_seen = max(self.max_keys_seen, len(keys))
+            if self.fail_first:
+                self.fail_first -= 1
+                raise RuntimeError("ProvisionedThroughputExceededException")
+        assert len(keys) <= 100
+        served, rest = keys[: self.per_call], keys[self.per_call:]
+        names = req.get("ExpressionAttributeNames")
+        found = []
+        for key in served:
+            item = self.items.get(key["parent_asin"]["S"])
+            if item is None:
+                continue
+            if names:
+                wanted = {names[p.strip()] for p in req["ProjectionExpression"].split(",")}
+                item = {k: v for k, v in item.items() if k in wanted}
+            found.append(item)
+        resp = {"Responses": {table: found}}
+        if rest:
+            resp["UnprocessedKeys"] = {table: {**req, "Keys": rest}}
+        return resp
+
+
+def _items(n: int):
+    "Helper for items."
+    return [
+        {
+            "parent_asin": {"S": f"P{i}"},
+            "title": {"S": f"Title {i}"},
+            "average_rating": {"N": "4.5"},
+            "rating_number": {"N": str(i)},
+            "categories": {"L": [{"S": "Fantasy"}]},
+            "description": {"S": "long text"},
+        }
+        for i in range(n)
+    ]
+
+
+def _keys(ids):
+    "Helper for keys."
+    return [{"parent_asin": {"S": i}} for i in ids]
+
+
+def test_decode_item_handles_wire_and_plain_values() -> None:
+    "Test decode item handles wire and plain values."
+    item = {
+        "a": {"S": "x"},
+        "b": {"N": "3"},
+        "c": {"N": "2.5"},
+        "d": {"M": {"e": {"BOOL": True}, "f": {"NULL": True}}},
+        "g": {"NS": ["1", "1.5"]},
+        "h": "plain",
+        "i": {"L": [{"S": "y"}, {"SS": ["p", "q"]}]},
+        "j": {"B": b"raw"},
+        "k": {"M": "not a map"},
+    }
+    assert dynamo_batch.decode_item(item) == {
+        "a": "x", "b": 3, "c": 2.5, "d": {"e": True, "f": None}, "g": [1, 1.5], "h": "plain",
+        "i": ["y", ["p", "q"]], "j": {"B": b"raw"}, "k": {"M": "not a map"},
+    }
+
+
+def test_batch_get_items_is_complete_under_throttling() -> None:
+    "Test batch get items is complete under throttling."
+    fake = _ThrottlingDynamo(_items(350), per_call=30, fail_first=2)
+    ids = [f"P{i}" for i in range(350)] + ["missing"]
+    result = dynamo_batch.batch_get_items(
+        fake, "books", _keys(ids), attributes=["parent_asin", "title", "rating_number"],
+        max_attempts=20, sleep=lambda _s: None,
+    )
+    assert result.unprocessed == []
+    assert sorted(i["parent_asin"] for i in result.items) == sorted(ids[:-1])
+    assert all(set(i) == {"parent_asin", "title", "rating_number"} for i in result.items)
+    assert fake.max_keys_seen == 100
+
+
+def test_batch_get_items_reports_keys_left_unprocessed() -> None:
+    "Test batch get items reports keys left unprocessed."
+    fake = _ThrottlingDynamo(_items(50), per_call=10)
+    delays = []
+    result = dynamo_batch.batch_get_items(
+        fake, "books", _keys([f"P{i}" for i in range(50)]), max_attempts=3, sleep=delays.append
+    )
+    assert len(result.items) == 30 and len(result.unprocessed) == 20
+    assert len(delays) == 2 and delays[1] >= delays[0] / 2
+
+
+def test_cloud_storage_batch_does_not_negative_cache_throttled_keys() -> None:
+    "Test cloud storage batch does not negative cache throttled keys."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    import boto3  # type: ignore
+
+    fake = _ThrottlingDynamo(_items(20), per_call=5)
+    with patch.object(storage._config, "DYNAMO_BATCH_MAX_ATTEMPTS", 2), patch.object(
+        dynamo_batch.time, "sleep", lambda _s: None
+    ), patch.object(boto3, "client", lambda *_a, **_k: fake):
+        first = storage.CloudStorage().get_books_metadata_batch([f"P{i}" for i in range(20)])
+        assert len(first) == 10
+        assert first["P3"]["rating_number"] == 3 and "description" not in first["P3"]
+        fake.per_call = 100
+        second = storage.CloudStorage().get_books_metadata_batch([f"P{i}" for i in range(20)])
+    assert len(second) == 20
+
+
+def test_dynamo_client_is_reused() -> None:
+    "Test dynamo client is reused."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    import boto3  # type: ignore
+
+    made = []
+    with patch.object(boto3, "client", lambda *_a, **_k: made.append(1) or types.SimpleNamespace()):
+        assert storage._dynamo_client() is storage._dynamo_client()
+    assert len(made) == 1
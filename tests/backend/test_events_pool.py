@@ -0,0 +1,329 @@
+"""
+Tests for Book-Club-Manager.backend.events_pool.
+
+These tests verify:
+- EventsSnapshot sorts by ttl, skips expired events in listings and indexes
+  events by event_id, parent_asin and city_state.
+- EventsSnapshot.event_index builds the recommender's EventIndex once per
+  snapshot and window, and LocalStorage exposes it per events refresh.
+- EventsPool loads once, serves stale snapshots while reloading in the
+  background after the TTL, and keeps the old snapshot when a reload fails.
+- LocalStorage serves all event reads from one shared snapshot.
+- get_events_batch preserves order and only sends snapshot misses to
+  BatchGetItem.
+- Without the ttl GSI, the snapshot is read from day buckets in parallel
+  and merged by ttl instead of scanning; the last-resort scan is filtered
+  on ttl and stops after a bounded number of events or pages.
+- iter_event_pages pages GSI queries with a `ttl > now` key condition and a
+  projection (CloudStorage) or the snapshot (LocalStorage).
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import threading
+import types
+from unittest.mock import patch
+
+from backend.events_pool import EventsPool, EventsSnapshot
+
+
+def _events():
+    "Helper for events."
+    return [
+        {"event_id": "late", "ttl": 300, "city_state": "Seattle, WA", "parent_asin": "P1"},
+        {"event_id": "over", "ttl": 50, "city_state": "Seattle, WA", "parent_asin": "P1"},
+        {"event_id": "soon", "expiry": 150, "city_state": "Portland, OR", "parent_asin": "P1"},
+        {"event_id": "undated", "city_state": "Seattle, WA"},
+        "not-a-dict",
+    ]
+
+
+def test_snapshot_orders_indexes_and_skips_expired() -> None:
+    "Test snapshot orders indexes and skips expired."
+    snap = EventsSnapshot(_events())
+    assert len(snap) == 4
+    assert [e["event_id"] for e in snap.soonest(10, now=100)] == ["undated", "soon", "late"]
+    assert [e["event_id"] for e in snap.soonest(2, now=100)] == ["undated", "soon"]
+    assert snap.soonest(0, now=100) == []
+    assert [e["event_id"] for e in snap.for_city("Seattle, WA", now=100)] == ["undated", "late"]
+    assert [e["event_id"] for e in snap.for_book("P1", limit=1, now=100)] == ["soon"]
+    assert snap.for_book("P1", now=1000) == []
+    # Lookups by id still resolve expired events.
+    assert snap.get(" over ")["ttl"] == 50
+    assert snap.get("missing") is None
+
+
+def test_snapshot_returns_copies() -> None:
+    "Test snapshot returns copies."
+    snap = EventsSnapshot(_events())
+    snap.soonest(10, now=0)[0]["title"] = "changed"
+    snap.get("late")["title"] = "changed"
+    assert all("title" not in e for e in snap.events)
+
+
+def test_event_index_built_once_per_snapshot_window() -> None:
+    "Test event index built once per snapshot window."
+    snap = EventsSnapshot(_events())
+    index = snap.event_index(10, now=100)
+    assert [e["event_id"] for e in index.events] == ["undated", "soon", "late"]
+    assert snap.event_index(10, now=120) is index
+    # "soon" expired: the window moved, so the index is rebuilt.
+    later = snap.event_index(10, now=200)
+    assert later is not index
+    assert [e["event_id"] for e in later.events] == ["undated", "late"]
+    assert [e["event_id"] for e in snap.event_index(1, now=100).events] == ["undated"]
+    assert EventsSnapshot(_events()).event_index(10, now=100) is not index
+
+
+def test_pool_refreshes_in_background_after_ttl() -> None:
+    "Test pool refreshes in background after ttl."
+    now = [0.0]
+    loads = []
+    release = threading.Event()
+
+    def loader():
+        "Helper for loader."
+        loads.append(1)
+        if len(loads) > 1:
+            release.wait(5)
+        return [{"event_id": f"v{len(loads)}"}]
+
+    pool = EventsPool(loader, ttl_seconds=60, clock=lambda: now[0])
+    first = pool.snapshot()
+    assert pool.snapshot() is first and len(loads) == 1
+    now[0] = 61.0
+    # Stale: the old snapshot is served while one reload runs.
+    assert pool.snapshot() is first
+    assert pool.snapshot() is first
+    thread = pool._refresh_thread
+    release.set()
+    thread.join(5)
+    assert len(loads) == 2
+    assert pool.snapshot().get("v2") is not None
+
+
+def test_pool_keeps_snapshot_when_reload_fails() -> None:
+    "Test pool keeps snapshot when reload fails."
+    results = [[{"event_id": "e1"}], RuntimeError("throttled")]
+
+    def loader():
+        "Helper for loader."
+        value = results.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    pool = EventsPool(loader, ttl_seconds=60)
+    first = pool.snapshot()
+    assert pool.refresh() is first
+    assert len(EventsPool(lambda: 1 / 0, ttl_seconds=60).snapshot()) == 0
+
+
+def test_local_storage_reads_events_file_once(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test local storage reads events file once."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    from backend import config as cfg
+
+    monkeypatch.setattr(cfg, "PROCESSED_DIR", tmp_path, raising=False)
+    (tmp_path / "book_events_clean.json").write_text(
+        json.dumps([{"event_id": "e1", "city_state": "Seattle, WA", "parent_asin": "P1"}]),
+        encoding="utf-8",
+    )
+    ls = storage.LocalStorage()
+    loads = []
+    original = storage.LocalStorage._load_upcoming_events
+
+    def counting(self):  # type: ignore[no-untyped-def]
+        "Helper for counting."
+        loads.append(1)
+        return original(self)
+
+    monkeypatch.setattr(storage.LocalStorage, "_load_upcoming_events", counting)
+    assert ls.get_soonest_events(36)[0]["event_id"] == "e1"
+    assert ls.get_events_by_city("Seattle, WA")[0]["event_id"] == "e1"
+    assert storage.LocalStorage().get_events_for_book("P1")[0]["event_id"] == "e1"
+    assert ls.get_event_details("e1")["event_id"] == "e1"  # type: ignore[index]
+    assert ls.get_soonest_events_index(36) is storage.LocalStorage().get_soonest_events_index(36)
+    assert len(loads) == 1
+
+
+def test_get_events_batch_local_and_cloud(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test get events batch local and cloud."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    from backend import config as cfg
+
+    monkeypatch.setattr(cfg, "PROCESSED_DIR", tmp_path, raising=False)
+    (tmp_path / "book_events_clean.json").write_text(
+        json.dumps([{"event_id": "e1"}, {"event_id": "e2"}]), encoding="utf-8"
+    )
+    assert storage.LocalStorage().get_events_batch(["e2", "nope", "e1", "e2"]) == [
+        {"event_id": "e2"}, {"event_id": "e1"}, {"event_id": "e2"},
+    ]
+
+    import boto3  # type: ignore
+
+    requests = []
+
+    def batch_get_item(RequestItems):  # type: ignore[no-untyped-def] # pylint: disable=invalid-name
+        "Helper for batch get item."
+        (table, req), = RequestItems.items()
+        requests.append(req["Keys"])
+        return {"Responses": {table: [{"event_id": {"S": "old"}, "ttl": {"N": "5"}}]}}
+
+    cs = storage.CloudStorage()
+    with patch.object(cs, "_load_upcoming_events", lambda: [{"event_id": "e1"}]), patch.object(
+        boto3, "client", lambda *_a, **_k: types.SimpleNamespace(batch_get_item=batch_get_item)
+    ):
+        got = cs.get_events_batch(["old", "e1", "gone", "old"])
+    assert got == [{"event_id": "old", "ttl": 5}, {"event_id": "e1"}, {"event_id": "old", "ttl": 5}]
+    assert requests == [[{"event_id": {"S": "old"}}, {"event_id": {"S": "gone"}}]]
+
+
+def test_iter_event_pages_queries_upcoming_window(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test iter event pages queries upcoming window."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    cs = storage.CloudStorage()
+    monkeypatch.setattr(storage._config, "EVENTS_CITY_STATE_GSI", "city_state_ttl-index", raising=False)
+    monkeypatch.setattr(storage._config, "EVENT_LIST_PROJECTION", ["event_id", "ttl"], raising=False)
+    monkeypatch.setattr(storage.time, "time", lambda: 1000.0)
+    calls = []
+    pages = [
+        {"Items": [{"event_id": "a"}], "LastEvaluatedKey": {"k": 1}},
+        {"Items": [], "LastEvaluatedKey": {"k": 2}},
+        {"Items": [{"event_id": "b"}]},
+    ]
+
+    def query(**kwargs):  # type: ignore[no-untyped-def]
+        "Helper for query."
+        calls.append(dict(kwargs))
+        return pages[len(calls) - 1]
+
+    monkeypatch.setattr(cs._table("EVENTS_TABLE", "events"), "query", query)
+    got = list(cs.iter_event_pages(2, city_state="Seattle, WA"))
+    assert got == [[{"event_id": "a"}], [{"event_id": "b"}]]
+    assert calls[0]["KeyConditionExpression"] == (
+        "and", ("eq", "city_state", "Seattle, WA"), ("gt", "ttl", 1000)
+    )
+    assert calls[0]["Limit"] == 2
+    assert set(calls[0]["ExpressionAttributeNames"].values()) == {"event_id", "ttl"}
+    assert [c.get("ExclusiveStartKey") for c in calls] == [None, {"k": 1}, {"k": 2}]
+
+
+def test_truncated_snapshot_falls_back_to_gsi_pages(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test truncated snapshot falls back to gsi pages."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    cs = storage.CloudStorage()
+    monkeypatch.setattr(storage._config, "EVENTS_POOL_MAX_EVENTS", 1, raising=False)
+    monkeypatch.setattr(storage._config, "EVENTS_PARENT_ASIN_GSI", "pa-index", raising=False)
+    monkeypatch.setattr(cs, "_load_upcoming_events", lambda: [{"event_id": "x"}])
+    seen = []
+
+    def pages(gsi, key_name, key_value, **_kw):  # type: ignore[no-untyped-def]
+        "Helper for pages."
+        seen.append((gsi, key_name, key_value))
+        yield [{"event_id": "b1"}, {"event_id": "b2"}]
+        yield [{"event_id": "b3"}]
+
+    monkeypatch.setattr(cs, "_query_event_pages", pages)
+    assert [e["event_id"] for e in cs.get_events_for_book("P1", limit=2)] == ["b1", "b2"]
+    assert seen == [("pa-index", "parent_asin", "P1")]
+
+
+def test_local_iter_event_pages(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test local iter event pages."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    from backend import config as cfg
+
+    monkeypatch.setattr(cfg, "PROCESSED_DIR", tmp_path, raising=False)
+    (tmp_path / "book_events_clean.json").write_text(
+        json.dumps([{"event_id": f"e{i}", "city_state": "Seattle, WA"} for i in range(5)]),
+        encoding="utf-8",
+    )
+    ls = storage.LocalStorage()
+    assert [len(p) for p in ls.iter_event_pages(2)] == [2, 2, 1]
+    assert [len(p) for p in ls.iter_event_pages(10, city_state="Seattle, WA")] == [5]
+    assert list(ls.iter_event_pages(10, parent_asin="P9")) == []
+
+
+def test_day_bucket_fallback_merges_buckets_by_ttl(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test day bucket fallback merges buckets by ttl."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    import boto3  # type: ignore
+    from backend.events_pool import day_bucket
+
+    now = 1_800_000_000
+    events = [
+        {"event_id": f"e{i}", "ttl": now + 3600 * i} for i in (-2, 5, 30, 1, 70, 200)
+    ]
+    by_bucket: dict = {}
+    for ev in events:
+        by_bucket.setdefault(day_bucket(ev["ttl"]), []).append(ev)
+    asked = []
+
+    def query(**kw):  # type: ignore[no-untyped-def]
+        "Helper for query."
+        bucket = kw["ExpressionAttributeValues"][":b"]["S"]
+        cutoff = int(kw["ExpressionAttributeValues"][":now"]["N"])
+        asked.append(bucket)
+        rows = sorted(
+            (e for e in by_bucket.get(bucket, []) if e["ttl"] > cutoff), key=lambda e: e["ttl"]
+        )
+        return {"Items": [{"event_id": {"S": e["event_id"]}, "ttl": {"N": str(e["ttl"])}} for e in rows]}
+
+    def failing_gsi(**_kw):  # type: ignore[no-untyped-def]
+        "Helper for failing gsi."
+        raise RuntimeError("AccessDenied")
+
+    cs = storage.CloudStorage()
+    table = cs._table("EVENTS_TABLE", "events")
+    monkeypatch.setattr(table, "query", failing_gsi)
+    monkeypatch.setattr(table, "scan", lambda **_kw: (_ for _ in ()).throw(AssertionError("scan")))
+    monkeypatch.setattr(storage._config, "EVENTS_DAY_BUCKET_DAYS", 30, raising=False)
+    monkeypatch.setattr(storage._config, "DYNAMO_BATCH_MAX_WORKERS", 2, raising=False)
+    monkeypatch.setattr(storage.time, "time", lambda: float(now))
+    with patch.object(boto3, "client", lambda *_a, **_k: types.SimpleNamespace(query=query)):
+        assert [e["event_id"] for e in cs._load_from_day_buckets("day-index", cap=3)] == [
+            "e1", "e5", "e30",
+        ]
+        assert len(asked) == 2  # one wave covered the first two days
+        assert [e["event_id"] for e in cs.get_soonest_events(10)] == [
+            "e1", "e5", "e30", "e70", "e200",
+        ]
+
+
+def test_scan_fallback_is_filtered_and_bounded(monkeypatch, caplog) -> None:  # type: ignore[no-untyped-def]
+    "Test scan fallback is filtered and bounded."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+
+    now = 1_800_000_000
+    scans = []
+
+    def scan(**kw):  # type: ignore[no-untyped-def]
+        "Helper for scan (endless table, two upcoming events per page)."
+        scans.append(kw)
+        page = len(scans)
+        ttls = [now + 100 * (50 - page), now + 100 * (50 - page) + 1]
+        return {
+            "Items": [{"event_id": f"e{t}", "ttl": t} for t in ttls],
+            "LastEvaluatedKey": {"event_id": f"k{page}"},
+        }
+
+    cs = storage.CloudStorage()
+    table = cs._table("EVENTS_TABLE", "events")
+    monkeypatch.setattr(table, "scan", scan)
+    monkeypatch.setattr(storage._config, "EVENTS_SCAN_FACTOR", 3, raising=False)
+    monkeypatch.setattr(storage._config, "EVENTS_SCAN_MAX_PAGES", 100, raising=False)
+    with caplog.at_level("ERROR"):
+        out = cs._scan_upcoming_events(cap=2, now=now)
+    assert len(scans) == 3  # 6 events read = 3 x cap
+    assert scans[0]["FilterExpression"] == "#t > :now"
+    assert scans[0]["ExpressionAttributeValues"] == {":now": now}
+    assert [e["ttl"] for e in out] == [now + 4700, now + 4701]
+    assert "DEGRADED" in caplog.text
+
+    scans.clear()
+    monkeypatch.setattr(storage._config, "EVENTS_SCAN_MAX_PAGES", 2, raising=False)
+    assert len(cs._scan_upcoming_events(cap=50, now=now)) == 4
+    assert len(scans) == 2
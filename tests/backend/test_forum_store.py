@@ -9,6 +9,8 @@ Covers:
 - load_forum_store when the file contains invalid JSON: falls back to an empty
   store with sane defaults.
 - save_forum_store: writes the provided store to FORUM_DB_PATH with JSON.
+- ForumBookIndex: threads a book's posts by parent_asin, normalized title or
+  the legacy bootstrap book_id, newest first.
 """
 
 import json
@@ -165,3 +167,40 @@ def test_save_forum_store_writes_json(tmp_path: Path) -> None:
     loaded = json.loads(forum_path.read_text(encoding="utf-8"))
     assert loaded == input_store
 
+
+
+def test_forum_book_index_threads_by_asin_and_title() -> None:
+    """ForumBookIndex finds a book's posts by parent_asin or title (tag/book_title), newest first."""
+    posts = [
+        {"id": 5, "parent_asin": "P1", "book_title": "Dune", "tags": ["Dune"]},
+        {"id": 4, "parent_asin": None, "book_title": None, "tags": ["  dune "]},
+        {"id": 3, "parent_asin": "P2", "book_title": "Other", "tags": []},
+        {"id": 2, "parent_asin": None, "book_title": "DUNE", "tags": []},
+        {"id": "bad", "parent_asin": "P1"},
+    ]
+    index = forum_store.ForumBookIndex(posts)
+
+    assert [p["id"] for p in index.thread("P1")] == [5]
+    assert [p["id"] for p in index.thread(None, "Dune")] == [5, 4, 2]
+    assert [p["id"] for p in index.thread("P1", "Dune")] == [5, 4, 2]
+    assert index.thread("", "") == []
+
+    index.add({"id": 6, "parent_asin": "P1", "book_title": "Dune", "tags": []})
+    assert [p["id"] for p in index.thread("P1", "dune")] == [6, 5, 4, 2]
+    assert forum_store.post_book_keys({"tags": ["A  b"], "parent_asin": " X "}) == {("asin", "X"), ("title", "a b")}
+
+
+def test_forum_book_index_keeps_legacy_book_id_match() -> None:
+    """Posts that only carry the bootstrap book_id are still found for that book."""
+    posts = [
+        {"id": 3, "parent_asin": "P1", "book_id": 7},
+        {"id": 2, "book_id": "7", "tags": []},
+        {"id": 1, "book_id": True, "book_title": "Other"},
+    ]
+    index = forum_store.ForumBookIndex(posts)
+
+    assert [p["id"] for p in index.thread("P1", None, 7)] == [3, 2]
+    assert [p["id"] for p in index.thread(None, None, "7")] == [3, 2]
+    assert index.thread(None, None, "x") == []
+    assert forum_store.post_book_keys({"book_id": 1.0}) == {("book_id", "1")}
+    assert forum_store.post_book_keys({"book_id": True}) == set()
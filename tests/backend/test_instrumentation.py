@@ -0,0 +1,148 @@
+"""
+Tests for Book-Club-Manager.backend.instrumentation.
+
+These tests verify:
+- timed() records counts, errors and p50/p95/p99 per operation
+- Warnings logged inside an operation (swallowed storage errors) count as errors
+- Storage methods and service functions are instrumented; generators are not
+- One recommender request records exactly one span, not one per nested entry point
+- trace() collects nested spans for one rerun
+- JSON and Prometheus exports, and the INSTRUMENTATION_ENABLED switch
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+
+import numpy as np
+import pytest
+
+
+def test_timed_records_counts_errors_and_percentiles(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test timed records counts errors and percentiles."
+    from backend import instrumentation
+
+    ticks = iter(float(i) for i in range(1000))
+    monkeypatch.setattr(instrumentation.time, "perf_counter", lambda: next(ticks) / 1000.0)
+    # Durations 1ms, 1ms, ... : each timed block consumes two ticks one millisecond apart.
+    for _ in range(99):
+        with instrumentation.timed("s3.get"):
+            pass
+    with pytest.raises(ValueError):
+        with instrumentation.timed("s3.get"):
+            raise ValueError("boom")
+
+    stats = instrumentation.get_registry().snapshot()["s3.get"]
+    assert stats["count"] == 100
+    assert stats["errors"] == 1
+    assert stats["p50_ms"] == pytest.approx(1.0)
+    assert stats["p99_ms"] == pytest.approx(1.0)
+
+    registry = instrumentation.Registry(sample_size=100)
+    for ms in range(1, 101):
+        registry.record("op", ms / 1000.0)
+    summary = registry.snapshot()["op"]
+    assert (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]) == (50.0, 95.0, 99.0)
+    assert summary["max_ms"] == 100.0
+
+
+def test_logged_warnings_count_as_errors_of_storage_methods(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test logged warnings count as errors of storage methods."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    from backend import instrumentation
+
+    import boto3  # type: ignore
+
+    table = boto3.resource("dynamodb").Table("user_books")
+    monkeypatch.setattr(table, "raise_on_get", RuntimeError("throttled"))
+    assert storage.CloudStorage().get_user_books("u@x.com") is None
+    logging.warning("outside any operation")
+
+    snap = instrumentation.get_registry().snapshot()
+    assert snap["storage.cloud.get_user_books"]["errors"] == 1
+    assert snap["storage.cloud._table"]["errors"] == 0
+    assert storage.LocalStorage.iter_event_pages.__name__ == "iter_event_pages"
+    assert not getattr(storage.LocalStorage.iter_event_pages, "__instrumented__", False)
+
+
+def test_service_functions_and_recommend_are_instrumented() -> None:
+    "Test service functions and recommend are instrumented."
+    from backend import instrumentation
+    from backend.recommender.event_recommender import EventRecommender
+    from backend.services import forum_service
+
+    assert getattr(forum_service.get_thread_for_book, "__instrumented__", False)
+    assert not getattr(forum_service.get_storage, "__instrumented__", False)
+    with instrumentation.trace("rerun") as rerun_trace:
+        forum_service.get_thread_for_book("", None)
+        EventRecommender().recommend([], user_tags=["Fantasy"], top_k=3)
+    ops = [span["op"] for span in rerun_trace.rows()]
+    assert ops == ["service.forum.get_thread_for_book", "event_recommender.EventRecommender.recommend"]
+
+
+def test_recommender_requests_record_one_span() -> None:
+    "Test recommender requests record one span."
+    from scipy import sparse
+
+    from backend import instrumentation
+    from backend.recommender import book_recommender as br
+    from backend.recommender.event_recommender import EventRecommender
+
+    rec = br.ContentBasedBookRecommender(compact=False)
+    rec.book_tfidf = sparse.identity(len(br.GENRE_VOCAB), format="csr")
+    rec.book_id_to_idx = {f"A{i}": i for i in range(len(br.GENRE_VOCAB))}
+    rec._rating_norm = rec._rating_number_norm = np.zeros(len(br.GENRE_VOCAB))
+    rec._fetch_metadata_for_asins = lambda asins: [{"parent_asin": a} for a in asins]  # type: ignore[assignment]
+    event = {"title": "Talk", "link": "l", "tags": ["Fantasy"], "start_ts": 0}
+    with instrumentation.trace("rerun") as rerun_trace:
+        rec.recommend_for_user("u", {"library": {"saved": ["A1"]}}, None, top_k=3)
+        rec.recommend("u", None, None, top_k=3)
+        EventRecommender().recommend([event], user_tags=["Fantasy"], top_k=1)
+    assert [span["op"] for span in rerun_trace.rows()] == [
+        "book_recommender.ContentBasedBookRecommender.recommend_for_user",
+        "book_recommender.ContentBasedBookRecommender.recommend",
+        "event_recommender.EventRecommender.recommend",
+    ]
+
+
+def test_trace_collects_nested_spans_and_exports() -> None:
+    "Test trace collects nested spans and exports."
+    from backend import instrumentation
+
+    with instrumentation.trace("rerun") as rerun_trace:
+        with instrumentation.timed("page.feed"):
+            with instrumentation.timed("dynamo.get_item"):
+                pass
+        with instrumentation.trace("inner") as inner:
+            assert inner is rerun_trace
+    with instrumentation.timed("untraced"):
+        pass
+    rows = rerun_trace.rows()
+    assert [(r["op"], r["depth"]) for r in rows] == [("page.feed", 0), ("dynamo.get_item", 1)]
+    assert rerun_trace.slowest(1)[0]["op"] == "page.feed"
+
+    registry = instrumentation.get_registry()
+    assert set(json.loads(registry.to_json())) == {"dynamo.get_item", "page.feed", "untraced"}
+    text = registry.to_prometheus()
+    assert '# TYPE bookish_operation_seconds summary' in text
+    assert 'bookish_operation_seconds{op="page.feed",quantile="0.95"}' in text
+    assert 'bookish_operation_seconds_count{op="untraced"} 1' in text
+    assert 'bookish_operation_errors_total{op="page.feed"} 0' in text
+
+
+def test_disabled_instrumentation_records_nothing(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test disabled instrumentation records nothing."
+    from backend import config as cfg
+    from backend import instrumentation
+
+    monkeypatch.setattr(cfg, "INSTRUMENTATION_ENABLED", False, raising=False)
+
+    @instrumentation.instrumented("quiet")
+    def quiet() -> int:
+        "Helper for quiet."
+        return 3
+
+    assert quiet() == 3
+    assert instrumentation.get_registry().snapshot() == {}
@@ -8,6 +8,7 @@ These tests verify:
 - The subclass relationship to the base LocalStorage.
 - Reading book metadata/details from a local SQLite `books.db`.
 - Fallback behavior to the base implementation when no row is found.
+- books.db errors are not cached as missing books.
 """
 
 import json
@@ -274,7 +275,7 @@ def test_get_book_metadata_falls_back_to_base_when_no_row() -> None:
     """If books.db has no row, LocalStorage should call the base implementation."""
     storage = _make_local_storage()
 
-    with patch.object(storage, "_fetch_book_row", return_value=None), patch(
+    with patch.object(storage, "_read_book_row", return_value=None), patch(
         "backend.storage.LocalStorage.get_book_metadata", return_value={"from": "base"}
     ) as m_base:
         out = storage.get_book_metadata("P3")
@@ -283,6 +284,35 @@ def test_get_book_metadata_falls_back_to_base_when_no_row() -> None:
     assert out == {"from": "base"}
 
 
+def test_get_book_metadata_does_not_cache_sqlite_errors(tmp_path: Path) -> None:
+    """A books.db error falls back to the base lookup without caching a missing book."""
+    db_path = tmp_path / "books.db"
+    _create_books_db(db_path, [("P5", "Title", "Author", 4.0, 3, "[]", "", "[]", "k")])
+    storage = _make_local_storage()
+
+    with patch.object(storage, "_books_db_path", return_value=db_path):
+        with patch("backend.books_db.fetch_one", side_effect=sqlite3.OperationalError("locked")), patch(
+            "backend.storage.LocalStorage.get_book_metadata", return_value=None
+        ) as m_base:
+            assert storage.get_book_metadata("P5") is None
+        m_base.assert_called_once_with("P5")
+        assert storage.get_book_metadata("P5")["title"] == "Title"
+
+
+def test_get_books_metadata_batch_does_not_cache_sqlite_errors(tmp_path: Path) -> None:
+    """A failed books.db batch leaves unresolved ASINs uncached."""
+    db_path = tmp_path / "books.db"
+    _create_books_db(db_path, [("P6", "Six", "Author", 4.0, 3, "[]", "", "[]", "k")])
+    storage = _make_local_storage()
+
+    with patch.object(storage, "_books_db_path", return_value=db_path):
+        with patch("backend.books_db.fetch_many", side_effect=sqlite3.OperationalError("locked")), patch(
+            "backend.storage.LocalStorage.get_books_metadata_batch", return_value={}
+        ):
+            assert storage.get_books_metadata_batch(["P6"]) == {}
+        assert storage.get_books_metadata_batch(["P6"])["P6"]["title"] == "Six"
+
+
 def test_get_book_details_falls_back_to_base_when_no_row() -> None:
     """If books.db has no row for details, LocalStorage should call the base implementation."""
     storage = _make_local_storage()
@@ -0,0 +1,179 @@
+"""
+Tests for Book-Club-Manager.backend.metadata_cache.
+
+These tests verify:
+- TTL expiry, negative caching, LRU bounds and hit/miss statistics.
+- Batch lookups only fetch misses and cache nothing on backend errors.
+- CloudStorage / local LocalStorage route metadata through the shared cache;
+  DynamoDB errors on single lookups are not cached as not-found.
+- Warm-up preloads popular ASINs from the reviews and SPL lists.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sqlite3
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.metadata_cache import MetadataCache, get_metadata_cache, popular_asins, warm_up
+
+
+class _Clock:
+    "Manual clock for TTL tests."
+
+    def __init__(self) -> None:
+        "Support __init__ for test doubles."
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        "Support __call__ for test doubles."
+        return self.now
+
+
+def test_get_one_caches_hits_and_negative_results_with_ttls() -> None:
+    "Test get one caches hits and negative results with ttls."
+    clock = _Clock()
+    cache = MetadataCache(10, ttl_seconds=60, negative_ttl_seconds=5, clock=clock)
+    calls = []
+
+    def _fetch(asin):  # type: ignore[no-untyped-def]
+        "Helper for fetch."
+        calls.append(asin)
+        return {"parent_asin": asin} if asin != "gone" else None
+
+    assert cache.get_one("A", _fetch) == {"parent_asin": "A"}
+    cache.get_one("A", _fetch)["title"] = "mutated"
+    assert cache.get_one("A", _fetch) == {"parent_asin": "A"}
+    assert cache.get_one("gone", _fetch) is None
+    assert cache.get_one("gone", _fetch) is None
+    assert calls == ["A", "gone"]
+
+    clock.now = 10  # negative entry expired, positive still fresh
+    cache.get_one("gone", _fetch)
+    cache.get_one("A", _fetch)
+    assert calls == ["A", "gone", "gone"]
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["negative_hits"] == 1
+    assert stats["expired"] == 1 and stats["misses"] == 3
+
+
+def test_get_many_fetches_only_misses_and_is_bounded() -> None:
+    "Test get many fetches only misses and is bounded."
+    cache = MetadataCache(3, ttl_seconds=60, negative_ttl_seconds=60)
+    requested = []
+
+    def _fetch_many(ids):  # type: ignore[no-untyped-def]
+        "Helper for fetch many."
+        requested.append(list(ids))
+        return {i: {"parent_asin": i} for i in ids if i != "X"}
+
+    assert set(cache.get_many(["A", "B", "X"], _fetch_many)) == {"A", "B"}
+    assert set(cache.get_many(["A", "X", "C"], _fetch_many)) == {"A", "C"}
+    assert requested == [["A", "B", "X"], ["C"]]
+    assert len(cache) == 3
+
+    def _boom(_ids):  # type: ignore[no-untyped-def]
+        "Helper for boom."
+        raise RuntimeError("throttled")
+
+    assert cache.get_many(["C", "D"], _boom) == {"C": {"parent_asin": "C"}}
+    assert cache.get_many(["D"], _fetch_many) == {"D": {"parent_asin": "D"}}
+
+
+def test_cloud_storage_batch_sends_only_misses_to_dynamodb() -> None:
+    "Test cloud storage batch sends only misses to dynamodb."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    import boto3  # type: ignore
+
+    keys_sent = []
+
+    def _batch_get_item(**kw):  # type: ignore[no-untyped-def]
+        "Helper for batch get item."
+        (table, req), = kw["RequestItems"].items()
+        ids = [k["parent_asin"]["S"] for k in req["Keys"]]
+        keys_sent.append(ids)
+        return {"Responses": {table: [{"parent_asin": {"S": i}} for i in ids if i != "P9"]}}
+
+    with patch.object(boto3, "client", lambda *_a, **_k: types.SimpleNamespace(batch_get_item=_batch_get_item)):
+        cs = storage.CloudStorage()
+        assert set(cs.get_books_metadata_batch(["P1", "P2", "P9"])) == {"P1", "P2"}
+        assert set(storage.CloudStorage().get_books_metadata_batch(["P2", "P3", "P9"])) == {"P2", "P3"}
+    assert keys_sent == [["P1", "P2", "P9"], ["P3"]]
+    assert get_metadata_cache().stats()["negative_hits"] == 1
+
+
+def test_cloud_storage_single_lookup_does_not_cache_errors() -> None:
+    "Test cloud storage single lookup does not cache errors."
+    storage = importlib.reload(importlib.import_module("backend.storage"))
+    import boto3  # type: ignore
+
+    responses = [
+        RuntimeError("ProvisionedThroughputExceededException"),
+        {},
+        {"Item": {"parent_asin": "P1", "average_rating": "4.5"}},
+    ]
+
+    def _get_item(**_kw):  # type: ignore[no-untyped-def]
+        "Helper for get item."
+        resp = responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+    table = types.SimpleNamespace(get_item=_get_item)
+    resource = types.SimpleNamespace(Table=lambda _name: table)
+    with patch.object(boto3, "resource", lambda *_a, **_k: resource):
+        cs = storage.CloudStorage()
+        assert cs.get_book_metadata("P1") is None
+        assert len(get_metadata_cache()) == 0
+        assert cs.get_book_metadata("P2") is None
+        assert cs.get_book_metadata("P2") is None
+        assert cs.get_book_metadata("P1") == {"parent_asin": "P1", "average_rating": 4.5}
+    assert responses == []
+    assert get_metadata_cache().stats()["negative_hits"] == 1
+
+
+def test_local_storage_batch_reads_books_db_once(tmp_path: Path) -> None:
+    "Test local storage batch reads books db once."
+    import backend.local_storage as local_mod
+
+    db_path = tmp_path / "books.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE books (parent_asin TEXT PRIMARY KEY, title TEXT, author_name TEXT, "
+        "average_rating REAL, rating_number INTEGER, description TEXT, images TEXT, "
+        "categories TEXT, title_author_key TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO books (parent_asin, title, categories) VALUES (?, ?, ?)",
+        [("P1", "One", '["Fantasy"]'), ("P2", "Two", "[]")],
+    )
+    conn.commit()
+    conn.close()
+
+    store = local_mod.LocalStorage()
+    with patch.object(store, "_books_db_path", return_value=db_path), patch.object(
+        local_mod._BaseLocalStorage, "get_books_metadata_batch", return_value={}
+    ) as m_base:
+        out = store.get_books_metadata_batch(["P1", "P2", "P3"])
+        assert store.get_book_metadata("P1")["categories"] == ["Fantasy"]
+    assert out["P1"]["title"] == "One" and "description" not in out["P1"]
+    assert set(out) == {"P1", "P2"}
+    m_base.assert_called_once_with(["P3"])
+    assert get_metadata_cache().stats()["hits"] == 1
+
+
+def test_warm_up_loads_popular_asins_through_batch() -> None:
+    "Test warm up loads popular asins through batch."
+    seen = []
+    store = types.SimpleNamespace(
+        get_top50_review_books=lambda: [{"parent_asin": "R1"}, {"parent_asin": "R2"}, "bad"],
+        get_spl_top50_checkout_books=lambda: [{"source_id": "S1"}, {"parent_asin": "R1"}],
+        get_books_metadata_batch=seen.append,
+    )
+    assert popular_asins(store, 10) == ["R1", "R2", "S1"]
+    assert warm_up(store, top_n=2) == 2
+    assert seen == [["R1", "R2"]]
+    assert warm_up(store, top_n=0) == 0
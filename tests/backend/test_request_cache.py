@@ -0,0 +1,127 @@
+"""
+Tests for Book-Club-Manager.backend.request_cache.
+
+These tests verify:
+- Identical per-user reads inside a unit of work cost one backend round trip
+- A unit's own writes invalidate the reads they affect
+- Storage methods are pass-through outside a unit of work
+- The per-page report counts calls (before) and round trips (after)
+"""
+
+from __future__ import annotations
+
+import importlib
+
+
+def _import_storage():
+    "Helper for  import storage."
+    return importlib.reload(importlib.import_module("backend.storage"))
+
+
+def _count_get_items(monkeypatch, table, item):  # type: ignore[no-untyped-def]
+    "Helper for count get items."
+    calls = []
+
+    def _get_item(**kwargs):
+        "Helper for get item."
+        calls.append(kwargs)
+        return {"Item": dict(item)}
+
+    monkeypatch.setattr(table, "get_item", _get_item, raising=False)
+    return calls
+
+
+def test_repeated_forum_reads_cost_one_get_item_per_rerun(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test repeated forum reads cost one get item per rerun."
+    storage = _import_storage()
+    from backend.request_cache import unit_of_work
+    from backend.services import forum_service
+
+    import boto3  # type: ignore
+
+    table = boto3.resource("dynamodb").Table("user_forums")
+    calls = _count_get_items(
+        monkeypatch, table, {"user_email": "u@x.com", "saved_forum_post_ids": [1], "liked_post_ids": [2]}
+    )
+    monkeypatch.setattr(table, "put_item", lambda **_kw: {}, raising=False)
+    monkeypatch.setattr(forum_service, "get_storage", storage.CloudStorage)
+
+    with unit_of_work() as unit:
+        saved = [forum_service.is_post_saved("U@x.com", pid) for pid in range(1, 6)]
+        liked = [forum_service.is_post_liked("u@x.com", pid) for pid in range(1, 6)]
+        assert len(calls) == 1
+        forum_service.save_post(3, "u@x.com")
+        forum_service.is_post_saved("u@x.com", 3)
+        assert len(calls) == 2
+    assert saved == [True, False, False, False, False]
+    assert liked == [False, True, False, False, False]
+    assert unit.report() == [
+        {"page": "rerun", "method": "get_user_forums", "calls": 12, "round_trips": 2}
+    ]
+
+    forum_service.is_post_saved("u@x.com", 1)
+    forum_service.is_post_saved("u@x.com", 1)
+    assert len(calls) == 4
+
+
+def test_cached_reads_are_copies_and_pages_are_reported(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test cached reads are copies and pages are reported."
+    storage = _import_storage()
+    from backend.request_cache import page, unit_of_work
+
+    import boto3  # type: ignore
+
+    table = boto3.resource("dynamodb").Table("user_books")
+    calls = _count_get_items(
+        monkeypatch, table, {"user_email": "u@x.com", "library": {"saved": ["P1"]}, "genre_preferences": []}
+    )
+    cs = storage.CloudStorage()
+    with unit_of_work() as unit:
+        with page("feed"):
+            first = cs.get_user_books("u@x.com")
+            first["library"]["saved"].append("P2")
+            assert cs.get_user_books("u@x.com")["library"]["saved"] == ["P1"]
+        with page("library"):
+            cs.get_user_books("u@x.com")
+            cs.get_user_books("other@x.com")
+            cs.get_user_recommendations("u@x.com")
+        with unit_of_work() as inner:
+            assert inner is unit
+            cs.get_user_books("u@x.com")
+    assert len(calls) == 2
+    assert unit.report() == [
+        {"page": "feed", "method": "get_user_books", "calls": 2, "round_trips": 1},
+        {"page": "library", "method": "get_user_books", "calls": 2, "round_trips": 1},
+        {"page": "library", "method": "get_user_recommendations", "calls": 1, "round_trips": 1},
+        {"page": "rerun", "method": "get_user_books", "calls": 1, "round_trips": 0},
+    ]
+    text = unit.format_report()
+    assert "feed / get_user_books: 2 -> 1" in text
+    assert "library total: 3 -> 2" in text
+
+
+def test_local_store_reads_are_shared_until_a_write(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test local store reads are shared until a write."
+    storage = _import_storage()
+    from backend.request_cache import unit_of_work
+
+    saved = {"books": {"u@x.com": {"library": {"saved": ["P1"]}, "genre_preferences": []}}}
+    loads = []
+
+    def _load():
+        "Helper for load."
+        loads.append(1)
+        return {"accounts": {"users": {}}, "books": dict(saved["books"]), "clubs": {}, "forum": {}}
+
+    monkeypatch.setattr(storage, "load_user_store", _load)
+    monkeypatch.setattr(storage, "save_user_books", lambda store: saved.update(books=store["books"]))
+    ls = storage.LocalStorage()
+
+    with unit_of_work():
+        ls.get_user_books("u@x.com")
+        ls.get_user_forums("u@x.com")
+        ls.get_user_events("u@x.com")
+        assert len(loads) == 1
+        ls.save_user_books("u@x.com", {"library": {"saved": ["P2"]}, "genre_preferences": []})
+        assert ls.get_user_books("u@x.com")["library"]["saved"] == ["P2"]
+        assert len(loads) == 2
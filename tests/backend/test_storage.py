@@ -394,9 +394,11 @@ def test_local_storage_get_soonest_events_and_helpers(
     events_path = tmp_path / "book_events_clean.json"
 
     import json
+    import time
+    now = int(time.time())
     events = [
-        {"event_id": "E2", "ttl": 20, "city_state": "Seattle, WA", "parent_asin": "P1"},
-        {"event_id": "E1", "ttl": 10, "city_state": "Seattle, WA", "parent_asin": "P1"},
+        {"event_id": "E2", "ttl": now + 20, "city_state": "Seattle, WA", "parent_asin": "P1"},
+        {"event_id": "E1", "ttl": now + 10, "city_state": "Seattle, WA", "parent_asin": "P1"},
         "not-a-dict",
     ]
     events_path.write_text(json.dumps(events), encoding="utf-8")
@@ -574,33 +576,38 @@ def test_cloud_storage_get_events_by_city_and_for_book(
     storage = _import_storage()
     cs = storage.CloudStorage()
     from backend import config as cfg
+    import time
 
-    # No GSI configured -> empty list
-    monkeypatch.setattr(cfg, "EVENTS_CITY_STATE_GSI", "", raising=False)
-    assert cs.get_events_by_city("Seattle, WA") == []
-
-    monkeypatch.setattr(cfg, "EVENTS_CITY_STATE_GSI", "CITY_GSI", raising=False)
-    monkeypatch.setattr(cfg, "EVENTS_PARENT_ASIN_GSI", "PA_GSI", raising=False)
+    monkeypatch.setattr(cfg, "EVENTS_GSI", "TTL_GSI", raising=False)
     monkeypatch.setattr(cfg, "EVENTS_TABLE", "events", raising=False)
 
     boto3_mod = sys.modules["boto3"]
     dynamo = boto3_mod.resource("dynamodb")
     table = dynamo.Table("events")
+    now = int(time.time())
+    calls: list = []
 
     def query(**kwargs: Any) -> dict:
         "Helper for query."
-        if kwargs.get("IndexName") == "CITY_GSI":
-            return {"Items": [{"city_state": "Seattle, WA", "ttl": Decimal("10")}]}
-        return {"Items": [{"parent_asin": "P1", "ttl": Decimal("20")}]}
+        calls.append(kwargs)
+        return {
+            "Items": [
+                {"event_id": "e1", "city_state": "Seattle, WA", "ttl": Decimal(now + 10)},
+                {"event_id": "e2", "parent_asin": "P1", "ttl": Decimal(now + 20)},
+            ]
+        }
 
     table.query = query
 
+    assert cs.get_events_by_city("") == []
     by_city = cs.get_events_by_city("Seattle, WA")
     assert by_city[0]["city_state"] == "Seattle, WA"
-    assert by_city[0]["ttl"] == 10  # Decimal converted by _from_dynamo
+    assert by_city[0]["ttl"] == now + 10  # Decimal converted by _from_dynamo
 
     by_book = cs.get_events_for_book("P1", limit=5)
     assert by_book[0]["parent_asin"] == "P1"
+    # Both lookups are served from one snapshot load on the ttl GSI.
+    assert [c["IndexName"] for c in calls] == ["TTL_GSI"]
 
 
 def test_cloud_storage_forum_thread_helpers(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -75,33 +75,38 @@ def test_cloud_storage_events_gsi_queries_and_early_returns(monkeypatch) -> None
     storage = _import_storage()
     cs = storage.CloudStorage()
 
-    # No GSI -> []
-    monkeypatch.setattr(storage._config, "EVENTS_CITY_STATE_GSI", None, raising=False)
-    monkeypatch.setattr(storage._config, "EVENTS_PARENT_ASIN_GSI", None, raising=False)
-    monkeypatch.delenv("EVENTS_CITY_STATE_GSI", raising=False)
-    monkeypatch.delenv("EVENTS_PARENT_ASIN_GSI", raising=False)
-    assert cs.get_events_by_city("Seattle, WA") == []
-    assert cs.get_events_for_book("P1") == []
+    monkeypatch.setattr(storage._config, "EVENTS_GSI", "ttl-index", raising=False)
+    monkeypatch.setattr(storage._config, "EVENTS_TABLE", "events", raising=False)
+    assert cs.get_events_by_city("") == []
+    assert cs.get_events_for_book("") == []
 
     import boto3  # type: ignore
 
     dyn = boto3.resource("dynamodb")
     events_table = dyn.Table("events")
-
-    # Provide GSIs and stub query results
-    os.environ["EVENTS_CITY_STATE_GSI"] = "city_state_index"
-    os.environ["EVENTS_PARENT_ASIN_GSI"] = "parent_asin_index"
+    pages = {
+        None: {
+            "Items": [{"event_id": "e1", "city_state": "Seattle, WA", "parent_asin": "P1"}],
+            "LastEvaluatedKey": {"event_id": "e1"},
+        },
+        "e1": {"Items": [{"event_id": "e2", "city_state": "Seattle, WA", "parent_asin": "P1"}]},
+    }
 
     def _query(**kwargs):  # type: ignore[no-untyped-def]
-        # Ensure IndexName is passed through
+        # Ensure IndexName is passed through and pages are followed
         "Helper for  query."
-        assert "IndexName" in kwargs
-        return {"Items": [{"event_id": "e1"}, {"event_id": "e2"}]}
+        assert kwargs["IndexName"] == "ttl-index"
+        return pages[(kwargs.get("ExclusiveStartKey") or {}).get("event_id")]
 
     events_table.query = _query  # type: ignore[assignment]
 
-    assert cs.get_events_by_city("Seattle, WA") == [{"event_id": "e1"}, {"event_id": "e2"}]
-    assert cs.get_events_for_book("P1", limit=2) == [{"event_id": "e1"}, {"event_id": "e2"}]
+    expected = [
+        {"event_id": "e1", "city_state": "Seattle, WA", "parent_asin": "P1"},
+        {"event_id": "e2", "city_state": "Seattle, WA", "parent_asin": "P1"},
+    ]
+    assert cs.get_events_by_city("Seattle, WA") == expected
+    assert cs.get_events_for_book("P1", limit=1) == expected[:1]
+    assert cs.get_event_details("e2") == expected[1]
 
 
 def test_cloud_storage_save_user_books_store_mode_and_save_user_events_cleaning() -> None:
@@ -117,3 +117,184 @@ def test_cloud_storage_save_forum_db_writes_posts_and_counter_row() -> None:
     assert len(put_items) == 2
     assert any(it.get("pk") == "META" for it in put_items)
 
+
+
+def test_local_storage_forum_thread_index_and_single_post_create(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test local storage forum thread index and single post create."
+    storage = _import_storage()
+    from backend import forum_store
+
+    forum_path = tmp_path / "forum_posts.json"
+    monkeypatch.setattr(forum_store, "FORUM_DB_PATH", forum_path)
+    monkeypatch.setattr(forum_store, "PROCESSED_DIR", tmp_path)
+    monkeypatch.delitem(storage.LocalStorage._cache, "forum_index", raising=False)
+    forum_path.write_text(
+        '{"next_post_id": 3, "posts": ['
+        '{"id": 2, "title": "Old", "tags": ["Dune"]},'
+        '{"id": 1, "title": "Other", "parent_asin": "P9"}]}',
+        encoding="utf-8",
+    )
+    loads = []
+    real_load = storage.load_forum_store
+    monkeypatch.setattr(storage, "load_forum_store", lambda seed: loads.append(1) or real_load(seed))
+    ls = storage.LocalStorage()
+
+    assert [p["id"] for p in ls.get_forum_thread_for_book("P1", book_title="dune")] == [2]
+    assert [p["id"] for p in ls.get_forum_thread_for_book("P9")] == [1]
+    assert len(loads) == 1  # unchanged file: the index is reused
+
+    gen = storage.write_generation("forum")
+    new_id = ls.create_forum_post({"title": "New", "parent_asin": "P1", "book_title": "Dune", "tags": ["Dune"]})
+    assert new_id == 3
+    assert storage.write_generation("forum") == gen + 1
+    assert [p["id"] for p in ls.get_forum_thread_for_book("P1", book_title="Dune")] == [3, 2]
+    assert [p["id"] for p in ls.get_forum_thread_for_book("P1")] == [3]
+    # The index was updated in place rather than rebuilt from the file.
+    assert len(loads) == 2
+    saved = forum_store.load_forum_store([])
+    assert saved["next_post_id"] == 4
+    assert [p["id"] for p in saved["posts"]] == [3, 2, 1]
+
+
+def test_local_storage_get_and_update_forum_post(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test local storage get and update forum post."
+    storage = _import_storage()
+    from backend import forum_store
+
+    forum_path = tmp_path / "forum_posts.json"
+    monkeypatch.setattr(forum_store, "FORUM_DB_PATH", forum_path)
+    monkeypatch.setattr(forum_store, "PROCESSED_DIR", tmp_path)
+    monkeypatch.delitem(storage.LocalStorage._cache, "forum_index", raising=False)
+    forum_path.write_text(
+        '{"next_post_id": 3, "posts": ['
+        '{"id": 2, "title": "Two", "parent_asin": "P1", "likes": 0,'
+        ' "comments": [{"author": "a", "text": "t", "likes": 0}]},'
+        '{"id": 1, "title": "One", "parent_asin": "P9"}]}',
+        encoding="utf-8",
+    )
+    ls = storage.LocalStorage()
+
+    post = ls.get_forum_post("2")
+    assert post["title"] == "Two"
+    post["comments"][0]["likes"] = 5
+    assert ls.get_forum_post(2)["comments"][0]["likes"] == 0  # callers get a copy
+    assert ls.get_forum_post(99) is None
+
+    gen = storage.write_generation("forum")
+    post["likes"] = 1
+    post["parent_asin"] = "P9"
+    ls.update_forum_post(2, post)
+    assert storage.write_generation("forum") == gen + 1
+    assert ls.get_forum_post(2)["likes"] == 1
+    assert [p["id"] for p in ls.get_forum_thread_for_book("P9")] == [2, 1]
+    assert ls.get_forum_thread_for_book("P1") == []
+    saved = forum_store.load_forum_store([])
+    assert [(p["id"], p.get("likes")) for p in saved["posts"]] == [(2, 1), (1, None)]
+    assert saved["posts"][0]["comments"][0]["likes"] == 5
+
+    ls.update_forum_post(99, {"title": "Ghost"})
+    assert [p["id"] for p in forum_store.load_forum_store([])["posts"]] == [2, 1]
+
+
+def test_cloud_storage_create_forum_post_uses_counter_and_one_put(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test cloud storage create forum post uses counter and one put."
+    storage = _import_storage()
+    cs = storage.CloudStorage()
+
+    import boto3  # type: ignore
+
+    table = boto3.resource("dynamodb").Table("forum_posts")
+    puts: list[dict] = []
+    updates: list[dict] = []
+
+    def _update_item(**kw):  # type: ignore[no-untyped-def]
+        "Helper for  update item."
+        updates.append(kw)
+        return {"Attributes": {"next_post_id": Decimal("8")}}
+
+    monkeypatch.setattr(table, "update_item", _update_item, raising=False)
+    monkeypatch.setattr(table, "put_item", lambda **kw: puts.append(kw["Item"]) or {}, raising=False)
+    monkeypatch.setattr(table, "scan", lambda **_kw: (_ for _ in ()).throw(AssertionError("no scan")), raising=False)
+
+    post_id = cs.create_forum_post({"title": "T", "parent_asin": "P1"})
+    assert post_id == 7
+    assert updates[0]["Key"] == {"pk": "META", "sk": "next_post_id"}
+    assert "if_not_exists" in updates[0]["UpdateExpression"]
+    assert len(puts) == 1
+    assert puts[0]["sk"] == "7" and puts[0]["id"] == 7 and puts[0]["parent_asin"] == "P1"
+
+
+def test_cloud_storage_forum_thread_reads_all_pages_newest_first(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test cloud storage forum thread reads all pages newest first."
+    storage = _import_storage()
+    cs = storage.CloudStorage()
+    from backend import config as cfg
+
+    import boto3  # type: ignore
+
+    monkeypatch.setattr(cfg, "FORUM_POSTS_GSI", "parent_asin-index", raising=False)
+    monkeypatch.setattr(cfg, "FORUM_POSTS_TITLE_GSI", None, raising=False)
+    table = boto3.resource("dynamodb").Table("forum_posts")
+    pages = {
+        None: {"Items": [{"id": 1, "created_at": 10}], "LastEvaluatedKey": {"sk": "1"}},
+        "1": {"Items": [{"id": 2, "created_at": 20}]},
+    }
+    calls: list[dict] = []
+
+    def _query(**kw):  # type: ignore[no-untyped-def]
+        "Helper for  query."
+        calls.append(kw)
+        return pages[(kw.get("ExclusiveStartKey") or {}).get("sk")]
+
+    monkeypatch.setattr(table, "query", _query, raising=False)
+    posts = cs.get_forum_thread_for_book("P1", book_title="Dune")
+    assert [p["id"] for p in posts] == [2, 1]
+    assert len(calls) == 2 and all(c["IndexName"] == "parent_asin-index" for c in calls)
+    assert cs.get_forum_thread_for_book("  ") == []
+
+
+def test_cloud_storage_forum_thread_merges_title_gsi(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test cloud storage forum thread merges title gsi."
+    storage = _import_storage()
+    cs = storage.CloudStorage()
+    from backend import config as cfg
+
+    import boto3  # type: ignore
+
+    monkeypatch.setattr(cfg, "FORUM_POSTS_GSI", "parent_asin-index", raising=False)
+    monkeypatch.setattr(cfg, "FORUM_POSTS_TITLE_GSI", "book_title_key-index", raising=False)
+    table = boto3.resource("dynamodb").Table("forum_posts")
+    by_index = {
+        "parent_asin-index": {"Items": [{"id": 3, "created_at": 30}, {"id": 2, "created_at": 20}]},
+        # Legacy post 1 has no parent_asin; post 2 is found by both lookups.
+        "book_title_key-index": {"Items": [{"id": 2, "created_at": 20}, {"id": 1, "created_at": 10}]},
+    }
+    calls: list[dict] = []
+
+    def _query(**kw):  # type: ignore[no-untyped-def]
+        "Helper for  query."
+        calls.append(kw)
+        return by_index[kw["IndexName"]]
+
+    monkeypatch.setattr(table, "query", _query, raising=False)
+    assert [p["id"] for p in cs.get_forum_thread_for_book("P1", book_title="  DUNE ")] == [3, 2, 1]
+    assert [c["IndexName"] for c in calls] == ["parent_asin-index", "book_title_key-index"]
+    assert [p["id"] for p in cs.get_forum_thread_for_book("", book_title="Dune")] == [2, 1]
+
+    def _title_index_missing(**kw):  # type: ignore[no-untyped-def]
+        "Helper for  title index missing."
+        if kw["IndexName"] == "book_title_key-index":
+            raise RuntimeError("ValidationException: index not found")
+        return by_index[kw["IndexName"]]
+
+    monkeypatch.setattr(table, "query", _title_index_missing, raising=False)
+    assert [p["id"] for p in cs.get_forum_thread_for_book("P1", book_title="Dune")] == [3, 2]
+
+
+def test_forum_post_item_carries_title_key() -> None:
+    "Test forum post item carries title key."
+    storage = _import_storage()
+    item = storage._forum_post_to_item({"id": 4, "book_title": " The  Hobbit "}, "pk", "sk", "POST")
+    assert item["book_title_key"] == "the hobbit"
+    stale = storage._forum_post_to_item({"id": 5, "book_title": "", "book_title_key": "x"}, "pk", "sk", "POST")
+    assert "book_title_key" not in stale
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import importlib
 import json
+import time
 from pathlib import Path
 
 
@@ -69,12 +70,13 @@ def test_local_storage_soonest_events_sorting_and_filters(tmp_path, monkeypatch)
     monkeypatch.setattr(cfg, "PROCESSED_DIR", processed, raising=False)
 
     events_path = processed / "book_events_clean.json"
+    now = int(time.time())
     events_path.write_text(
         json.dumps(
             [
-                {"event_id": "e2", "ttl": 20, "city_state": "Seattle, WA", "parent_asin": "P1"},
-                {"event_id": "e1", "expiry": 10, "city_state": "Seattle, WA", "parent_asin": "P1"},
-                {"event_id": "e3", "ttl": 30, "city_state": "Portland, OR", "parent_asin": "P2"},
+                {"event_id": "e2", "ttl": now + 20, "city_state": "Seattle, WA", "parent_asin": "P1"},
+                {"event_id": "e1", "expiry": now + 10, "city_state": "Seattle, WA", "parent_asin": "P1"},
+                {"event_id": "e3", "ttl": now + 30, "city_state": "Portland, OR", "parent_asin": "P2"},
             ]
         ),
         encoding="utf-8",
@@ -0,0 +1,175 @@
+"""
+Tests for Book-Club-Manager.backend.write_behind and dynamo_batch.batch_write_items.
+
+These tests verify:
+- Writes to the same record are coalesced and flushed once per table
+- Queued, in-flight and just-flushed writes are visible through the overlay
+- Failed writes are re-queued unless a newer write for the record exists
+- The background thread flushes after the window and close() drains the queue
+- batch_write_items sends 25-item chunks and re-sends UnprocessedItems
+- CloudStorage user writes go through the queue when write-behind is enabled
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+import types
+
+
+def _import_storage():
+    "Helper for  import storage."
+    return importlib.reload(importlib.import_module("backend.storage"))
+
+
+def test_queue_coalesces_per_record_and_overlays_reads() -> None:
+    "Test queue coalesces per record and overlays reads."
+    from backend.write_behind import WriteBehindQueue
+
+    now = [0.0]
+    flushed = []
+    queue = WriteBehindQueue(
+        lambda table, key_attr, items: flushed.append((table, key_attr, items)) or [],
+        settle_seconds=2,
+        clock=lambda: now[0],
+        start_thread=False,
+    )
+    for n in range(3):
+        queue.put("user_books", "user_email", {"user_email": "a@x.com", "n": n})
+    queue.put("user_books", "user_email", {"user_email": "b@x.com", "n": 9})
+    queue.put("user_forums", "user_email", {"user_email": "a@x.com", "liked_post_ids": [1]})
+    assert queue.pending("user_books", "a@x.com") == {"user_email": "a@x.com", "n": 2}
+    assert queue.pending("user_events", "a@x.com") is None
+
+    assert queue.flush() == 3
+    assert sorted((t, len(items)) for t, _k, items in flushed) == [("user_books", 2), ("user_forums", 1)]
+    assert queue.pending("user_books", "a@x.com")["n"] == 2
+    now[0] = 5.0
+    assert queue.pending("user_books", "a@x.com") is None
+    assert queue.flush() == 0
+    assert (queue.puts, queue.flushed) == (5, 3)
+
+
+def test_failed_writes_are_requeued_unless_superseded() -> None:
+    "Test failed writes are requeued unless superseded."
+    from backend.write_behind import WriteBehindQueue
+
+    queue = None
+    attempts = []
+
+    def flush_fn(_table, key_attr, items):
+        "Helper for flush fn."
+        attempts.append([i["n"] for i in items])
+        if len(attempts) == 1:
+            # A newer write for b arrives while the first flush is in flight.
+            queue.put("t", "k", {"k": "b", "n": 3})
+            return [i[key_attr] for i in items]
+        return []
+
+    queue = WriteBehindQueue(flush_fn, start_thread=False)
+    queue.put("t", "k", {"k": "a", "n": 1})
+    queue.put("t", "k", {"k": "b", "n": 2})
+    assert queue.flush() == 0
+    assert queue.pending("t", "a")["n"] == 1
+    assert queue.flush() == 2
+    assert sorted(attempts[1]) == [1, 3]
+
+    def boom(*_a):
+        "Helper for boom."
+        raise ConnectionError("down")
+
+    broken = WriteBehindQueue(boom, start_thread=False)
+    broken.put("t", "k", {"k": "a", "n": 1})
+    assert broken.flush() == 0
+    assert broken.pending("t", "a") == {"k": "a", "n": 1}
+
+
+def test_background_thread_flushes_and_close_drains() -> None:
+    "Test background thread flushes and close drains."
+    from backend.write_behind import WriteBehindQueue
+
+    done = threading.Event()
+    written = []
+
+    def flush_fn(_table, _key_attr, items):
+        "Helper for flush fn."
+        written.extend(items)
+        done.set()
+        return []
+
+    queue = WriteBehindQueue(flush_fn, window_seconds=0.01)
+    queue.put("t", "k", {"k": "a"})
+    assert done.wait(5)
+    queue.close()
+    queue.put("t", "k", {"k": "b"})
+    queue.close()
+    assert [i["k"] for i in written] == ["a", "b"]
+
+
+def test_batch_write_items_chunks_and_retries_unprocessed() -> None:
+    "Test batch write items chunks and retries unprocessed."
+    from backend.dynamo_batch import batch_write_items, encode_item
+
+    lock = threading.Lock()
+    stored = {}
+    sizes = []
+
+    def batch_write_item(RequestItems):  # pylint: disable=invalid-name
+        "Helper for batch write item."
+        (table, requests), = RequestItems.items()
+        with lock:
+            sizes.append(len(requests))
+            served, rest = requests[:20], requests[20:]
+            for req in served:
+                item = req["PutRequest"]["Item"]
+                stored[item["k"]["S"]] = item
+        return {"UnprocessedItems": {table: rest} if rest else {}}
+
+    client = types.SimpleNamespace(batch_write_item=batch_write_item)
+    items = [encode_item({"k": f"u{i}", "n": 1.5, "ok": True, "tags": ["x"], "m": {"a": None}}) for i in range(60)]
+    assert batch_write_items(client, "t", items, sleep=lambda _s: None) == []
+    assert len(stored) == 60
+    assert max(sizes) == 25
+    assert stored["u0"]["n"] == {"N": "1.5"}
+    assert stored["u0"]["m"] == {"M": {"a": {"NULL": True}}}
+
+    failing = types.SimpleNamespace(batch_write_item=lambda **_kw: (_ for _ in ()).throw(ConnectionError()))
+    assert len(batch_write_items(failing, "t", items[:3], max_attempts=2, sleep=lambda _s: None)) == 3
+
+
+def test_cloud_user_writes_use_queue_and_read_their_writes(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    "Test cloud user writes use queue and read their writes."
+    storage = _import_storage()
+    from backend import config as cfg
+    from backend import write_behind
+
+    import boto3  # type: ignore
+
+    monkeypatch.setattr(cfg, "WRITE_BEHIND_ENABLED", True, raising=False)
+    books = boto3.resource("dynamodb").Table("user_books")
+    forums = boto3.resource("dynamodb").Table("user_forums")
+    direct = []
+    for table in (books, forums):
+        monkeypatch.setattr(table, "put_item", lambda **kw: direct.append(kw) or {}, raising=False)
+    monkeypatch.setattr(books, "get_item", lambda **_kw: {}, raising=False)
+    batches = []
+    client = types.SimpleNamespace(
+        batch_write_item=lambda RequestItems: batches.append(RequestItems) or {"UnprocessedItems": {}}
+    )
+    monkeypatch.setattr(storage, "_dynamo_client", lambda: client)
+
+    cs = storage.CloudStorage()
+    for shelf in (["P1"], ["P1", "P2"]):
+        cs.save_user_books("U@x.com", {"library": {"saved": shelf}, "genre_preferences": []})
+    cs.save_user_forums("u@x.com", {"saved_forum_post_ids": [4]})
+    assert direct == []
+    assert cs.get_user_books("u@x.com")["library"]["saved"] == ["P1", "P2"]
+
+    write_behind.reset_write_behind()
+    assert sorted(t for batch in batches for t in batch) == ["user_books", "user_forums"]
+    (book_batch,) = [b["user_books"] for b in batches if "user_books" in b]
+    assert len(book_batch) == 1
+    item = book_batch[0]["PutRequest"]["Item"]
+    assert item["user_email"] == {"S": "u@x.com"}
+    assert item["library"]["M"]["saved"] == {"L": [{"S": "P1"}, {"S": "P2"}]}
+    assert cs.get_user_books("u@x.com") is None
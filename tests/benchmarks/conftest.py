@@ -0,0 +1,63 @@
+"""Fixtures for the pytest-benchmark suite (opt-in).
+
+The test_bench_*.py modules are only collected when RUN_BENCHMARKS=1 and the
+pytest-benchmark plugin is installed, so the regular test run stays fast.
+Record a JSON baseline on a reference commit, then a run of the change, and
+compare them (exit status 1 on regressions beyond the threshold):
+
+    RUN_BENCHMARKS=1 python -m pytest tests/benchmarks \
+        --benchmark-json Book-Club-Manager/benchmarks/baselines/main.json
+    RUN_BENCHMARKS=1 python -m pytest tests/benchmarks --benchmark-json current.json
+    cd Book-Club-Manager && python -m benchmarks.compare \
+        benchmarks/baselines/main.json ../current.json --threshold 0.15
+
+BENCH_CATALOG_SIZES (comma-separated, default "10000,100000,1000000") limits
+the synthetic catalog sizes.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+from benchmarks import synthetic
+
+
+def _benchmarks_enabled() -> bool:
+    """Return True if RUN_BENCHMARKS is set and pytest-benchmark is installed."""
+    return (
+        os.getenv("RUN_BENCHMARKS", "").strip().lower() in ("1", "true", "yes")
+        and importlib.util.find_spec("pytest_benchmark") is not None
+    )
+
+
+def pytest_ignore_collect(collection_path: Path, config):  # type: ignore[no-untyped-def]
+    """Skip the test_bench_*.py modules unless benchmarks are enabled."""
+    del config
+    if Path(str(collection_path)).name.startswith("test_bench_") and not _benchmarks_enabled():
+        return True
+    return None
+
+
+def catalog_sizes() -> list[int]:
+    """Return the catalog sizes to benchmark (BENCH_CATALOG_SIZES or all of CATALOG_SIZES)."""
+    raw = os.getenv("BENCH_CATALOG_SIZES", "").strip()
+    if not raw:
+        return list(synthetic.CATALOG_SIZES)
+    return [int(s) for s in raw.split(",") if s.strip()]
+
+
+@functools.lru_cache(maxsize=None)
+def _catalog(n_books: int) -> dict:
+    """Build each synthetic catalog once per session."""
+    return synthetic.synthetic_catalog(n_books)
+
+
+@pytest.fixture(params=catalog_sizes(), ids=lambda n: f"{n}books")
+def catalog(request) -> dict:  # type: ignore[no-untyped-def]
+    """Synthetic catalog, parametrized over the benchmark catalog sizes."""
+    return _catalog(request.param)
@@ -0,0 +1,67 @@
+"""
+Benchmarks for the recommender hot paths on synthetic catalogs.
+
+Covers:
+- ContentBasedBookRecommender.recommend (cold start and personalized, float64 and compact)
+- Logistic book_recommender_backend.BookRecommender.recommend
+- EventRecommender.recommend over event pools of increasing size
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from backend.recommender.event_recommender import EventRecommender
+from benchmarks import synthetic
+
+EVENT_POOL_SIZES = (1_000, 10_000, 50_000)
+
+
+def _library(catalog: dict) -> list[str]:
+    "Helper for library."
+    n_books = len(catalog["book_id_to_idx"])
+    return [synthetic.book_id(i) for i in range(0, min(n_books, 200), 20)]
+
+
+@pytest.mark.benchmark(group="content_recommend")
+@pytest.mark.parametrize("compact", [False, True], ids=["float64", "compact"])
+def test_content_recommend_cold_start(benchmark, catalog, compact) -> None:  # type: ignore[no-untyped-def]
+    "Benchmark content recommend cold start."
+    rec = synthetic.content_recommender(catalog, compact)
+    result = benchmark(rec.recommend, "bench", None, None, 50)
+    assert len(result) <= 50
+
+
+@pytest.mark.benchmark(group="content_recommend")
+@pytest.mark.parametrize("compact", [False, True], ids=["float64", "compact"])
+def test_content_recommend_personalized(benchmark, catalog, compact) -> None:  # type: ignore[no-untyped-def]
+    "Benchmark content recommend personalized."
+    rec = synthetic.content_recommender(catalog, compact)
+    genres_df = pd.DataFrame(
+        [
+            {"user_id": "bench", "genre": "Fantasy", "rank": 1},
+            {"user_id": "bench", "genre": "Romance", "rank": 2},
+        ]
+    )
+    books_df = pd.DataFrame({"user_id": "bench", "parent_asin": _library(catalog)})
+    result = benchmark(rec.recommend, "bench", genres_df, books_df, 50)
+    assert len(result) <= 50
+
+
+@pytest.mark.benchmark(group="logistic_recommend")
+@pytest.mark.parametrize("compact", [False, True], ids=["float64", "compact"])
+def test_logistic_recommend(benchmark, catalog, compact) -> None:  # type: ignore[no-untyped-def]
+    "Benchmark logistic recommend."
+    rec = synthetic.backend_recommender(catalog, compact, _library(catalog))
+    result = benchmark(rec.recommend, "bench", 50)
+    assert len(result) <= 50
+
+
+@pytest.mark.benchmark(group="event_recommend")
+@pytest.mark.parametrize("n_events", EVENT_POOL_SIZES, ids=lambda n: f"{n}events")
+def test_event_recommend(benchmark, n_events) -> None:  # type: ignore[no-untyped-def]
+    "Benchmark event recommend."
+    events = synthetic.event_pool(n_events)
+    result = benchmark(EventRecommender().recommend, events, ["Fantasy", "Romance"], 10)
+    assert len(result) == 10
@@ -0,0 +1,61 @@
+"""
+Benchmarks for service hot paths against an in-memory storage stand-in.
+
+Covers:
+- library_service.get_library_with_details for growing libraries
+- forum_service.get_posts_sorted (newest, top_likes, tag filter) for growing forums
+- data_loader.build_ui_bootstrap with growing event pools
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from backend import data_loader
+from backend.services import books_service, forum_service, library_service
+from benchmarks import synthetic
+
+LIBRARY_SIZES = (20, 200, 1_000)
+FORUM_SIZES = (1_000, 10_000, 100_000)
+EVENT_POOL_SIZES = (100, 1_000, 10_000)
+USER = "bench@example.com"
+
+
+def _use_stand_in(monkeypatch, stand_in) -> None:  # type: ignore[no-untyped-def]
+    "Helper for use stand in."
+    for module in (books_service, forum_service, library_service):
+        monkeypatch.setattr(module, "get_storage", lambda: stand_in)
+
+
+@pytest.mark.benchmark(group="library_with_details")
+@pytest.mark.parametrize("size", LIBRARY_SIZES, ids=lambda n: f"{n}books")
+def test_get_library_with_details(benchmark, monkeypatch, size) -> None:  # type: ignore[no-untyped-def]
+    "Benchmark get library with details."
+    n_books = synthetic.CATALOG_SIZES[0]
+    stand_in = synthetic.LocalStandIn(n_books, users={USER: synthetic.user_library(n_books, size)})
+    _use_stand_in(monkeypatch, stand_in)
+    result = benchmark(library_service.get_library_with_details, USER)
+    assert sum(len(books) for books in result.values()) == size
+
+
+@pytest.mark.benchmark(group="posts_sorted")
+@pytest.mark.parametrize("n_posts", FORUM_SIZES, ids=lambda n: f"{n}posts")
+@pytest.mark.parametrize(
+    "sort,tag", [("newest", None), ("top_likes", None), ("newest", "fantasy")]
+)
+def test_get_posts_sorted(benchmark, monkeypatch, n_posts, sort, tag) -> None:  # type: ignore[no-untyped-def]
+    "Benchmark get posts sorted."
+    _use_stand_in(monkeypatch, synthetic.LocalStandIn(0, forum=synthetic.forum_db(n_posts)))
+    result = benchmark(forum_service.get_posts_sorted, sort, tag)
+    assert result
+
+
+@pytest.mark.benchmark(group="ui_bootstrap")
+@pytest.mark.parametrize("n_events", EVENT_POOL_SIZES, ids=lambda n: f"{n}events")
+def test_build_ui_bootstrap(benchmark, n_events) -> None:  # type: ignore[no-untyped-def]
+    "Benchmark build ui bootstrap."
+    raw_books = [synthetic.book_record(i) for i in range(200)]
+    events = synthetic.event_pool(n_events, n_books=200)
+    posts = synthetic.forum_db(1_000, n_books=200)["posts"]
+    result = benchmark(data_loader.build_ui_bootstrap, raw_books, events, posts)
+    assert len(result["clubs"]) == n_events
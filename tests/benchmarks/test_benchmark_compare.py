@@ -0,0 +1,51 @@
+"""
+Tests for Book-Club-Manager.benchmarks.compare (always collected).
+
+These tests verify:
+- pytest-benchmark JSON files are read by benchmark name and statistic
+- Slowdowns beyond the threshold are regressions and make main() exit 1
+- New, missing and improved benchmarks are reported without failing
+"""
+
+from __future__ import annotations
+
+import json
+
+from benchmarks import compare
+
+
+def _write(path, medians: dict[str, float]):  # type: ignore[no-untyped-def]
+    "Helper for write."
+    path.write_text(
+        json.dumps(
+            {
+                "benchmarks": [
+                    {"name": name.split("::")[-1], "fullname": name, "stats": {"median": m, "mean": m * 2}}
+                    for name, m in medians.items()
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_compare_flags_regressions_beyond_threshold(tmp_path, capsys) -> None:  # type: ignore[no-untyped-def]
+    "Test compare flags regressions beyond threshold."
+    base = _write(tmp_path / "base.json", {"a": 0.010, "b": 0.010, "c": 0.010, "gone": 0.001})
+    cur = _write(tmp_path / "cur.json", {"a": 0.011, "b": 0.013, "c": 0.005, "new": 0.001})
+
+    assert compare.load_results(base, "mean")["a"] == 0.020
+    rows = {r["name"]: r for r in compare.compare(compare.load_results(base), compare.load_results(cur), 0.2)}
+    assert {name: r["status"] for name, r in rows.items()} == {
+        "a": "ok",
+        "b": "regression",
+        "c": "improved",
+        "gone": "missing",
+        "new": "new",
+    }
+    assert round(rows["b"]["change"], 3) == 0.3
+
+    assert compare.main([str(base), str(cur), "--threshold", "0.2"]) == 1
+    assert "1 regression(s) beyond 20%" in capsys.readouterr().err
+    assert compare.main([str(base), str(cur), "--threshold", "0.5"]) == 0
@@ -0,0 +1,43 @@
+"""
+Tests for Book-Club-Manager.benchmarks.import_time (always collected).
+
+These tests verify:
+- -X importtime output is parsed into self / cumulative milliseconds
+- Budget and forbidden-package violations are reported
+- Importing the service layer loads none of pandas, sklearn, joblib or boto3
+"""
+
+from __future__ import annotations
+
+import os
+
+from benchmarks import import_time
+
+_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   pandas._libs
+2026-01-01 WARNING some log line
+import time:       900 |       1500 | pandas
+import time:       300 |       2100 | frontend.main
+"""
+
+
+def test_parse_and_check_report_budget_and_forbidden_modules() -> None:
+    "Test parse and check report budget and forbidden modules."
+    times = import_time.parse_importtime(_OUTPUT)
+    assert times["pandas"] == (0.9, 1.5)
+    assert times["frontend.main"] == (0.3, 2.1)
+    assert len(times) == 3
+
+    assert import_time.check(times, "frontend.main", budget_ms=10, forbidden=()) == []
+    problems = import_time.check(times, "frontend.main", budget_ms=1, forbidden=("pandas", "boto3"))
+    assert problems == [
+        "import frontend.main took 2 ms (budget 1 ms)",
+        "import frontend.main loaded pandas",
+    ]
+
+
+def test_service_layer_import_stays_off_heavy_packages() -> None:
+    "Test service layer import stays off heavy packages."
+    times = import_time.measure("backend.services.recommender_service", env=dict(os.environ, APP_ENV="local"))
+    assert "backend.recommender.book_recommender" in times
+    assert import_time.check(times, "backend.services.recommender_service", float("inf")) == []
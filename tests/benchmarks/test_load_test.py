@@ -0,0 +1,137 @@
+"""
+Tests for Book-Club-Manager.benchmarks.load_test and benchmarks.aws_standin (always collected).
+
+These tests verify:
+- A small thread-mode run against LocalStorage reports per-step latency,
+  throughput and error rates without errors (likes included), and leaves
+  the real data paths untouched
+- A run against the AWS stand-ins likes posts for users with no
+  user_forums record yet
+- The DynamoDB stand-in evaluates string key conditions on tables and GSIs,
+  pages with LastEvaluatedKey and applies if_not_exists counters
+- The S3 stand-in serves ranged GETs and raises NoSuchKey for missing objects
+"""
+
+from __future__ import annotations
+
+import pytest
+from botocore.exceptions import ClientError
+
+from benchmarks import aws_standin, load_test
+
+
+def test_local_thread_run_reports_steps_and_errors(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    "Test local thread run reports steps and errors."
+    from backend import config, user_store
+    from backend.services import auth_service
+
+    monkeypatch.setattr(auth_service, "BCRYPT_ROUNDS", 4)
+    accounts_path = user_store.USER_ACCOUNTS_PATH
+    opts = load_test.LoadOptions(users=2, iterations=2, events=20, posts=30, workdir=str(tmp_path))
+
+    summary = load_test.run(opts)
+
+    steps = summary["steps"]
+    assert steps["sign_in"]["count"] == 2
+    assert steps["sign_in"]["errors"] == 0
+    assert sum(s["count"] for name, s in steps.items() if name.startswith("journey.")) == 4
+    assert summary["journeys"] == 4
+    assert summary["requests"] == sum(
+        s["count"] for name, s in steps.items() if not name.startswith("journey.")
+    )
+    for stats in steps.values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    assert summary["error_rate"] == 0.0
+    if "like_post" in steps:
+        assert steps["like_post"]["errors"] == 0
+    assert (tmp_path / "user_accounts.json").exists()
+    assert user_store.USER_ACCOUNTS_PATH == accounts_path
+    assert config.PROCESSED_DIR != tmp_path
+
+
+def test_aws_standin_run_likes_posts_without_user_forums_records(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    "Test aws standin run likes posts without user forums records."
+    from backend.services import auth_service
+
+    monkeypatch.setattr(auth_service, "BCRYPT_ROUNDS", 4)
+    opts = load_test.LoadOptions(
+        backend="aws", users=2, iterations=3, books=200, events=20, posts=30,
+        dynamo_latency_ms=0.0, s3_latency_ms=0.0, seed=1, workdir=str(tmp_path),
+    )
+
+    steps = load_test.run(opts)["steps"]
+
+    assert steps["like_post"]["count"] > 0
+    assert steps["like_post"]["errors"] == 0
+
+
+def test_summarize_computes_rates_and_first_errors() -> None:
+    "Test summarize computes rates and first errors."
+    samples = [("feed", 0.010, ""), ("feed", 0.030, "ValueError: x"), ("journey.browse", 0.05, "failed")]
+    summary = load_test.summarize(samples, elapsed=2.0)
+    assert summary["requests"] == 2
+    assert summary["requests_per_second"] == 1.0
+    assert summary["error_rate"] == 0.5
+    assert summary["steps"]["feed"]["first_error"] == "ValueError: x"
+    assert summary["steps"]["feed"]["max_ms"] == pytest.approx(30.0)
+
+
+def test_standin_table_queries_pages_and_counters() -> None:
+    "Test standin table queries pages and counters."
+    from backend import config
+
+    dynamo = aws_standin.StandInDynamoResource()
+    events = dynamo.Table(config.EVENTS_TABLE)
+    events.load(
+        [
+            {"event_id": f"e{i}", "city_state": "Seattle, WA", "ttl": 100 + i}
+            for i in range(5)
+        ]
+    )
+    query = {
+        "IndexName": config.EVENTS_CITY_STATE_GSI,
+        "KeyConditionExpression": "#c = :c AND #t > :now",
+        "ExpressionAttributeNames": {"#c": "city_state", "#t": "ttl"},
+        "ExpressionAttributeValues": {":c": "Seattle, WA", ":now": 101},
+        "Limit": 2,
+    }
+    first = events.query(**query)
+    assert [i["event_id"] for i in first["Items"]] == ["e2", "e3"]
+    second = events.query(ExclusiveStartKey=first["LastEvaluatedKey"], **query)
+    assert [i["event_id"] for i in second["Items"]] == ["e4"]
+    assert "LastEvaluatedKey" not in second
+    with pytest.raises(ClientError):
+        events.query(
+            IndexName="missing-index",
+            KeyConditionExpression="event_id = :e",
+            ExpressionAttributeValues={":e": "e1"},
+        )
+
+    meta = dynamo.Table("counters")
+    resp = meta.update_item(
+        Key={"id": "META"},
+        UpdateExpression="SET next_post_id = if_not_exists(next_post_id, :first) + :one",
+        ExpressionAttributeValues={":first": 0, ":one": 1},
+        ReturnValues="UPDATED_NEW",
+    )
+    assert resp["Attributes"] == {"next_post_id": 1}
+    meta.update_item(
+        Key={"id": "META"},
+        UpdateExpression="SET next_post_id = if_not_exists(next_post_id, :first) + :one",
+        ExpressionAttributeValues={":first": 0, ":one": 1},
+    )
+    assert meta.get_item(Key={"id": "META"})["Item"]["next_post_id"] == 2
+    assert dynamo.calls()[f"{config.EVENTS_TABLE}.query"] == 3
+
+
+def test_standin_s3_missing_key_raises_no_such_key() -> None:
+    "Test standin s3 missing key raises no such key."
+    s3 = aws_standin.StandInS3()
+    s3.put_object(Bucket="b", Key="k.json", Body='{"a": 1}')
+    assert s3.get_object(Bucket="b", Key="k.json")["Body"].read() == b'{"a": 1}'
+    etag = s3.head_object(Bucket="b", Key="k.json")["ETag"]
+    part = s3.get_object(Bucket="b", Key="k.json", Range="bytes=1-4", IfMatch=etag)
+    assert part["Body"].read() == b'"a":'
+    with pytest.raises(ClientError) as excinfo:
+        s3.get_object(Bucket="b", Key="missing.json")
+    assert excinfo.value.response["Error"]["Code"] == "NoSuchKey"
@@ -4,6 +4,8 @@ import sys
 from pathlib import Path
 import types
 
+import pytest
+
 
 def _ensure_inner_project_on_path() -> None:
     """Make inner `Book-Club-Manager/` importable as top-level packages.
@@ -32,6 +34,11 @@ def _ensure_boto3_importable() -> None:
     # Always install the stub for test runs (overrides real boto3 if present).
     boto3_mod = types.ModuleType("boto3")
 
+    class _Cond(tuple):
+        def __and__(self, other: object) -> "_Cond":
+            "Helper for and."
+            return _Cond(("and", self, other))
+
     class _Key:
         def __init__(self, name: str):
             "Support __init__ for test doubles."
@@ -39,7 +46,11 @@ def _ensure_boto3_importable() -> None:
 
         def eq(self, value: object) -> tuple[str, str, object]:
             "Helper for eq."
-            return ("eq", self.name, value)
+            return _Cond(("eq", self.name, value))
+
+        def gt(self, value: object) -> tuple[str, str, object]:
+            "Helper for gt."
+            return _Cond(("gt", self.name, value))
 
     class _FakeTable:
         def __init__(self) -> None:
@@ -163,3 +174,26 @@ def pytest_ignore_collect(collection_path: Path, config):  # type: ignore[no-unt
             pass
     return Path(str(collection_path)).name == "test_streamlit_app.py"
 
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_caches():  # type: ignore[no-untyped-def]
+    """Start every test with empty process-wide caches, queues and executors."""
+    from backend import bootstrap_cache, events_pool, instrumentation, metadata_cache, refresh_executor, write_behind
+    from backend.recommender import artifact_cache
+
+    metadata_cache.reset_metadata_cache()
+    events_pool.reset_events_pools()
+    bootstrap_cache.reset_bootstrap_cache()
+    write_behind.reset_write_behind()
+    refresh_executor.reset_refresh_executor()
+    instrumentation.reset_registry()
+    artifact_cache.reset_artifact_cache()
+    yield
+    metadata_cache.reset_metadata_cache()
+    events_pool.reset_events_pools()
+    bootstrap_cache.reset_bootstrap_cache()
+    write_behind.reset_write_behind()
+    refresh_executor.reset_refresh_executor()
+    instrumentation.reset_registry()
+    artifact_cache.reset_artifact_cache()
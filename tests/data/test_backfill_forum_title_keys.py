@@ -0,0 +1,78 @@
+"""
+Tests for `loaders/backfill_forum_title_keys.py`.
+
+These tests cover:
+- Agreement of the backfilled key with the key the backend writes and queries
+- Paging through the scan and updating only posts missing the key
+
+Usage:
+    Run all tests from the project root using:
+        python -m unittest tests.data.test_backfill_forum_title_keys
+"""
+
+import unittest
+
+from backend.forum_store import book_title_key
+from data.scripts.loaders.backfill_forum_title_keys import (
+    backfill_forum_title_keys,
+    missing_title_key,
+    title_key,
+)
+
+
+class _FakeTable:
+    """forum_posts table stand-in: paged scan and recorded update_item calls."""
+
+    def __init__(self, pages):
+        "Helper for init."
+        self.pages = pages
+        self.updates = []
+
+    def scan(self, **kwargs):
+        "Helper for scan."
+        start = kwargs.get("ExclusiveStartKey")
+        page = start["page"] if start else 0
+        resp = {"Items": self.pages[page]}
+        if page + 1 < len(self.pages):
+            resp["LastEvaluatedKey"] = {"page": page + 1}
+        return resp
+
+    def update_item(self, **kwargs):
+        "Helper for update item."
+        self.updates.append((kwargs["Key"], kwargs["ExpressionAttributeValues"][":k"]))
+
+
+class TestBackfillForumTitleKeys(unittest.TestCase):
+    """Tests for the book_title_key backfill."""
+
+    def test_title_key_matches_backend(self):
+        "Test title key matches backend."
+        for title in ("  The   Hobbit ", "DUNE", "", None):
+            self.assertEqual(title_key(title), book_title_key(title))
+
+    def test_missing_title_key(self):
+        "Test missing title key."
+        self.assertEqual(missing_title_key({"book_title": "Dune"}), "dune")
+        self.assertEqual(missing_title_key({"book_title": "Dune", "book_title_key": "dune"}), "")
+        self.assertEqual(missing_title_key({"book_title": ""}), "")
+
+    def test_backfill_pages_and_updates_only_missing(self):
+        "Test backfill pages and updates only missing."
+        table = _FakeTable(
+            [
+                [{"pk": "POST", "sk": "1", "book_title": "Dune"}, {"pk": "META", "sk": "next_post_id"}],
+                [{"pk": "POST", "sk": "2", "book_title": "Emma", "book_title_key": "emma"}],
+                [{"pk": "POST", "sk": "3", "book_title": " Emma "}],
+            ]
+        )
+        self.assertEqual(backfill_forum_title_keys(table, dry_run=True), 2)
+        self.assertEqual(table.updates, [])
+        self.assertEqual(backfill_forum_title_keys(table), 2)
+        self.assertEqual(
+            table.updates,
+            [({"pk": "POST", "sk": "1"}, "dune"), ({"pk": "POST", "sk": "3"}, "emma")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
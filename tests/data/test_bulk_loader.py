@@ -0,0 +1,203 @@
+"""
+Tests for `loaders/bulk_loader.py` and the books/events loaders built on it.
+
+These tests cover:
+- Key-range splitting over SQLite (balanced, complete, honours limit)
+- Parallel loads against an in-memory DynamoDB stand-in that throttles
+  (UnprocessedItems) and enforces the 25-item BatchWriteItem limit
+- Resuming an interrupted load from its checkpoint file
+- Clearing a table with a parallel-segment Scan
+- Adaptive rate limiting (pacing and backoff on throttling)
+
+Usage:
+    Run all tests from the project root using:
+        python -m unittest tests.data.test_bulk_loader
+"""
+
+import json
+import sqlite3
+import tempfile
+import threading
+import unittest
+from contextlib import closing
+from pathlib import Path
+
+from data.scripts.loaders.bulk_loader import AdaptiveRateLimiter, BulkLoader, split_key_range
+from data.scripts.loaders.load_books_to_dynamodb import clear_table, load_books_to_dynamodb
+from data.scripts.loaders.load_events_to_dynamodb import load_events_to_dynamodb
+
+
+class _LocalDynamo:
+    """In-memory stand-in for the DynamoDB client calls the bulk loader uses."""
+
+    def __init__(self, key, per_call=25, fail_after=None):
+        "Support __init__ for test doubles."
+        self.key = key
+        self.items = {}
+        self.per_call = per_call
+        self.fail_after = fail_after
+        self.calls = 0
+        self.unprocessed_returned = 0
+        self._lock = threading.Lock()
+
+    def batch_write_item(self, RequestItems):  # pylint: disable=invalid-name
+        "Helper for batch write item."
+        (table, requests), = RequestItems.items()
+        assert len(requests) <= 25
+        with self._lock:
+            self.calls += 1
+            if self.fail_after is not None and self.calls > self.fail_after:
+                raise ConnectionError("network down")
+            served, rest = requests[: self.per_call], requests[self.per_call:]
+            for req in served:
+                if "PutRequest" in req:
+                    item = req["PutRequest"]["Item"]
+                    self.items[item[self.key]["S"]] = item
+                else:
+                    self.items.pop(req["DeleteRequest"]["Key"][self.key]["S"], None)
+            self.unprocessed_returned += len(rest)
+        return {"UnprocessedItems": {table: rest} if rest else {}}
+
+    def scan(self, TableName, Segment, TotalSegments, ExclusiveStartKey=None, **_kw):  # pylint: disable=invalid-name
+        "Helper for scan."
+        with self._lock:
+            keys = sorted(k for k in self.items if hash(k) % TotalSegments == Segment)
+        start = ExclusiveStartKey[self.key]["S"] if ExclusiveStartKey else None
+        keys = [k for k in keys if start is None or k > start][:7]
+        resp = {"Items": [{self.key: {"S": k}} for k in keys]}
+        if len(keys) == 7:
+            resp["LastEvaluatedKey"] = {self.key: {"S": keys[-1]}}
+        return resp
+
+
+def _make_books_db(path, n):
+    "Helper for make books db."
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute(
+            "CREATE TABLE books (parent_asin TEXT PRIMARY KEY, title TEXT, author_name TEXT, "
+            "average_rating REAL, rating_number INTEGER, images TEXT, categories TEXT, "
+            "title_author_key TEXT, description TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (f"B{i:05d}", f"Title {i}", "A", 4.5, i, "", json.dumps(["Fiction"]), f"k{i}", "d")
+                for i in range(n)
+            ]
+            + [("", "blank", "A", 1.0, 1, "", "[]", "", "")],
+        )
+        conn.commit()
+
+
+class TestBulkLoader(unittest.TestCase):
+    """Tests for BulkLoader and the loaders using it."""
+
+    def setUp(self):
+        "Create a temporary books.db."
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.db = self.tmp / "books.db"
+        _make_books_db(self.db, 300)
+
+    def tearDown(self):
+        "Remove the temporary directory."
+        self._tmp.cleanup()
+
+    def test_split_key_range_is_balanced_and_complete(self):
+        "Test split key range is balanced and complete."
+        with closing(sqlite3.connect(self.db)) as conn:
+            ranges = split_key_range(conn, "books", "parent_asin", 4, where="parent_asin != ''")
+            limited = split_key_range(conn, "books", "parent_asin", 4, where="parent_asin != ''", limit=10)
+        self.assertEqual(ranges[0][0], None)
+        self.assertEqual(ranges[-1][1], "B00299")
+        self.assertEqual([r[1] for r in ranges[:-1]], [r[0] for r in ranges[1:]])
+        self.assertEqual([r[1] for r in ranges], ["B00074", "B00149", "B00224", "B00299"])
+        self.assertEqual(limited[-1][1], "B00009")
+
+    def test_parallel_load_is_complete_under_throttling(self):
+        "Test parallel load is complete under throttling."
+        fake = _LocalDynamo("parent_asin", per_call=10)
+        written = load_books_to_dynamodb(
+            self.db, "books", limit=None, workers=4, target_wcu=0, client=fake
+        )
+        self.assertEqual(written, 300)
+        self.assertEqual(sorted(fake.items), [f"B{i:05d}" for i in range(300)])
+        self.assertGreater(fake.unprocessed_returned, 0)
+        item = fake.items["B00007"]
+        self.assertEqual(item["rating_number"], {"N": "7"})
+        self.assertEqual(item["categories"], {"L": [{"S": "Fiction"}]})
+        self.assertNotIn("description", item)
+
+    def test_interrupted_load_resumes_from_checkpoint(self):
+        "Test interrupted load resumes from checkpoint."
+        ckpt = self.tmp / "books.ckpt.json"
+        crashing = _LocalDynamo("parent_asin", fail_after=5)
+        with self.assertRaises(ConnectionError):
+            load_books_to_dynamodb(self.db, "books", limit=None, workers=3, client=crashing, checkpoint_path=ckpt)
+        self.assertTrue(ckpt.exists())
+        fake = _LocalDynamo("parent_asin")
+        fake.items.update(crashing.items)
+        written = load_books_to_dynamodb(
+            self.db, "books", limit=None, workers=5, client=fake, checkpoint_path=ckpt
+        )
+        self.assertEqual(len(fake.items), 300)
+        # Only what the first run did not finish is written again.
+        self.assertEqual(written, 300 - len(crashing.items))
+
+    def test_clear_uses_parallel_segment_scan(self):
+        "Test clear uses parallel segment scan."
+        fake = _LocalDynamo("parent_asin")
+        fake.items = {f"B{i}": {"parent_asin": {"S": f"B{i}"}} for i in range(90)}
+        clear_table("books", workers=4, client=fake)
+        self.assertEqual(fake.items, {})
+
+    def test_events_loader_uses_bulk_writes(self):
+        "Test events loader uses bulk writes."
+        path = self.tmp / "events.json"
+        events = [
+            {"link": f"https://x/{i}", "title": f"E{i}", "ttl": 1773943200 + i, "start_iso": "2026-03-19T18:00:00"}
+            for i in range(40)
+        ] + [{"link": "", "title": "skip"}]
+        path.write_text(json.dumps(events), encoding="utf-8")
+        fake = _LocalDynamo("event_id", per_call=20)
+        self.assertEqual(load_events_to_dynamodb(path, "events", target_wcu=0, client=fake), 40)
+        self.assertEqual(len(fake.items), 40)
+
+    def test_non_throttling_errors_propagate(self):
+        "Test non throttling errors propagate."
+        loader = BulkLoader(_LocalDynamo("k", fail_after=0), "t", sleep=lambda _s: None)
+        with self.assertRaises(ConnectionError):
+            loader.write_items([{"k": "a"}], key="k")
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """Tests for AdaptiveRateLimiter."""
+
+    def test_paces_to_target_and_backs_off(self):
+        "Test paces to target and backs off."
+        now = [0.0]
+        slept = []
+
+        def sleep(s):
+            "Helper for sleep."
+            slept.append(s)
+            now[0] += s
+
+        limiter = AdaptiveRateLimiter(100, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            limiter.acquire(50)
+        # 200 units at 100/s with a one-second burst: one second of waiting.
+        self.assertAlmostEqual(sum(slept), 1.0)
+        limiter.throttled()
+        limiter.throttled()
+        self.assertEqual(limiter.rate, 25)
+        for _ in range(30):
+            limiter.succeeded()
+        self.assertEqual(limiter.rate, 100)
+        unpaced = AdaptiveRateLimiter(0, sleep=sleep)
+        unpaced.acquire(10_000)
+        self.assertAlmostEqual(sum(slept), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
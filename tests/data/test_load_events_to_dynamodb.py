@@ -0,0 +1,38 @@
+"""
+Tests for `loaders/load_events_to_dynamodb.py` item building.
+
+These tests cover:
+- The `day_bucket` attribute written for the day-bucket GSI
+- Agreement with the bucket key the backend queries
+
+Usage:
+    Run all tests from the project root using:
+        python -m unittest tests.data.test_load_events_to_dynamodb
+"""
+
+import unittest
+
+from backend.events_pool import day_bucket
+from data.scripts.loaders.load_events_to_dynamodb import record_to_item
+
+
+class TestRecordToItemDayBucket(unittest.TestCase):
+    """Tests for the day_bucket attribute of record_to_item."""
+
+    def test_day_bucket_from_ttl(self):
+        "Test day bucket from ttl."
+        item = record_to_item(
+            {"link": "https://x/e", "title": "T", "ttl": 1773943200, "start_iso": "2026-03-19T18:00:00"}
+        )
+        self.assertEqual(item["day_bucket"], "day#20260319")
+        self.assertEqual(item["day_bucket"], day_bucket(item["ttl"]))
+
+    def test_no_bucket_without_ttl(self):
+        "Test no bucket without ttl."
+        item = record_to_item({"link": "https://x/e", "title": "T", "start_iso": ""})
+        self.assertNotIn("ttl", item)
+        self.assertNotIn("day_bucket", item)
+
+
+if __name__ == "__main__":
+    unittest.main()
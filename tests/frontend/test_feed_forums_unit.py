@@ -134,6 +134,10 @@ class _FakeStreamlitRuntime:
         "Helper for form submit button."
         return bool(self._form_submit_by_label.get(label, False))
 
+    def text_input(self, _label: str, *, key: str, **_kw: Any) -> str:
+        "Helper for text input."
+        return str(self._text_area_by_key.get(key, ""))
+
 
 def _install_streamlit(rt: _FakeStreamlitRuntime) -> None:
     "Helper for  install streamlit."
@@ -164,6 +168,7 @@ def _install_streamlit(rt: _FakeStreamlitRuntime) -> None:
         "text_area",
         "form_submit_button",
         "selectbox",
+        "text_input",
     ):
         setattr(st_mod, name, getattr(rt, name))
 
@@ -299,3 +304,51 @@ def test_feed_render_book_detail_deeplink_builds_minimal_book() -> None:
         clear_book_recs_cache=None,
     )
 
+
+
+def test_feed_book_detail_reads_indexed_thread_and_creates_one_post() -> None:
+    "Test feed book detail reads indexed thread and creates one post."
+    rt = _FakeStreamlitRuntime()
+    _install_streamlit(rt)
+    feed = importlib.import_module("frontend.pages.feed")
+    importlib.reload(feed)
+    feed.render_pill_tags = lambda *_a, **_kw: None  # type: ignore[assignment]
+
+    lookups: list[tuple] = []
+    created: list[dict] = []
+
+    def _thread(parent_asin: str, book_title: str | None = None, book_id: int | None = None) -> list[dict]:
+        "Helper for thread."
+        lookups.append((parent_asin, book_title, book_id))
+        return [{"id": 4, "title": "D", "author": "U", "tags": ["Title"], "preview": "p"}]
+
+    feed.forum_service = types.SimpleNamespace(get_thread_for_book=_thread)  # type: ignore[assignment]
+    feed.storage_get_book_details = lambda _sid: None  # type: ignore[assignment]
+    feed.library_service = types.SimpleNamespace(  # type: ignore[assignment]
+        add_book_to_library=lambda *_a, **_kw: None,
+        remove_book_from_library=lambda *_a, **_kw: None,
+    )
+    feed.get_storage = lambda: types.SimpleNamespace(  # type: ignore[assignment]
+        create_forum_post=lambda post: created.append(post) or 9,
+        save_forum_db=lambda _db: (_ for _ in ()).throw(AssertionError("full forum rewrite")),
+    )
+
+    book = {"id": 1, "source_id": "P1", "title": "Title", "author": "A", "genres": ["F"], "cover": "c", "rating": 1, "rating_count": 1}
+    rt.session_state["selected_book_source_id"] = "P1"
+    rt.session_state["signed_in"] = True
+    rt.session_state["user_name"] = "Ann"
+    rt._text_area_by_key = {"book_post_1_title": "Thoughts", "book_post_1_text": "Loved it", "book_post_1_tags": "pacing"}
+    rt._form_submit_by_label["Post discussion"] = True
+
+    feed.render_book_detail_page(
+        books=[book],
+        books_by_id={1: book},
+        extended_books_by_source_id={"P1": book},
+        current_user={"user_id": "u@example.com", "library": {"saved": [], "in_progress": [], "finished": []}},
+    )
+
+    assert lookups == [("P1", "Title", 1)]
+    assert len(created) == 1
+    assert created[0]["parent_asin"] == "P1"
+    assert created[0]["tags"] == ["Title", "pacing"]
+    assert rt.session_state["active_tab_after_save"] == "forum"
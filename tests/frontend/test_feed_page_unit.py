@@ -195,6 +195,7 @@ def test_feed_render_tab_hits_trending_recs_and_save_event_paths() -> None:
 
     assert sync_calls, "expected save-event path to sync user clubs"
     assert rt.rerun_called == 1
+    assert "Updating your recommendations…" not in rt.captions
 
     # Call again to hit resolved recommendations session cache branch.
     feed._render_feed_tab(
@@ -207,13 +208,15 @@ def test_feed_render_tab_hits_trending_recs_and_save_event_paths() -> None:
         books_by_source_id={"P1": books[0]},
         recommender_available=True,
         cached_spl_trending=cached_spl_trending,
-        cached_book_recommendations=cached_book_recommendations,
+        # A background refresh is running: the stored list is shown with a note.
+        cached_book_recommendations=lambda email: {**cached_book_recommendations(email), "refreshing": True},
         resolve_recommended_books=lambda **_kw: [],  # would be ignored due to cache hit
         get_recommended_events_for_user=get_recommended_events_for_user,
         format_when=format_when,
         sync_user_clubs_and_save=_sync_user_clubs_and_save,
         genre_dropdown_options=["F"],
     )
+    assert "Updating your recommendations…" in rt.captions
 
 
 def test_feed_book_detail_open_discussion_sets_state_and_reruns() -> None:
@@ -246,10 +246,16 @@ def test_forums_detail_signed_in_like_save_and_reply_paths() -> None:
         clear_aws_bootstrap_cache=lambda: None,
     )
 
-    assert post["likes"] >= 1
-    assert "u@example.com" in post.get("liked_by", [])
+    # The shared (cached) forum store is not mutated; each write saves an edited copy.
+    assert post["likes"] == 0 and post["liked_by"] == [] and len(post["comments"]) == 1
+    liked_post = saved_forum_db[0]["posts"][0]
+    assert liked_post["likes"] == 1
+    assert "u@example.com" in liked_post.get("liked_by", [])
     assert 1 in current_user.get("saved_forum_post_ids", [])
-    assert post["replies"] == len(post.get("comments", []))
+    assert saved_forum_db[1]["posts"][0]["comments"][0]["likes"] == 1
+    replied = saved_forum_db[-1]["posts"][0]
+    assert replied["comments"][-1]["text"] == "Reply text"
+    assert replied["replies"] == len(replied.get("comments", [])) == 2
     assert saved_forum_db, "expected forum db saves"
     assert saved_user_forum, "expected user forum save"
     assert rt.rerun_called >= 1
@@ -322,7 +328,8 @@ def test_forums_create_post_success_and_open_discussion_from_list() -> None:
     rt._selectbox_value = "Newest first"
     rt._button_by_key["open_forum_post_1"] = True
 
-    forum_store = {"posts": [], "next_post_id": 1}
+    existing = {"id": 1, "title": "Old", "author": "A", "preview": "P", "created_at": 1}
+    forum_store = {"posts": [existing], "next_post_id": 2}
     current_user = {"saved_forum_post_ids": []}
 
     cleared = {"called": 0}
@@ -341,9 +348,14 @@ def test_forums_create_post_success_and_open_discussion_from_list() -> None:
         clear_aws_bootstrap_cache=_clear_cache,
     )
 
-    assert forum_store["posts"], "expected new post inserted"
-    assert forum_store["next_post_id"] == 2
     assert saved_forum_db, "expected save_forum_db called"
+    saved = saved_forum_db[0]
+    assert [p["id"] for p in saved["posts"]] == [2, 1]
+    assert saved["posts"][0]["title"] == "New title"
+    assert saved["posts"][0]["tags"] == ["mystery", "pacing"]
+    assert saved["next_post_id"] == 3
+    # The shared (cached) forum store is not mutated.
+    assert forum_store == {"posts": [existing], "next_post_id": 2}
     assert cleared["called"] >= 1
     assert rt.session_state.get("forum_form_clear_next") is True
     assert rt.session_state.get("selected_forum_post_id") == 1
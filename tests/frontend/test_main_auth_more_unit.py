@@ -329,3 +329,66 @@ def test_main_restores_auth_user_from_query() -> None:
     assert rt.session_state["user_email"] == "u@example.com"
     assert rt.session_state["user_name"] == "Restored"
 
+
+
+def test_main_reruns_reuse_cached_bootstrap_until_forum_write() -> None:
+    "Test main reruns reuse cached bootstrap until forum write."
+    rt = _FakeStreamlitRuntime()
+    _install_streamlit(rt)
+    main = importlib.import_module("frontend.main")
+    importlib.reload(main)
+    from backend import storage as storage_mod
+
+    calls = {"reviews": 0, "events": 0, "forum": 0}
+
+    def _reviews(_n):  # type: ignore[no-untyped-def]
+        "Helper for reviews."
+        calls["reviews"] += 1
+        return [{"parent_asin": "B1", "title": "One"}]
+
+    def _events(_n):  # type: ignore[no-untyped-def]
+        "Helper for events."
+        calls["events"] += 1
+        return []
+
+    class _Storage:
+        def load_forum_db(self):  # type: ignore[no-untyped-def]
+            "Helper for load forum db."
+            calls["forum"] += 1
+            return {"posts": [{"id": 1, "title": "t"}], "next_post_id": 2}
+
+        def load_user_store(self, _email=None):  # type: ignore[no-untyped-def]
+            "Helper for load user store."
+            return {"accounts": {"users": {}}}
+
+    seen: list[dict] = []
+    main.inject_styles = lambda: None  # type: ignore[assignment]
+    main.auth_panel = lambda: None  # type: ignore[assignment]
+    main.handle_query_navigation = lambda *_a, **_kw: None  # type: ignore[assignment]
+    main.render_tabs = lambda **kw: seen.append(kw)  # type: ignore[assignment]
+    main.books_service = types.SimpleNamespace(get_trending_books_reviews=_reviews, get_trending_books_spl=lambda _n: [])  # type: ignore[assignment]
+    main.events_service = types.SimpleNamespace(get_explore_events=_events)  # type: ignore[assignment]
+    main.get_storage = lambda: _Storage()  # type: ignore[assignment]
+
+    main.main()
+    main.main()
+    assert calls == {"reviews": 1, "events": 1, "forum": 1}
+    assert seen[0]["books"] is seen[1]["books"]
+    # Reruns share the cached forum store (no per-rerun copy).
+    assert seen[0]["forum_store"] is seen[1]["forum_store"]
+
+    storage_mod.note_write("forum")
+    main.main()
+    assert calls == {"reviews": 1, "events": 1, "forum": 2}
+
+    # A rebuilt books section (same key, e.g. after invalidate) rebuilds the clubs.
+    main.get_bootstrap_cache().invalidate("books")
+    main.main()
+    assert calls == {"reviews": 2, "events": 2, "forum": 2}
+
+    rt.session_state["show_create_account"] = True
+    main.render_create_account_page = lambda: None  # type: ignore[assignment]
+    seen[-1]["clear_aws_bootstrap_cache"]()
+    main.main()
+    # Pages that return early never load the events or the forum.
+    assert calls == {"reviews": 3, "events": 2, "forum": 2}
@@ -40,6 +40,7 @@ def _make_recommender(n_books=20, beta=(1.0, 1.0, 1.0), library_book_ids=None):
 
     rec.book_id_to_idx = {f"book_{i}": i for i in range(n_books)}
     rec.idx_to_book_id = {i: f"book_{i}" for i in range(n_books)}
+    rec._prior_cache = None
 
     storage = MagicMock()
     storage.get_user_books.return_value = library_book_ids or []